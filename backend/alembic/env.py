@@ -52,6 +52,13 @@ print(f"target_metadata: {target_metadata}")
 print(f"Tablas en target_metadata: {target_metadata.tables.keys()}")
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Ignorar la tabla FTS5 de búsqueda de socios y sus tablas internas (SQLite)"""
+    if type_ == "table" and name.startswith("miembros_fts"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """
     Run migrations in 'offline' mode.
@@ -72,6 +79,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -97,6 +105,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,165 @@
+"""accesos_fecha_hora_datetime
+
+Revision ID: a3c8e1f4b7d2
+Revises: f0fe84dc3ac9
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c8e1f4b7d2'
+down_revision = 'f0fe84dc3ac9'
+branch_labels = None
+depends_on = None
+
+
+# Filas procesadas por lote durante el backfill
+BATCH_SIZE = 5000
+
+
+def _parse_iso(valor):
+    """ISO string -> datetime aware en UTC (los strings sin offset ya eran UTC)"""
+    if valor is None or valor == "":
+        return None
+    dt = datetime.fromisoformat(str(valor).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _format_iso(valor):
+    """datetime -> ISO string naive en UTC (formato original)"""
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor)
+    if valor.tzinfo is not None:
+        valor = valor.astimezone(timezone.utc).replace(tzinfo=None)
+    return valor.isoformat()
+
+
+def _backfill(tabla, columnas, tipo_origen, tipo_destino, convertir):
+    """
+    Copiar columna -> columna_nueva en lotes por id
+
+    Cada lote toma BATCH_SIZE filas con id mayor al último procesado, de modo
+    que el log de accesos (millones de filas) no se carga entero en memoria
+    ni bloquea la tabla en una sola sentencia UPDATE gigante.
+
+    Args:
+        tabla: Nombre de la tabla
+        columnas: Lista de tuplas (columna_origen, columna_destino)
+        tipo_origen: Tipo SQLAlchemy de las columnas origen
+        tipo_destino: Tipo SQLAlchemy de las columnas destino
+        convertir: Función de conversión de valores
+    """
+    bind = op.get_bind()
+    t = sa.table(
+        tabla,
+        sa.column("id", sa.Integer),
+        *[sa.column(origen, tipo_origen) for origen, _ in columnas],
+        *[sa.column(destino, tipo_destino) for _, destino in columnas]
+    )
+
+    ultimo_id = 0
+    while True:
+        filas = bind.execute(
+            sa.select(t.c.id, *[t.c[origen] for origen, _ in columnas])
+            .where(t.c.id > ultimo_id)
+            .order_by(t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not filas:
+            break
+
+        params = []
+        for fila in filas:
+            valores = {"_id": fila[0]}
+            for i, (_, destino) in enumerate(columnas, start=1):
+                valores[destino] = convertir(fila[i])
+            params.append(valores)
+
+        bind.execute(
+            t.update()
+            .where(t.c.id == sa.bindparam("_id"))
+            .values({destino: sa.bindparam(destino) for _, destino in columnas}),
+            params
+        )
+        ultimo_id = filas[-1][0]
+
+
+def _reemplazar_columnas(tabla, columnas, tipo_actual, tipo_nuevo, convertir, nullables):
+    """
+    Cambiar el tipo de columnas agregando una columna temporal, copiando en
+    lotes y renombrando. batch_alter_table permite hacerlo también en SQLite
+    (que no soporta ALTER COLUMN TYPE).
+    """
+    with op.batch_alter_table(tabla) as batch_op:
+        for columna in columnas:
+            batch_op.add_column(sa.Column(f"{columna}_nueva", tipo_nuevo, nullable=True))
+
+    _backfill(tabla, [(c, f"{c}_nueva") for c in columnas], tipo_actual, tipo_nuevo, convertir)
+
+    with op.batch_alter_table(tabla) as batch_op:
+        for columna in columnas:
+            batch_op.drop_column(columna)
+            batch_op.alter_column(
+                f"{columna}_nueva",
+                new_column_name=columna,
+                existing_type=tipo_nuevo,
+                nullable=nullables[columna]
+            )
+
+
+def upgrade() -> None:
+    """
+    Migrar accesos.fecha_hora y eventos_acceso.fecha_inicio/fecha_fin de
+    String (ISO) a DateTime con zona horaria.
+
+    Con la columna nativa, los filtros "hoy / semana / mes" son comparaciones
+    de rango sobre el índice en lugar de func.date(fecha_hora), que obligaba
+    a recorrer toda la tabla. El índice compuesto (fecha_hora, resultado)
+    cubre los conteos por resultado dentro de un rango.
+    """
+    op.drop_index('ix_accesos_fecha_hora', table_name='accesos')
+
+    _reemplazar_columnas(
+        'accesos', ['fecha_hora'], sa.String(length=255), sa.DateTime(timezone=True), _parse_iso,
+        nullables={'fecha_hora': False}
+    )
+    _reemplazar_columnas(
+        'eventos_acceso', ['fecha_inicio', 'fecha_fin'], sa.String(length=255), sa.DateTime(timezone=True),
+        _parse_iso,
+        nullables={'fecha_inicio': False, 'fecha_fin': True}
+    )
+
+    op.create_index('ix_accesos_fecha_hora', 'accesos', ['fecha_hora'], unique=False)
+    op.create_index(
+        'idx_accesos_fecha_hora_resultado',
+        'accesos',
+        ['fecha_hora', 'resultado'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Volver a columnas String con timestamps ISO"""
+    op.drop_index('idx_accesos_fecha_hora_resultado', table_name='accesos')
+    op.drop_index('ix_accesos_fecha_hora', table_name='accesos')
+
+    _reemplazar_columnas(
+        'eventos_acceso', ['fecha_inicio', 'fecha_fin'], sa.DateTime(timezone=True), sa.String(length=255),
+        _format_iso,
+        nullables={'fecha_inicio': False, 'fecha_fin': True}
+    )
+    _reemplazar_columnas(
+        'accesos', ['fecha_hora'], sa.DateTime(timezone=True), sa.String(length=255), _format_iso,
+        nullables={'fecha_hora': False}
+    )
+
+    op.create_index('ix_accesos_fecha_hora', 'accesos', ['fecha_hora'], unique=False)
@@ -0,0 +1,34 @@
+"""usuarios_token_version
+
+Revision ID: a6d1e8b3f5c2
+Revises: f2c7a4d8e1b3
+Create Date: 2026-10-17 19:48:12.640915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d1e8b3f5c2'
+down_revision = 'f2c7a4d8e1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Versión de tokens por usuario (claim "ver" del JWT).
+
+    Los tokens ya emitidos no traen "ver" y se toman como versión 0, que es
+    la inicial de todos los usuarios existentes.
+    """
+    op.add_column(
+        'usuarios',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,75 @@
+"""resumen_diario_caja
+
+Revision ID: b7f2a9c4e1d5
+Revises: e4b9d3c6a2f8
+Create Date: 2026-10-17 17:05:48.331902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f2a9c4e1d5'
+down_revision = 'e4b9d3c6a2f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Agregado diario de caja + carga inicial desde los datos existentes.
+
+    La carga equivale a ResumenCajaService.reconstruir(); se hace en SQL para
+    no depender de los modelos de la aplicación. ON CONFLICT funciona igual en
+    PostgreSQL y SQLite (>= 3.24; SQLite exige WHERE en el SELECT para no
+    confundir el ON con un JOIN).
+    """
+    op.create_table('resumen_diario_caja',
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('categoria_contable', sa.String(length=100), nullable=False),
+    sa.Column('ingresos', sa.Float(), nullable=False),
+    sa.Column('egresos', sa.Float(), nullable=False),
+    sa.Column('cantidad_ingresos', sa.Integer(), nullable=False),
+    sa.Column('cantidad_egresos', sa.Integer(), nullable=False),
+    sa.Column('cantidad_pagos', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('fecha', 'categoria_contable')
+    )
+    op.create_index(
+        'idx_movimientos_caja_tipo_fecha',
+        'movimientos_caja',
+        ['tipo', 'fecha_movimiento'],
+        unique=False
+    )
+
+    op.execute("""
+        INSERT INTO resumen_diario_caja
+            (fecha, categoria_contable, ingresos, egresos,
+             cantidad_ingresos, cantidad_egresos, cantidad_pagos)
+        SELECT fecha_movimiento, COALESCE(categoria_contable, ''),
+               SUM(CASE WHEN tipo = 'ingreso' THEN monto ELSE 0 END),
+               SUM(CASE WHEN tipo = 'ingreso' THEN 0 ELSE monto END),
+               SUM(CASE WHEN tipo = 'ingreso' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN tipo = 'ingreso' THEN 0 ELSE 1 END),
+               0
+        FROM movimientos_caja
+        GROUP BY fecha_movimiento, COALESCE(categoria_contable, '')
+    """)
+    op.execute("""
+        INSERT INTO resumen_diario_caja
+            (fecha, categoria_contable, ingresos, egresos,
+             cantidad_ingresos, cantidad_egresos, cantidad_pagos)
+        SELECT p.fecha_pago, COALESCE(m.categoria_contable, ''), 0, 0, 0, 0, COUNT(p.id)
+        FROM pagos p
+        LEFT JOIN movimientos_caja m ON m.pago_id = p.id AND m.tipo = 'ingreso'
+        WHERE p.estado = 'APROBADO'
+        GROUP BY p.fecha_pago, COALESCE(m.categoria_contable, '')
+        ON CONFLICT (fecha, categoria_contable)
+        DO UPDATE SET cantidad_pagos = excluded.cantidad_pagos
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_movimientos_caja_tipo_fecha', table_name='movimientos_caja')
+    op.drop_table('resumen_diario_caja')
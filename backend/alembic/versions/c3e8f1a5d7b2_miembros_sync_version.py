@@ -0,0 +1,50 @@
+"""miembros_sync_version
+
+Revision ID: c3e8f1a5d7b2
+Revises: a6d1e8b3f5c2
+Create Date: 2026-10-17 21:02:37.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f1a5d7b2'
+down_revision = 'a6d1e8b3f5c2'
+branch_labels = None
+depends_on = None
+
+SYNC_VERSION_SEQ = 'miembros_sync_version_seq'
+
+
+def upgrade() -> None:
+    """
+    Versión de sincronización de socios (delta de /api/accesos/snapshot).
+
+    Los socios existentes toman su id como versión inicial (valores únicos).
+    En PostgreSQL se crea la secuencia que asigna las versiones siguientes,
+    posicionada después de la mayor versión existente.
+    """
+    op.add_column(
+        'miembros',
+        sa.Column('sync_version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+    op.execute('UPDATE miembros SET sync_version = id')
+    op.create_index(op.f('ix_miembros_sync_version'), 'miembros', ['sync_version'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f'CREATE SEQUENCE IF NOT EXISTS {SYNC_VERSION_SEQ}')
+        op.execute(
+            f"SELECT setval('{SYNC_VERSION_SEQ}', "
+            f"(SELECT COALESCE(MAX(sync_version), 0) + 1 FROM miembros), false)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f'DROP SEQUENCE IF EXISTS {SYNC_VERSION_SEQ}')
+
+    op.drop_index(op.f('ix_miembros_sync_version'), table_name='miembros')
+    with op.batch_alter_table('miembros') as batch_op:
+        batch_op.drop_column('sync_version')
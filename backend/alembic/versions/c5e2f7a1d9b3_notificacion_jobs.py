@@ -0,0 +1,70 @@
+"""notificacion_jobs
+
+Revision ID: c5e2f7a1d9b3
+Revises: a3c8e1f4b7d2
+Create Date: 2026-10-17 15:02:11.402871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e2f7a1d9b3'
+down_revision = 'a3c8e1f4b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('notificacion_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'EN_CURSO', 'COMPLETADO', 'FALLIDO', name='estadojob'), nullable=False),
+    sa.Column('parametros', sa.JSON(), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('enviados', sa.Integer(), nullable=False),
+    sa.Column('fallidos', sa.Integer(), nullable=False),
+    sa.Column('omitidos', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('creado_por_id', sa.Integer(), nullable=True),
+    sa.Column('worker_id', sa.String(length=100), nullable=True),
+    sa.Column('lease_hasta', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('iniciado_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finalizado_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['creado_por_id'], ['usuarios.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notificacion_jobs_estado'), 'notificacion_jobs', ['estado'], unique=False)
+    op.create_index(op.f('ix_notificacion_jobs_id'), 'notificacion_jobs', ['id'], unique=False)
+
+    op.create_table('notificacion_envios',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('miembro_id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'ENVIADO', 'FALLIDO', 'OMITIDO', name='estadoenvio'), nullable=False),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('proximo_intento', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('ultimo_error', sa.String(length=500), nullable=True),
+    sa.Column('enviado_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['notificacion_jobs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['miembro_id'], ['miembros.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'miembro_id', name='uq_notificacion_envio_job_miembro')
+    )
+    op.create_index('idx_notificacion_envios_job_estado', 'notificacion_envios', ['job_id', 'estado'], unique=False)
+    op.create_index(op.f('ix_notificacion_envios_id'), 'notificacion_envios', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notificacion_envios_id'), table_name='notificacion_envios')
+    op.drop_index('idx_notificacion_envios_job_estado', table_name='notificacion_envios')
+    op.drop_table('notificacion_envios')
+    op.drop_index(op.f('ix_notificacion_jobs_id'), table_name='notificacion_jobs')
+    op.drop_index(op.f('ix_notificacion_jobs_estado'), table_name='notificacion_jobs')
+    op.drop_table('notificacion_jobs')
+    sa.Enum(name='estadoenvio').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='estadojob').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,38 @@
+"""versiones_recurso
+
+Revision ID: d4f9b2e7a1c6
+Revises: c3e8f1a5d7b2
+Create Date: 2026-10-17 23:14:05.612840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f9b2e7a1c6'
+down_revision = 'c3e8f1a5d7b2'
+branch_labels = None
+depends_on = None
+
+RECURSOS = ('categorias', 'miembros', 'pagos')
+
+
+def upgrade() -> None:
+    """
+    Contadores de versión por recurso (ETag de la caché HTTP condicional).
+
+    Se crean con versión 0; la aplicación los incrementa en cada commit que
+    escribe las tablas del recurso.
+    """
+    tabla = op.create_table('versiones_recurso',
+    sa.Column('recurso', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('recurso')
+    )
+    op.bulk_insert(tabla, [{'recurso': recurso, 'version': 0} for recurso in RECURSOS])
+
+
+def downgrade() -> None:
+    op.drop_table('versiones_recurso')
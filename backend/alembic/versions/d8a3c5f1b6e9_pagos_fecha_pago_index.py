@@ -0,0 +1,30 @@
+"""pagos_fecha_pago_index
+
+Revision ID: d8a3c5f1b6e9
+Revises: b7f2a9c4e1d5
+Create Date: 2026-10-17 18:12:04.557130
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3c5f1b6e9'
+down_revision = 'b7f2a9c4e1d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Índice para listar pagos por fecha.
+
+    La paginación por cursor de GET /api/pagos filtra
+    (fecha_pago, id) < (último visto) y ordena por ambas columnas.
+    """
+    op.create_index('idx_pagos_fecha_pago_id', 'pagos', ['fecha_pago', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_pagos_fecha_pago_id', table_name='pagos')
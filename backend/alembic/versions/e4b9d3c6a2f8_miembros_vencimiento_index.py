@@ -0,0 +1,36 @@
+"""miembros_vencimiento_index
+
+Revision ID: e4b9d3c6a2f8
+Revises: c5e2f7a1d9b3
+Create Date: 2026-10-17 16:20:37.118540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9d3c6a2f8'
+down_revision = 'c5e2f7a1d9b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Índice para filtrar deudores por días de mora en SQL.
+
+    Miembro.filtro_dias_mora traduce `dias_mora >= N` a
+    `proximo_vencimiento <= hoy - N`; junto con is_deleted = false es un
+    rango sobre (is_deleted, proximo_vencimiento).
+    """
+    op.create_index(
+        'idx_miembros_is_deleted_vencimiento',
+        'miembros',
+        ['is_deleted', 'proximo_vencimiento'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_miembros_is_deleted_vencimiento', table_name='miembros')
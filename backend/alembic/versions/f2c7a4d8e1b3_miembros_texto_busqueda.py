@@ -0,0 +1,129 @@
+"""miembros_texto_busqueda
+
+Revision ID: f2c7a4d8e1b3
+Revises: d8a3c5f1b6e9
+Create Date: 2026-10-17 19:05:41.302218
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a4d8e1b3'
+down_revision = 'd8a3c5f1b6e9'
+branch_labels = None
+depends_on = None
+
+LOTE = 1000
+
+
+def _normalizar(texto):
+    """Copia de app.utils.busqueda.normalizar (la migración no depende de la app)"""
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", sin_tildes).strip().lower()
+
+
+def upgrade() -> None:
+    """
+    Búsqueda indexada de socios.
+
+    Agrega miembros.texto_busqueda (apellido, nombre, documento y número
+    normalizados), lo completa para los socios existentes y lo indexa:
+    GIN de trigramas en PostgreSQL, tabla FTS5 (tokenizador trigram) con
+    triggers de sincronización en SQLite.
+    """
+    bind = op.get_bind()
+    dialecto = bind.dialect.name
+
+    op.add_column('miembros', sa.Column('texto_busqueda', sa.String(length=400), nullable=True))
+
+    miembros = sa.table(
+        'miembros',
+        sa.column('id', sa.Integer),
+        sa.column('apellido', sa.String),
+        sa.column('nombre', sa.String),
+        sa.column('numero_documento', sa.String),
+        sa.column('numero_miembro', sa.String),
+        sa.column('texto_busqueda', sa.String),
+    )
+    ultimo_id = 0
+    while True:
+        filas = bind.execute(
+            sa.select(
+                miembros.c.id, miembros.c.apellido, miembros.c.nombre,
+                miembros.c.numero_documento, miembros.c.numero_miembro
+            )
+            .where(miembros.c.id > ultimo_id)
+            .order_by(miembros.c.id)
+            .limit(LOTE)
+        ).all()
+        if not filas:
+            break
+        bind.execute(
+            miembros.update()
+            .where(miembros.c.id == sa.bindparam('_id'))
+            .values(texto_busqueda=sa.bindparam('_texto')),
+            [
+                {
+                    '_id': f.id,
+                    '_texto': _normalizar(
+                        f"{f.apellido or ''} {f.nombre or ''} {f.numero_documento or ''} {f.numero_miembro or ''}"
+                    ),
+                }
+                for f in filas
+            ]
+        )
+        ultimo_id = filas[-1].id
+
+    if dialecto == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'idx_miembros_texto_busqueda',
+            'miembros',
+            ['texto_busqueda'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'texto_busqueda': 'gin_trgm_ops'}
+        )
+    else:
+        op.create_index('idx_miembros_texto_busqueda', 'miembros', ['texto_busqueda'], unique=False)
+
+    if dialecto == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS miembros_fts USING fts5("
+            "texto_busqueda, content='miembros', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS miembros_fts_ai AFTER INSERT ON miembros BEGIN "
+            "INSERT INTO miembros_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS miembros_fts_ad AFTER DELETE ON miembros BEGIN "
+            "INSERT INTO miembros_fts(miembros_fts, rowid, texto_busqueda) "
+            "VALUES ('delete', old.id, old.texto_busqueda); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS miembros_fts_au AFTER UPDATE OF texto_busqueda ON miembros BEGIN "
+            "INSERT INTO miembros_fts(miembros_fts, rowid, texto_busqueda) "
+            "VALUES ('delete', old.id, old.texto_busqueda); "
+            "INSERT INTO miembros_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END"
+        )
+        op.execute("INSERT INTO miembros_fts(miembros_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('miembros_fts_ai', 'miembros_fts_ad', 'miembros_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS miembros_fts')
+
+    op.drop_index('idx_miembros_texto_busqueda', table_name='miembros')
+    with op.batch_alter_table('miembros') as batch_op:
+        batch_op.drop_column('texto_busqueda')
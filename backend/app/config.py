@@ -3,7 +3,7 @@ Configuración de la aplicación con Pydantic Settings
 backend/app/config.py
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from functools import lru_cache
 
 
@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     DATABASE_ECHO: bool = False  # True para ver queries SQL
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    # URL para el driver asíncrono (si no se define, se deriva de DATABASE_URL:
+    # sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    DATABASE_ASYNC_URL: Optional[str] = None
     
     # ==================== SEGURIDAD ====================
     SECRET_KEY: str = "tu-clave-secreta-super-segura-cambiala-en-produccion"
@@ -29,6 +32,13 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # bcrypt corre en un pool de threads acotado (fuera del event loop).
+    # WORKERS = hashes simultáneos; MAX_QUEUE = esperas admitidas antes de
+    # responder 503. Los hashes con menos de BCRYPT_ROUNDS se rehacen al
+    # iniciar sesión
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 100
+    BCRYPT_ROUNDS: int = 12
     
     # ==================== ORGANIZACIÓN ====================
     ORG_PREFIX: str = "CLUB"  # Prefijo para QR: CLUB-ID-CHECKSUM
@@ -59,6 +69,22 @@ class Settings(BaseSettings):
     SMTP_FROM_EMAIL: str = ""
     SMTP_FROM_NAME: str = "Sistema de Gestión"
     SMTP_TLS: bool = True  # ← NUEVO: Para usar STARTTLS
+    SMTP_TIMEOUT: int = 30  # Segundos por operación SMTP
+    # Pool de conexiones persistentes para envíos masivos
+    SMTP_POOL_SIZE: int = 4  # Conexiones (y envíos) simultáneos
+    SMTP_POOL_RATE_PER_SECOND: float = 5.0  # Mensajes/s por conexión (0 = sin límite)
+    SMTP_POOL_MAX_RETRIES: int = 2  # Reintentos tras un corte de conexión
+    SMTP_POOL_IDLE_SECONDS: int = 60  # Verificar con NOOP conexiones ociosas por más tiempo
+    
+    # ==================== TRABAJOS DE NOTIFICACIÓN ====================
+    # Worker dentro del proceso de la API; en producción puede desactivarse
+    # y correr aparte con: python -m scripts.notification_worker
+    NOTIFICATION_WORKER_EMBEDDED: bool = True
+    NOTIFICATION_WORKER_POLL_SECONDS: float = 5.0
+    NOTIFICATION_JOB_BATCH_SIZE: int = 50  # Destinatarios por lote (y por commit)
+    NOTIFICATION_JOB_MAX_ATTEMPTS: int = 3  # Intentos por destinatario
+    NOTIFICATION_JOB_RETRY_BASE_SECONDS: int = 60  # Backoff: base * 2^(intento-1)
+    NOTIFICATION_JOB_LEASE_SECONDS: int = 300  # Reserva del worker; al vencer otro retoma el job
     
     # ==================== ARCHIVOS ====================
     UPLOAD_DIR: str = "uploads"
@@ -71,13 +97,48 @@ class Settings(BaseSettings):
     QR_BOX_SIZE: int = 10
     QR_BORDER: int = 4
     
+    # Caché de PNGs renderizados de /qr-image (memoria + {UPLOAD_DIR}/qr_cache).
+    # La clave incluye qr_hash y los parámetros de render, no requiere invalidación
+    QR_RENDER_CACHE_ENABLED: bool = True
+    QR_RENDER_CACHE_MAX_SIZE: int = 500
+    QR_RENDER_CACHE_TTL_SECONDS: int = 3600
+    
+    # Credenciales en lote: procesos del pool de render y tamaño mínimo de
+    # lote para usarlo (debajo se renderiza en el proceso del request)
+    CREDENCIALES_WORKERS: int = 4
+    CREDENCIALES_MIN_LOTE_POOL: int = 200
+    CREDENCIALES_MAX_LOTE: int = 10000
+    
     # ==================== PAGINACIÓN ====================
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # ==================== COMPRESIÓN ====================
+    # gzip/brotli (negociado por Accept-Encoding) para respuestas de al menos N bytes
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    
+    # ==================== CACHÉ HTTP ====================
+    # ETag / Last-Modified en lecturas (categorías, detalle de socio, reportes,
+    # QR). Respuestas autenticadas: caché privada que siempre revalida (304)
+    HTTP_CACHE_CONTROL: str = "private, no-cache"
+    
     # ==================== LOGS ====================
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
     LOG_FILE: str = "logs/app.log"
+    # Registros en espera de escribirse (thread de logs); llena, se descartan
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    # Fracción de respuestas exitosas (< 400) con log por request; errores y
+    # requests lentas se registran siempre
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0
+    LOG_REQUEST_SAMPLE_RATES: Dict[str, float] = {
+        "/api/accesos/validar-qr": 0.1,
+        "/health": 0.01,
+        "/metrics": 0.01,
+    }
+    LOG_SLOW_REQUEST_MS: float = 1000.0
     
     # ==================== AUDITORÍA ====================
     # Días de retención de auditoría (90 días por defecto)
@@ -108,6 +169,74 @@ class Settings(BaseSettings):
     # Monto máximo de deuda para advertencia (no bloqueo)
     DEUDA_MAXIMA_ADVERTENCIA: float = 500.0
     
+    # ==================== CACHÉ DE ACCESOS ====================
+    # Caché en memoria (LRU + TTL) de los datos de socio que usa validar-qr.
+    # Se invalida en pagos/cambios de estado/edición; el TTL acota la
+    # desactualización cuando hay varios workers (cada uno tiene su caché)
+    ACCESS_CACHE_ENABLED: bool = True
+    ACCESS_CACHE_MAX_SIZE: int = 10000
+    ACCESS_CACHE_TTL_SECONDS: int = 60
+    
+    # Escritura diferida (write-behind) de accesos + auditoría en lotes.
+    # Durabilidad: "wait" = el request espera el commit de su lote;
+    # "async" = responde al encolar (puede perder un lote ante un corte)
+    ACCESS_WRITE_BEHIND_ENABLED: bool = False
+    ACCESS_WRITE_BEHIND_FLUSH_MS: int = 200
+    ACCESS_WRITE_BEHIND_MAX_ROWS: int = 100
+    ACCESS_WRITE_BEHIND_DURABILITY: str = "wait"  # wait | async
+    
+    # Validación en lote de escaneos offline (POST /api/accesos/validar-qr/batch):
+    # máximo de escaneos por request y tolerancia a relojes de dispositivo
+    # adelantados (escaneos más en el futuro que esto se rechazan)
+    ACCESS_BATCH_MAX_SCANS: int = 500
+    ACCESS_BATCH_MAX_CLOCK_SKEW_SECONDS: int = 300
+    
+    # Snapshot offline (GET /api/accesos/snapshot): la deuda se informa en
+    # tramos de este monto (no se exporta el saldo exacto)
+    ACCESS_SNAPSHOT_DEBT_BUCKET: float = 100.0
+    
+    # ==================== CACHÉ DEL DASHBOARD ====================
+    # Snapshot de /api/reportes/dashboard/snapshot: se sirve tal cual durante
+    # TTL segundos y, hasta TTL + STALE, se devuelve el viejo mientras se
+    # recalcula en segundo plano
+    DASHBOARD_CACHE_ENABLED: bool = True
+    DASHBOARD_CACHE_TTL_SECONDS: float = 5.0
+    DASHBOARD_CACHE_STALE_SECONDS: float = 30.0
+    
+    # ==================== CACHÉ DE REPORTES ====================
+    # Resultados de /api/reportes/{socios,financiero,accesos,morosidad} por
+    # parámetros y versión de las tablas que leen: una escritura los invalida.
+    # Backend "memory" = por proceso; "redis" = compartido entre workers
+    # (usa REDIS_URL/REDIS_DB; requiere el paquete redis). El TTL solo acota
+    # cambios hechos por fuera del ORM (SQL manual)
+    REPORTES_CACHE_ENABLED: bool = True
+    REPORTES_CACHE_BACKEND: str = "memory"  # memory | redis
+    REPORTES_CACHE_TTL_SECONDS: float = 600.0
+    REPORTES_CACHE_MAX_ENTRIES: int = 256
+    
+    # ==================== CACHÉ DE USUARIOS (JWT) ====================
+    # Usuario de cada access token cacheado por id y versión de token: las
+    # requests autenticadas no consultan usuarios. Se invalida al revocar
+    # tokens; el TTL acota la desactualización con varios workers
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_MAX_SIZE: int = 1000
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    
+    # ==================== RATE LIMITING ====================
+    # Ventana deslizante por IP, usuario y dispositivo (app/middleware/rate_limit.py).
+    # Backend "memory" = contadores por proceso; "redis" = compartidos entre
+    # workers (usa REDIS_URL/REDIS_DB; requiere el paquete redis).
+    # Reglas: "MÉTODO /ruta" -> {clave: "cantidad/segundos"}, clave = ip | usuario | dispositivo
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | redis
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # Tomar la IP de X-Forwarded-For (detrás de proxy)
+    RATE_LIMIT_MAX_KEYS: int = 100000  # Contadores en memoria (LRU)
+    RATE_LIMIT_RULES: Dict[str, Dict[str, str]] = {
+        "POST /api/auth/login": {"ip": "60/60", "usuario": "10/60"},
+        "POST /api/accesos/validar-qr": {"ip": "600/60", "usuario": "240/60", "dispositivo": "120/60"},
+        "POST /api/accesos/validar-qr/batch": {"ip": "120/60", "usuario": "60/60", "dispositivo": "30/60"},
+    }
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -3,9 +3,10 @@ Configuración de SQLAlchemy y sesión de base de datos
 backend/app/database.py
 """
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import Generator
+from sqlalchemy.pool import NullPool, StaticPool
+from typing import AsyncGenerator, Generator
 import logging
 
 from app.config import settings
@@ -39,6 +40,55 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+# ==================== ENGINE ASÍNCRONO ====================
+def get_async_database_url(url: str) -> str:
+    """
+    Deriva la URL del driver asíncrono a partir de DATABASE_URL
+
+    - sqlite:///archivo.db      -> sqlite+aiosqlite:///archivo.db
+    - postgresql://...          -> postgresql+asyncpg://...
+    - postgresql+psycopg2://... -> postgresql+asyncpg://...
+    """
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    if url.startswith("sqlite+aiosqlite") or url.startswith("postgresql+asyncpg"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("postgresql") or url.startswith("postgres"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    return url
+
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    # SQLite: sin pool. Cada sesión abre su propia conexión aiosqlite, lo que
+    # evita compartir conexiones entre event loops (TestClient crea uno por request)
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        poolclass=NullPool,
+        echo=settings.DATABASE_ECHO,
+    )
+else:
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        echo=settings.DATABASE_ECHO,
+    )
+
+# Session factory asíncrona
+# expire_on_commit=False: los objetos siguen siendo legibles después del commit
+# (en modo async no hay lazy loading implícito)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base declarativa (SQLAlchemy 2.0 style)
 class Base(DeclarativeBase):
     """Base class for all ORM models"""
@@ -57,8 +107,20 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para obtener sesión asíncrona de base de datos en FastAPI
+
+    Usar en endpoints `async def` para no bloquear el event loop
+    mientras la consulta se ejecuta.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # ==================== EVENTOS ====================
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """
     Configuración específica para SQLite
@@ -11,12 +11,19 @@ from datetime import datetime
 import logging
 import sys
 from pathlib import Path
-import json
-import uuid
 
 from app.database import engine, Base, check_db_connection
 from app.config import settings
 from app import metrics
+from app.utils.respuestas import RespuestaJSON
+from app.services.acceso_writer import acceso_writer
+from app.services.credencial_service import CredencialService
+from app.services.notification_service import NotificationService
+from app.services.notification_jobs import notification_worker
+from app.services.password_pool import password_pool
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.logging import ColaLogs, RequestLoggingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, rate_limiter
 
 # Importar todos los routers
 from app.routers import auth, miembros, accesos, pagos, usuarios, reportes, notificaciones, auditoria
@@ -31,11 +38,17 @@ if settings.LOG_FILE:
 else:
     handlers.append(logging.NullHandler())
 
+# Los handlers escriben desde un thread; loggear en el event loop solo encola
+cola_logs = ColaLogs(
+    handlers,
+    formato='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    max_cola=settings.LOG_QUEUE_MAX_SIZE
+)
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=handlers
+    handlers=[cola_logs.handler]
 )
+cola_logs.iniciar()
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +60,7 @@ async def lifespan(app: FastAPI):
     Eventos de inicio y cierre de la aplicación
     """
     # Startup
+    cola_logs.iniciar()
     logger.info("Iniciando Sistema de Gestión de Socios...")
     logger.info(f"Entorno: {settings.ENVIRONMENT}")
     logger.info(f"Versión: {settings.APP_VERSION}")
@@ -117,6 +131,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error creando tablas: {e}")      
     
+    # Escritura diferida de accesos (opt-in)
+    if settings.ACCESS_WRITE_BEHIND_ENABLED:
+        await acceso_writer.start()
+    
+    # Worker de envíos masivos (o correrlo aparte: scripts/notification_worker.py)
+    if settings.NOTIFICATION_WORKER_EMBEDDED:
+        await notification_worker.start()
+    
     logger.info(f"[WEB] API disponible en: http://localhost:8000")
     logger.info(f"[DOCS] Documentación: http://localhost:8000/docs")
     
@@ -124,6 +146,25 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Cerrando Sistema de Gestión de Socios...")
+    
+    # Persistir accesos pendientes antes de salir
+    await acceso_writer.stop()
+    
+    # Terminar el lote de emails en curso y cerrar conexiones SMTP
+    await notification_worker.stop()
+    NotificationService.cerrar_pool()
+    
+    # Threads de bcrypt
+    password_pool.cerrar()
+    
+    # Procesos de render de credenciales
+    CredencialService.cerrar_pool()
+    
+    # Conexión del rate limiter compartido (si usa Redis)
+    await rate_limiter.cerrar()
+    
+    # Escribir los logs pendientes
+    cola_logs.detener()
 
 
 # ==================== APP ====================
@@ -137,12 +178,19 @@ app = FastAPI(
     description="API para gestión de socios de clubes y cooperativas",
     docs_url=_docs_url,
     redoc_url=_redoc_url,
+    default_response_class=RespuestaJSON,
     lifespan=lifespan
 )
 
 
 # ==================== MIDDLEWARE ====================
 
+# Compresión gzip/brotli de respuestas grandes (COMPRESSION_MIN_SIZE)
+app.add_middleware(CompressionMiddleware)
+
+# Rate limiting (RATE_LIMIT_RULES); CORS lo envuelve para que los 429 lleven sus headers
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -153,55 +201,8 @@ app.add_middleware(
 )
 
 
-# Logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Middleware: asigna X-Request-ID, mide duración, registra métricas y log estructurado."""
-    # Correlación: request id
-    req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-    request.state.request_id = req_id
-
-    # Medición de tiempo de alta resolución
-    t0 = metrics.now()
-
-    # Procesar petición
-    response = await call_next(request)
-
-    # Calcular tiempo
-    duration = max(metrics.now() - t0, 0.0)
-
-    # Propagar header
-    try:
-        response.headers["X-Request-ID"] = req_id
-    except Exception:
-        pass
-
-    # Path "templated" si está disponible (evita cardinalidad alta)
-    path_template = getattr(getattr(request.scope, "get", lambda *_: None)("route"), "path", None)
-    if not path_template:
-        route = request.scope.get("route") if isinstance(request.scope, dict) else None
-        path_template = getattr(route, "path", request.url.path)
-
-    # Métricas
-    try:
-        metrics.track_http(request.method, path_template, response.status_code, duration)
-    except Exception:
-        pass
-
-    # Log estructurado (JSON)
-    log_payload = {
-        "msg": "request",
-        "request_id": req_id,
-        "method": request.method,
-        "path": request.url.path,
-        "route": path_template,
-        "status": response.status_code,
-        "duration_ms": round(duration * 1000, 3),
-        "client": getattr(request.client, "host", None),
-    }
-    logger.info(json.dumps(log_payload, ensure_ascii=False))
-
-    return response
+# Logging: X-Request-ID, métricas HTTP y log JSON por request (muestreado)
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # ==================== EXCEPTION HANDLERS ====================
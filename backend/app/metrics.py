@@ -35,11 +35,24 @@ _registry: Optional["_CollectorRegistry"] = None
 _http_requests_total: Optional["_Counter"] = None
 _http_request_duration_seconds: Optional["_Histogram"] = None
 _audit_events_total: Optional["_Counter"] = None
+_cache_requests_total: Optional["_Counter"] = None
+_mail_sends_total: Optional["_Counter"] = None
+_password_hash_queue_seconds: Optional["_Histogram"] = None
+_password_hash_seconds: Optional["_Histogram"] = None
+_password_hash_rejected_total: Optional["_Counter"] = None
+_rate_limit_rejected_total: Optional["_Counter"] = None
+_rate_limit_backend_errors_total: Optional["_Counter"] = None
+_cache_invalidations_total: Optional["_Counter"] = None
+_cache_backend_errors_total: Optional["_Counter"] = None
 
 
 def init_metrics() -> None:
     """Inicializa el registro y las métricas si Prometheus está disponible."""
     global _registry, _http_requests_total, _http_request_duration_seconds, _audit_events_total
+    global _cache_requests_total, _mail_sends_total
+    global _password_hash_queue_seconds, _password_hash_seconds, _password_hash_rejected_total
+    global _rate_limit_rejected_total, _rate_limit_backend_errors_total
+    global _cache_invalidations_total, _cache_backend_errors_total
 
     if not _PROM_AVAILABLE:
         # Sin librería: no hacemos nada, pero mantenemos API estable
@@ -72,6 +85,69 @@ def init_metrics() -> None:
         registry=_registry,
     )
 
+    _cache_requests_total = Counter(
+        "cache_requests_total",
+        "Consultas a cachés en memoria (hit/miss)",
+        labelnames=("cache", "result"),
+        registry=_registry,
+    )
+
+    _mail_sends_total = Counter(
+        "mail_sends_total",
+        "Intentos de envío por el pool SMTP",
+        labelnames=("result",),
+        registry=_registry,
+    )
+
+    _password_hash_queue_seconds = Histogram(
+        "password_hash_queue_seconds",
+        "Espera en cola del pool de bcrypt",
+        labelnames=("operation",),
+        buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+        registry=_registry,
+    )
+
+    _password_hash_seconds = Histogram(
+        "password_hash_seconds",
+        "Duración de hash/verificación bcrypt",
+        labelnames=("operation",),
+        buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1, 2.5),
+        registry=_registry,
+    )
+
+    _password_hash_rejected_total = Counter(
+        "password_hash_rejected_total",
+        "Operaciones rechazadas por pool de bcrypt saturado",
+        registry=_registry,
+    )
+
+    _rate_limit_rejected_total = Counter(
+        "rate_limit_rejected_total",
+        "Requests rechazadas con 429 por el rate limiter",
+        labelnames=("rule", "key"),
+        registry=_registry,
+    )
+
+    _rate_limit_backend_errors_total = Counter(
+        "rate_limit_backend_errors_total",
+        "Errores del backend compartido del rate limiter (se usó el de memoria)",
+        registry=_registry,
+    )
+
+    _cache_invalidations_total = Counter(
+        "cache_invalidations_total",
+        "Invalidaciones por etiqueta de cachés compartidas (una por commit que escribe la tabla)",
+        labelnames=("cache", "tag"),
+        registry=_registry,
+    )
+
+    _cache_backend_errors_total = Counter(
+        "cache_backend_errors_total",
+        "Errores del backend de una caché (el valor se calculó sin caché)",
+        labelnames=("cache",),
+        registry=_registry,
+    )
+
 
 def track_http(method: str, path: str, status: int, duration_seconds: float) -> None:
     """Actualiza contadores y histogramas de HTTP si están disponibles."""
@@ -93,6 +169,79 @@ def inc_audit(tipo: str, severidad: str) -> None:
             pass
 
 
+def inc_cache(cache: str, hit: bool) -> None:
+    """Registra un hit o miss de la caché indicada si está disponible."""
+    if _PROM_AVAILABLE and _registry is not None and _cache_requests_total:
+        try:
+            _cache_requests_total.labels(cache=cache, result="hit" if hit else "miss").inc()
+        except Exception:
+            pass
+
+
+def inc_mail(resultado: str) -> None:
+    """Registra el resultado de un envío SMTP (enviado/reintento/rechazado/fallido)."""
+    if _PROM_AVAILABLE and _registry is not None and _mail_sends_total:
+        try:
+            _mail_sends_total.labels(result=resultado).inc()
+        except Exception:
+            pass
+
+
+def observe_password_hash(operacion: str, espera_seconds: float, duracion_seconds: float) -> None:
+    """Registra espera en cola y duración de una operación bcrypt (hash/verify)."""
+    if _PROM_AVAILABLE and _registry is not None and _password_hash_queue_seconds and _password_hash_seconds:
+        try:
+            _password_hash_queue_seconds.labels(operation=operacion).observe(espera_seconds)
+            _password_hash_seconds.labels(operation=operacion).observe(duracion_seconds)
+        except Exception:
+            pass
+
+
+def inc_password_hash_rechazado() -> None:
+    """Cuenta una operación bcrypt rechazada por cola llena."""
+    if _PROM_AVAILABLE and _registry is not None and _password_hash_rejected_total:
+        try:
+            _password_hash_rejected_total.inc()
+        except Exception:
+            pass
+
+
+def inc_rate_limit_rechazado(regla: str, clave: str) -> None:
+    """Cuenta una request rechazada por el rate limiter (regla y tipo de clave que la frenó)."""
+    if _PROM_AVAILABLE and _registry is not None and _rate_limit_rejected_total:
+        try:
+            _rate_limit_rejected_total.labels(rule=regla, key=clave).inc()
+        except Exception:
+            pass
+
+
+def inc_rate_limit_error_backend() -> None:
+    """Cuenta un error del backend compartido (Redis) del rate limiter."""
+    if _PROM_AVAILABLE and _registry is not None and _rate_limit_backend_errors_total:
+        try:
+            _rate_limit_backend_errors_total.inc()
+        except Exception:
+            pass
+
+
+def inc_cache_invalidacion(cache: str, etiqueta: str) -> None:
+    """Cuenta la invalidación de una etiqueta de la caché indicada."""
+    if _PROM_AVAILABLE and _registry is not None and _cache_invalidations_total:
+        try:
+            _cache_invalidations_total.labels(cache=cache, tag=etiqueta).inc()
+        except Exception:
+            pass
+
+
+def inc_cache_error_backend(cache: str) -> None:
+    """Cuenta un error del backend (Redis) de la caché indicada."""
+    if _PROM_AVAILABLE and _registry is not None and _cache_backend_errors_total:
+        try:
+            _cache_backend_errors_total.labels(cache=cache).inc()
+        except Exception:
+            pass
+
+
 def get_metrics_text() -> tuple[bytes, str]:
     """
     Devuelve (payload, content_type) para el endpoint /metrics.
@@ -0,0 +1,124 @@
+"""
+Middleware - Compresión
+backend/app/middleware/compression.py
+
+Comprime las respuestas grandes según el Accept-Encoding del cliente:
+brotli si el paquete está instalado y el cliente lo acepta, si no gzip.
+Pensado para listados y reportes JSON que viajan a la app de escritorio por
+redes lentas del club.
+
+Solo se comprimen respuestas de un único mensaje (no streaming) con
+content-type de texto/JSON, sin Content-Encoding previo y de al menos
+COMPRESSION_MIN_SIZE bytes. Las respuestas en streaming (snapshot offline,
+exportaciones) pasan sin cambios.
+"""
+import gzip
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    # Import opcional: sin brotli solo se negocia gzip
+    import brotli
+    _BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    _BROTLI_AVAILABLE = False
+
+TIPOS_COMPRIMIBLES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+# Cuerpos más grandes se comprimen en un thread (no frenar el event loop)
+_COMPRIMIR_EN_THREAD = 256 * 1024
+
+
+def elegir_codificacion(accept_encoding: str) -> Optional[str]:
+    """"br", "gzip" o None según Accept-Encoding (respeta q=0)"""
+    aceptadas = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.partition(";")
+        calidad = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                calidad = float(parametros[2:])
+            except ValueError:
+                calidad = 0.0
+        aceptadas[nombre.strip().lower()] = calidad
+
+    if _BROTLI_AVAILABLE and aceptadas.get("br", 0) > 0:
+        return "br"
+    if aceptadas.get("gzip", aceptadas.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def comprimir(cuerpo: bytes, codificacion: str) -> bytes:
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(cuerpo, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _comprimible(headers: Headers) -> bool:
+    tipo = headers.get("content-type", "")
+    return "content-encoding" not in headers and tipo.startswith(TIPOS_COMPRIMIBLES)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI: gzip/brotli negociado para respuestas sobre el umbral"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        # El inicio de la respuesta se retiene hasta ver el primer body
+        inicio: Optional[Message] = None
+        resuelto = False
+
+        async def enviar(message: Message) -> None:
+            nonlocal inicio, resuelto
+            if resuelto:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                inicio = message
+                return
+            if message["type"] != "http.response.body" or inicio is None:
+                await send(message)
+                return
+
+            resuelto = True
+            headers = MutableHeaders(raw=inicio.setdefault("headers", []))
+            cuerpo = message.get("body", b"")
+            if _comprimible(headers):
+                headers.add_vary_header("Accept-Encoding")
+                if not message.get("more_body", False) and len(cuerpo) >= settings.COMPRESSION_MIN_SIZE:
+                    if len(cuerpo) >= _COMPRIMIR_EN_THREAD:
+                        cuerpo = await anyio.to_thread.run_sync(comprimir, cuerpo, codificacion)
+                    else:
+                        cuerpo = comprimir(cuerpo, codificacion)
+                    headers["Content-Encoding"] = codificacion
+                    headers["Content-Length"] = str(len(cuerpo))
+                    message = {"type": "http.response.body", "body": cuerpo}
+            await send(inicio)
+            await send(message)
+
+        await self.app(scope, receive, enviar)
@@ -1 +1,201 @@
-# Middleware - Logging
\ No newline at end of file
+"""
+Middleware - Logging
+backend/app/middleware/logging.py
+
+Log por request y escritura de logs fuera del event loop.
+
+RequestLoggingMiddleware (ASGI puro): asigna X-Request-ID, mide la duración,
+publica las métricas HTTP y emite un log JSON por request. A diferencia de
+@app.middleware("http") (BaseHTTPMiddleware) no crea una tarea ni una
+respuesta intermedia por request. Las respuestas exitosas se muestrean
+(LOG_REQUEST_SAMPLE_RATE, o LOG_REQUEST_SAMPLE_RATES por ruta); los errores
+y las requests lentas (LOG_SLOW_REQUEST_MS) se registran siempre.
+
+ColaLogs: el root logger solo encola (QueueHandler) y un thread
+(QueueListener) formatea y escribe en consola/archivo. Si la cola se llena
+(LOG_QUEUE_MAX_SIZE) el registro se descarta en lugar de bloquear el loop.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== COLA DE LOGS ====================
+
+class _LogJSON:
+    """Mensaje que se serializa recién al formatearlo (en el thread de logs)"""
+    __slots__ = ("datos",)
+
+    def __init__(self, datos: dict):
+        self.datos = datos
+
+    def __str__(self) -> str:
+        return json.dumps(self.datos, ensure_ascii=False)
+
+
+class _QueueHandlerNoBloqueante(QueueHandler):
+    """QueueHandler que no formatea en el thread que loggea ni espera cola llena"""
+
+    def __init__(self, cola: queue.Queue):
+        super().__init__(cola)
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El QueueHandler estándar formatea aquí (en el event loop). Solo se
+        # resuelve lo que puede cambiar después: args y traceback.
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+class _QueueListenerBloqueante(QueueListener):
+    """QueueListener cuyo stop() espera lugar en la cola para el centinela"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class ColaLogs:
+    """
+    Handler de cola para el root logger + thread que escribe en los destinos
+
+    Uso:
+        cola = ColaLogs([logging.StreamHandler()], formato="%(message)s")
+        logging.basicConfig(handlers=[cola.handler])
+        cola.iniciar()
+    """
+
+    def __init__(self, destinos: List[logging.Handler], formato: str, max_cola: int = 10000):
+        formatter = logging.Formatter(formato)
+        for destino in destinos:
+            destino.setFormatter(formatter)
+        self.destinos = destinos
+        self.handler = _QueueHandlerNoBloqueante(queue.Queue(maxsize=max(1, max_cola)))
+        self._listener: Optional[QueueListener] = None
+        self._atexit = False
+
+    @property
+    def descartados(self) -> int:
+        return self.handler.descartados
+
+    def iniciar(self) -> None:
+        """Arrancar el thread de escritura (no-op si ya corre)"""
+        if self._listener is not None:
+            return
+        self._listener = _QueueListenerBloqueante(self.handler.queue, *self.destinos, respect_handler_level=True)
+        self._listener.start()
+        if not self._atexit:
+            atexit.register(self.detener)
+            self._atexit = True
+
+    def detener(self) -> None:
+        """Escribir lo pendiente y frenar el thread"""
+        if self._listener is None:
+            return
+        if self.handler.descartados:
+            logger.warning(f"[WARN] {self.handler.descartados} logs descartados por cola llena")
+        self._listener.stop()
+        self._listener = None
+
+
+# ==================== MIDDLEWARE ====================
+
+def tasa_muestreo(ruta: str, estado: int, duracion: float) -> float:
+    """Fracción de requests como esta que se registran"""
+    if estado >= 400 or duracion * 1000 >= settings.LOG_SLOW_REQUEST_MS:
+        return 1.0
+    return settings.LOG_REQUEST_SAMPLE_RATES.get(ruta, settings.LOG_REQUEST_SAMPLE_RATE)
+
+
+class RequestLoggingMiddleware:
+    """Middleware ASGI: X-Request-ID, métricas HTTP y log JSON por request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Correlación: request id (disponible como request.state.request_id)
+        req_id = None
+        for clave, valor in scope["headers"]:
+            if clave == b"x-request-id":
+                req_id = valor.decode("latin-1")
+                break
+        req_id = req_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = req_id
+        cabecera_id = (b"x-request-id", req_id.encode("latin-1"))
+
+        # Sin respuesta enviada (excepción no manejada) se registra como 500
+        estado = 500
+
+        async def send_con_id(message: Message) -> None:
+            nonlocal estado
+            if message["type"] == "http.response.start":
+                estado = message["status"]
+                headers = [h for h in message.get("headers", ()) if h[0].lower() != b"x-request-id"]
+                headers.append(cabecera_id)
+                message["headers"] = headers
+            await send(message)
+
+        t0 = metrics.now()
+        try:
+            await self.app(scope, receive, send_con_id)
+        finally:
+            self._registrar(scope, req_id, estado, max(metrics.now() - t0, 0.0))
+
+    @staticmethod
+    def _registrar(scope: Scope, req_id: str, estado: int, duracion: float) -> None:
+        # Path "templated" si la request llegó a una ruta (evita cardinalidad alta)
+        ruta = getattr(scope.get("route"), "path", None) or scope["path"]
+
+        try:
+            metrics.track_http(scope["method"], ruta, estado, duracion)
+        except Exception:
+            pass
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        tasa = tasa_muestreo(ruta, estado, duracion)
+        if tasa < 1.0 and random.random() >= tasa:
+            return
+
+        cliente = scope.get("client")
+        logger.info(_LogJSON({
+            "msg": "request",
+            "request_id": req_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": ruta,
+            "status": estado,
+            "duration_ms": round(duracion * 1000, 3),
+            "client": cliente[0] if cliente else None,
+            "sample_rate": tasa,
+        }))
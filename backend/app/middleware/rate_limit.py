@@ -1 +1,421 @@
-# Middleware - Rate limiting
\ No newline at end of file
+"""
+Middleware - Rate limiting
+backend/app/middleware/rate_limit.py
+
+Protege los endpoints caros o expuestos a abuso: el login (cada intento
+cuesta una verificación bcrypt) y validar-qr (escáneres que reintentan en
+bucle pueden saturar los workers).
+
+Algoritmo: ventana deslizante aproximada (sliding window counter). Por
+clave se cuentan las requests de la ventana fija actual y de la anterior;
+la estimación es anterior * (parte de la ventana anterior que todavía
+cubre) + actual. Memoria O(1) por clave y, en Redis, solo INCR/GET/EXPIRE.
+
+Claves (por regla, ver RATE_LIMIT_RULES):
+- ip:          IP del cliente (X-Forwarded-For con RATE_LIMIT_TRUST_FORWARDED)
+- usuario:     user_id del access token; sin token (login), el username del body
+- dispositivo: dispositivo_id del body JSON
+Una request pasa solo si todas sus claves tienen cupo. Si alguna lo agotó
+se responde 429 con Retry-After y se devuelve el cupo tomado en las demás.
+
+Backends: MemoriaBackend (por proceso, LRU acotado) y RedisBackend
+(compartido entre workers; acepta cualquier cliente con la interfaz de
+redis.asyncio). Si Redis falla, la request se evalúa con el de memoria.
+"""
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jose import JWTError, jwt
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import metrics
+from app.config import settings
+
+try:
+    # Import opcional: sin redis solo está disponible el backend en memoria
+    import redis.asyncio as redis_asyncio
+    _REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    _REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CLAVES = ("ip", "usuario", "dispositivo")
+
+# Cuerpos más grandes no se inspeccionan (sin claves usuario/dispositivo del body)
+MAX_BODY_INSPECCION = 256 * 1024
+
+# Segundos entre avisos de backend compartido caído (evita un log por request)
+_INTERVALO_AVISO_BACKEND = 60.0
+
+
+# ==================== REGLAS ====================
+
+@dataclass(frozen=True)
+class Limite:
+    """Máximo de requests por ventana de segundos"""
+    cantidad: int
+    ventana: float
+
+    @classmethod
+    def parsear(cls, texto: str) -> "Limite":
+        """Leer "cantidad/segundos" (ej: "10/60")"""
+        try:
+            cantidad, ventana = texto.split("/")
+            limite = cls(int(cantidad), float(ventana))
+        except ValueError:
+            raise ValueError(f"Límite inválido '{texto}' (formato: cantidad/segundos)")
+        if limite.cantidad < 1 or limite.ventana <= 0:
+            raise ValueError(f"Límite inválido '{texto}': cantidad y ventana deben ser positivas")
+        return limite
+
+
+@dataclass(frozen=True)
+class Regla:
+    """Límites de una ruta ("MÉTODO /ruta") por tipo de clave"""
+    nombre: str
+    limites: Dict[str, Limite]
+
+    @classmethod
+    def parsear(cls, nombre: str, limites: Dict[str, str]) -> "Regla":
+        desconocidas = set(limites) - set(CLAVES)
+        if desconocidas:
+            raise ValueError(f"Regla '{nombre}': claves desconocidas {sorted(desconocidas)} (válidas: {CLAVES})")
+        return cls(nombre, {tipo: Limite.parsear(texto) for tipo, texto in limites.items()})
+
+
+def _ventana(ahora: float, limite: Limite) -> Tuple[int, float]:
+    """Número de ventana fija y fracción transcurrida de ella"""
+    n, resto = divmod(ahora, limite.ventana)
+    return int(n), resto / limite.ventana
+
+
+def _estimar(anterior: int, actual: int, fraccion: float) -> float:
+    """Requests estimadas en la ventana deslizante que termina ahora"""
+    return anterior * (1 - fraccion) + actual
+
+
+def _espera(anterior: int, actual: int, fraccion: float, limite: Limite) -> float:
+    """Segundos hasta que una request más quepa en el límite"""
+    resto = (1 - fraccion) * limite.ventana
+    if anterior > 0 and actual + 1 <= limite.cantidad:
+        # Dentro de la ventana actual, a medida que "sale" la anterior
+        espera = limite.ventana * (1 - fraccion - (limite.cantidad - actual - 1) / anterior)
+        if espera <= resto:
+            return max(espera, 0.0)
+    # En la ventana siguiente la actual pasa a ser la anterior
+    if actual <= 0:
+        return resto
+    return resto + limite.ventana * max(0.0, 1 - (limite.cantidad - 1) / actual)
+
+
+# ==================== BACKENDS ====================
+
+class MemoriaBackend:
+    """Contadores por proceso (cada worker limita por su cuenta)"""
+
+    def __init__(self, max_claves: int, reloj: Callable[[], float] = time.time):
+        self.max_claves = max(1, max_claves)
+        self.reloj = reloj
+        # clave -> [número de ventana, cuenta anterior, cuenta actual]
+        self._contadores: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def _leer(self, clave: str, n: int) -> Tuple[int, int]:
+        entrada = self._contadores.get(clave)
+        if entrada is None:
+            return 0, 0
+        ventana_n, anterior, actual = entrada
+        if ventana_n == n:
+            return anterior, actual
+        if ventana_n == n - 1:
+            return actual, 0
+        return 0, 0
+
+    async def registrar(self, clave: str, limite: Limite) -> Tuple[bool, float, int]:
+        """
+        Contar una request si hay cupo
+
+        Returns:
+            (permitida, segundos de espera si no, número de ventana)
+        """
+        n, fraccion = _ventana(self.reloj(), limite)
+        anterior, actual = self._leer(clave, n)
+        if _estimar(anterior, actual + 1, fraccion) > limite.cantidad:
+            return False, _espera(anterior, actual, fraccion, limite), n
+
+        self._contadores[clave] = [n, anterior, actual + 1]
+        self._contadores.move_to_end(clave)
+        while len(self._contadores) > self.max_claves:
+            self._contadores.popitem(last=False)
+        return True, 0.0, n
+
+    async def devolver(self, clave: str, limite: Limite, n: int) -> None:
+        """Descontar una request contada en la ventana n"""
+        entrada = self._contadores.get(clave)
+        if entrada is not None and entrada[0] == n and entrada[2] > 0:
+            entrada[2] -= 1
+
+    def limpiar(self) -> None:
+        self._contadores.clear()
+
+    async def cerrar(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """
+    Contadores compartidos en Redis (todos los workers ven el mismo cupo)
+
+    Una clave por ventana fija con expiración de dos ventanas. INCR primero
+    y DECR si la request no entra: dos workers no pueden pasarse del límite
+    a la vez.
+    """
+
+    def __init__(self, cliente: Any, prefijo: str = "ratelimit:", reloj: Callable[[], float] = time.time):
+        self.cliente = cliente
+        self.prefijo = prefijo
+        self.reloj = reloj
+
+    @classmethod
+    def desde_url(cls, url: str, db: int = 0) -> "RedisBackend":
+        if not _REDIS_AVAILABLE:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere el paquete redis")
+        return cls(redis_asyncio.from_url(url, db=db, decode_responses=True))
+
+    def _clave(self, clave: str, n: int) -> str:
+        return f"{self.prefijo}{clave}:{n}"
+
+    async def registrar(self, clave: str, limite: Limite) -> Tuple[bool, float, int]:
+        """Igual que MemoriaBackend.registrar, con los contadores en Redis"""
+        n, fraccion = _ventana(self.reloj(), limite)
+        clave_actual = self._clave(clave, n)
+
+        async with self.cliente.pipeline(transaction=True) as pipe:
+            pipe.incr(clave_actual)
+            pipe.expire(clave_actual, math.ceil(limite.ventana * 2))
+            pipe.get(self._clave(clave, n - 1))
+            actual, _, anterior = await pipe.execute()
+        anterior = int(anterior or 0)
+
+        if _estimar(anterior, actual, fraccion) > limite.cantidad:
+            await self.cliente.decr(clave_actual)
+            return False, _espera(anterior, actual - 1, fraccion, limite), n
+        return True, 0.0, n
+
+    async def devolver(self, clave: str, limite: Limite, n: int) -> None:
+        await self.cliente.decr(self._clave(clave, n))
+
+    async def cerrar(self) -> None:
+        await self.cliente.aclose()
+
+
+# ==================== LIMITADOR ====================
+
+class RateLimiter:
+    """Reglas por ruta + backend de contadores (con respaldo en memoria)"""
+
+    def __init__(self, reglas: Dict[str, Dict[str, str]], backend: Any = None, max_claves: int = 100000):
+        self.respaldo = MemoriaBackend(max_claves)
+        self.backend = backend or self.respaldo
+        self._ultimo_aviso = 0.0
+        self.configurar(reglas)
+
+    @classmethod
+    def desde_settings(cls) -> "RateLimiter":
+        backend = None
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            try:
+                backend = RedisBackend.desde_url(settings.REDIS_URL, settings.REDIS_DB)
+            except RuntimeError as e:
+                logger.error(f"[ERROR] {e}; rate limiting en memoria (por proceso)")
+        return cls(settings.RATE_LIMIT_RULES, backend, settings.RATE_LIMIT_MAX_KEYS)
+
+    def configurar(self, reglas: Dict[str, Dict[str, str]]) -> None:
+        """Reemplazar las reglas ("MÉTODO /ruta" -> {clave: "cantidad/segundos"})"""
+        self._reglas = {nombre: Regla.parsear(nombre, limites) for nombre, limites in reglas.items()}
+
+    def regla_para(self, metodo: str, ruta: str) -> Optional[Regla]:
+        return self._reglas.get(f"{metodo} {ruta}")
+
+    async def _registrar(self, clave: str, limite: Limite):
+        """Registrar en el backend; si el compartido falla, en memoria"""
+        if self.backend is not self.respaldo:
+            try:
+                return self.backend, await self.backend.registrar(clave, limite)
+            except Exception as e:
+                metrics.inc_rate_limit_error_backend()
+                ahora = time.monotonic()
+                if ahora - self._ultimo_aviso > _INTERVALO_AVISO_BACKEND:
+                    self._ultimo_aviso = ahora
+                    logger.warning(f"[WARN] Rate limiter: backend compartido no disponible ({e}); se usa memoria")
+        return self.respaldo, await self.respaldo.registrar(clave, limite)
+
+    async def verificar(self, regla: Regla, claves: Dict[str, str]) -> Optional[Tuple[str, float]]:
+        """
+        Contar la request en cada clave de la regla
+
+        Returns:
+            None si entra; (tipo de clave agotada, segundos de espera) si no
+        """
+        tomadas = []
+        for tipo, limite in regla.limites.items():
+            valor = claves.get(tipo)
+            if not valor:
+                continue
+            clave = f"{regla.nombre}|{tipo}|{valor}"
+            backend, (permitida, espera, n) = await self._registrar(clave, limite)
+            if not permitida:
+                for backend_tomado, clave_tomada, limite_tomado, n_tomado in tomadas:
+                    try:
+                        await backend_tomado.devolver(clave_tomada, limite_tomado, n_tomado)
+                    except Exception:
+                        pass
+                return tipo, espera
+            tomadas.append((backend, clave, limite, n))
+        return None
+
+    def limpiar(self) -> None:
+        """Vaciar los contadores en memoria"""
+        self.respaldo.limpiar()
+
+    async def cerrar(self) -> None:
+        if self.backend is not self.respaldo:
+            await self.backend.cerrar()
+
+
+# ==================== MIDDLEWARE ====================
+
+def _header(scope: Scope, nombre: bytes) -> Optional[str]:
+    for clave, valor in scope.get("headers", ()):
+        if clave == nombre:
+            return valor.decode("latin-1")
+    return None
+
+
+def _ip_cliente(scope: Scope) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        reenviado = _header(scope, b"x-forwarded-for")
+        if reenviado:
+            return reenviado.split(",")[0].strip()
+    cliente = scope.get("client")
+    return cliente[0] if cliente else None
+
+
+def _usuario_token(scope: Scope) -> Optional[str]:
+    """user_id de un access token válido (sin consultar la base)"""
+    autorizacion = _header(scope, b"authorization")
+    if not autorizacion or not autorizacion.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(autorizacion[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    user_id = payload.get("user_id")
+    return f"id:{user_id}" if user_id is not None else None
+
+
+async def _leer_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """Leer el body completo y devolver un receive que lo vuelve a entregar"""
+    mensajes = []
+    cuerpo = bytearray()
+    while True:
+        mensaje = await receive()
+        mensajes.append(mensaje)
+        if mensaje["type"] != "http.request":
+            break
+        cuerpo += mensaje.get("body", b"")
+        if not mensaje.get("more_body", False):
+            break
+
+    async def reenviar():
+        if mensajes:
+            return mensajes.pop(0)
+        return await receive()
+
+    return bytes(cuerpo), reenviar
+
+
+def _json_inspeccionable(scope: Scope) -> bool:
+    """Body JSON con Content-Length conocido y chico"""
+    tipo = _header(scope, b"content-type") or ""
+    largo = _header(scope, b"content-length")
+    return tipo.startswith("application/json") and largo is not None and largo.isdigit() \
+        and int(largo) <= MAX_BODY_INSPECCION
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI: aplica las reglas de RATE_LIMIT_RULES antes de la ruta
+
+    Las rutas sin regla (y todo, con RATE_LIMIT_ENABLED=false) pasan sin
+    costo adicional. El body solo se lee cuando la regla necesita claves del
+    body (dispositivo, o usuario sin token).
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter or rate_limiter
+        regla = limiter.regla_para(scope["method"], scope["path"])
+        if regla is None:
+            await self.app(scope, receive, send)
+            return
+
+        claves: Dict[str, Optional[str]] = {}
+        if "ip" in regla.limites:
+            claves["ip"] = _ip_cliente(scope)
+        if "usuario" in regla.limites:
+            claves["usuario"] = _usuario_token(scope)
+
+        faltan_del_body = "dispositivo" in regla.limites or ("usuario" in regla.limites and not claves["usuario"])
+        if faltan_del_body and _json_inspeccionable(scope):
+            cuerpo, receive = await _leer_body(receive)
+            try:
+                datos = json.loads(cuerpo)
+            except ValueError:
+                datos = None
+            if isinstance(datos, dict):
+                if "usuario" in regla.limites and not claves["usuario"] and isinstance(datos.get("username"), str):
+                    claves["usuario"] = f"nombre:{datos['username'].strip().lower()[:100]}"
+                if "dispositivo" in regla.limites and isinstance(datos.get("dispositivo_id"), str):
+                    claves["dispositivo"] = datos["dispositivo_id"][:100]
+
+        rechazo = await limiter.verificar(regla, claves)
+        if rechazo is None:
+            await self.app(scope, receive, send)
+            return
+
+        tipo, espera = rechazo
+        reintentar = max(1, math.ceil(espera))
+        metrics.inc_rate_limit_rechazado(regla.nombre, tipo)
+        logger.warning(
+            f"[WARN] Rate limit '{regla.nombre}' por {tipo} "
+            f"(ip {claves.get('ip')}) - reintentar en {reintentar}s"
+        )
+        respuesta = JSONResponse(
+            status_code=429,
+            content={
+                "success": False,
+                "error": "Demasiadas solicitudes",
+                "detail": f"Límite de solicitudes alcanzado, reintentar en {reintentar} segundos",
+            },
+            headers={"Retry-After": str(reintentar)}
+        )
+        await respuesta(scope, receive, send)
+
+
+# Instancia global (reglas y backend desde settings)
+rate_limiter = RateLimiter.desde_settings()
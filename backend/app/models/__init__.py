@@ -16,6 +16,7 @@ from app.models.miembro import (
 from app.models.pago import (
     Pago,
     MovimientoCaja,
+    ResumenDiarioCaja,
     TipoPago,
     MetodoPago,
     EstadoPago
@@ -32,6 +33,13 @@ from app.models.actividad import (
     TipoActividad,
     NivelSeveridad
 )
+from app.models.notificacion import (
+    NotificacionJob,
+    NotificacionEnvio,
+    EstadoJob,
+    EstadoEnvio
+)
+from app.models.version import VersionRecurso
 
 __all__ = [
     # Base
@@ -53,6 +61,7 @@ __all__ = [
     # Pago
     "Pago",
     "MovimientoCaja",
+    "ResumenDiarioCaja",
     "TipoPago",
     "MetodoPago",
     "EstadoPago",
@@ -68,4 +77,13 @@ __all__ = [
     "Actividad",
     "TipoActividad",
     "NivelSeveridad",
+    
+    # Notificaciones
+    "NotificacionJob",
+    "NotificacionEnvio",
+    "EstadoJob",
+    "EstadoEnvio",
+
+    # Caché HTTP
+    "VersionRecurso",
 ]
\ No newline at end of file
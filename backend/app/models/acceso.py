@@ -3,7 +3,7 @@ Modelo Acceso - Control de acceso con QR
 backend/app/models/acceso.py
 """
 from sqlalchemy import (
-    Column, Integer, String, ForeignKey,
+    Column, Integer, String, ForeignKey, DateTime, Index,
     Enum as SQLEnum, Text, Boolean, Float
 )
 from sqlalchemy.orm import relationship
@@ -34,13 +34,17 @@ class Acceso(BaseModel):
     Para control de entradas a instalaciones, eventos, etc.
     """
     __tablename__ = "accesos"
+    __table_args__ = (
+        # Conteos por resultado dentro de un rango de fechas (hoy/semana/mes)
+        Index("idx_accesos_fecha_hora_resultado", "fecha_hora", "resultado"),
+    )
     
     # Relación con miembro
     miembro_id = Column(Integer, ForeignKey("miembros.id"), nullable=False, index=True)
     miembro = relationship("Miembro", back_populates="accesos")
     
     # Datos del acceso
-    fecha_hora = Column(String(255), nullable=False, index=True)  # ISO timestamp
+    fecha_hora = Column(DateTime(timezone=True), nullable=False, index=True)  # UTC
     tipo_acceso = Column(SQLEnum(TipoAcceso), nullable=False)
     resultado = Column(SQLEnum(ResultadoAcceso), nullable=False)
     
@@ -107,8 +111,8 @@ class EventoAcceso(BaseModel):
     nombre = Column(String(255), nullable=False)
     descripcion = Column(Text, nullable=True)
     
-    fecha_inicio = Column(String(255), nullable=False)  # ISO timestamp
-    fecha_fin = Column(String(255), nullable=True)
+    fecha_inicio = Column(DateTime(timezone=True), nullable=False)
+    fecha_fin = Column(DateTime(timezone=True), nullable=True)
     
     ubicacion = Column(String(255), nullable=True)
     
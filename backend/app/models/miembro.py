@@ -3,15 +3,17 @@ Modelo Miembro - Núcleo genérico (Socio/Asociado)
 backend/app/models/miembro.py
 """
 from sqlalchemy import (
-    Column, Integer, String, Date, Enum as SQLEnum,
-    Float, ForeignKey, Text, Boolean
+    Column, Integer, BigInteger, String, Date, Enum as SQLEnum,
+    Float, ForeignKey, Text, Boolean, Index, true, event, DDL, func, select
 )
-from sqlalchemy.orm import relationship
-from datetime import datetime, date
+from sqlalchemy.orm import relationship, aliased
+from datetime import datetime, date, timedelta
+from typing import Optional
 import enum
 
 from app.models.base import BaseModel, SoftDeleteMixin
 from app.models.categoria import Categoria
+from app.utils.busqueda import texto_busqueda
 
 
 class EstadoMiembro(str, enum.Enum):
@@ -37,6 +39,18 @@ class Miembro(BaseModel, SoftDeleteMixin):
     Base para módulos específicos (clubes, cooperativas)
     """
     __tablename__ = "miembros"
+    __table_args__ = (
+        # Filtro de deudores por días de mora (ver filtro_dias_mora)
+        Index("idx_miembros_is_deleted_vencimiento", "is_deleted", "proximo_vencimiento"),
+        # Búsqueda por subcadena (ver BusquedaMiembrosService): GIN de
+        # trigramas en PostgreSQL; en SQLite la resuelve miembros_fts
+        Index(
+            "idx_miembros_texto_busqueda",
+            "texto_busqueda",
+            postgresql_using="gin",
+            postgresql_ops={"texto_busqueda": "gin_trgm_ops"}
+        ),
+    )
     
     # Identificación única
     numero_miembro = Column(
@@ -112,6 +126,13 @@ class Miembro(BaseModel, SoftDeleteMixin):
     # Metadatos adicionales (JSON-like, extensible)
     metadatos = Column(Text, nullable=True)  # Guardar como JSON string
     
+    # Apellido, nombre, documento y número normalizados (se calcula al guardar)
+    texto_busqueda = Column(String(400), nullable=True)
+    
+    # Versión de sincronización: crece en cada alta/modificación por el ORM
+    # (delta de /api/accesos/snapshot para dispositivos offline)
+    sync_version = Column(BigInteger, server_default="0", nullable=False, index=True)
+    
     # Relaciones
     pagos = relationship("Pago", back_populates="miembro")
     accesos = relationship("Acceso", back_populates="miembro")
@@ -153,6 +174,24 @@ class Miembro(BaseModel, SoftDeleteMixin):
         delta = date.today() - self.proximo_vencimiento
         return delta.days
     
+    @classmethod
+    def filtro_dias_mora(cls, minimo: int, hoy: Optional[date] = None):
+        """
+        Expresión SQL equivalente a `dias_mora >= minimo`
+        
+        dias_mora >= N (N >= 1) equivale a proximo_vencimiento <= hoy - N, una
+        comparación de rango que usa idx_miembros_is_deleted_vencimiento en
+        lugar de cargar cada socio y calcular la propiedad en Python.
+        
+        Args:
+            minimo: Días mínimos de mora (<= 0 no filtra)
+            hoy: Fecha de referencia (default: hoy, igual que dias_mora)
+        """
+        if minimo <= 0:
+            return true()
+        hoy = hoy or date.today()
+        return cls.proximo_vencimiento <= hoy - timedelta(days=minimo)
+    
     def calcular_deuda(self):
         """Calcula deuda total (valor absoluto si es negativo)"""
         return abs(self.saldo_cuenta) if self.saldo_cuenta < 0 else 0
@@ -161,4 +200,82 @@ class Miembro(BaseModel, SoftDeleteMixin):
         return (
             f"<Miembro {self.numero_miembro}: "
             f"{self.nombre_completo} - {self.estado.value}>"
-        )
\ No newline at end of file
+        )
+
+
+# ==================== BÚSQUEDA ====================
+
+@event.listens_for(Miembro, "before_insert")
+@event.listens_for(Miembro, "before_update")
+def _actualizar_texto_busqueda(mapper, connection, target):
+    """Mantener texto_busqueda al crear o editar un socio por el ORM"""
+    target.texto_busqueda = texto_busqueda(
+        target.apellido, target.nombre, target.numero_documento, target.numero_miembro
+    )
+
+
+# Con create_all (desarrollo y tests) se crean también la extensión de
+# trigramas (PostgreSQL) o la tabla FTS5 con sus triggers (SQLite); en
+# producción lo hace la migración f2c7a4d8e1b3.
+event.listen(
+    Miembro.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+SQLITE_FTS_DDL = (
+    # Tabla de contenido externo: indexa miembros.texto_busqueda por trigramas
+    "CREATE VIRTUAL TABLE IF NOT EXISTS miembros_fts USING fts5("
+    "texto_busqueda, content='miembros', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS miembros_fts_ai AFTER INSERT ON miembros BEGIN "
+    "INSERT INTO miembros_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END",
+    "CREATE TRIGGER IF NOT EXISTS miembros_fts_ad AFTER DELETE ON miembros BEGIN "
+    "INSERT INTO miembros_fts(miembros_fts, rowid, texto_busqueda) "
+    "VALUES ('delete', old.id, old.texto_busqueda); END",
+    "CREATE TRIGGER IF NOT EXISTS miembros_fts_au AFTER UPDATE OF texto_busqueda ON miembros BEGIN "
+    "INSERT INTO miembros_fts(miembros_fts, rowid, texto_busqueda) "
+    "VALUES ('delete', old.id, old.texto_busqueda); "
+    "INSERT INTO miembros_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END",
+)
+
+for _sentencia in SQLITE_FTS_DDL:
+    event.listen(Miembro.__table__, "after_create", DDL(_sentencia).execute_if(dialect="sqlite"))
+event.listen(
+    Miembro.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS miembros_fts").execute_if(dialect="sqlite")
+)
+
+
+# ==================== SINCRONIZACIÓN OFFLINE ====================
+
+# En PostgreSQL la versión sale de una secuencia (valores únicos aunque haya
+# escrituras concurrentes); en SQLite, de max + 1 (un solo escritor a la vez)
+SYNC_VERSION_SEQ = "miembros_sync_version_seq"
+
+
+def _siguiente_sync_version(dialecto: str):
+    """Expresión SQL de la próxima versión de sincronización"""
+    if dialecto == "postgresql":
+        return func.nextval(SYNC_VERSION_SEQ)
+    otro = aliased(Miembro)
+    return select(func.coalesce(func.max(otro.sync_version), 0) + 1).scalar_subquery()
+
+
+@event.listens_for(Miembro, "before_insert")
+@event.listens_for(Miembro, "before_update")
+def _actualizar_sync_version(mapper, connection, target):
+    """Nueva versión en cada alta o modificación (incluida la baja lógica)"""
+    target.sync_version = _siguiente_sync_version(connection.dialect.name)
+
+
+event.listen(
+    Miembro.__table__,
+    "before_create",
+    DDL(f"CREATE SEQUENCE IF NOT EXISTS {SYNC_VERSION_SEQ}").execute_if(dialect="postgresql")
+)
+event.listen(
+    Miembro.__table__,
+    "after_drop",
+    DDL(f"DROP SEQUENCE IF EXISTS {SYNC_VERSION_SEQ}").execute_if(dialect="postgresql")
+)
@@ -0,0 +1,119 @@
+"""
+Modelos de trabajos de notificación (cola persistente)
+backend/app/models/notificacion.py
+"""
+from sqlalchemy import (
+    Column, Integer, String, DateTime, JSON, Text, ForeignKey,
+    Enum as SQLEnum, Index, UniqueConstraint
+)
+from sqlalchemy.orm import relationship
+import enum
+
+from app.database import Base
+from app.models.base import BaseModel
+
+
+class EstadoJob(str, enum.Enum):
+    """Estados de un trabajo de notificación"""
+    PENDIENTE = "pendiente"     # Encolado, ningún worker lo tomó
+    EN_CURSO = "en_curso"       # Procesándose (o con reintentos programados)
+    COMPLETADO = "completado"   # Sin destinatarios pendientes
+    FALLIDO = "fallido"         # Error general (p.ej. SMTP sin configurar)
+
+
+class EstadoEnvio(str, enum.Enum):
+    """Estado de entrega por destinatario"""
+    PENDIENTE = "pendiente"     # Por enviar (o esperando reintento)
+    ENVIADO = "enviado"
+    FALLIDO = "fallido"         # Agotó los reintentos
+    OMITIDO = "omitido"         # Ya no corresponde (pagó, fue dado de baja)
+
+
+class NotificacionJob(BaseModel):
+    """
+    Trabajo de envío masivo
+
+    El worker que lo procesa lo reserva con worker_id + lease_hasta; si el
+    proceso muere, al vencer el lease otro worker lo retoma.
+    """
+    __tablename__ = "notificacion_jobs"
+
+    tipo = Column(String(50), nullable=False)  # "recordatorio_cuota"
+    estado = Column(
+        SQLEnum(EstadoJob),
+        default=EstadoJob.PENDIENTE,
+        nullable=False,
+        index=True
+    )
+    parametros = Column(JSON, nullable=True)
+
+    # Contadores (se actualizan en cada lote)
+    total = Column(Integer, default=0, nullable=False)
+    enviados = Column(Integer, default=0, nullable=False)
+    fallidos = Column(Integer, default=0, nullable=False)
+    omitidos = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+
+    creado_por_id = Column(
+        Integer,
+        ForeignKey("usuarios.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Reserva del worker
+    worker_id = Column(String(100), nullable=True)
+    lease_hasta = Column(DateTime(timezone=True), nullable=True)
+
+    iniciado_at = Column(DateTime(timezone=True), nullable=True)
+    finalizado_at = Column(DateTime(timezone=True), nullable=True)
+
+    envios = relationship("NotificacionEnvio", back_populates="job", cascade="all, delete-orphan")
+
+    @property
+    def pendientes(self) -> int:
+        """Destinatarios sin resultado definitivo"""
+        return max(0, self.total - self.enviados - self.fallidos - self.omitidos)
+
+    def __repr__(self):
+        return f"<NotificacionJob(id={self.id}, tipo={self.tipo}, estado={self.estado})>"
+
+
+class NotificacionEnvio(Base):
+    """
+    Destinatario de un trabajo
+
+    (job_id, miembro_id) es único: cada socio recibe a lo sumo un email por
+    trabajo aunque el lote se reprocese.
+    """
+    __tablename__ = "notificacion_envios"
+    __table_args__ = (
+        UniqueConstraint("job_id", "miembro_id", name="uq_notificacion_envio_job_miembro"),
+        Index("idx_notificacion_envios_job_estado", "job_id", "estado"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(
+        Integer,
+        ForeignKey("notificacion_jobs.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    miembro_id = Column(
+        Integer,
+        ForeignKey("miembros.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    email = Column(String(255), nullable=False)
+    estado = Column(
+        SQLEnum(EstadoEnvio),
+        default=EstadoEnvio.PENDIENTE,
+        nullable=False
+    )
+    intentos = Column(Integer, default=0, nullable=False)
+    proximo_intento = Column(DateTime(timezone=True), nullable=True)
+    ultimo_error = Column(String(500), nullable=True)
+    enviado_at = Column(DateTime(timezone=True), nullable=True)
+
+    job = relationship("NotificacionJob", back_populates="envios")
+
+    def __repr__(self):
+        return f"<NotificacionEnvio(job={self.job_id}, miembro={self.miembro_id}, estado={self.estado})>"
@@ -4,12 +4,14 @@ backend/app/models/pago.py
 """
 from sqlalchemy import (
     Column, Integer, String, Float, ForeignKey,
-    Enum as SQLEnum, Text, Date
+    Enum as SQLEnum, Text, Date, DateTime, Index
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import date
 import enum
 
+from app.database import Base
 from app.models.base import BaseModel
 
 
@@ -45,6 +47,10 @@ class EstadoPago(str, enum.Enum):
 class Pago(BaseModel):
     """Registro de pagos realizados por miembros"""
     __tablename__ = "pagos"
+    __table_args__ = (
+        # Listado por fecha (paginación por cursor sobre fecha_pago, id)
+        Index("idx_pagos_fecha_pago_id", "fecha_pago", "id"),
+    )
     
     # Relación con miembro
     miembro_id = Column(Integer, ForeignKey("miembros.id"), nullable=False, index=True)
@@ -114,6 +120,9 @@ class MovimientoCaja(BaseModel):
     Contabilidad básica
     """
     __tablename__ = "movimientos_caja"
+    __table_args__ = (
+        Index("idx_movimientos_caja_tipo_fecha", "tipo", "fecha_movimiento"),
+    )
     
     # Tipo de movimiento
     tipo = Column(
@@ -146,4 +155,41 @@ class MovimientoCaja(BaseModel):
     
     def __repr__(self):
         signo = "+" if self.tipo == "ingreso" else "-"
-        return f"<MovimientoCaja {signo}${self.monto}: {self.concepto}>"
\ No newline at end of file
+        return f"<MovimientoCaja {signo}${self.monto}: {self.concepto}>"
+
+class ResumenDiarioCaja(Base):
+    """
+    Agregado diario de caja por categoría contable
+
+    Lo mantienen al día los endpoints que crean movimientos (ver
+    ResumenCajaService); los reportes leen de acá en lugar de sumar
+    movimientos_caja. Se puede reconstruir con scripts/rebuild_resumen_caja.py.
+
+    categoria_contable es "" cuando el movimiento no tiene categoría (la clave
+    primaria no admite NULL).
+    """
+    __tablename__ = "resumen_diario_caja"
+
+    fecha = Column(Date, primary_key=True)
+    categoria_contable = Column(String(100), primary_key=True, default="")
+
+    ingresos = Column(Float, default=0.0, nullable=False)
+    egresos = Column(Float, default=0.0, nullable=False)
+    cantidad_ingresos = Column(Integer, default=0, nullable=False)
+    cantidad_egresos = Column(Integer, default=0, nullable=False)
+
+    # Pagos aprobados con fecha_pago en el día (se descuentan al anular)
+    cantidad_pagos = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=True
+    )
+
+    def __repr__(self):
+        return (
+            f"<ResumenDiarioCaja {self.fecha} [{self.categoria_contable}]: "
+            f"+${self.ingresos} -${self.egresos}>"
+        )
@@ -49,6 +49,10 @@ class Usuario(BaseModel, SoftDeleteMixin):
     # Último acceso
     last_login = Column(String(255), nullable=True)  # Timestamp ISO
     
+    # Versión de los tokens emitidos (claim "ver"); al incrementarla los
+    # tokens anteriores dejan de valer
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Relaciones
     accesos_registrados = relationship(
         "Acceso",
@@ -64,6 +68,10 @@ class Usuario(BaseModel, SoftDeleteMixin):
     def nombre_completo(self):
         return f"{self.apellido}, {self.nombre}"
     
+    def revocar_tokens(self):
+        """Invalida los tokens emitidos (cambio de contraseña, rol, estado o baja)"""
+        self.token_version = (self.token_version or 0) + 1
+    
     @property
     def puede_registrar_accesos(self):
         """Verifica si puede registrar accesos"""
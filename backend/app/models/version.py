@@ -0,0 +1,138 @@
+"""
+Modelo VersionRecurso - Marcas de versión para caché HTTP condicional
+backend/app/models/version.py
+
+Una fila por recurso (grupo de tablas) con un contador que se incrementa en
+la misma transacción que cualquier escritura ORM sobre sus tablas. Los
+endpoints de lectura arman el ETag / Last-Modified con estas filas (una
+consulta por PK) y responden 304 sin ejecutar la consulta completa.
+
+Se usa un contador en lugar de max(updated_at): updated_at toma now() del
+inicio de la transacción (una escritura más larga puede confirmar con una
+marca anterior a otra ya leída), no cambia en los borrados y en SQLite
+tiene resolución de segundos.
+
+Las tablas de solo inserción (accesos) no llevan contador: un UPDATE a una
+fila compartida en cada escaneo serializaría las transacciones de los
+molinetes hasta el COMMIT. Su marca es el último id (ver VersionService).
+"""
+import logging
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Callable, List, Set
+
+from sqlalchemy import BigInteger, Column, DateTime, String, event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+class VersionRecurso(Base):
+    """Contador de versión de un recurso"""
+    __tablename__ = "versiones_recurso"
+
+    recurso = Column(String(50), primary_key=True)
+    version = Column(BigInteger, server_default="0", nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<VersionRecurso {self.recurso}={self.version}>"
+
+
+# Tabla -> recurso versionado. Las tablas que no figuran no invalidan nada.
+RECURSO_POR_TABLA = {
+    "miembros": "miembros",
+    "categorias": "categorias",
+    "pagos": "pagos",
+    "movimientos_caja": "pagos",
+}
+RECURSOS = tuple(sorted(set(RECURSO_POR_TABLA.values())))
+
+# Claves en Session.info: recursos escritos en la transacción en curso y
+# recursos con versión nueva a la espera de que el COMMIT termine
+_RECURSOS_ESCRITOS = "recursos_escritos"
+_RECURSOS_CONFIRMANDO = "recursos_confirmando"
+
+# Funciones a llamar con los recursos modificados después de cada COMMIT
+_suscriptores: List[Callable[[Set[str]], None]] = []
+
+
+def al_confirmar(funcion: Callable[[Set[str]], None]) -> Callable[[Set[str]], None]:
+    """
+    Registrar `funcion(recursos)` para después de cada commit que escribió
+    tablas versionadas (p. ej. invalidar cachés derivadas de esos recursos)
+    """
+    _suscriptores.append(funcion)
+    return funcion
+
+
+@event.listens_for(VersionRecurso.__table__, "after_create")
+def _insertar_recursos(tabla, connection, **kw):
+    """Filas iniciales al crear la tabla con create_all (desarrollo y tests)"""
+    connection.execute(tabla.insert(), [{"recurso": recurso, "version": 0} for recurso in RECURSOS])
+
+
+# ==================== REGISTRO DE ESCRITURAS ====================
+
+def _registrar(session: Session, tabla) -> None:
+    recurso = RECURSO_POR_TABLA.get(getattr(tabla, "name", None))
+    if recurso:
+        session.info.setdefault(_RECURSOS_ESCRITOS, set()).add(recurso)
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(session, flush_context):
+    """Altas, modificaciones y borrados por unidad de trabajo"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        _registrar(session, getattr(obj, "__table__", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(estado):
+    """insert/update/delete masivos ejecutados con session.execute"""
+    if (estado.is_insert or estado.is_update or estado.is_delete) and estado.bind_mapper is not None:
+        _registrar(estado.session, estado.bind_mapper.local_table)
+
+
+@event.listens_for(Session, "before_commit")
+def _incrementar_versiones(session):
+    """
+    Incrementar las versiones de los recursos escritos antes del COMMIT
+
+    El UPDATE viaja en la misma transacción que los datos: una lectura nunca
+    ve la versión nueva sin los cambios (ni al revés). Los recursos se
+    actualizan en orden fijo para no generar deadlocks entre transacciones.
+    """
+    session.flush()
+    recursos = session.info.pop(_RECURSOS_ESCRITOS, None)
+    if not recursos:
+        return
+    session.connection().execute(
+        update(VersionRecurso)
+        .where(VersionRecurso.recurso.in_(sorted(recursos)))
+        .values(version=VersionRecurso.version + 1, updated_at=datetime.now(timezone.utc))
+    )
+    session.info[_RECURSOS_CONFIRMANDO] = recursos
+
+
+@event.listens_for(Session, "after_commit")
+def _notificar_confirmados(session):
+    """Avisar a los suscriptores una vez que los cambios son visibles"""
+    recursos = session.info.pop(_RECURSOS_CONFIRMANDO, None)
+    if not recursos:
+        return
+    for funcion in _suscriptores:
+        try:
+            funcion(recursos)
+        except Exception as e:
+            logger.warning(f"[WARN] Aviso de recursos modificados ({funcion.__qualname__}): {e}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_escrituras(session, previous_transaction):
+    """Lo escrito en una transacción revertida no invalida nada"""
+    session.info.pop(_RECURSOS_ESCRITOS, None)
+    session.info.pop(_RECURSOS_CONFIRMANDO, None)
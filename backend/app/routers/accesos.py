@@ -4,18 +4,26 @@ ESTE ES EL ENDPOINT MÁS CRÍTICO PARA LA APP MÓVIL
 backend/app/routers/accesos.py
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlalchemy import desc, func
-from datetime import datetime, date
-from typing import List, Optional
+from sqlalchemy import desc, func, select
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
-from app.database import get_db
+from app.database import get_async_db
 from app.services.audit_service import AuditService
+from app.services.acceso_stats_service import AccesoStatsService
+from app.services.acceso_cache_service import AccesoCacheService, MiembroAcceso
+from app.services.acceso_writer import acceso_writer
+from app.services.acceso_snapshot_service import AccesoSnapshotService, ClaseAcceso
 from app.schemas.acceso import (
     ValidarQRRequest,
     ValidarQRResponse,
+    ValidarQRBatchRequest,
+    ValidarQRBatchResponse,
+    ResultadoEscaneo,
     RegistrarAccesoManual,
     AccesoResponse,
     AccesoListItem,
@@ -26,10 +34,12 @@ from app.schemas.acceso import (
 )
 from app.schemas.common import PaginatedResponse, PaginationMeta
 from app.models.acceso import Acceso, TipoAcceso, ResultadoAcceso
-from app.models.miembro import Miembro, EstadoMiembro
+from app.models.miembro import Miembro
 from app.models.usuario import Usuario
 from app.services.qr_service import QRService
 from app.utils.dependencies import get_current_user, require_portero, PaginationParams
+from app.utils.helpers import ahora_utc, parse_fecha_param
+from app.utils.respuestas import SerializadorJSON
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -37,12 +47,130 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _obtener_miembro_acceso(db: AsyncSession, miembro_id: int) -> Optional[MiembroAcceso]:
+    """
+    Datos del socio para decidir el acceso
+
+    Primero consulta la caché en memoria; ante un miss carga el socio (con su
+    categoría) y lo guarda. Retorna None si no existe o fue eliminado.
+    """
+    miembro = AccesoCacheService.obtener(miembro_id)
+    if miembro is not None:
+        return miembro
+    
+    result = await db.execute(
+        select(Miembro)
+        .options(selectinload(Miembro.categoria))
+        .where(
+            Miembro.id == miembro_id,
+            Miembro.is_deleted == False
+        )
+    )
+    modelo = result.scalar_one_or_none()
+    if modelo is None:
+        return None
+    
+    miembro = MiembroAcceso.desde_miembro(modelo)
+    AccesoCacheService.guardar(miembro)
+    return miembro
+
+
+async def _obtener_miembros_acceso(db: AsyncSession, miembro_ids: Iterable[int]) -> Dict[int, MiembroAcceso]:
+    """
+    Datos de varios socios para decidir sus accesos
+
+    Los que no están en caché se cargan con un único SELECT ... IN (con sus
+    categorías) y se guardan. Los inexistentes o eliminados no aparecen en
+    el resultado.
+    """
+    miembros: Dict[int, MiembroAcceso] = {}
+    faltantes = []
+    for miembro_id in set(miembro_ids):
+        miembro = AccesoCacheService.obtener(miembro_id)
+        if miembro is not None:
+            miembros[miembro_id] = miembro
+        else:
+            faltantes.append(miembro_id)
+
+    if faltantes:
+        result = await db.execute(
+            select(Miembro)
+            .options(selectinload(Miembro.categoria))
+            .where(
+                Miembro.id.in_(faltantes),
+                Miembro.is_deleted == False
+            )
+        )
+        for modelo in result.scalars():
+            miembro = MiembroAcceso.desde_miembro(modelo)
+            AccesoCacheService.guardar(miembro)
+            miembros[miembro.id] = miembro
+
+    return miembros
+
+
+def _decidir_acceso(miembro: MiembroAcceso) -> Tuple[bool, str, str, ResultadoAcceso]:
+    """
+    Lógica de validación de acceso según estado y deuda del socio
+
+    La clase de decisión es la misma que precalcula el snapshot offline
+    (AccesoSnapshotService.clasificar).
+
+    Returns:
+        (acceso_permitido, nivel_alerta, mensaje, resultado)
+    """
+    clase = AccesoSnapshotService.clasificar(miembro.estado, miembro.saldo_cuenta)
+    deuda = abs(miembro.saldo_cuenta) if miembro.saldo_cuenta < 0 else 0
+
+    if clase == ClaseAcceso.MOROSO:
+        return False, "error", f"[ERROR] ACCESO DENEGADO - Cuota impaga. Deuda: ${deuda:.2f}", ResultadoAcceso.RECHAZADO
+    if clase == ClaseAcceso.SUSPENDIDO:
+        return False, "error", "[ERROR] ACCESO DENEGADO - Socio suspendido", ResultadoAcceso.RECHAZADO
+    if clase == ClaseAcceso.BAJA:
+        return False, "error", "[ERROR] ACCESO DENEGADO - Socio dado de baja", ResultadoAcceso.RECHAZADO
+    if clase == ClaseAcceso.DEUDA_EXCESIVA:
+        return False, "error", f"[ERROR] ACCESO DENEGADO - Deuda excesiva: ${deuda:.2f}", ResultadoAcceso.RECHAZADO
+    if clase == ClaseAcceso.ADVERTENCIA:
+        return (
+            True, "warning",
+            f"[WARN] ACCESO PERMITIDO - Advertencia: Deuda de ${deuda:.2f}",
+            ResultadoAcceso.ADVERTENCIA
+        )
+    return True, "success", f"[OK] ACCESO AUTORIZADO - Bienvenido {miembro.nombre}", ResultadoAcceso.PERMITIDO
+
+
+def _datos_miembro(miembro: MiembroAcceso) -> dict:
+    """Datos del socio que muestra la app móvil"""
+    return {
+        "id": miembro.id,
+        "numero_miembro": miembro.numero_miembro,
+        "nombre_completo": miembro.nombre_completo,
+        "foto_url": miembro.foto_url,
+        "categoria": miembro.categoria_nombre or "Sin categoría",
+        "estado": miembro.estado.value,
+        "saldo_cuenta": miembro.saldo_cuenta,
+        "ultima_cuota_pagada": miembro.ultima_cuota_pagada.isoformat() if miembro.ultima_cuota_pagada else None
+    }
+
+
+def _fecha_utc(fecha: datetime) -> datetime:
+    """Normalizar un timestamp del dispositivo a UTC (sin zona = UTC)"""
+    if fecha.tzinfo is None:
+        return fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc)
+
+
+def _clave_escaneo(miembro_id: int, fecha: datetime) -> Tuple[int, datetime]:
+    """Clave de deduplicación (SQLite devuelve las fechas sin zona)"""
+    return miembro_id, _fecha_utc(fecha).replace(tzinfo=None)
+
+
 @router.post("/validar-qr", response_model=ValidarQRResponse)
 async def validar_acceso_qr(
     validacion: ValidarQRRequest,
     request: Request,
     current_user: Usuario = Depends(require_portero),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
      ENDPOINT PRINCIPAL PARA LA APP MÓVIL 
@@ -62,7 +190,7 @@ async def validar_acceso_qr(
     - [WARN] Amarillo (warning): Acceso permitido con advertencia (deuda menor)
     - [ERROR] Rojo (error): Acceso denegado (moroso, suspendido, QR inválido)
     """
-    logger.info(f"[PHONE] Validación QR recibida de {current_user.username}")
+    logger.debug(f"[PHONE] Validación QR recibida de {current_user.username}")
     
     # Extraer ID del miembro del QR
     miembro_id = QRService.extraer_id_de_qr(validacion.qr_code)
@@ -84,11 +212,8 @@ async def validar_acceso_qr(
             detail="Código QR inválido o corrupto"
         )
     
-    # Buscar miembro en la base de datos
-    miembro = db.query(Miembro).filter(
-        Miembro.id == miembro_id,
-        Miembro.is_deleted == False
-    ).first()
+    # Buscar miembro (caché en memoria o base de datos)
+    miembro = await _obtener_miembro_acceso(db, miembro_id)
     
     if not miembro:
         logger.warning(f"[ERROR] Miembro no encontrado: ID {miembro_id}")
@@ -97,13 +222,18 @@ async def validar_acceso_qr(
             detail="Miembro no encontrado"
         )
     
-    # Validar integridad del QR
-    qr_valido, mensaje_error = QRService.validar_qr(
-        qr_code=validacion.qr_code,
-        miembro_id=miembro.id,
-        numero_documento=miembro.numero_documento,
-        fecha_alta=miembro.qr_generated_at
-    )
+    # Validar integridad del QR (se omite si este mismo QR ya fue validado)
+    if miembro.qr_code_validado == validacion.qr_code:
+        qr_valido, mensaje_error = True, None
+    else:
+        qr_valido, mensaje_error = QRService.validar_qr(
+            qr_code=validacion.qr_code,
+            miembro_id=miembro.id,
+            numero_documento=miembro.numero_documento,
+            fecha_alta=miembro.qr_generated_at
+        )
+        if qr_valido:
+            miembro = AccesoCacheService.marcar_qr_validado(miembro, validacion.qr_code)
     
     if not qr_valido:
         logger.warning(f"[ERROR] QR adulterado para miembro {miembro.numero_miembro}: {mensaje_error}")
@@ -111,7 +241,7 @@ async def validar_acceso_qr(
         # Registrar intento de fraude
         acceso = Acceso(
             miembro_id=miembro.id,
-            fecha_hora=datetime.utcnow().isoformat(),
+            fecha_hora=ahora_utc(),
             tipo_acceso=TipoAcceso.QR,
             resultado=ResultadoAcceso.RECHAZADO,
             ubicacion=validacion.ubicacion,
@@ -123,66 +253,23 @@ async def validar_acceso_qr(
             estado_miembro_snapshot=miembro.estado.value,
             saldo_cuenta_snapshot=miembro.saldo_cuenta
         )
-        db.add(acceso)
-        db.commit()
+        if acceso_writer.activo:
+            await acceso_writer.encolar(acceso)
+        else:
+            db.add(acceso)
+            await db.commit()
         
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"QR adulterado o inválido: {mensaje_error}"
         )
     
-    # ============================================
-    # LÓGICA DE VALIDACIÓN DE ACCESO
-    # ============================================
-    
-    acceso_permitido = False
-    nivel_alerta = "error"
-    mensaje = ""
-    resultado = ResultadoAcceso.RECHAZADO
-    
-    # Verificar estado del miembro
-    if miembro.estado == EstadoMiembro.MOROSO:
-        deuda = abs(miembro.saldo_cuenta) if miembro.saldo_cuenta < 0 else 0
-        mensaje = f"[ERROR] ACCESO DENEGADO - Cuota impaga. Deuda: ${deuda:.2f}"
-        nivel_alerta = "error"
-        resultado = ResultadoAcceso.RECHAZADO
-        
-    elif miembro.estado == EstadoMiembro.SUSPENDIDO:
-        mensaje = "[ERROR] ACCESO DENEGADO - Socio suspendido"
-        nivel_alerta = "error"
-        resultado = ResultadoAcceso.RECHAZADO
-        
-    elif miembro.estado == EstadoMiembro.BAJA:
-        mensaje = "[ERROR] ACCESO DENEGADO - Socio dado de baja"
-        nivel_alerta = "error"
-        resultado = ResultadoAcceso.RECHAZADO
-        
-    elif miembro.estado == EstadoMiembro.ACTIVO:
-        # Miembro activo - verificar deuda
-        if miembro.saldo_cuenta < 0:
-            deuda = abs(miembro.saldo_cuenta)
-            
-            # Si la deuda es menor al límite, permitir con advertencia
-            if deuda <= settings.DEUDA_MAXIMA_ADVERTENCIA:
-                acceso_permitido = True
-                mensaje = f"[WARN] ACCESO PERMITIDO - Advertencia: Deuda de ${deuda:.2f}"
-                nivel_alerta = "warning"
-                resultado = ResultadoAcceso.ADVERTENCIA
-            else:
-                mensaje = f"[ERROR] ACCESO DENEGADO - Deuda excesiva: ${deuda:.2f}"
-                nivel_alerta = "error"
-                resultado = ResultadoAcceso.RECHAZADO
-        else:
-            # Todo OK
-            acceso_permitido = True
-            mensaje = f"[OK] ACCESO AUTORIZADO - Bienvenido {miembro.nombre}"
-            nivel_alerta = "success"
-            resultado = ResultadoAcceso.PERMITIDO
+    acceso_permitido, nivel_alerta, mensaje, resultado = _decidir_acceso(miembro)
     
     # Registrar el acceso en la base de datos
     acceso = Acceso(
         miembro_id=miembro.id,
-        fecha_hora=datetime.utcnow().isoformat(),
+        fecha_hora=ahora_utc(),
         tipo_acceso=TipoAcceso.QR,
         resultado=resultado,
         ubicacion=validacion.ubicacion or "No especificada",
@@ -198,19 +285,32 @@ async def validar_acceso_qr(
         saldo_cuenta_snapshot=miembro.saldo_cuenta
     )
     
-    db.add(acceso)
-    db.commit()
-    db.refresh(acceso)
+    miembro_nombre = f"{miembro.numero_miembro} - {miembro.nombre_completo}"
+    motivo = mensaje if not acceso_permitido else None
     
-    # Registrar actividad de auditoría
-    AuditService.registrar_acceso(
-        db=db,
-        acceso_id=acceso.id,
-        miembro_nombre=f"{miembro.numero_miembro} - {miembro.nombre_completo}",
-        permitido=acceso_permitido,
-        motivo=mensaje if not acceso_permitido else None,
-        request=request
-    )
+    if acceso_writer.activo:
+        # Write-behind: acceso + auditoría se persisten en lote (un commit por lote)
+        actividad = AuditService.crear_actividad_acceso(
+            miembro_nombre=miembro_nombre,
+            permitido=acceso_permitido,
+            motivo=motivo,
+            request=request
+        )
+        acceso_id = await acceso_writer.encolar(acceso, actividad)
+    else:
+        db.add(acceso)
+        await db.commit()  # expire_on_commit=False: id y fecha_hora siguen cargados
+        acceso_id = acceso.id
+        
+        # Registrar actividad de auditoría
+        await AuditService.registrar_acceso_async(
+            db=db,
+            acceso_id=acceso_id,
+            miembro_nombre=miembro_nombre,
+            permitido=acceso_permitido,
+            motivo=motivo,
+            request=request
+        )
     
     logger.info(
         f"{'[OK]' if acceso_permitido else '[ERROR]'} Acceso {resultado.value} - "
@@ -224,18 +324,9 @@ async def validar_acceso_qr(
         resultado=resultado,
         nivel_alerta=nivel_alerta,
         mensaje=mensaje,
-        miembro={
-            "id": miembro.id,
-            "numero_miembro": miembro.numero_miembro,
-            "nombre_completo": miembro.nombre_completo,
-            "foto_url": miembro.foto_url,
-            "categoria": miembro.categoria.nombre if miembro.categoria else "Sin categoría",
-            "estado": miembro.estado.value,
-            "saldo_cuenta": miembro.saldo_cuenta,
-            "ultima_cuota_pagada": miembro.ultima_cuota_pagada.isoformat() if miembro.ultima_cuota_pagada else None
-        },
-        acceso_id=acceso.id,
-        timestamp=acceso.fecha_hora,
+        miembro=_datos_miembro(miembro),
+        acceso_id=acceso_id,
+        timestamp=acceso.fecha_hora.isoformat(),
         deuda=abs(miembro.saldo_cuenta) if miembro.saldo_cuenta < 0 else None,
         dias_mora=miembro.dias_mora
     )
@@ -243,12 +334,270 @@ async def validar_acceso_qr(
     return response
 
 
+@router.post("/validar-qr/batch", response_model=ValidarQRBatchResponse)
+async def validar_acceso_qr_batch(
+    lote: ValidarQRBatchRequest,
+    request: Request,
+    current_user: Usuario = Depends(require_portero),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sincronizar la cola de escaneos que la app móvil guardó sin conexión
+
+    Cada escaneo trae la fecha/hora del dispositivo, que es la que se
+    registra. La decisión se toma con el estado actual del socio (la misma
+    lógica que /validar-qr) y se devuelve por escaneo, en el orden recibido.
+
+    - Los socios se resuelven con un único SELECT ... IN (o desde la caché).
+    - Los checksums se validan en una sola pasada (uno por socio).
+    - Todos los accesos y su auditoría se insertan en una transacción.
+    - Con dispositivo_id, reenviar un escaneo ya sincronizado (mismo socio y
+      fecha/hora) no lo duplica: vuelve con estado "duplicado" y la decisión
+      original.
+
+    **Estados:** registrado | duplicado | qr_invalido | no_encontrado | fecha_invalida
+    """
+    if len(lote.escaneos) > settings.ACCESS_BATCH_MAX_SCANS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.ACCESS_BATCH_MAX_SCANS} escaneos por lote"
+        )
+
+    ahora = ahora_utc()
+    limite_futuro = ahora + timedelta(seconds=settings.ACCESS_BATCH_MAX_CLOCK_SKEW_SECONDS)
+    resultados: List[Optional[ResultadoEscaneo]] = [None] * len(lote.escaneos)
+
+    def descartar(indice: int, estado: str, mensaje: str, fecha: datetime, miembro_id: Optional[int] = None):
+        resultados[indice] = ResultadoEscaneo(
+            indice=indice,
+            id_local=lote.escaneos[indice].id_local,
+            estado=estado,
+            acceso_permitido=False,
+            nivel_alerta="error",
+            mensaje=mensaje,
+            miembro_id=miembro_id,
+            fecha_hora=fecha
+        )
+
+    # 1. Fecha del dispositivo e ID del QR
+    candidatos = []  # (indice, escaneo, miembro_id, fecha_utc)
+    for indice, escaneo in enumerate(lote.escaneos):
+        fecha = _fecha_utc(escaneo.fecha_hora)
+        if fecha > limite_futuro:
+            descartar(indice, "fecha_invalida", "[ERROR] Fecha del escaneo en el futuro (reloj del dispositivo)", fecha)
+            continue
+        miembro_id = QRService.extraer_id_de_qr(escaneo.qr_code)
+        if not miembro_id:
+            descartar(indice, "qr_invalido", "[ERROR] Código QR inválido o corrupto", fecha)
+            continue
+        candidatos.append((indice, escaneo, miembro_id, fecha))
+
+    # 2. Socios en un único SELECT ... IN
+    miembros = await _obtener_miembros_acceso(db, (c[2] for c in candidatos))
+
+    # 3. Escaneos de este dispositivo que ya se sincronizaron antes
+    previos: Dict[Tuple[int, datetime], Acceso] = {}
+    encontrados = [c for c in candidatos if c[2] in miembros]
+    if lote.dispositivo_id and encontrados:
+        result = await db.execute(
+            select(Acceso).where(
+                Acceso.dispositivo_id == lote.dispositivo_id,
+                Acceso.tipo_acceso == TipoAcceso.QR,
+                Acceso.miembro_id.in_({c[2] for c in encontrados}),
+                Acceso.fecha_hora.in_({c[3] for c in encontrados})
+            )
+        )
+        previos = {_clave_escaneo(a.miembro_id, a.fecha_hora): a for a in result.scalars()}
+
+    pendientes = []  # (indice, escaneo, miembro, fecha)
+    nuevos: Dict[Tuple[int, datetime], int] = {}  # clave -> índice del primer escaneo
+    repetidos = []  # (indice, índice del primer escaneo)
+    for indice, escaneo, miembro_id, fecha in candidatos:
+        miembro = miembros.get(miembro_id)
+        if miembro is None:
+            descartar(indice, "no_encontrado", "[ERROR] Miembro no encontrado", fecha, miembro_id)
+            continue
+
+        clave = _clave_escaneo(miembro_id, fecha)
+        previo = previos.get(clave)
+        if previo is not None:
+            resultados[indice] = ResultadoEscaneo(
+                indice=indice,
+                id_local=escaneo.id_local,
+                estado="duplicado",
+                acceso_permitido=previo.resultado != ResultadoAcceso.RECHAZADO,
+                resultado=previo.resultado,
+                nivel_alerta={
+                    ResultadoAcceso.PERMITIDO: "success",
+                    ResultadoAcceso.ADVERTENCIA: "warning",
+                }.get(previo.resultado, "error"),
+                mensaje=previo.mensaje or "",
+                miembro_id=miembro_id,
+                acceso_id=previo.id,
+                fecha_hora=fecha
+            )
+            continue
+        if clave in nuevos:
+            repetidos.append((indice, nuevos[clave]))
+            continue
+
+        nuevos[clave] = indice
+        pendientes.append((indice, escaneo, miembro, fecha))
+
+    # 4. Checksums en una sola pasada
+    validaciones = QRService.validar_qr_lote(
+        (escaneo.qr_code, miembro.id, miembro.numero_documento, miembro.qr_generated_at)
+        for _, escaneo, miembro, _ in pendientes
+    )
+
+    # 5. Decisiones y filas a insertar
+    accesos: List[Tuple[int, Acceso]] = []
+    actividades = []
+    for (indice, escaneo, miembro, fecha), (qr_valido, mensaje_error) in zip(pendientes, validaciones):
+        if qr_valido:
+            if miembro.qr_code_validado != escaneo.qr_code:
+                miembro = AccesoCacheService.marcar_qr_validado(miembro, escaneo.qr_code)
+            acceso_permitido, nivel_alerta, mensaje, resultado = _decidir_acceso(miembro)
+        else:
+            logger.warning(f"[ERROR] QR adulterado para miembro {miembro.numero_miembro} (lote offline): {mensaje_error}")
+            acceso_permitido, nivel_alerta, resultado = False, "error", ResultadoAcceso.RECHAZADO
+            mensaje = f"QR adulterado: {mensaje_error}"
+
+        acceso = Acceso(
+            miembro_id=miembro.id,
+            fecha_hora=fecha,
+            tipo_acceso=TipoAcceso.QR,
+            resultado=resultado,
+            ubicacion=escaneo.ubicacion or ("No especificada" if qr_valido else None),
+            dispositivo_id=lote.dispositivo_id,
+            qr_code_escaneado=escaneo.qr_code,
+            qr_validacion_exitosa=qr_valido,
+            mensaje=mensaje,
+            observaciones=escaneo.observaciones,
+            registrado_por_id=current_user.id,
+            latitud=escaneo.latitud,
+            longitud=escaneo.longitud,
+            estado_miembro_snapshot=miembro.estado.value,
+            saldo_cuenta_snapshot=miembro.saldo_cuenta
+        )
+        accesos.append((indice, acceso))
+
+        # Auditoría solo para accesos con QR íntegro (igual que /validar-qr)
+        if qr_valido:
+            actividad = AuditService.crear_actividad_acceso(
+                miembro_nombre=f"{miembro.numero_miembro} - {miembro.nombre_completo}",
+                permitido=acceso_permitido,
+                motivo=mensaje if not acceso_permitido else None,
+                request=request
+            )
+            actividades.append((acceso, actividad))
+
+        resultados[indice] = ResultadoEscaneo(
+            indice=indice,
+            id_local=escaneo.id_local,
+            estado="registrado",
+            acceso_permitido=acceso_permitido,
+            resultado=resultado,
+            nivel_alerta=nivel_alerta,
+            mensaje=mensaje if qr_valido else f"[ERROR] QR adulterado o inválido: {mensaje_error}",
+            miembro_id=miembro.id,
+            fecha_hora=fecha
+        )
+
+    # 6. Una transacción: INSERT multi-fila de accesos, luego sus actividades
+    if accesos:
+        db.add_all([acceso for _, acceso in accesos])
+        await db.flush()
+        for acceso, actividad in actividades:
+            actividad.entidad_id = acceso.id
+        db.add_all([actividad for _, actividad in actividades])
+        await db.commit()
+
+        for _, actividad in actividades:
+            AuditService._post_registro(actividad)
+        for indice, acceso in accesos:
+            resultados[indice].acceso_id = acceso.id
+
+    # Repetidos dentro del mismo lote: misma decisión que el primero
+    for indice, primero in repetidos:
+        resultados[indice] = resultados[primero].model_copy(update={
+            "indice": indice,
+            "id_local": lote.escaneos[indice].id_local,
+            "estado": "duplicado",
+        })
+
+    registrados = len(accesos)
+    duplicados = sum(1 for r in resultados if r.estado == "duplicado")
+    logger.info(
+        f"[OK] Lote offline de {len(resultados)} escaneos - "
+        f"registrados: {registrados}, duplicados: {duplicados} - "
+        f"Dispositivo: {lote.dispositivo_id} - Portero: {current_user.username}"
+    )
+
+    return ValidarQRBatchResponse(
+        total=len(resultados),
+        registrados=registrados,
+        duplicados=duplicados,
+        invalidos=len(resultados) - registrados - duplicados,
+        resultados=resultados
+    )
+
+
+@router.get("/snapshot")
+async def exportar_snapshot_accesos(
+    since: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Versión del último snapshot recibido (omitir para el snapshot completo)"
+    ),
+    formato: str = Query("jsonl", pattern="^(jsonl|binario)$", description="jsonl | binario"),
+    current_user: Usuario = Depends(require_portero),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Snapshot de decisiones de acceso para validar sin conexión
+
+    Por socio: id, hash del QR, clase de decisión, tramo de deuda y nombre
+    (ver AccesoSnapshotService). Con `since` devuelve solo los socios
+    modificados desde esa versión, incluidos los eliminados (clase
+    "eliminado"). La versión a guardar para el próximo delta viene en la
+    cabecera del cuerpo y en X-Snapshot-Version.
+
+    Si `since` es mayor que la versión actual (base restaurada o de otro
+    servidor) se devuelve el snapshot completo.
+    """
+    version = (await db.execute(AccesoSnapshotService.consulta_version())).scalar_one()
+    if since is not None and since > version:
+        since = None
+
+    logger.info(
+        f"[PHONE] Snapshot de accesos ({formato}) - versión {version}, "
+        f"{'completo' if since is None else f'desde {since}'} - Portero: {current_user.username}"
+    )
+
+    if formato == "binario":
+        contenido = AccesoSnapshotService.generar_binario(version, since)
+        media_type = AccesoSnapshotService.MEDIA_TYPE_BINARIO
+    else:
+        contenido = AccesoSnapshotService.generar_jsonl(version, since)
+        media_type = AccesoSnapshotService.MEDIA_TYPE_JSONL
+
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={
+            "X-Snapshot-Version": str(version),
+            "X-Snapshot-Completo": "true" if since is None else "false",
+        }
+    )
+
+
 @router.post("/manual", response_model=AccesoResponse)
 async def registrar_acceso_manual(
     acceso_data: RegistrarAccesoManual,
     request: Request,
     current_user: Usuario = Depends(require_portero),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Registrar acceso manual (sin QR)
@@ -256,7 +605,7 @@ async def registrar_acceso_manual(
     Para casos donde el miembro no tiene QR o el portero
     necesita registrar manualmente por autorización especial.
     """
-    miembro = db.query(Miembro).filter(Miembro.id == acceso_data.miembro_id).first()
+    miembro = await db.get(Miembro, acceso_data.miembro_id)
     
     if not miembro:
         raise HTTPException(
@@ -271,7 +620,7 @@ async def registrar_acceso_manual(
     
     acceso = Acceso(
         miembro_id=miembro.id,
-        fecha_hora=datetime.utcnow().isoformat(),
+        fecha_hora=ahora_utc(),
         tipo_acceso=TipoAcceso.MANUAL,
         resultado=resultado,
         ubicacion=acceso_data.ubicacion or "No especificada",
@@ -283,11 +632,11 @@ async def registrar_acceso_manual(
     )
     
     db.add(acceso)
-    db.commit()
-    db.refresh(acceso)
+    await db.commit()
+    await db.refresh(acceso)
     
     # Registrar actividad de auditoría
-    AuditService.registrar_acceso(
+    await AuditService.registrar_acceso_async(
         db=db,
         acceso_id=acceso.id,
         miembro_nombre=f"{miembro.numero_miembro} - {miembro.nombre_completo}",
@@ -301,6 +650,9 @@ async def registrar_acceso_manual(
     return acceso
 
 
+_PAGINA_ACCESOS = SerializadorJSON(PaginatedResponse[AccesoListItem])
+
+
 @router.get("/historial", response_model=PaginatedResponse[AccesoListItem])
 async def obtener_historial_accesos(
     miembro_id: Optional[int] = Query(None),
@@ -309,37 +661,60 @@ async def obtener_historial_accesos(
     resultado: Optional[ResultadoAcceso] = Query(None),
     pagination: PaginationParams = Depends(),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener historial de accesos con filtros
     
     Filtros disponibles:
     - miembro_id: Filtrar por miembro específico
-    - fecha_inicio/fecha_fin: Rango de fechas
+    - fecha_inicio/fecha_fin: Rango de fechas (YYYY-MM-DD o ISO 8601; fecha_fin
+      como fecha incluye el día completo)
     - resultado: Filtrar por resultado (permitido, rechazado, advertencia)
     """
-    # Evitar N+1 cargando miembros asociados
-    query = db.query(Acceso).options(selectinload(Acceso.miembro))
+    try:
+        desde = parse_fecha_param(fecha_inicio)
+        hasta = parse_fecha_param(fecha_fin, fin=True)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de fecha inválido (usar YYYY-MM-DD o ISO 8601)"
+        )
     
-    # Aplicar filtros
+    # Aplicar filtros (rangos sobre la columna indexada)
+    filtros = []
     if miembro_id:
-        query = query.filter(Acceso.miembro_id == miembro_id)
+        filtros.append(Acceso.miembro_id == miembro_id)
     
-    if fecha_inicio:
-        query = query.filter(Acceso.fecha_hora >= fecha_inicio)
+    if desde:
+        filtros.append(Acceso.fecha_hora >= desde)
     
-    if fecha_fin:
-        query = query.filter(Acceso.fecha_hora <= fecha_fin)
+    if hasta:
+        filtros.append(Acceso.fecha_hora < hasta)
     
     if resultado:
-        query = query.filter(Acceso.resultado == resultado)
-    
-    # Total de registros
-    total = query.count()
+        filtros.append(Acceso.resultado == resultado)
     
-    # Paginación
-    accesos = query.order_by(desc(Acceso.fecha_hora)).offset(pagination.skip).limit(pagination.limit).all()
+    # Evitar N+1 cargando miembros asociados
+    consulta = select(Acceso).options(selectinload(Acceso.miembro)).where(*filtros)
+    
+    if pagination.usa_cursor:
+        # Keyset por (fecha_hora, id): sin COUNT ni OFFSET sobre el log
+        result = await db.execute(pagination.aplicar_cursor(consulta, Acceso.fecha_hora, Acceso.id))
+        accesos, metadata = pagination.pagina_cursor(result.scalars().all())
+    else:
+        # Total de registros
+        total = await db.scalar(select(func.count(Acceso.id)).where(*filtros)) or 0
+        
+        # Paginación
+        result = await db.execute(
+            consulta
+            .order_by(desc(Acceso.fecha_hora))
+            .offset(pagination.skip)
+            .limit(pagination.limit)
+        )
+        accesos = result.scalars().all()
+        metadata = pagination.get_metadata(total)
     
     # Convertir a lista simplificada
     items = []
@@ -356,16 +731,16 @@ async def obtener_historial_accesos(
             numero_miembro=miembro.numero_miembro if miembro else None
         ))
     
-    return PaginatedResponse(
-        items=items,
-        pagination=pagination.get_metadata(total)
-    )
+    return _PAGINA_ACCESOS.respuesta({
+        "items": items,
+        "pagination": metadata
+    })
 
 
 @router.get("/resumen", response_model=ResumenAccesos)
 async def obtener_resumen_accesos(
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener resumen de accesos para dashboard
@@ -375,35 +750,16 @@ async def obtener_resumen_accesos(
     - Rechazos del día
     - Últimos 10 accesos
     """
-    from datetime import timedelta
-    
-    hoy = date.today()
-    inicio_semana = hoy - timedelta(days=hoy.weekday())
-    inicio_mes = hoy.replace(day=1)
+    hoy = ahora_utc().date()
     
-    # Accesos de hoy
-    accesos_hoy = db.query(func.count(Acceso.id)).filter(
-        func.date(Acceso.fecha_hora) == hoy
-    ).scalar() or 0
-    
-    # Accesos de la semana
-    accesos_semana = db.query(func.count(Acceso.id)).filter(
-        func.date(Acceso.fecha_hora) >= inicio_semana
-    ).scalar() or 0
-    
-    # Accesos del mes
-    accesos_mes = db.query(func.count(Acceso.id)).filter(
-        func.date(Acceso.fecha_hora) >= inicio_mes
-    ).scalar() or 0
-    
-    # Rechazos hoy
-    rechazos_hoy = db.query(func.count(Acceso.id)).filter(
-        func.date(Acceso.fecha_hora) == hoy,
-        Acceso.resultado == ResultadoAcceso.RECHAZADO
-    ).scalar() or 0
+    # Hoy / semana / mes / rechazos en una sola consulta
+    conteos = await AccesoStatsService.conteos_ventanas_async(db, hoy)
     
     # Últimos accesos
-    ultimos = db.query(Acceso).options(selectinload(Acceso.miembro)).order_by(desc(Acceso.fecha_hora)).limit(10).all()
+    result = await db.execute(
+        select(Acceso).options(selectinload(Acceso.miembro)).order_by(desc(Acceso.fecha_hora)).limit(10)
+    )
+    ultimos = result.scalars().all()
     
     ultimos_accesos = []
     for acceso in ultimos:
@@ -420,10 +776,10 @@ async def obtener_resumen_accesos(
         ))
     
     return ResumenAccesos(
-        hoy=accesos_hoy,
-        semana=accesos_semana,
-        mes=accesos_mes,
-        rechazos_hoy=rechazos_hoy,
+        hoy=conteos["hoy"],
+        semana=conteos["semana"],
+        mes=conteos["mes"],
+        rechazos_hoy=conteos["rechazos_hoy"],
         ultimos_accesos=ultimos_accesos
     )
 
@@ -431,7 +787,7 @@ async def obtener_resumen_accesos(
 @router.get("/estadisticas", response_model=EstadisticasAcceso)
 async def obtener_estadisticas_accesos(
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener estadísticas detalladas de accesos del día
@@ -444,74 +800,44 @@ async def obtener_estadisticas_accesos(
     - Rechazos hoy
     - Promedio por hora
     """
-    from datetime import datetime, time
-    
-    hoy = date.today()
-    inicio_hoy = datetime.combine(hoy, time.min)
-    fin_hoy = datetime.combine(hoy, time.max)
+    hoy = ahora_utc().date()
     
-    # Total de accesos hoy
-    total_hoy = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio_hoy.isoformat(),
-        Acceso.fecha_hora <= fin_hoy.isoformat()
-    ).scalar() or 0
+    # Totales por resultado + histograma por hora en una sola consulta agrupada
+    stats = await AccesoStatsService.estadisticas_dia_async(db, hoy)
     
-    # Accesos permitidos (entradas)
-    entradas_hoy = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio_hoy.isoformat(),
-        Acceso.fecha_hora <= fin_hoy.isoformat(),
-        Acceso.resultado == ResultadoAcceso.PERMITIDO
-    ).scalar() or 0
+    total_hoy = stats["total"]
+    entradas_hoy = stats["por_resultado"][ResultadoAcceso.PERMITIDO.value]
+    rechazos_hoy = stats["por_resultado"][ResultadoAcceso.RECHAZADO.value]
+    advertencias_hoy = stats["por_resultado"][ResultadoAcceso.ADVERTENCIA.value]
     
     # Salidas (si tienes un campo tipo_movimiento, sino usar el mismo que entradas)
     # Por ahora asumimos que todas son entradas
     salidas_hoy = 0  # Implementar si tienes lógica de entrada/salida
     
-    # Rechazos
-    rechazos_hoy = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio_hoy.isoformat(),
-        Acceso.fecha_hora <= fin_hoy.isoformat(),
-        Acceso.resultado == ResultadoAcceso.RECHAZADO
-    ).scalar() or 0
-    
-    # Advertencias
-    advertencias_hoy = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio_hoy.isoformat(),
-        Acceso.fecha_hora <= fin_hoy.isoformat(),
-        Acceso.resultado == ResultadoAcceso.ADVERTENCIA
-    ).scalar() or 0
-    
     # Hora actual
-    hora_actual = datetime.now().hour
+    hora_actual = ahora_utc().hour
     promedio_por_hora = round(total_hoy / hora_actual, 1) if hora_actual > 0 else 0
     
     # Accesos por hora (últimas 24 horas)
-    accesos_por_hora = []
-    for hora in range(24):
-        inicio_hora = datetime.combine(hoy, time(hora, 0))
-        fin_hora = datetime.combine(hoy, time(hora, 59, 59))
-        
-        cantidad = db.query(func.count(Acceso.id)).filter(
-            Acceso.fecha_hora >= inicio_hora.isoformat(),
-            Acceso.fecha_hora <= fin_hora.isoformat()
-        ).scalar() or 0
-        
-        accesos_por_hora.append({
-            "hora": f"{hora:02d}:00",
-            "cantidad": cantidad
-        })
+    accesos_por_hora = [
+        {"hora": h["hora"], "cantidad": h["total"]}
+        for h in stats["por_hora"]
+    ]
     
     # Último acceso
-    ultimo_acceso = db.query(Acceso).options(selectinload(Acceso.miembro)).order_by(
-        desc(Acceso.fecha_hora)
-    ).first()
+    result = await db.execute(
+        select(Acceso).options(selectinload(Acceso.miembro)).order_by(
+            desc(Acceso.fecha_hora)
+        ).limit(1)
+    )
+    ultimo_acceso = result.scalars().first()
     
     ultimo_acceso_info = None
     if ultimo_acceso:
         miembro = ultimo_acceso.miembro
         if miembro:
             ultimo_acceso_info = {
-                "fecha_hora": ultimo_acceso.fecha_hora,
+                "fecha_hora": ultimo_acceso.fecha_hora.isoformat(),
                 "nombre_miembro": miembro.nombre_completo,
                 "resultado": ultimo_acceso.resultado.value
             }
@@ -14,12 +14,15 @@ from app.schemas.auditoria import ActividadListItem, ActividadDetail
 from app.schemas.common import PaginatedResponse
 from app.utils.dependencies import PaginationParams, require_admin
 from app.models.usuario import Usuario
+from app.utils.respuestas import SerializadorJSON
 
 router = APIRouter()
 
+_PAGINA_ACTIVIDADES = SerializadorJSON(PaginatedResponse[ActividadListItem])
+
 
 @router.get("", response_model=PaginatedResponse[ActividadListItem])
-async def listar_actividades(
+def listar_actividades(
     tipo: Optional[TipoActividad] = Query(None, description="Filtrar por tipo de actividad"),
     severidad: Optional[NivelSeveridad] = Query(None, description="Filtrar por severidad"),
     usuario_id: Optional[int] = Query(None, description="Filtrar por usuario ejecutor"),
@@ -55,23 +58,30 @@ async def listar_actividades(
         like = f"%{q}%"
         query = query.filter(Actividad.descripcion.ilike(like))
 
-    total = query.count()
-    items = (
-        query
-        .order_by(Actividad.fecha_hora.desc())
-        .offset(pagination.skip)
-        .limit(pagination.limit)
-        .all()
-    )
+    if pagination.usa_cursor:
+        # Keyset por (fecha_hora, id): sin COUNT ni OFFSET
+        items, metadata = pagination.pagina_cursor(
+            pagination.aplicar_cursor(query, Actividad.fecha_hora, Actividad.id).all()
+        )
+    else:
+        total = query.count()
+        items = (
+            query
+            .order_by(Actividad.fecha_hora.desc())
+            .offset(pagination.skip)
+            .limit(pagination.limit)
+            .all()
+        )
+        metadata = pagination.get_metadata(total)
 
-    return {
+    return _PAGINA_ACTIVIDADES.respuesta({
         "items": items,
-        "pagination": pagination.get_metadata(total)
-    }
+        "pagination": metadata
+    })
 
 
 @router.get("/{actividad_id}", response_model=ActividadDetail)
-async def obtener_actividad(
+def obtener_actividad(
     actividad_id: int,
     current_user: Usuario = Depends(require_admin),
     db: Session = Depends(get_db)
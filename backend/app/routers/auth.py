@@ -41,7 +41,7 @@ async def login(
     Retorna access_token y refresh_token
     """
     # Autenticar usuario
-    usuario = AuthService.autenticar_usuario(
+    usuario = await AuthService.autenticar_usuario(
         db=db,
         username=credentials.username,
         password=credentials.password
@@ -103,7 +103,7 @@ async def register(
     Solo usuarios con rol ADMINISTRADOR pueden crear usuarios con otros roles.
     """
     try:
-        nuevo_usuario = AuthService.crear_usuario(
+        nuevo_usuario = await AuthService.crear_usuario(
             db=db,
             username=usuario_data.username,
             email=usuario_data.email,
@@ -159,18 +159,26 @@ async def refresh_token(
         # Buscar usuario
         usuario = db.query(Usuario).filter(Usuario.username == username).first()
         
-        if not usuario or not usuario.is_active:
+        if not usuario or not usuario.is_active or usuario.is_deleted:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario no válido"
             )
         
+        # Un refresh token emitido antes de revocar los tokens ya no vale
+        if payload.get("ver", 0) != usuario.token_version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revocado: volver a iniciar sesión"
+            )
+        
         # Generar nuevo access token
         token_data = {
             "sub": usuario.username,
             "user_id": usuario.id,
             "rol": usuario.rol.value,
-            "email": usuario.email
+            "email": usuario.email,
+            "ver": usuario.token_version
         }
         
         access_token = create_access_token(token_data)
@@ -204,7 +212,7 @@ async def change_password(
     Requiere autenticación.
     """
     try:
-        AuthService.cambiar_contraseña(
+        await AuthService.cambiar_contraseña(
             db=db,
             usuario_id=current_user.id,
             password_actual=password_data.current_password,
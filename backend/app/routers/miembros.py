@@ -3,8 +3,9 @@ Router de gestión de miembros/socios
 backend/app/routers/miembros.py
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, func
 from sqlalchemy.exc import IntegrityError
 from datetime import date, datetime
 from typing import List, Optional
@@ -13,12 +14,14 @@ import base64
 
 from app.database import get_db
 from app.services.audit_service import AuditService
+from app.services.acceso_cache_service import AccesoCacheService
 from app.models.actividad import TipoActividad
 from app.schemas.miembro import (
     MiembroCreate,
     MiembroUpdate,
     MiembroResponse,
     MiembroListItem,
+    MiembroBusquedaItem,
     GenerarQRRequest,
     QRResponse,
     CambiarEstadoRequest,
@@ -32,12 +35,18 @@ from app.schemas.common import PaginatedResponse, MessageResponse, IDResponse
 from app.models.miembro import Miembro, Categoria, EstadoMiembro
 from app.models.usuario import Usuario
 from app.services.qr_service import QRService
+from app.services.busqueda_service import BusquedaMiembrosService
+from app.services.qr_render_cache import QRRenderCache
+from app.services.credencial_service import CredencialService, CredencialDatos
 from app.utils.dependencies import (
     get_current_user,
     require_operador,
     PaginationParams
 )
 from app.config import settings
+from app.utils.respuestas import SerializadorJSON
+from app.utils.cache_http import ValidadorHTTP
+from app.services.version_service import VersionService
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +56,7 @@ router = APIRouter()
 # ==================== CATEGORÍAS ====================
 
 @router.post("/categorias", response_model=CategoriaResponse, status_code=status.HTTP_201_CREATED)
-async def crear_categoria(
+def crear_categoria(
     categoria_data: CategoriaCreate,
     current_user: Usuario = Depends(require_operador),
     db: Session = Depends(get_db)
@@ -81,19 +90,28 @@ async def crear_categoria(
 
 
 @router.get("/categorias", response_model=List[CategoriaResponse])
-async def listar_categorias(
+def listar_categorias(
+    request: Request,
+    response: Response,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Listar todas las categorías
+    
+    Con If-None-Match vigente responde 304 sin consultar las categorías.
     """
+    validador = ValidadorHTTP.desde_marca(request, VersionService.marca(db, "categorias"))
+    if validador.vigente:
+        return validador.no_modificado()
+    
     categorias = db.query(Categoria).all()
+    validador.aplicar(response)
     return categorias
 
 
 @router.put("/categorias/{categoria_id}", response_model=CategoriaResponse)
-async def actualizar_categoria(
+def actualizar_categoria(
     categoria_id: int,
     categoria_data: CategoriaUpdate,
     current_user: Usuario = Depends(require_operador),
@@ -118,13 +136,16 @@ async def actualizar_categoria(
     db.commit()
     db.refresh(categoria)
     
+    # El nombre de categoría forma parte de los datos cacheados de acceso
+    AccesoCacheService.limpiar()
+    
     logger.info(f"[EDIT] Categoría actualizada: {categoria.nombre}")
     
     return categoria
 
 
 @router.delete("/categorias/{categoria_id}", response_model=MessageResponse)
-async def eliminar_categoria(
+def eliminar_categoria(
     categoria_id: int,
     current_user: Usuario = Depends(require_operador),
     db: Session = Depends(get_db)
@@ -167,7 +188,7 @@ async def eliminar_categoria(
 # ==================== MIEMBROS ====================
 
 @router.post("", response_model=MiembroResponse, status_code=status.HTTP_201_CREATED)
-async def crear_miembro(
+def crear_miembro(
     miembro_data: MiembroCreate,
     request: Request,
     current_user: Usuario = Depends(require_operador),
@@ -273,8 +294,39 @@ async def crear_miembro(
     return nuevo_miembro
 
 
+def _filtrar_miembros(
+    query,
+    q: Optional[str],
+    estado: Optional[EstadoMiembro],
+    categoria_id: Optional[int],
+    solo_activos: bool
+):
+    """Aplicar los filtros comunes del listado de miembros"""
+    # Filtro de eliminados
+    if solo_activos:
+        query = query.filter(Miembro.is_deleted == False)
+    
+    # Búsqueda general (índice de trigramas / FTS sobre texto_busqueda)
+    if q:
+        dialecto = query.session.get_bind().dialect.name
+        query = query.filter(BusquedaMiembrosService.filtro(q, dialecto))
+    
+    # Filtro por estado
+    if estado:
+        query = query.filter(Miembro.estado == estado)
+    
+    # Filtro por categoría
+    if categoria_id:
+        query = query.filter(Miembro.categoria_id == categoria_id)
+    
+    return query
+
+
+_PAGINA_MIEMBROS = SerializadorJSON(PaginatedResponse[MiembroListItem])
+
+
 @router.get("", response_model=PaginatedResponse[MiembroListItem])
-async def listar_miembros(
+def listar_miembros(
     q: Optional[str] = Query(None, description="Búsqueda por nombre, apellido o documento"),
     estado: Optional[EstadoMiembro] = Query(None),
     categoria_id: Optional[int] = Query(None),
@@ -292,70 +344,123 @@ async def listar_miembros(
     - categoria_id: Filtrar por categoría
     - solo_activos: Si es True, solo muestra no eliminados
     """
-    query = db.query(Miembro)
-    
-    # Filtro de eliminados
-    if solo_activos:
-        query = query.filter(Miembro.is_deleted == False)
+    query = _filtrar_miembros(db.query(Miembro), q, estado, categoria_id, solo_activos)
     
-    # Búsqueda general
-    if q:
-        search_term = f"%{q}%"
-        query = query.filter(
-            or_(
-                Miembro.nombre.ilike(search_term),
-                Miembro.apellido.ilike(search_term),
-                Miembro.numero_documento.ilike(search_term),
-                Miembro.numero_miembro.ilike(search_term)
-            )
+    if pagination.usa_cursor:
+        # Keyset sobre la PK: sin COUNT ni OFFSET
+        miembros, metadata = pagination.pagina_cursor(
+            pagination.aplicar_cursor(query, None, Miembro.id).all()
         )
+    else:
+        # Total de registros
+        total = query.count()
+        
+        # Paginación
+        miembros = query.order_by(Miembro.id.desc()).offset(pagination.skip).limit(pagination.limit).all()
+        metadata = pagination.get_metadata(total)
+    
+    # Serializar con el adapter precompilado (MiembroListItem lee los atributos del ORM)
+    return _PAGINA_MIEMBROS.respuesta({"items": miembros, "pagination": metadata})
+
+
+@router.get("/buscar", response_model=List[MiembroBusquedaItem])
+def buscar_miembros(
+    q: str = Query(..., min_length=2, description="Nombre, apellido, documento o número de socio"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Autocompletado de socios
     
-    # Filtro por estado
-    if estado:
-        query = query.filter(Miembro.estado == estado)
+    Devuelve solo los datos necesarios para elegir un socio, ordenados por
+    relevancia (documento o número exacto, prefijo del apellido, palabra).
+    No distingue mayúsculas ni tildes.
+    """
+    return BusquedaMiembrosService.autocompletar(db, q, limit)
+
+
+@router.get("/credenciales")
+def generar_credenciales_lote(
+    formato: str = Query("pdf", pattern="^(pdf|zip)$", description="pdf (hoja A4) o zip (PNG por socio)"),
+    q: Optional[str] = Query(None, description="Búsqueda por nombre, apellido o documento"),
+    estado: Optional[EstadoMiembro] = Query(None),
+    categoria_id: Optional[int] = Query(None),
+    columnas: int = Query(2, ge=1, le=4, description="Credenciales por fila (PDF)"),
+    filas: int = Query(5, ge=1, le=8, description="Filas por hoja (PDF)"),
+    current_user: Usuario = Depends(require_operador),
+    db: Session = Depends(get_db)
+):
+    """
+    Generar credenciales de un conjunto filtrado de miembros
     
-    # Filtro por categoría
-    if categoria_id:
-        query = query.filter(Miembro.categoria_id == categoria_id)
+    - pdf: hoja A4 con columnas x filas credenciales por página
+    - zip: un PNG por socio (igual a /{id}/qr-image)
     
-    # Total de registros
-    total = query.count()
+    El render se reparte en un pool de procesos y la respuesta se
+    transmite a medida que se genera.
+    """
+    query = _filtrar_miembros(
+        db.query(Miembro).options(joinedload(Miembro.categoria)),
+        q, estado, categoria_id, solo_activos=True
+    )
     
-    # Paginación
-    miembros = query.order_by(Miembro.id.desc()).offset(pagination.skip).limit(pagination.limit).all()
-    
-    # Convertir a lista simplificada
-    items = [
-        MiembroListItem(
-            id=m.id,
-            numero_miembro=m.numero_miembro,
-            numero_documento=m.numero_documento,
-            nombre_completo=m.nombre_completo,
-            email=m.email,
-            telefono=m.telefono,
-            estado=m.estado,
-            saldo_cuenta=m.saldo_cuenta,
-            categoria=m.categoria,
-            fecha_alta=m.fecha_alta
+    total = query.count()
+    if total == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No hay miembros que coincidan con los filtros"
+        )
+    if total > settings.CREDENCIALES_MAX_LOTE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote supera el máximo de {settings.CREDENCIALES_MAX_LOTE} credenciales; aplicar filtros"
         )
-        for m in miembros
+    
+    # Cargar todo antes de transmitir: la sesión se cierra al salir del endpoint
+    datos = [
+        CredencialDatos.desde_miembro(m)
+        for m in query.order_by(Miembro.apellido, Miembro.nombre).all()
     ]
     
-    return PaginatedResponse(
-        items=items,
-        pagination=pagination.get_metadata(total)
+    logger.info(f"[OK] Generando {len(datos)} credenciales ({formato}) - Usuario: {current_user.username}")
+    
+    fecha = date.today().strftime("%Y%m%d")
+    if formato == "zip":
+        contenido = CredencialService.generar_zip(datos)
+        media_type = "application/zip"
+    else:
+        contenido = CredencialService.generar_pdf(datos, columnas=columnas, filas=filas)
+        media_type = "application/pdf"
+    
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=credenciales_{fecha}.{formato}"
+        }
     )
 
 
 @router.get("/{miembro_id}", response_model=MiembroResponse)
-async def obtener_miembro(
+def obtener_miembro(
     miembro_id: int,
+    request: Request,
+    response: Response,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Obtener detalles completos de un miembro
+    
+    El ETag sale de sync_version del socio y de la versión de categorías:
+    con If-None-Match vigente responde 304 sin cargar el socio.
     """
+    marca = VersionService.marca_miembro(db, miembro_id)
+    validador = ValidadorHTTP.desde_marca(request, marca) if marca else None
+    if validador and validador.vigente:
+        return validador.no_modificado()
+    
     miembro = db.query(Miembro).filter(
         Miembro.id == miembro_id,
         Miembro.is_deleted == False
@@ -367,11 +472,13 @@ async def obtener_miembro(
             detail="Miembro no encontrado"
         )
     
+    if validador:
+        validador.aplicar(response)
     return miembro
 
 
 @router.put("/{miembro_id}", response_model=MiembroResponse)
-async def actualizar_miembro(
+def actualizar_miembro(
     miembro_id: int,
     miembro_data: MiembroUpdate,
     current_user: Usuario = Depends(require_operador),
@@ -398,6 +505,7 @@ async def actualizar_miembro(
     
     db.commit()
     db.refresh(miembro)
+    AccesoCacheService.invalidar(miembro.id)
     
     logger.info(f"[EDIT] Miembro actualizado: {miembro.numero_miembro}")
     
@@ -405,7 +513,7 @@ async def actualizar_miembro(
 
 
 @router.delete("/{miembro_id}", response_model=MessageResponse)
-async def eliminar_miembro(
+def eliminar_miembro(
     miembro_id: int,
     request: Request,
     current_user: Usuario = Depends(require_operador),
@@ -433,6 +541,7 @@ async def eliminar_miembro(
     miembro.fecha_baja = date.today()
     
     db.commit()
+    AccesoCacheService.invalidar(miembro_id)
     
     # Registrar actividad de auditoría
     AuditService.registrar(
@@ -459,7 +568,7 @@ async def eliminar_miembro(
 
 
 @router.post("/{miembro_id}/cambiar-estado", response_model=MiembroResponse)
-async def cambiar_estado_miembro(
+def cambiar_estado_miembro(
     miembro_id: int,
     cambio: CambiarEstadoRequest,
     request: Request,
@@ -491,6 +600,7 @@ async def cambiar_estado_miembro(
     
     db.commit()
     db.refresh(miembro)
+    AccesoCacheService.invalidar(miembro.id)
     
     # Registrar actividad de auditoría
     AuditService.registrar(
@@ -519,15 +629,18 @@ async def cambiar_estado_miembro(
 
 
 @router.get("/{miembro_id}/qr-image")
-async def descargar_qr_imagen(
+def descargar_qr_imagen(
     miembro_id: int,
+    request: Request,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Descargar imagen QR del miembro en formato PNG
     
-    Útil para imprimir credenciales
+    Útil para imprimir credenciales. La imagen se sirve desde la caché de
+    renders; el ETag es la clave de contenido, por lo que un cliente que
+    envía If-None-Match recibe 304 sin transferir la imagen.
     """
     miembro = db.query(Miembro).filter(Miembro.id == miembro_id).first()
     
@@ -537,28 +650,22 @@ async def descargar_qr_imagen(
             detail="Miembro no encontrado"
         )
     
-    # Regenerar imagen QR
-    qr_data = QRService.generar_qr_miembro(
-        miembro_id=miembro.id,
-        numero_documento=miembro.numero_documento,
-        numero_miembro=miembro.numero_miembro,
-        nombre_completo=miembro.nombre_completo,
-        timestamp=miembro.qr_generated_at,
-        personalizar=True
-    )
+    validador = ValidadorHTTP(request, f'"{QRRenderCache.clave_miembro(miembro)}"')
+    if validador.vigente:
+        return validador.no_modificado()
+    
+    image_bytes, _ = QRRenderCache.obtener_png(miembro)
     
     # Retornar imagen PNG
-    return Response(
-        content=qr_data["image_bytes"],
+    return validador.aplicar(Response(
+        content=image_bytes,
         media_type="image/png",
-        headers={
-            "Content-Disposition": f"attachment; filename=qr_{miembro.numero_miembro}.png"
-        }
-    )
+        headers={"Content-Disposition": f"attachment; filename=qr_{miembro.numero_miembro}.png"}
+    ))
 
 
 @router.get("/{miembro_id}/estado-financiero", response_model=EstadoFinanciero)
-async def obtener_estado_financiero(
+def obtener_estado_financiero(
     miembro_id: int,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
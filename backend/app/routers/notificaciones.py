@@ -2,18 +2,21 @@
 Router de Notificaciones - Envío de emails
 backend/app/routers/notificaciones.py
 """
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional
 import logging
 
 from app.database import get_db
-from app.models.miembro import Miembro, EstadoMiembro
+from app.models.miembro import Miembro
 from app.models.usuario import Usuario
 from app.utils.dependencies import get_current_user, require_operador
 from app.schemas.common import MessageResponse
+from app.schemas.notificacion import NotificacionJobResponse
 from app.config import settings
 from app.services.notification_service import NotificationService
+from app.services.notification_jobs import NotificationJobService, notification_worker
 
 logger = logging.getLogger(__name__)
 
@@ -95,75 +98,68 @@ async def enviar_recordatorio_individual(
 
 
 @router.post("/recordatorios-masivos")
-async def enviar_recordatorios_masivos(
+def enviar_recordatorios_masivos(
+    response: Response,
     solo_morosos: bool = True,
     dias_mora_minimo: int = 5,
     incluir_email: bool = True,
-    background_tasks: BackgroundTasks = None,
     current_user: Usuario = Depends(require_operador),
     db: Session = Depends(get_db)
 ):
     """
     Enviar recordatorios masivos de cuota
     
+    El envío no se hace dentro del request: se encola un trabajo (202) que
+    procesa el worker de notificaciones. El avance se consulta en
+    GET /api/notificaciones/jobs/{job_id}.
+    
     Args:
         solo_morosos: Si True, solo envía a socios con estado MOROSO
         dias_mora_minimo: Días mínimos de mora para enviar
-        incluir_email: Si True, envía emails (False para test/preview)
+        incluir_email: Si True, encola el envío (False para test/preview)
     
     Returns:
-        Estadísticas de envío
+        ID y estado del trabajo encolado
     """
     try:
-        # Preview mode: solo contar sin enviar
+        # Preview mode: solo contar sin enviar (un COUNT en SQL)
         if not incluir_email:
-            query = db.query(Miembro).filter(
-                Miembro.is_deleted == False,
-                Miembro.saldo_cuenta < 0,
-                Miembro.email.isnot(None)
-            )
-            
-            if solo_morosos:
-                query = query.filter(Miembro.estado == EstadoMiembro.MOROSO)
-            
-            morosos = query.all()
-            
-            # Filtrar por días de mora
-            if dias_mora_minimo > 0:
-                morosos = [
-                    m for m in morosos 
-                    if (m.dias_mora or 0) >= dias_mora_minimo
-                ]
+            total = db.query(func.count(Miembro.id)).filter(
+                *NotificationService.filtros_destinatarios(solo_morosos, dias_mora_minimo)
+            ).scalar()
             
             return {
                 "success": True,
                 "enviados": 0,
                 "fallidos": 0,
-                "total_procesados": len(morosos),
+                "total_procesados": total,
                 "preview": True,
-                "message": f"Se enviarían {len(morosos)} recordatorios"
+                "message": f"Se enviarían {total} recordatorios"
             }
         
-        # Envío real usando el servicio
-        resultado = await NotificationService.enviar_recordatorios_masivos(
+        # Encolar el envío para el worker
+        job = NotificationJobService.crear_recordatorios(
+            db,
             solo_morosos=solo_morosos,
             dias_mora_minimo=dias_mora_minimo,
-            db=db
+            usuario_id=current_user.id
         )
+        notification_worker.despertar()
         
         logger.info(
-            f"[EMAIL] Recordatorios masivos - "
-            f"Enviados: {resultado['enviados']}, "
-            f"Fallidos: {resultado['fallidos']}"
+            f"[EMAIL] Recordatorios masivos encolados - "
+            f"Job: {job.id}, Destinatarios: {job.total}"
         )
         
+        response.status_code = status.HTTP_202_ACCEPTED
         return {
             "success": True,
-            "enviados": resultado["enviados"],
-            "fallidos": resultado["fallidos"],
-            "total_procesados": resultado.get("total_procesados", 0),
-            "message": f"Recordatorios enviados: {resultado['enviados']}",
-            "errores": resultado.get("errores", [])
+            "job_id": job.id,
+            "estado": job.estado.value,
+            "enviados": 0,
+            "fallidos": 0,
+            "total_procesados": job.total,
+            "message": f"Recordatorios en cola: {job.total}"
         }
     
     except Exception as e:
@@ -174,6 +170,27 @@ async def enviar_recordatorios_masivos(
         )
 
 
+@router.get("/jobs/{job_id}", response_model=NotificacionJobResponse)
+def obtener_job(
+    job_id: int,
+    current_user: Usuario = Depends(require_operador),
+    db: Session = Depends(get_db)
+):
+    """
+    Estado de un envío masivo
+    
+    Los contadores (enviados, fallidos, omitidos, pendientes) se actualizan
+    después de cada lote, así que sirven para mostrar el progreso.
+    """
+    job = NotificationJobService.obtener(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trabajo de notificación no encontrado"
+        )
+    return job
+
+
 @router.get("/test-email")
 async def test_configuracion_email(
     current_user: Usuario = Depends(require_operador)
@@ -227,44 +244,38 @@ async def preview_morosos(
     
     Útil para verificar antes de enviar masivamente.
     """
-    query = db.query(Miembro).filter(
-        Miembro.is_deleted == False,
-        Miembro.saldo_cuenta < 0,
-        Miembro.email.isnot(None)
-    )
-    
-    if solo_morosos:
-        query = query.filter(Miembro.estado == EstadoMiembro.MOROSO)
+    filtros = NotificationService.filtros_destinatarios(solo_morosos, dias_mora_minimo)
     
-    morosos = query.all()
+    # Totales en SQL (COUNT + SUM); solo se cargan los 50 del preview
+    total_destinatarios, total_deuda = db.query(
+        func.count(Miembro.id),
+        func.coalesce(func.sum(-Miembro.saldo_cuenta), 0.0)
+    ).filter(*filtros).one()
     
-    # Filtrar por días de mora
-    if dias_mora_minimo > 0:
-        morosos = [
-            m for m in morosos 
-            if (m.dias_mora or 0) >= dias_mora_minimo
-        ]
+    primeros = (
+        db.query(Miembro)
+        .filter(*filtros)
+        .order_by(Miembro.saldo_cuenta.asc(), Miembro.id)
+        .limit(50)
+        .all()
+    )
     
     # Preparar preview
     preview = []
-    total_deuda = 0
     
-    for miembro in morosos[:50]:  # Limitar a 50 para preview
-        deuda = abs(miembro.saldo_cuenta)
-        total_deuda += deuda
-        
+    for miembro in primeros:
         preview.append({
             "numero_miembro": miembro.numero_miembro,
             "nombre_completo": miembro.nombre_completo,
             "email": miembro.email,
-            "deuda": deuda,
+            "deuda": abs(miembro.saldo_cuenta),
             "dias_mora": miembro.dias_mora or 0,
             "estado": miembro.estado.value
         })
     
     return {
-        "total_destinatarios": len(morosos),
-        "total_deuda": total_deuda,
+        "total_destinatarios": total_destinatarios,
+        "total_deuda": float(total_deuda),
         "preview_primeros_50": preview,
         "filtros": {
             "solo_morosos": solo_morosos,
@@ -5,7 +5,7 @@ backend/app/routers/pagos.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import selectinload
-from sqlalchemy import func, extract, and_
+from sqlalchemy import func
 from datetime import date, datetime
 from typing import List, Optional
 from calendar import monthrange
@@ -13,6 +13,8 @@ import logging
 
 from app.database import get_db
 from app.services.audit_service import AuditService
+from app.services.acceso_cache_service import AccesoCacheService
+from app.services.resumen_caja_service import ResumenCajaService
 from app.schemas.pago import (
     PagoCreate,
     PagoUpdate,
@@ -38,7 +40,7 @@ router = APIRouter()
 # ==================== PAGOS ====================
 
 @router.post("", response_model=PagoResponse, status_code=status.HTTP_201_CREATED)
-async def registrar_pago(
+def registrar_pago(
     pago_data: PagoCreate,
     request: Request,
     current_user: Usuario = Depends(require_operador),
@@ -125,9 +127,12 @@ async def registrar_pago(
             registrado_por_id=current_user.id
         )
         db.add(movimiento)
+        ResumenCajaService.aplicar_movimiento(db, movimiento)
+        ResumenCajaService.ajustar_pagos(db, nuevo_pago.fecha_pago, movimiento.categoria_contable, 1)
 
         db.commit()
         db.refresh(nuevo_pago)
+        AccesoCacheService.invalidar(miembro.id)
 
         # Registrar auditoría (no bloquear por fallos)
         try:
@@ -158,7 +163,7 @@ async def registrar_pago(
 
 
 @router.post("/rapido", response_model=PagoResponse, status_code=status.HTTP_201_CREATED)
-async def registrar_pago_rapido(
+def registrar_pago_rapido(
     pago_data: RegistrarPagoRapido,
     request: Request,
     current_user: Usuario = Depends(require_operador),
@@ -235,9 +240,12 @@ async def registrar_pago_rapido(
             registrado_por_id=current_user.id
         )
         db.add(movimiento)
+        ResumenCajaService.aplicar_movimiento(db, movimiento)
+        ResumenCajaService.ajustar_pagos(db, nuevo_pago.fecha_pago, movimiento.categoria_contable, 1)
 
         db.commit()
         db.refresh(nuevo_pago)
+        AccesoCacheService.invalidar(miembro.id)
         
         # Registrar auditoría (no bloquear por fallos)
         try:
@@ -264,7 +272,7 @@ async def registrar_pago_rapido(
 
 
 @router.get("", response_model=PaginatedResponse[PagoListItem])
-async def listar_pagos(
+def listar_pagos(
     miembro_id: Optional[int] = Query(None),
     fecha_inicio: Optional[date] = Query(None),
     fecha_fin: Optional[date] = Query(None),
@@ -296,11 +304,18 @@ async def listar_pagos(
     if estado:
         query = query.filter(Pago.estado == estado)
     
-    # Total
-    total = query.count()
-    
-    # Paginación
-    pagos = query.order_by(Pago.fecha_pago.desc()).offset(pagination.skip).limit(pagination.limit).all()
+    if pagination.usa_cursor:
+        # Keyset por (fecha_pago, id): sin COUNT ni OFFSET
+        pagos, metadata = pagination.pagina_cursor(
+            pagination.aplicar_cursor(query, Pago.fecha_pago, Pago.id).all()
+        )
+    else:
+        # Total
+        total = query.count()
+        
+        # Paginación
+        pagos = query.order_by(Pago.fecha_pago.desc()).offset(pagination.skip).limit(pagination.limit).all()
+        metadata = pagination.get_metadata(total)
     
     # Convertir a lista sin consultas adicionales por cada pago (usa relación precargada)
     items = []
@@ -320,14 +335,14 @@ async def listar_pagos(
     
     return PaginatedResponse(
         items=items,
-        pagination=pagination.get_metadata(total)
+        pagination=metadata
     )
 
 
 # ==================== MOVIMIENTOS DE CAJA ====================
 
 @router.post("/movimientos", response_model=MovimientoCajaResponse, status_code=status.HTTP_201_CREATED)
-async def registrar_movimiento(
+def registrar_movimiento(
     movimiento_data: MovimientoCajaCreate,
     current_user: Usuario = Depends(require_operador),
     db: Session = Depends(get_db)
@@ -343,6 +358,7 @@ async def registrar_movimiento(
     )
     
     db.add(nuevo_movimiento)
+    ResumenCajaService.aplicar_movimiento(db, nuevo_movimiento)
     db.commit()
     db.refresh(nuevo_movimiento)
     
@@ -355,7 +371,7 @@ async def registrar_movimiento(
 
 
 @router.get("/movimientos", response_model=List[MovimientoCajaResponse])
-async def listar_movimientos(
+def listar_movimientos(
     fecha_inicio: Optional[date] = Query(None),
     fecha_fin: Optional[date] = Query(None),
     tipo: Optional[str] = Query(None, pattern="^(ingreso|egreso)$"),
@@ -384,7 +400,7 @@ async def listar_movimientos(
 # ==================== RESUMEN FINANCIERO ====================
 
 @router.get("/resumen/financiero", response_model=ResumenFinanciero)
-async def obtener_resumen_financiero(
+def obtener_resumen_financiero(
     mes: Optional[int] = Query(None, ge=1, le=12),
     anio: Optional[int] = Query(None, ge=2020, le=2100),
     current_user: Usuario = Depends(get_current_user),
@@ -408,41 +424,20 @@ async def obtener_resumen_financiero(
         mes_anterior = 12
         anio_anterior -= 1
     
-    # Total ingresos del mes
-    total_ingresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-        and_(
-            MovimientoCaja.tipo == "ingreso",
-            extract('month', MovimientoCaja.fecha_movimiento) == mes,
-            extract('year', MovimientoCaja.fecha_movimiento) == anio
-        )
-    ).scalar() or 0.0
-    
-    # Total egresos del mes
-    total_egresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-        and_(
-            MovimientoCaja.tipo == "egreso",
-            extract('month', MovimientoCaja.fecha_movimiento) == mes,
-            extract('year', MovimientoCaja.fecha_movimiento) == anio
-        )
-    ).scalar() or 0.0
-    
-    # Ingresos mes anterior
-    ingresos_mes_anterior = db.query(func.sum(MovimientoCaja.monto)).filter(
-        and_(
-            MovimientoCaja.tipo == "ingreso",
-            extract('month', MovimientoCaja.fecha_movimiento) == mes_anterior,
-            extract('year', MovimientoCaja.fecha_movimiento) == anio_anterior
-        )
-    ).scalar() or 0.0
-    
-    # Cantidad de pagos del mes
-    cantidad_pagos = db.query(func.count(Pago.id)).filter(
-        and_(
-            extract('month', Pago.fecha_pago) == mes,
-            extract('year', Pago.fecha_pago) == anio,
-            Pago.estado == EstadoPago.APROBADO
-        )
-    ).scalar() or 0
+    # Totales del mes y del anterior desde el resumen diario (rango por fecha)
+    inicio_mes = date(anio, mes, 1)
+    fin_mes = date(anio, mes, monthrange(anio, mes)[1])
+    actual = ResumenCajaService.totales(db, inicio_mes, fin_mes)
+    anterior = ResumenCajaService.totales(
+        db,
+        date(anio_anterior, mes_anterior, 1),
+        date(anio_anterior, mes_anterior, monthrange(anio_anterior, mes_anterior)[1])
+    )
+
+    total_ingresos = actual["ingresos"]
+    total_egresos = actual["egresos"]
+    ingresos_mes_anterior = anterior["ingresos"]
+    cantidad_pagos = actual["cantidad_pagos"]
     
     # Miembros al día
     cantidad_al_dia = db.query(func.count(Miembro.id)).filter(
@@ -479,7 +474,7 @@ async def obtener_resumen_financiero(
 
 
 @router.get("/{pago_id}", response_model=PagoResponse)
-async def obtener_pago(
+def obtener_pago(
     pago_id: int,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -499,7 +494,7 @@ async def obtener_pago(
 
 
 @router.post("/{pago_id}/anular", response_model=MessageResponse)
-async def anular_pago(
+def anular_pago(
     pago_id: int,
     anular_data: AnularPagoRequest,
     request: Request,
@@ -544,6 +539,13 @@ async def anular_pago(
         pago.estado = EstadoPago.CANCELADO
         pago.observaciones = f"{pago.observaciones or ''}\n[ANULADO] {anular_data.motivo}"
 
+        # El pago deja de contar en el día y la categoría en que se registró
+        categoria_original = db.query(MovimientoCaja.categoria_contable).filter(
+            MovimientoCaja.pago_id == pago.id,
+            MovimientoCaja.tipo == "ingreso"
+        ).scalar()
+        ResumenCajaService.ajustar_pagos(db, pago.fecha_pago, categoria_original, -1)
+
         # Registrar movimiento de egreso (devolución)
         movimiento = MovimientoCaja(
             tipo="egreso",
@@ -557,8 +559,10 @@ async def anular_pago(
             registrado_por_id=current_user.id
         )
         db.add(movimiento)
+        ResumenCajaService.aplicar_movimiento(db, movimiento)
 
         db.commit()
+        AccesoCacheService.invalidar(miembro.id)
 
         # Registrar auditoría
         AuditService.registrar_pago_anulado(
@@ -588,7 +592,7 @@ async def anular_pago(
 
 
 @router.get("/{pago_id}/recibo-pdf")
-async def descargar_recibo_pdf(
+def descargar_recibo_pdf(
     pago_id: int,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
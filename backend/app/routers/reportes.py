@@ -2,34 +2,69 @@
 Router de Reportes y Estadísticas
 backend/app/routers/reportes.py
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import selectinload
-from sqlalchemy import func, and_, extract, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, extract, case, select
 from datetime import date, datetime, timedelta
-from dateutil.relativedelta import relativedelta
 from typing import Optional, List, Dict, Any
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.miembro import Miembro, Categoria, EstadoMiembro
-from app.models.pago import Pago, MovimientoCaja, EstadoPago
+from app.models.pago import MovimientoCaja, EstadoPago
 from app.models.acceso import Acceso, ResultadoAcceso
-from app.models.usuario import Usuario
+from app.models.usuario import Usuario, RolUsuario
 from app.utils.dependencies import get_current_user
+from app.utils.helpers import inicio_dia_utc, rango_dia_utc, parse_fecha_param
 from app.schemas.common import MessageResponse
 from app.services.export_service import ExportService
+from app.services.export_proyecciones import (
+    Proyeccion,
+    proyeccion_socios,
+    proyeccion_pagos,
+    proyeccion_morosidad,
+    proyeccion_accesos,
+)
+from app.services.acceso_stats_service import AccesoStatsService
+from app.services.resumen_caja_service import ResumenCajaService
+from app.services.dashboard_service import DashboardService
+from app.services.version_service import VersionService
+from app.utils.respuestas import RespuestaJSON
+from app.utils.cache_http import ValidadorHTTP
+from app.utils.cache_etiquetas import cache_reportes
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+# ==================== CACHÉ HTTP ====================
+# Los reportes llevan ETag con las versiones de los recursos que leen y la
+# fecha del día (los períodos por defecto y los días de mora dependen de
+# ella): sin escrituras, la revalidación responde 304 sin recalcular.
+#
+# Los cálculos de socios, financiero, morosidad y accesos se cachean además
+# en el servidor (cache_reportes) por parámetros normalizados y versión de
+# las tablas que leen: varios operadores que abren el mismo reporte
+# comparten un solo cálculo.
+
+def _validador(request: Request, db: Session, *recursos: str) -> ValidadorHTTP:
+    return ValidadorHTTP.desde_marca(request, VersionService.marca(db, *recursos), date.today())
+
+
+async def _validador_async(request: Request, db: AsyncSession, *recursos: str) -> ValidadorHTTP:
+    return ValidadorHTTP.desde_marca(request, await VersionService.marca_async(db, *recursos), date.today())
+
+
 # ==================== REPORTE DE SOCIOS ====================
 
 @router.get("/socios")
-async def obtener_reporte_socios(
+def obtener_reporte_socios(
+    request: Request,
+    response: Response,
     estado: Optional[EstadoMiembro] = Query(None),
     categoria_id: Optional[int] = Query(None),
     current_user: Usuario = Depends(get_current_user),
@@ -44,6 +79,21 @@ async def obtener_reporte_socios(
     - Distribución por categoría
     - Estadísticas generales
     """
+    validador = _validador(request, db, "miembros", "categorias")
+    if validador.vigente:
+        return validador.no_modificado()
+    
+    validador.aplicar(response)
+    return _reporte_socios(db, estado=estado, categoria_id=categoria_id)
+
+
+@cache_reportes.cacheado("miembros", "categorias")
+def _reporte_socios(
+    db: Session,
+    estado: Optional[EstadoMiembro] = None,
+    categoria_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Cálculo del reporte de socios (cacheado por filtros)"""
     # Query base
     query = db.query(Miembro).filter(Miembro.is_deleted == False)
     
@@ -139,7 +189,9 @@ async def obtener_reporte_socios(
 # ==================== REPORTE FINANCIERO ====================
 
 @router.get("/financiero")
-async def obtener_reporte_financiero(
+def obtener_reporte_financiero(
+    request: Request,
+    response: Response,
     fecha_desde: Optional[str] = Query(None),
     fecha_hasta: Optional[str] = Query(None),
     current_user: Usuario = Depends(get_current_user),
@@ -154,6 +206,10 @@ async def obtener_reporte_financiero(
     - Ingresos por concepto
     - Comparativa con período anterior
     """
+    validador = _validador(request, db, "pagos")
+    if validador.vigente:
+        return validador.no_modificado()
+    
     # Determinar período
     if not fecha_desde or not fecha_hasta:
         # Por defecto: último mes
@@ -163,32 +219,31 @@ async def obtener_reporte_financiero(
         fecha_desde_obj = datetime.fromisoformat(fecha_desde).date()
         fecha_hasta_obj = datetime.fromisoformat(fecha_hasta).date()
     
-    # Total ingresos
-    total_ingresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-        MovimientoCaja.tipo == "ingreso",
-        MovimientoCaja.fecha_movimiento >= fecha_desde_obj,
-        MovimientoCaja.fecha_movimiento <= fecha_hasta_obj
-    ).scalar() or 0.0
-    
-    # Total egresos
-    total_egresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-        MovimientoCaja.tipo == "egreso",
-        MovimientoCaja.fecha_movimiento >= fecha_desde_obj,
-        MovimientoCaja.fecha_movimiento <= fecha_hasta_obj
-    ).scalar() or 0.0
+    validador.aplicar(response)
+    return _reporte_financiero(db, desde=fecha_desde_obj, hasta=fecha_hasta_obj)
+
+
+@cache_reportes.cacheado("pagos")
+def _reporte_financiero(db: Session, desde: date, hasta: date) -> Dict[str, Any]:
+    """Cálculo del reporte financiero (cacheado por período)"""
+    # Totales del período desde el resumen diario
+    totales = ResumenCajaService.totales(db, desde, hasta)
+    total_ingresos = totales["ingresos"]
+    total_egresos = totales["egresos"]
     
     # Balance
     balance = total_ingresos - total_egresos
     
-    # Ingresos por concepto
+    # Ingresos por concepto (el resumen no guarda conceptos: rango sobre
+    # idx_movimientos_caja_tipo_fecha)
     ingresos_detalle = db.query(
         MovimientoCaja.concepto,
         func.count(MovimientoCaja.id).label('cantidad'),
         func.sum(MovimientoCaja.monto).label('total')
     ).filter(
         MovimientoCaja.tipo == "ingreso",
-        MovimientoCaja.fecha_movimiento >= fecha_desde_obj,
-        MovimientoCaja.fecha_movimiento <= fecha_hasta_obj
+        MovimientoCaja.fecha_movimiento >= desde,
+        MovimientoCaja.fecha_movimiento <= hasta
     ).group_by(
         MovimientoCaja.concepto
     ).all()
@@ -202,33 +257,9 @@ async def obtener_reporte_financiero(
         for ing in ingresos_detalle
     ]
     
-    # Egresos por categoría
-    egresos_detalle = db.query(
-        MovimientoCaja.categoria_contable,
-        func.count(MovimientoCaja.id).label('cantidad'),
-        func.sum(MovimientoCaja.monto).label('total')
-    ).filter(
-        MovimientoCaja.tipo == "egreso",
-        MovimientoCaja.fecha_movimiento >= fecha_desde_obj,
-        MovimientoCaja.fecha_movimiento <= fecha_hasta_obj
-    ).group_by(
-        MovimientoCaja.categoria_contable
-    ).all()
-    
-    egresos_detalle_list = [
-        {
-            "categoria": egr.categoria_contable or "Sin categoría",
-            "cantidad": egr.cantidad,
-            "total": float(egr.total)
-        }
-        for egr in egresos_detalle
-    ]
-    
-    # Cantidad de transacciones
-    cantidad_transacciones = db.query(func.count(MovimientoCaja.id)).filter(
-        MovimientoCaja.fecha_movimiento >= fecha_desde_obj,
-        MovimientoCaja.fecha_movimiento <= fecha_hasta_obj
-    ).scalar() or 0
+    # Egresos por categoría y cantidad de transacciones (resumen diario)
+    egresos_detalle_list = ResumenCajaService.egresos_por_categoria(db, desde, hasta)
+    cantidad_transacciones = totales["cantidad_movimientos"]
     
     # Promedio de ingreso
     promedio_ingreso = total_ingresos / len(ingresos_detalle) if ingresos_detalle else 0
@@ -241,31 +272,49 @@ async def obtener_reporte_financiero(
         "egresos_detalle": egresos_detalle_list,
         "cantidad_transacciones": cantidad_transacciones,
         "promedio_ingreso": float(promedio_ingreso),
-        "fecha_desde": fecha_desde_obj.isoformat(),
-        "fecha_hasta": fecha_hasta_obj.isoformat(),
-        "periodo_dias": (fecha_hasta_obj - fecha_desde_obj).days
+        "fecha_desde": desde.isoformat(),
+        "fecha_hasta": hasta.isoformat(),
+        "periodo_dias": (hasta - desde).days
     }
 
 
 # ==================== REPORTE DE MOROSIDAD ====================
 
-@router.get("/morosidad")
+@router.get("/morosidad", response_model=Dict[str, Any])
 async def obtener_reporte_morosidad(
+    request: Request,
+    dias_mora_minimo: int = Query(0, ge=0, description="Solo socios con al menos N días de mora"),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Reporte de morosidad
     
     Lista de socios con deudas, ordenados por monto de deuda.
     """
-    # Socios morosos (saldo negativo)
-    morosos = db.query(Miembro).filter(
-        Miembro.is_deleted == False,
-        Miembro.saldo_cuenta < 0
-    ).order_by(
-        Miembro.saldo_cuenta.asc()  # Los más endeudados primero
-    ).all()
+    validador = await _validador_async(request, db, "miembros", "categorias")
+    if validador.vigente:
+        return validador.no_modificado()
+    
+    reporte = await _reporte_morosidad(db, dias_mora_minimo=dias_mora_minimo)
+    # Solo tipos JSON nativos: se serializa directo con orjson (sin jsonable_encoder)
+    return validador.aplicar(RespuestaJSON(reporte))
+
+
+@cache_reportes.cacheado("miembros", "categorias")
+async def _reporte_morosidad(db: AsyncSession, dias_mora_minimo: int = 0) -> Dict[str, Any]:
+    """Cálculo del reporte de morosidad (cacheado por mora mínima)"""
+    # Socios morosos (saldo negativo), filtrando la mora en SQL
+    result = await db.execute(
+        select(Miembro).options(selectinload(Miembro.categoria)).where(
+            Miembro.is_deleted == False,
+            Miembro.saldo_cuenta < 0,
+            Miembro.filtro_dias_mora(dias_mora_minimo)
+        ).order_by(
+            Miembro.saldo_cuenta.asc()  # Los más endeudados primero
+        )
+    )
+    morosos = result.scalars().all()
     
     morosos_list = []
     total_deuda = 0.0
@@ -274,12 +323,6 @@ async def obtener_reporte_morosidad(
         deuda = abs(miembro.saldo_cuenta)
         total_deuda += deuda
         
-        # Calcular días de mora
-        dias_mora = 0
-        if miembro.proximo_vencimiento:
-            if miembro.proximo_vencimiento < date.today():
-                dias_mora = (date.today() - miembro.proximo_vencimiento).days
-        
         morosos_list.append({
             "id": miembro.id,
             "numero_miembro": miembro.numero_miembro,
@@ -287,7 +330,7 @@ async def obtener_reporte_morosidad(
             "email": miembro.email,
             "telefono": miembro.telefono or miembro.celular,
             "deuda": float(deuda),
-            "dias_mora": dias_mora,
+            "dias_mora": miembro.dias_mora,
             "ultima_cuota_pagada": miembro.ultima_cuota_pagada.isoformat() if miembro.ultima_cuota_pagada else None,
             "categoria": miembro.categoria.nombre if miembro.categoria else None,
             "estado": miembro.estado.value
@@ -319,7 +362,9 @@ async def obtener_reporte_morosidad(
 # ==================== REPORTE DE ACCESOS ====================
 
 @router.get("/accesos")
-async def obtener_reporte_accesos(
+def obtener_reporte_accesos(
+    request: Request,
+    response: Response,
     fecha_desde: Optional[str] = Query(None),
     fecha_hasta: Optional[str] = Query(None),
     current_user: Usuario = Depends(get_current_user),
@@ -330,6 +375,10 @@ async def obtener_reporte_accesos(
     
     Estadísticas de control de acceso en un período.
     """
+    validador = _validador(request, db, "accesos", "miembros")
+    if validador.vigente:
+        return validador.no_modificado()
+    
     # Determinar período
     if not fecha_desde or not fecha_hasta:
         # Por defecto: última semana
@@ -339,68 +388,37 @@ async def obtener_reporte_accesos(
         fecha_desde_obj = datetime.fromisoformat(fecha_desde).date()
         fecha_hasta_obj = datetime.fromisoformat(fecha_hasta).date()
     
-    inicio = datetime.combine(fecha_desde_obj, datetime.min.time())
-    fin = datetime.combine(fecha_hasta_obj, datetime.max.time())
-    
-    # Total de accesos
-    total_accesos = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio.isoformat(),
-        Acceso.fecha_hora <= fin.isoformat()
-    ).scalar() or 0
-    
-    # Por resultado
-    permitidos = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio.isoformat(),
-        Acceso.fecha_hora <= fin.isoformat(),
-        Acceso.resultado == ResultadoAcceso.PERMITIDO
-    ).scalar() or 0
-    
-    rechazados = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio.isoformat(),
-        Acceso.fecha_hora <= fin.isoformat(),
-        Acceso.resultado == ResultadoAcceso.RECHAZADO
-    ).scalar() or 0
-    
-    advertencias = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio.isoformat(),
-        Acceso.fecha_hora <= fin.isoformat(),
-        Acceso.resultado == ResultadoAcceso.ADVERTENCIA
-    ).scalar() or 0
-    
-    # Accesos por día
-    accesos_por_dia = []
-    current_date = fecha_desde_obj
+    validador.aplicar(response)
+    return _reporte_accesos(db, desde=fecha_desde_obj, hasta=fecha_hasta_obj)
+
+
+@cache_reportes.cacheado("accesos", "miembros")
+def _reporte_accesos(db: Session, desde: date, hasta: date) -> Dict[str, Any]:
+    """Cálculo del reporte de accesos (cacheado por período)"""
+    # Rango semiabierto [inicio, fin) sobre la columna indexada
+    inicio = inicio_dia_utc(desde)
+    fin = inicio_dia_utc(hasta + timedelta(days=1))
     
-    while current_date <= fecha_hasta_obj:
-        inicio_dia = datetime.combine(current_date, datetime.min.time())
-        fin_dia = datetime.combine(current_date, datetime.max.time())
-        
-        cantidad = db.query(func.count(Acceso.id)).filter(
-            Acceso.fecha_hora >= inicio_dia.isoformat(),
-            Acceso.fecha_hora <= fin_dia.isoformat()
-        ).scalar() or 0
-        
-        accesos_por_dia.append({
-            "fecha": current_date.isoformat(),
-            "cantidad": cantidad
-        })
-        
-        current_date += timedelta(days=1)
+    # Totales por resultado y serie diaria en una consulta agrupada
+    stats = AccesoStatsService.estadisticas_periodo(db, desde, hasta)
+    total_accesos = stats["total"]
     
     # Top 10 socios con más accesos
     top_socios = db.query(
         Miembro.numero_miembro,
-        Miembro.nombre_completo,
+        Miembro.apellido,
+        Miembro.nombre,
         func.count(Acceso.id).label('cantidad_accesos')
     ).join(
         Acceso, Acceso.miembro_id == Miembro.id
     ).filter(
-        Acceso.fecha_hora >= inicio.isoformat(),
-        Acceso.fecha_hora <= fin.isoformat()
+        Acceso.fecha_hora >= inicio,
+        Acceso.fecha_hora < fin
     ).group_by(
         Miembro.id,
         Miembro.numero_miembro,
-        Miembro.nombre_completo
+        Miembro.apellido,
+        Miembro.nombre
     ).order_by(
         func.count(Acceso.id).desc()
     ).limit(10).all()
@@ -408,26 +426,26 @@ async def obtener_reporte_accesos(
     top_socios_list = [
         {
             "numero_miembro": s.numero_miembro,
-            "nombre_completo": s.nombre_completo,
+            "nombre_completo": f"{s.apellido}, {s.nombre}",
             "cantidad_accesos": s.cantidad_accesos
         }
         for s in top_socios
     ]
     
     # Promedio diario
-    dias = (fecha_hasta_obj - fecha_desde_obj).days + 1
+    dias = (hasta - desde).days + 1
     promedio_diario = total_accesos / dias if dias > 0 else 0
     
     return {
         "total_accesos": total_accesos,
-        "permitidos": permitidos,
-        "rechazados": rechazados,
-        "advertencias": advertencias,
+        "permitidos": stats["por_resultado"][ResultadoAcceso.PERMITIDO.value],
+        "rechazados": stats["por_resultado"][ResultadoAcceso.RECHAZADO.value],
+        "advertencias": stats["por_resultado"][ResultadoAcceso.ADVERTENCIA.value],
         "promedio_diario": round(promedio_diario, 1),
-        "accesos_por_dia": accesos_por_dia,
+        "accesos_por_dia": stats["por_dia"],
         "top_socios": top_socios_list,
-        "fecha_desde": fecha_desde_obj.isoformat(),
-        "fecha_hasta": fecha_hasta_obj.isoformat(),
+        "fecha_desde": desde.isoformat(),
+        "fecha_hasta": hasta.isoformat(),
         "periodo_dias": dias
     }
 
@@ -436,53 +454,53 @@ async def obtener_reporte_accesos(
 
 @router.get("/dashboard")
 async def obtener_reporte_dashboard(
+    request: Request,
+    response: Response,
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Reporte consolidado para dashboard principal
     
     Vista general rápida del estado del sistema.
     """
+    validador = await _validador_async(request, db, "miembros", "pagos", "accesos")
+    if validador.vigente:
+        return validador.no_modificado()
+    
     hoy = date.today()
     
     # Socios
-    total_socios = db.query(func.count(Miembro.id)).filter(
+    total_socios = await db.scalar(select(func.count(Miembro.id)).where(
         Miembro.is_deleted == False
-    ).scalar() or 0
+    )) or 0
     
-    socios_activos = db.query(func.count(Miembro.id)).filter(
+    socios_activos = await db.scalar(select(func.count(Miembro.id)).where(
         Miembro.is_deleted == False,
         Miembro.estado == EstadoMiembro.ACTIVO
-    ).scalar() or 0
+    )) or 0
     
-    socios_morosos = db.query(func.count(Miembro.id)).filter(
+    socios_morosos = await db.scalar(select(func.count(Miembro.id)).where(
         Miembro.is_deleted == False,
         Miembro.estado == EstadoMiembro.MOROSO
-    ).scalar() or 0
+    )) or 0
     
     # Finanzas del mes actual
     inicio_mes = hoy.replace(day=1)
     
-    ingresos_mes = db.query(func.sum(MovimientoCaja.monto)).filter(
-        MovimientoCaja.tipo == "ingreso",
-        MovimientoCaja.fecha_movimiento >= inicio_mes
-    ).scalar() or 0.0
-    
-    egresos_mes = db.query(func.sum(MovimientoCaja.monto)).filter(
-        MovimientoCaja.tipo == "egreso",
-        MovimientoCaja.fecha_movimiento >= inicio_mes
-    ).scalar() or 0.0
+    finanzas = (await db.execute(ResumenCajaService.query_totales(inicio_mes, hoy))).one()
+    ingresos_mes = finanzas.ingresos
+    egresos_mes = finanzas.egresos
     
     # Accesos del día
-    inicio_hoy = datetime.combine(hoy, datetime.min.time())
-    fin_hoy = datetime.combine(hoy, datetime.max.time())
+    inicio_hoy, fin_hoy = rango_dia_utc(hoy)
     
-    accesos_hoy = db.query(func.count(Acceso.id)).filter(
-        Acceso.fecha_hora >= inicio_hoy.isoformat(),
-        Acceso.fecha_hora <= fin_hoy.isoformat()
-    ).scalar() or 0
+    accesos_hoy = await db.scalar(select(func.count(Acceso.id)).where(
+        Acceso.fecha_hora >= inicio_hoy,
+        Acceso.fecha_hora < fin_hoy
+    )) or 0
     
+    validador.aplicar(response)
     return {
         "socios": {
             "total": total_socios,
@@ -502,10 +520,28 @@ async def obtener_reporte_dashboard(
     }
 
 
+@router.get("/dashboard/snapshot")
+async def obtener_snapshot_dashboard(
+    current_user: Usuario = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Todo lo que muestra el dashboard del escritorio en una sola respuesta
+    
+    KPIs de socios/finanzas/accesos, ingresos de los últimos 6 meses, accesos
+    por hora de hoy, principales deudores y (solo administradores) actividad
+    reciente. Se cachea unos segundos en el servidor con stale-while-revalidate
+    (DASHBOARD_CACHE_*): `generado_at` indica cuándo se calculó.
+    """
+    incluir_actividad = current_user.rol in (RolUsuario.SUPER_ADMIN, RolUsuario.ADMINISTRADOR)
+    return await DashboardService.obtener_snapshot(incluir_actividad)
+
+
 # ==================== HISTÓRICOS PARA GRÁFICOS ====================
 
 @router.get("/ingresos-historicos")
-async def obtener_ingresos_historicos(
+def obtener_ingresos_historicos(
+    request: Request,
+    response: Response,
     meses: int = Query(6, description="Cantidad de meses a retornar"),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -519,55 +555,19 @@ async def obtener_ingresos_historicos(
     Returns:
         Lista de ingresos mensuales con fecha y monto
     """
+    validador = _validador(request, db, "pagos")
+    if validador.vigente:
+        return validador.no_modificado()
+    
     # Fecha actual
     hoy = date.today()
     
-    # Calcular meses hacia atrás
-    historico = []
-    
-    for i in range(meses - 1, -1, -1):  # Del más antiguo al más reciente
-        # Calcular fecha del mes
-        mes_fecha = hoy - relativedelta(months=i)
-        primer_dia = mes_fecha.replace(day=1)
-        
-        # Último día del mes
-        if mes_fecha.month == 12:
-            ultimo_dia = mes_fecha.replace(day=31)
-        else:
-            siguiente_mes = mes_fecha.replace(day=1) + relativedelta(months=1)
-            ultimo_dia = siguiente_mes - relativedelta(days=1)
-        
-        # Calcular ingresos del mes
-        total_ingresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-            MovimientoCaja.tipo == "ingreso",
-            MovimientoCaja.fecha_movimiento >= primer_dia,
-            MovimientoCaja.fecha_movimiento <= ultimo_dia
-        ).scalar() or 0.0
-        
-        # Calcular egresos del mes
-        total_egresos = db.query(func.sum(MovimientoCaja.monto)).filter(
-            MovimientoCaja.tipo == "egreso",
-            MovimientoCaja.fecha_movimiento >= primer_dia,
-            MovimientoCaja.fecha_movimiento <= ultimo_dia
-        ).scalar() or 0.0
-        
-        # Nombres de meses en español
-        nombres_meses = [
-            "Ene", "Feb", "Mar", "Abr", "May", "Jun",
-            "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"
-        ]
-        
-        historico.append({
-            "mes": nombres_meses[mes_fecha.month - 1],
-            "anio": mes_fecha.year,
-            "mes_numero": mes_fecha.month,
-            "ingresos": float(total_ingresos),
-            "egresos": float(total_egresos),
-            "balance": float(total_ingresos - total_egresos),
-            "fecha_inicio": primer_dia.isoformat(),
-            "fecha_fin": ultimo_dia.isoformat()
-        })
+    # Todo el rango en una consulta sobre el resumen diario
+    desde, hasta = ResumenCajaService.rango_meses(hoy, meses)
+    por_mes = ResumenCajaService.mensual(db, desde, hasta)
+    historico = ResumenCajaService.serie_mensual(por_mes, hoy, meses)
     
+    validador.aplicar(response)
     return {
         "historico": historico,
         "total_meses": len(historico),
@@ -577,9 +577,11 @@ async def obtener_ingresos_historicos(
 
 @router.get("/accesos-detallados")
 async def obtener_accesos_detallados(
+    request: Request,
+    response: Response,
     fecha: Optional[str] = Query(None, description="Fecha específica (YYYY-MM-DD)"),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Obtener accesos detallados por hora para gráficos
@@ -590,60 +592,30 @@ async def obtener_accesos_detallados(
     Returns:
         Accesos agrupados por hora con detalles
     """
+    validador = await _validador_async(request, db, "accesos")
+    if validador.vigente:
+        return validador.no_modificado()
+    
     # Determinar fecha
     if fecha:
         fecha_consulta = datetime.fromisoformat(fecha).date()
     else:
         fecha_consulta = date.today()
     
-    inicio_dia = datetime.combine(fecha_consulta, datetime.min.time())
-    fin_dia = datetime.combine(fecha_consulta, datetime.max.time())
-    
-    # Obtener todos los accesos del día
-    accesos = db.query(Acceso).filter(
-        Acceso.fecha_hora >= inicio_dia.isoformat(),
-        Acceso.fecha_hora <= fin_dia.isoformat()
-    ).all()
-    
-    # Agrupar por hora
-    accesos_por_hora = {}
-    for hora in range(24):
-        accesos_por_hora[hora] = {
-            "hora": f"{hora:02d}:00",
-            "total": 0,
-            "permitidos": 0,
-            "rechazados": 0,
-            "advertencias": 0
-        }
+    # Totales e histograma por hora en una sola consulta agrupada
+    stats = await AccesoStatsService.estadisticas_dia_async(db, fecha_consulta)
     
-    # Contar accesos
-    for acceso in accesos:
-        try:
-            fecha_hora = datetime.fromisoformat(acceso.fecha_hora.replace("Z", "+00:00"))
-            hora = fecha_hora.hour
-            
-            accesos_por_hora[hora]["total"] += 1
-            
-            if acceso.resultado == ResultadoAcceso.PERMITIDO:
-                accesos_por_hora[hora]["permitidos"] += 1
-            elif acceso.resultado == ResultadoAcceso.RECHAZADO:
-                accesos_por_hora[hora]["rechazados"] += 1
-            else:
-                accesos_por_hora[hora]["advertencias"] += 1
-        except:
-            continue
-    
-    # Convertir a lista
-    resultado = list(accesos_por_hora.values())
+    resultado = stats["por_hora"]
     
     # Estadísticas generales
-    total_dia = len(accesos)
-    permitidos_dia = sum(1 for a in accesos if a.resultado == ResultadoAcceso.PERMITIDO)
-    rechazados_dia = sum(1 for a in accesos if a.resultado == ResultadoAcceso.RECHAZADO)
+    total_dia = stats["total"]
+    permitidos_dia = stats["por_resultado"][ResultadoAcceso.PERMITIDO.value]
+    rechazados_dia = stats["por_resultado"][ResultadoAcceso.RECHAZADO.value]
     
     # Horario pico
-    hora_pico = max(accesos_por_hora.items(), key=lambda x: x[1]["total"])
+    hora_pico = max(resultado, key=lambda h: h["total"])
     
+    validador.aplicar(response)
     return {
         "fecha": fecha_consulta.isoformat(),
         "accesos_por_hora": resultado,
@@ -651,247 +623,138 @@ async def obtener_accesos_detallados(
             "total": total_dia,
             "permitidos": permitidos_dia,
             "rechazados": rechazados_dia,
-            "hora_pico": hora_pico[1]["hora"],
-            "accesos_hora_pico": hora_pico[1]["total"]
+            "hora_pico": hora_pico["hora"],
+            "accesos_hora_pico": hora_pico["total"]
         }
     }
 
 
 # ==================== EXPORTACIÓN ====================
 
-    """
-Endpoints de Exportación - Agregar a reportes.py
-backend/app/routers/reportes.py (AGREGAR AL FINAL)
-"""
-
-from fastapi.responses import StreamingResponse
-
-# Agregar estos imports al inicio del archivo
-from app.services.export_service import ExportService
+def formato_exportacion(
+    formato: str = Query(
+        "xlsx",
+        alias="format",
+        pattern="^(xlsx|csv|parquet)$",
+        description="Formato del archivo: xlsx, csv o parquet"
+    )
+) -> str:
+    """Parámetro ?format= común a todos los endpoints de exportación"""
+    return formato
+
+
+def _respuesta_exportacion(db: Session, proyeccion: Proyeccion, formato: str) -> StreamingResponse:
+    """Generar la exportación en el formato pedido y transmitirla como descarga"""
+    filename = f"{proyeccion.nombre}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    
+    # CSV: se transmite fila a fila mientras se lee la consulta
+    if formato == "csv":
+        return StreamingResponse(
+            ExportService.generar_csv(proyeccion),
+            media_type=ExportService.MEDIA_TYPE_CSV,
+            headers=headers
+        )
+    
+    if formato == "parquet" and not ExportService.parquet_disponible():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Formato parquet no disponible en este servidor (requiere pyarrow)"
+        )
+    
+    try:
+        if formato == "parquet":
+            archivo = ExportService.generar_parquet(db, proyeccion)
+            media_type = ExportService.MEDIA_TYPE_PARQUET
+        else:
+            archivo = ExportService.generar_excel(db, proyeccion)
+            media_type = ExportService.MEDIA_TYPE_XLSX
+    except Exception as e:
+        logger.error(f"[ERROR] Error exportando {proyeccion.nombre} ({formato}): {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al exportar: {str(e)}"
+        )
+    
+    return StreamingResponse(
+        ExportService.iterar_archivo(archivo),
+        media_type=media_type,
+        headers=headers
+    )
 
-# Agregar estos endpoints al final del archivo reportes.py:
 
+@router.get("/exportar/socios")
 @router.get("/exportar/socios/excel")
-async def exportar_socios_excel(
-    estado: Optional[str] = Query(None),
+def exportar_socios_excel(
+    estado: Optional[EstadoMiembro] = Query(None),
     categoria_id: Optional[int] = Query(None),
+    formato: str = Depends(formato_exportacion),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Exportar lista de socios a Excel
+    Exportar lista de socios (xlsx, csv o parquet)
     """
-    try:
-        # Obtener socios con filtros
-        query = db.query(Miembro).filter(Miembro.is_deleted == False)
-        
-        if estado:
-            query = query.filter(Miembro.estado == estado)
-        if categoria_id:
-            query = query.filter(Miembro.categoria_id == categoria_id)
-        
-        socios = query.all()
-        
-        # Convertir a diccionarios
-        socios_data = []
-        for socio in socios:
-            socios_data.append({
-                "numero_miembro": socio.numero_miembro,
-                "numero_documento": socio.numero_documento,
-                "nombre_completo": socio.nombre_completo,
-                "email": socio.email,
-                "telefono": socio.telefono or socio.celular,
-                "estado": socio.estado.value,
-                "categoria": {"nombre": socio.categoria.nombre} if socio.categoria else None,
-                "saldo_cuenta": socio.saldo_cuenta,
-                "fecha_alta": socio.fecha_alta
-            })
-        
-        # Generar Excel
-        excel_file = ExportService.exportar_socios_excel(socios_data)
-        
-        # Retornar como descarga
-        filename = f"socios_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        return StreamingResponse(
-            excel_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error exportando socios: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al exportar: {str(e)}"
-        )
+    return _respuesta_exportacion(db, proyeccion_socios(estado, categoria_id), formato)
 
 
+@router.get("/exportar/pagos")
 @router.get("/exportar/pagos/excel")
-async def exportar_pagos_excel(
+def exportar_pagos_excel(
     fecha_desde: Optional[str] = Query(None),
     fecha_hasta: Optional[str] = Query(None),
     miembro_id: Optional[int] = Query(None),
+    formato: str = Depends(formato_exportacion),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Exportar lista de pagos a Excel
+    Exportar lista de pagos (xlsx, csv o parquet)
     """
     try:
-        # Evitar N+1 cargando miembro relacionado
-        query = db.query(Pago).options(selectinload(Pago.miembro))
-        
-        if fecha_desde:
-            fecha_desde_obj = datetime.fromisoformat(fecha_desde).date()
-            query = query.filter(Pago.fecha_pago >= fecha_desde_obj)
-        
-        if fecha_hasta:
-            fecha_hasta_obj = datetime.fromisoformat(fecha_hasta).date()
-            query = query.filter(Pago.fecha_pago <= fecha_hasta_obj)
-        
-        if miembro_id:
-            query = query.filter(Pago.miembro_id == miembro_id)
-        
-        pagos = query.order_by(Pago.fecha_pago.desc()).all()
-        
-        # Convertir a diccionarios
-        pagos_data = []
-        for pago in pagos:
-            miembro = pago.miembro  # precargado por selectinload
-            pagos_data.append({
-                "numero_comprobante": pago.numero_comprobante,
-                "fecha_pago": pago.fecha_pago,
-                "nombre_miembro": miembro.nombre_completo if miembro else "",
-                "miembro": {"numero_miembro": miembro.numero_miembro} if miembro else None,
-                "concepto": pago.concepto,
-                "monto": pago.monto,
-                "descuento": pago.descuento,
-                "recargo": pago.recargo,
-                "monto_final": pago.monto_final,
-                "metodo_pago": pago.metodo_pago.value,
-                "estado": pago.estado.value
-            })
-        
-        # Generar Excel
-        excel_file = ExportService.exportar_pagos_excel(pagos_data)
-        
-        filename = f"pagos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        return StreamingResponse(
-            excel_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error exportando pagos: {e}")
+        desde = datetime.fromisoformat(fecha_desde).date() if fecha_desde else None
+        hasta = datetime.fromisoformat(fecha_hasta).date() if fecha_hasta else None
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al exportar: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de fecha inválido (usar YYYY-MM-DD o ISO 8601)"
         )
+    
+    return _respuesta_exportacion(db, proyeccion_pagos(desde, hasta, miembro_id), formato)
 
 
+@router.get("/exportar/morosidad")
 @router.get("/exportar/morosidad/excel")
-async def exportar_morosidad_excel(
+def exportar_morosidad_excel(
+    formato: str = Depends(formato_exportacion),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Exportar reporte de morosidad a Excel
+    Exportar reporte de morosidad (xlsx, csv o parquet)
     """
-    try:
-        # Obtener morosos
-        morosos = db.query(Miembro).filter(
-            Miembro.is_deleted == False,
-            Miembro.saldo_cuenta < 0
-        ).order_by(Miembro.saldo_cuenta.asc()).all()
-        
-        # Convertir a diccionarios
-        morosos_data = []
-        for miembro in morosos:
-            morosos_data.append({
-                "numero_miembro": miembro.numero_miembro,
-                "nombre_completo": miembro.nombre_completo,
-                "email": miembro.email,
-                "telefono": miembro.telefono or miembro.celular,
-                "deuda": abs(miembro.saldo_cuenta),
-                "dias_mora": miembro.dias_mora,
-                "ultima_cuota_pagada": miembro.ultima_cuota_pagada,
-                "categoria": miembro.categoria.nombre if miembro.categoria else ""
-            })
-        
-        # Generar Excel
-        excel_file = ExportService.exportar_morosidad_excel(morosos_data)
-        
-        filename = f"morosidad_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        return StreamingResponse(
-            excel_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error exportando morosidad: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al exportar: {str(e)}"
-        )
+    return _respuesta_exportacion(db, proyeccion_morosidad(), formato)
 
 
+@router.get("/exportar/accesos")
 @router.get("/exportar/accesos/excel")
-async def exportar_accesos_excel(
+def exportar_accesos_excel(
     fecha_inicio: Optional[str] = Query(None),
     fecha_fin: Optional[str] = Query(None),
+    formato: str = Depends(formato_exportacion),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Exportar accesos a Excel
+    Exportar accesos (xlsx, csv o parquet)
     """
     try:
-        # Construir query evitando N+1 cargando miembro relacionado
-        query = db.query(Acceso).options(selectinload(Acceso.miembro))
-        
-        if fecha_inicio:
-            query = query.filter(Acceso.fecha_hora >= fecha_inicio)
-        
-        if fecha_fin:
-            query = query.filter(Acceso.fecha_hora <= fecha_fin)
-        
-        accesos = query.order_by(Acceso.fecha_hora.desc()).all()
-        
-        # Convertir a diccionarios
-        accesos_data = []
-        for acceso in accesos:
-            miembro = acceso.miembro  # precargado por selectinload
-            accesos_data.append({
-                "fecha_hora": acceso.fecha_hora,
-                "nombre_miembro": miembro.nombre_completo if miembro else "Desconocido",
-                "numero_miembro": miembro.numero_miembro if miembro else "",
-                "tipo_acceso": acceso.tipo_acceso.value,
-                "resultado": acceso.resultado.value,
-                "ubicacion": acceso.ubicacion,
-                "mensaje": acceso.mensaje,
-                "estado_snapshot": acceso.estado_miembro_snapshot,
-                "saldo_snapshot": acceso.saldo_cuenta_snapshot
-            })
-        
-        # Generar Excel
-        excel_file = ExportService.exportar_accesos_excel(accesos_data)
-        
-        filename = f"accesos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        return StreamingResponse(
-            excel_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error exportando accesos: {e}")
+        desde = parse_fecha_param(fecha_inicio)
+        hasta = parse_fecha_param(fecha_fin, fin=True)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al exportar: {str(e)}"
-        )
\ No newline at end of file
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de fecha inválido (usar YYYY-MM-DD o ISO 8601)"
+        )
+    
+    return _respuesta_exportacion(db, proyeccion_accesos(desde, hasta), formato)
@@ -19,6 +19,7 @@ from app.schemas.usuario import (
 from app.schemas.common import MessageResponse
 from app.models.usuario import Usuario, RolUsuario
 from app.services.auth_service import AuthService
+from app.services.principal_cache_service import PrincipalCacheService
 from app.utils.dependencies import get_current_user, require_admin
 
 logger = logging.getLogger(__name__)
@@ -113,11 +114,21 @@ async def actualizar_usuario(
     # Actualizar campos
     update_data = usuario_data.dict(exclude_unset=True)
     
+    # Cambiar rol o estado revoca los tokens emitidos
+    revocar = any(
+        campo in update_data and update_data[campo] != getattr(usuario, campo)
+        for campo in ("rol", "is_active")
+    )
+    
     for field, value in update_data.items():
         setattr(usuario, field, value)
     
+    if revocar:
+        usuario.revocar_tokens()
     db.commit()
     db.refresh(usuario)
+    if revocar:
+        PrincipalCacheService.invalidar(usuario.id)
     
     logger.info(f"[EDIT] Usuario actualizado: {usuario.username}")
     
@@ -211,8 +222,10 @@ async def eliminar_usuario(
     # Soft delete
     usuario.soft_delete()
     usuario.is_active = False
+    usuario.revocar_tokens()
     
     db.commit()
+    PrincipalCacheService.invalidar(usuario.id)
     
     logger.warning(f"[DELETE] Usuario eliminado: {usuario.username}")
     
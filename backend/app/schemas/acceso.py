@@ -79,7 +79,10 @@ class ValidarQRResponse(BaseModel):
     )
     
     # Metadata
-    acceso_id: int = Field(..., description="ID del registro de acceso")
+    acceso_id: Optional[int] = Field(
+        None,
+        description="ID del registro de acceso (None con escritura diferida en modo async)"
+    )
     timestamp: str = Field(..., description="Timestamp ISO de la validación")
     
     # Información adicional (opcional)
@@ -87,6 +90,61 @@ class ValidarQRResponse(BaseModel):
     dias_mora: Optional[int] = Field(None, description="Días de mora si aplica")
 
 
+# ==================== VALIDACIÓN QR EN LOTE (OFFLINE) ====================
+class EscaneoOffline(BaseModel):
+    """Escaneo guardado por la app móvil mientras no tenía conexión"""
+    qr_code: str = Field(..., min_length=10, description="Código QR escaneado")
+    fecha_hora: datetime = Field(
+        ...,
+        description="Momento del escaneo según el reloj del dispositivo (sin zona = UTC)"
+    )
+    id_local: Optional[str] = Field(
+        None,
+        max_length=64,
+        description="ID del escaneo en la cola del dispositivo (se devuelve en el resultado)"
+    )
+    ubicacion: Optional[str] = Field(None, max_length=100)
+    latitud: Optional[str] = Field(None, max_length=50)
+    longitud: Optional[str] = Field(None, max_length=50)
+    observaciones: Optional[str] = None
+
+
+class ValidarQRBatchRequest(BaseModel):
+    """Cola de escaneos offline de un dispositivo"""
+    dispositivo_id: Optional[str] = Field(
+        None,
+        max_length=100,
+        description="ID del dispositivo (habilita descartar escaneos ya sincronizados)"
+    )
+    escaneos: List[EscaneoOffline] = Field(..., min_length=1)
+
+
+class ResultadoEscaneo(BaseModel):
+    """Decisión para un escaneo del lote"""
+    indice: int = Field(..., description="Posición del escaneo en el request")
+    id_local: Optional[str] = None
+    estado: str = Field(
+        ...,
+        description="registrado | duplicado | qr_invalido | no_encontrado | fecha_invalida"
+    )
+    acceso_permitido: bool
+    resultado: Optional[ResultadoAcceso] = None
+    nivel_alerta: str = Field(..., description="success | warning | error")
+    mensaje: str
+    miembro_id: Optional[int] = None
+    acceso_id: Optional[int] = None
+    fecha_hora: datetime
+
+
+class ValidarQRBatchResponse(BaseModel):
+    """Resultado de sincronizar una cola de escaneos"""
+    total: int
+    registrados: int = Field(..., description="Accesos nuevos guardados")
+    duplicados: int = Field(..., description="Escaneos que ya estaban sincronizados")
+    invalidos: int = Field(..., description="Escaneos no registrados (QR ilegible, socio o fecha inválidos)")
+    resultados: List[ResultadoEscaneo]
+
+
 # ==================== ACCESO MANUAL ====================
 class RegistrarAccesoManual(BaseModel):
     """Request para registrar acceso manual (sin QR)"""
@@ -104,7 +162,7 @@ class AccesoResponse(TimestampMixin):
     """Schema para respuesta de acceso registrado (sin datos del miembro anidados)"""
     id: int
     miembro_id: int
-    fecha_hora: str  # ISO timestamp
+    fecha_hora: datetime
     tipo_acceso: TipoAcceso
     resultado: ResultadoAcceso
     ubicacion: Optional[str]
@@ -125,7 +183,7 @@ class AccesoListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
-    fecha_hora: str
+    fecha_hora: datetime
     tipo_acceso: TipoAcceso
     resultado: ResultadoAcceso
     ubicacion: Optional[str]
@@ -191,8 +249,8 @@ class EventoAccesoBase(BaseModel):
     """Schema base de EventoAcceso"""
     nombre: str = Field(..., min_length=3, max_length=255)
     descripcion: Optional[str] = None
-    fecha_inicio: str  # ISO timestamp
-    fecha_fin: Optional[str] = None
+    fecha_inicio: datetime
+    fecha_fin: Optional[datetime] = None
     ubicacion: Optional[str] = Field(None, max_length=255)
     capacidad_maxima: Optional[int] = Field(None, gt=0)
     requiere_validacion_especial: bool = False
@@ -208,8 +266,8 @@ class EventoAccesoUpdate(BaseModel):
     """Schema para actualizar evento"""
     nombre: Optional[str] = Field(None, min_length=3, max_length=255)
     descripcion: Optional[str] = None
-    fecha_inicio: Optional[str] = None
-    fecha_fin: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
     ubicacion: Optional[str] = None
     capacidad_maxima: Optional[int] = None
     requiere_validacion_especial: Optional[bool] = None
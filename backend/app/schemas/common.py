@@ -33,13 +33,20 @@ class ErrorResponse(BaseModel):
 T = TypeVar('T')
 
 class PaginationMeta(BaseModel):
-    """Metadata de paginación"""
-    page: int = Field(..., description="Página actual")
+    """
+    Metadata de paginación
+
+    En modo cursor (?cursor=) page, total y total_pages van en None (no se
+    cuenta) y se navega con next_cursor / prev_cursor.
+    """
+    page: Optional[int] = Field(..., description="Página actual")
     page_size: int = Field(..., description="Registros por página")
-    total: int = Field(..., description="Total de registros")
-    total_pages: int = Field(..., description="Total de páginas")
+    total: Optional[int] = Field(..., description="Total de registros")
+    total_pages: Optional[int] = Field(..., description="Total de páginas")
     has_next: bool = Field(..., description="¿Hay página siguiente?")
     has_prev: bool = Field(..., description="¿Hay página anterior?")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (modo cursor)")
+    prev_cursor: Optional[str] = Field(None, description="Cursor de la página anterior (modo cursor)")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -166,6 +166,24 @@ class MiembroListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CategoriaBusqueda(BaseModel):
+    """Categoría resumida en resultados de búsqueda"""
+    id: int
+    nombre: str
+    cuota_base: float
+
+
+class MiembroBusquedaItem(BaseModel):
+    """Schema mínimo para autocompletado de socios"""
+    id: int
+    numero_miembro: str
+    numero_documento: str
+    nombre_completo: str
+    estado: EstadoMiembro
+    saldo_cuenta: float
+    categoria: Optional[CategoriaBusqueda] = None
+
+
 # ==================== QR ====================
 class GenerarQRRequest(BaseModel):
     """Request para generar QR de un miembro"""
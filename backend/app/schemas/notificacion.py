@@ -0,0 +1,28 @@
+"""
+Schemas de trabajos de notificación
+backend/app/schemas/notificacion.py
+"""
+from typing import Optional, Any, Dict
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+from app.models.notificacion import EstadoJob
+
+
+class NotificacionJobResponse(BaseModel):
+    """Estado y avance de un envío masivo"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    tipo: str
+    estado: EstadoJob
+    parametros: Optional[Dict[str, Any]] = None
+    total: int
+    enviados: int
+    fallidos: int
+    omitidos: int
+    pendientes: int
+    error: Optional[str] = None
+    created_at: datetime
+    iniciado_at: Optional[datetime] = None
+    finalizado_at: Optional[datetime] = None
@@ -0,0 +1,110 @@
+"""
+Caché de decisiones de acceso (datos de socio para validar-qr)
+backend/app/services/acceso_cache_service.py
+"""
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Optional
+import logging
+
+from app.config import settings
+from app.models.miembro import Miembro, EstadoMiembro
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MiembroAcceso:
+    """
+    Foto inmutable de los datos de un socio que necesita validar-qr
+
+    Expone los mismos nombres de atributo que Miembro para que la lógica de
+    decisión funcione igual con el modelo o con la versión cacheada.
+    """
+    id: int
+    numero_miembro: str
+    numero_documento: str
+    nombre: str
+    nombre_completo: str
+    qr_generated_at: str
+    estado: EstadoMiembro
+    saldo_cuenta: float
+    categoria_nombre: Optional[str]
+    foto_url: Optional[str]
+    ultima_cuota_pagada: Optional[date]
+    proximo_vencimiento: Optional[date]
+    # Último QR que pasó la validación de checksum (evita recalcular SHA256)
+    qr_code_validado: Optional[str] = None
+
+    @property
+    def dias_mora(self) -> int:
+        """Días de mora (se calcula al momento, no se cachea)"""
+        if not self.proximo_vencimiento or self.proximo_vencimiento >= date.today():
+            return 0
+        return (date.today() - self.proximo_vencimiento).days
+
+    @classmethod
+    def desde_miembro(cls, miembro: Miembro) -> "MiembroAcceso":
+        """Construir desde el modelo (requiere categoría precargada)"""
+        return cls(
+            id=miembro.id,
+            numero_miembro=miembro.numero_miembro,
+            numero_documento=miembro.numero_documento,
+            nombre=miembro.nombre,
+            nombre_completo=miembro.nombre_completo,
+            qr_generated_at=miembro.qr_generated_at,
+            estado=miembro.estado,
+            saldo_cuenta=miembro.saldo_cuenta,
+            categoria_nombre=miembro.categoria.nombre if miembro.categoria else None,
+            foto_url=miembro.foto_url,
+            ultima_cuota_pagada=miembro.ultima_cuota_pagada,
+            proximo_vencimiento=miembro.proximo_vencimiento,
+        )
+
+
+class AccesoCacheService:
+    """
+    Caché LRU/TTL en memoria de MiembroAcceso, por id de socio
+
+    Permite que un escaneo repetido no haga ningún SELECT de socio. Los
+    caminos que modifican saldo, estado o datos del socio (pagos, anulación,
+    cambiar-estado, edición, baja, categorías) deben llamar a invalidar().
+    """
+
+    _cache = TTLCache(
+        "miembros_acceso",
+        max_size=settings.ACCESS_CACHE_MAX_SIZE,
+        ttl_seconds=settings.ACCESS_CACHE_TTL_SECONDS,
+    )
+
+    @staticmethod
+    def obtener(miembro_id: int) -> Optional[MiembroAcceso]:
+        """Datos cacheados del socio, o None si no hay entrada vigente"""
+        if not settings.ACCESS_CACHE_ENABLED:
+            return None
+        return AccesoCacheService._cache.get(miembro_id)
+
+    @staticmethod
+    def guardar(miembro: MiembroAcceso) -> None:
+        """Guardar/actualizar la entrada del socio"""
+        if settings.ACCESS_CACHE_ENABLED:
+            AccesoCacheService._cache.set(miembro.id, miembro)
+
+    @staticmethod
+    def marcar_qr_validado(miembro: MiembroAcceso, qr_code: str) -> MiembroAcceso:
+        """Recordar que qr_code pasó la validación de integridad para este socio"""
+        actualizado = replace(miembro, qr_code_validado=qr_code)
+        AccesoCacheService.guardar(actualizado)
+        return actualizado
+
+    @staticmethod
+    def invalidar(miembro_id: int) -> None:
+        """Descartar la entrada de un socio (tras modificarlo)"""
+        AccesoCacheService._cache.invalidate(miembro_id)
+        logger.debug(f"Caché de acceso invalidada para miembro {miembro_id}")
+
+    @staticmethod
+    def limpiar() -> None:
+        """Vaciar la caché completa (ej: cambios en categorías)"""
+        AccesoCacheService._cache.clear()
@@ -0,0 +1,214 @@
+"""
+Snapshot de decisiones de acceso para dispositivos offline
+backend/app/services/acceso_snapshot_service.py
+
+Sin red, la app del portero no puede llamar a validar-qr. Con este snapshot
+(id de socio, hash del QR, clase de decisión, tramo de deuda y nombre) el
+dispositivo decide localmente y sube los escaneos después por
+/api/accesos/validar-qr/batch.
+
+Sincronización incremental: Miembro.sync_version crece en cada alta o
+modificación. El snapshot informa la versión hasta la que incluye cambios;
+el dispositivo la envía como ?since= en la próxima descarga y recibe solo
+los socios modificados desde entonces (los dados de baja lógica llegan con
+clase "eliminado").
+
+En PostgreSQL una transacción que obtuvo su versión antes que otra puede
+confirmar después; un delta descargado en ese instante no la incluye. Los
+dispositivos deben pedir un snapshot completo (sin since) periódicamente.
+
+El hash del QR son los primeros 16 caracteres de Miembro.qr_hash
+(SHA256 del código): alcanza para validar un escaneo sin exponer los
+códigos, que son la credencial.
+
+Formatos (ambos transmitidos fila a fila con su propia sesión):
+- jsonl:   primera línea con la cabecera (objeto), luego una lista por socio
+           [id, qr, clase, deuda, nombre]
+- binario: cabecera _CABECERA y registros _REGISTRO + nombre UTF-8
+"""
+import enum
+import json
+import math
+import struct
+from typing import Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.miembro import Miembro, EstadoMiembro
+
+# Filas por lote al recorrer la consulta
+LOTE_SNAPSHOT = 1000
+
+# magic, versión de formato, versión del snapshot, since, completo, tramo de deuda
+_CABECERA = struct.Struct("<4sBQQ?f")
+# id, hash del QR (8 bytes), clase, tramo de deuda, largo del nombre
+_REGISTRO = struct.Struct("<I8sBHB")
+_MAGIC = b"SNAP"
+_FORMATO_BINARIO = 1
+
+
+class ClaseAcceso(str, enum.Enum):
+    """Decisión de acceso precalculada (el orden define el código binario)"""
+    PERMITIDO = "permitido"
+    ADVERTENCIA = "advertencia"          # Permitido con deuda menor
+    DEUDA_EXCESIVA = "deuda_excesiva"
+    MOROSO = "moroso"
+    SUSPENDIDO = "suspendido"
+    BAJA = "baja"
+    ELIMINADO = "eliminado"              # Quitar del snapshot local
+
+    @property
+    def codigo(self) -> int:
+        return _CODIGOS[self]
+
+    @property
+    def permite_acceso(self) -> bool:
+        return self in (ClaseAcceso.PERMITIDO, ClaseAcceso.ADVERTENCIA)
+
+
+_CODIGOS = {clase: i for i, clase in enumerate(ClaseAcceso)}
+
+
+class AccesoSnapshotService:
+    """Clasificación de acceso y generación del snapshot offline"""
+
+    MEDIA_TYPE_JSONL = "application/x-ndjson"
+    MEDIA_TYPE_BINARIO = "application/octet-stream"
+
+    @staticmethod
+    def clasificar(estado: EstadoMiembro, saldo_cuenta: float) -> ClaseAcceso:
+        """
+        Clase de decisión según estado y saldo (misma regla que validar-qr)
+        """
+        if estado == EstadoMiembro.MOROSO:
+            return ClaseAcceso.MOROSO
+        if estado == EstadoMiembro.SUSPENDIDO:
+            return ClaseAcceso.SUSPENDIDO
+        if estado == EstadoMiembro.BAJA:
+            return ClaseAcceso.BAJA
+        if saldo_cuenta < 0:
+            if abs(saldo_cuenta) <= settings.DEUDA_MAXIMA_ADVERTENCIA:
+                return ClaseAcceso.ADVERTENCIA
+            return ClaseAcceso.DEUDA_EXCESIVA
+        return ClaseAcceso.PERMITIDO
+
+    @staticmethod
+    def tramo_deuda(saldo_cuenta: float) -> int:
+        """Deuda en tramos de ACCESS_SNAPSHOT_DEBT_BUCKET (0 = sin deuda)"""
+        if saldo_cuenta >= 0:
+            return 0
+        return min(0xFFFF, math.ceil(-saldo_cuenta / settings.ACCESS_SNAPSHOT_DEBT_BUCKET))
+
+    @staticmethod
+    def consulta_version():
+        """SELECT de la mayor sync_version (versión actual del snapshot)"""
+        return select(func.coalesce(func.max(Miembro.sync_version), 0))
+
+    # ==================== GENERACIÓN ====================
+
+    @staticmethod
+    def _filas(db: Session, version: int, since: Optional[int]):
+        """Socios modificados en (since, version]; todos los vigentes si since es None"""
+        consulta = select(
+            Miembro.id,
+            Miembro.qr_hash,
+            Miembro.estado,
+            Miembro.saldo_cuenta,
+            Miembro.apellido,
+            Miembro.nombre,
+            Miembro.is_deleted,
+        ).where(Miembro.sync_version <= version)
+        if since is None:
+            consulta = consulta.where(Miembro.is_deleted == False)
+        else:
+            consulta = consulta.where(Miembro.sync_version > since)
+        consulta = consulta.order_by(Miembro.id).execution_options(yield_per=LOTE_SNAPSHOT)
+
+        for fila in db.execute(consulta):
+            if fila.is_deleted:
+                yield fila.id, None, ClaseAcceso.ELIMINADO, 0, None
+            else:
+                yield (
+                    fila.id,
+                    fila.qr_hash[:16],
+                    AccesoSnapshotService.clasificar(fila.estado, fila.saldo_cuenta),
+                    AccesoSnapshotService.tramo_deuda(fila.saldo_cuenta),
+                    f"{fila.apellido}, {fila.nombre}",
+                )
+
+    @staticmethod
+    def generar_jsonl(
+        version: int,
+        since: Optional[int],
+        session_factory=SessionLocal
+    ) -> Iterator[bytes]:
+        """
+        Transmitir el snapshot como JSON lines (cabecera + una línea por socio)
+
+        Usa su propia sesión: el generador se consume mientras se envía la
+        respuesta, fuera del ciclo de vida del endpoint.
+        """
+        cabecera = {
+            "version": version,
+            "since": since,
+            "completo": since is None,
+            "org_prefix": settings.ORG_PREFIX,
+            "deuda_tramo": settings.ACCESS_SNAPSHOT_DEBT_BUCKET,
+            "campos": ["id", "qr", "clase", "deuda", "nombre"],
+        }
+        yield (json.dumps(cabecera, ensure_ascii=False) + "\n").encode("utf-8")
+
+        db = session_factory()
+        try:
+            bloque = []
+            for id_, qr, clase, deuda, nombre in AccesoSnapshotService._filas(db, version, since):
+                bloque.append(json.dumps([id_, qr, clase.value, deuda, nombre], ensure_ascii=False))
+                if len(bloque) == LOTE_SNAPSHOT:
+                    yield ("\n".join(bloque) + "\n").encode("utf-8")
+                    bloque = []
+        finally:
+            db.close()
+        if bloque:
+            yield ("\n".join(bloque) + "\n").encode("utf-8")
+
+    @staticmethod
+    def generar_binario(
+        version: int,
+        since: Optional[int],
+        session_factory=SessionLocal
+    ) -> Iterator[bytes]:
+        """
+        Transmitir el snapshot en formato binario compacto
+
+        Cabecera: b"SNAP", formato (u8), versión (u64), since (u64, 0 si es
+        completo), completo (bool), tramo de deuda (f32). Luego, hasta el
+        final, registros: id (u32), hash del QR (8 bytes), código de clase
+        (u8, orden de ClaseAcceso), tramo de deuda (u16), largo del nombre
+        (u8) y el nombre en UTF-8. Todo little-endian.
+        """
+        yield _CABECERA.pack(
+            _MAGIC, _FORMATO_BINARIO, version, since or 0, since is None,
+            settings.ACCESS_SNAPSHOT_DEBT_BUCKET
+        )
+
+        db = session_factory()
+        try:
+            bloque = bytearray()
+            n = 0
+            for id_, qr, clase, deuda, nombre in AccesoSnapshotService._filas(db, version, since):
+                nombre_bytes = (nombre or "").encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+                bloque += _REGISTRO.pack(
+                    id_, bytes.fromhex(qr) if qr else bytes(8), clase.codigo, deuda, len(nombre_bytes)
+                )
+                bloque += nombre_bytes
+                n += 1
+                if n % LOTE_SNAPSHOT == 0:
+                    yield bytes(bloque)
+                    bloque.clear()
+        finally:
+            db.close()
+        if bloque:
+            yield bytes(bloque)
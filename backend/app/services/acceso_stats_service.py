@@ -0,0 +1,191 @@
+"""
+Servicio de agregación de estadísticas de accesos
+backend/app/services/acceso_stats_service.py
+
+Calcula totales por resultado e histograma por hora con UNA sola consulta
+agrupada (GROUP BY hora, resultado), en lugar de un COUNT por cada hora.
+Para períodos de varios días, lo mismo por día (GROUP BY día, resultado).
+Compatible con SQLite y PostgreSQL; se usa con sesiones síncronas y asíncronas.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import Integer, and_, case, cast, extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.acceso import Acceso, ResultadoAcceso
+from app.utils.helpers import inicio_dia_utc, rango_dia_utc
+
+
+class AccesoStatsService:
+    """Consultas agregadas sobre el log de accesos"""
+
+    # ==================== EXPRESIONES SQL ====================
+
+    @staticmethod
+    def _expresion_hora():
+        """
+        Hora (0-23) de Acceso.fecha_hora
+
+        EXTRACT(HOUR ...) en PostgreSQL, strftime('%H', ...) en SQLite.
+        """
+        return cast(extract("hour", Acceso.fecha_hora), Integer)
+
+    @staticmethod
+    def _expresion_dia():
+        """Fecha de Acceso.fecha_hora: date() existe en PostgreSQL y SQLite"""
+        return func.date(Acceso.fecha_hora)
+
+    @staticmethod
+    def query_histograma(inicio: datetime, fin: datetime):
+        """
+        SELECT hora, resultado, COUNT(*) ... GROUP BY hora, resultado
+
+        Args:
+            inicio: Límite inferior inclusivo (UTC)
+            fin: Límite superior exclusivo (UTC)
+        """
+        hora = AccesoStatsService._expresion_hora().label("hora")
+        return (
+            select(hora, Acceso.resultado, func.count(Acceso.id).label("cantidad"))
+            .where(Acceso.fecha_hora >= inicio, Acceso.fecha_hora < fin)
+            .group_by(hora, Acceso.resultado)
+        )
+
+    @staticmethod
+    def query_por_dia(inicio: datetime, fin: datetime):
+        """
+        SELECT dia, resultado, COUNT(*) ... GROUP BY dia, resultado
+
+        Args:
+            inicio: Límite inferior inclusivo (UTC)
+            fin: Límite superior exclusivo (UTC)
+        """
+        dia = AccesoStatsService._expresion_dia().label("dia")
+        return (
+            select(dia, Acceso.resultado, func.count(Acceso.id).label("cantidad"))
+            .where(Acceso.fecha_hora >= inicio, Acceso.fecha_hora < fin)
+            .group_by(dia, Acceso.resultado)
+        )
+
+    @staticmethod
+    def query_ventanas(hoy: date):
+        """
+        Conteos de hoy / semana / mes y rechazos de hoy en una sola fila
+
+        Usa agregación condicional (SUM(CASE ...)) sobre el rango del mes o de
+        la semana (el que empiece antes).
+        """
+        inicio_hoy, fin_hoy = rango_dia_utc(hoy)
+        inicio_semana = inicio_dia_utc(hoy - timedelta(days=hoy.weekday()))
+        inicio_mes = inicio_dia_utc(hoy.replace(day=1))
+        desde = min(inicio_semana, inicio_mes)
+
+        def contar(*condiciones):
+            return func.coalesce(func.sum(case((and_(*condiciones), 1), else_=0)), 0)
+
+        es_hoy = Acceso.fecha_hora >= inicio_hoy
+        return (
+            select(
+                contar(es_hoy).label("hoy"),
+                contar(Acceso.fecha_hora >= inicio_semana).label("semana"),
+                contar(Acceso.fecha_hora >= inicio_mes).label("mes"),
+                contar(es_hoy, Acceso.resultado == ResultadoAcceso.RECHAZADO).label("rechazos_hoy"),
+            )
+            .where(Acceso.fecha_hora >= desde, Acceso.fecha_hora < fin_hoy)
+        )
+
+    # ==================== AGREGACIÓN EN PYTHON ====================
+
+    @staticmethod
+    def _consolidar(filas: Iterable) -> Dict[str, Any]:
+        """
+        Convierte las filas (hora, resultado, cantidad) en totales e histograma
+
+        Returns:
+            Dict con:
+                - total: Total de accesos del rango
+                - por_resultado: {resultado.value: cantidad}
+                - por_hora: Lista de 24 dicts {hora, total, permitidos, rechazados, advertencias}
+        """
+        por_resultado = {r.value: 0 for r in ResultadoAcceso}
+        por_hora = [
+            {"hora": f"{h:02d}:00", "total": 0, "permitidos": 0, "rechazados": 0, "advertencias": 0}
+            for h in range(24)
+        ]
+        claves = {
+            ResultadoAcceso.PERMITIDO: "permitidos",
+            ResultadoAcceso.RECHAZADO: "rechazados",
+            ResultadoAcceso.ADVERTENCIA: "advertencias",
+        }
+
+        for hora, resultado, cantidad in filas:
+            resultado = ResultadoAcceso(resultado)
+            por_resultado[resultado.value] += cantidad
+            if hora is not None and 0 <= hora < 24:
+                por_hora[hora]["total"] += cantidad
+                por_hora[hora][claves[resultado]] += cantidad
+
+        return {
+            "total": sum(por_resultado.values()),
+            "por_resultado": por_resultado,
+            "por_hora": por_hora,
+        }
+
+    @staticmethod
+    def _consolidar_periodo(filas: Iterable, desde: date, hasta: date) -> Dict[str, Any]:
+        """
+        Convierte las filas (dia, resultado, cantidad) en totales y serie diaria
+
+        Returns:
+            Dict con:
+                - total: Total de accesos del período
+                - por_resultado: {resultado.value: cantidad}
+                - por_dia: Un dict {fecha, cantidad} por cada día de desde a hasta
+        """
+        por_resultado = {r.value: 0 for r in ResultadoAcceso}
+        por_dia: Dict[str, int] = {}
+
+        for dia, resultado, cantidad in filas:
+            por_resultado[ResultadoAcceso(resultado).value] += cantidad
+            # SQLite devuelve texto 'YYYY-MM-DD'; PostgreSQL, date
+            clave = dia.isoformat() if isinstance(dia, date) else str(dia)[:10]
+            por_dia[clave] = por_dia.get(clave, 0) + cantidad
+
+        dias = [desde + timedelta(days=i) for i in range((hasta - desde).days + 1)]
+        return {
+            "total": sum(por_resultado.values()),
+            "por_resultado": por_resultado,
+            "por_dia": [{"fecha": d.isoformat(), "cantidad": por_dia.get(d.isoformat(), 0)} for d in dias],
+        }
+
+    # ==================== API PÚBLICA ====================
+
+    @staticmethod
+    def estadisticas_dia(db: Session, fecha: date) -> Dict[str, Any]:
+        """Totales por resultado e histograma por hora de un día (sesión síncrona)"""
+        inicio, fin = rango_dia_utc(fecha)
+        filas = db.execute(AccesoStatsService.query_histograma(inicio, fin)).all()
+        return AccesoStatsService._consolidar(filas)
+
+    @staticmethod
+    async def estadisticas_dia_async(db: AsyncSession, fecha: date) -> Dict[str, Any]:
+        """Totales por resultado e histograma por hora de un día (sesión asíncrona)"""
+        inicio, fin = rango_dia_utc(fecha)
+        result = await db.execute(AccesoStatsService.query_histograma(inicio, fin))
+        return AccesoStatsService._consolidar(result.all())
+
+    @staticmethod
+    def estadisticas_periodo(db: Session, desde: date, hasta: date) -> Dict[str, Any]:
+        """Totales por resultado y accesos por día de desde a hasta, inclusive (sesión síncrona)"""
+        inicio, fin = inicio_dia_utc(desde), inicio_dia_utc(hasta + timedelta(days=1))
+        filas = db.execute(AccesoStatsService.query_por_dia(inicio, fin)).all()
+        return AccesoStatsService._consolidar_periodo(filas, desde, hasta)
+
+    @staticmethod
+    async def conteos_ventanas_async(db: AsyncSession, hoy: date) -> Dict[str, int]:
+        """Accesos de hoy, semana, mes y rechazos de hoy en una consulta"""
+        result = await db.execute(AccesoStatsService.query_ventanas(hoy))
+        fila = result.one()
+        return {k: int(v or 0) for k, v in fila._mapping.items()}
@@ -0,0 +1,240 @@
+"""
+Escritura diferida (write-behind) de accesos y su auditoría
+backend/app/services/acceso_writer.py
+
+En lugar de dos commits por escaneo (Acceso + Actividad), validar-qr encola
+ambos registros y una tarea en segundo plano los persiste en lotes: un
+INSERT multi-fila de accesos, otro de actividades y un único commit, cada
+ACCESS_WRITE_BEHIND_FLUSH_MS milisegundos o cuando se juntan
+ACCESS_WRITE_BEHIND_MAX_ROWS filas.
+
+Durabilidad (ACCESS_WRITE_BEHIND_DURABILITY):
+- "wait":  el request espera al commit de su lote (group commit). Se conserva
+           la garantía de persistencia y el acceso_id en la respuesta.
+- "async": el request responde apenas encola. Menor latencia, pero un corte
+           abrupto del proceso puede perder hasta un lote y la respuesta no
+           incluye acceso_id.
+
+Si el lote falla se reintenta fila por fila: solo el acceso con error queda
+sin persistir. En modo "async" ese acceso vuelve al buffer para los próximos
+flush (hasta _MAX_INTENTOS); en "wait" el request recibe el error.
+
+Opt-in con ACCESS_WRITE_BEHIND_ENABLED. Se inicia y se vacía en el lifespan.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.acceso import Acceso
+from app.models.actividad import Actividad
+from app.services.audit_service import AuditService
+
+logger = logging.getLogger(__name__)
+
+DURABILIDADES = ("wait", "async")
+
+# Intentos de persistir un acceso en modo "async" antes de descartarlo
+_MAX_INTENTOS = 3
+
+
+@dataclass
+class _Pendiente:
+    """Acceso encolado con su actividad de auditoría (opcional)"""
+    acceso: Acceso
+    actividad: Optional[Actividad]
+    futuro: Optional[asyncio.Future]
+    intentos: int = 0
+
+
+class AccesoWriteBehind:
+    """Cola de escritura diferida con flush por tiempo o por tamaño"""
+
+    def __init__(
+        self,
+        flush_interval_ms: int,
+        max_rows: int,
+        durabilidad: str = "wait",
+        session_factory=AsyncSessionLocal
+    ):
+        if durabilidad not in DURABILIDADES:
+            raise ValueError(
+                f"ACCESS_WRITE_BEHIND_DURABILITY inválida: {durabilidad!r} "
+                f"(valores posibles: {', '.join(DURABILIDADES)})"
+            )
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.durabilidad = durabilidad
+        self.session_factory = session_factory
+        self._buffer: List[_Pendiente] = []
+        self._hay_lote = asyncio.Event()
+        self._tarea: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cerrando = False
+
+    # ==================== CICLO DE VIDA ====================
+
+    @property
+    def activo(self) -> bool:
+        """True si la tarea de flush corre en el event loop actual"""
+        if self._tarea is None or self._tarea.done() or self._cerrando:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def start(self) -> None:
+        """Iniciar la tarea de flush en el event loop actual"""
+        if self._tarea is not None and not self._tarea.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._hay_lote = asyncio.Event()
+        self._cerrando = False
+        self._tarea = asyncio.create_task(self._run(), name="acceso-write-behind")
+        logger.info(
+            f"[OK] Write-behind de accesos iniciado "
+            f"(cada {int(self.flush_interval * 1000)} ms o {self.max_rows} filas, "
+            f"durabilidad={self.durabilidad})"
+        )
+
+    async def stop(self) -> None:
+        """Detener la tarea y persistir lo que quede en el buffer"""
+        if self._tarea is None:
+            return
+        self._cerrando = True
+        self._hay_lote.set()
+        try:
+            await self._tarea
+        finally:
+            self._tarea = None
+        # Lo encolado mientras se cerraba (y los reintentos pendientes)
+        while self._buffer:
+            await self.flush()
+        logger.info("[OK] Write-behind de accesos detenido (buffer vaciado)")
+
+    # ==================== API ====================
+
+    async def encolar(self, acceso: Acceso, actividad: Optional[Actividad] = None) -> Optional[int]:
+        """
+        Encolar un acceso (y su actividad de auditoría)
+
+        La actividad recibe entidad_id = acceso.id al momento del flush.
+
+        Returns:
+            ID del acceso si la durabilidad es "wait", None en modo "async"
+        """
+        futuro = None
+        if self.durabilidad == "wait":
+            futuro = asyncio.get_running_loop().create_future()
+
+        self._buffer.append(_Pendiente(acceso=acceso, actividad=actividad, futuro=futuro))
+        if len(self._buffer) >= self.max_rows:
+            self._hay_lote.set()
+
+        if futuro is None:
+            return None
+        return await futuro
+
+    async def flush(self) -> int:
+        """
+        Persistir el buffer actual en una transacción
+
+        Si la transacción falla, cada acceso se reintenta en la suya.
+
+        Returns:
+            Cantidad de accesos escritos
+        """
+        if not self._buffer:
+            return 0
+
+        lote, self._buffer = self._buffer, []
+
+        try:
+            await self._persistir(lote)
+        except Exception as e:
+            logger.warning(f"[WARN] Falló el lote de {len(lote)} accesos, se reintenta uno por uno: {e}")
+            return await self._persistir_por_fila(lote)
+
+        for p in lote:
+            self._confirmar(p)
+        logger.debug(f"Write-behind: {len(lote)} accesos persistidos")
+        return len(lote)
+
+    # ==================== INTERNO ====================
+
+    async def _persistir(self, lote: List[_Pendiente]) -> None:
+        """INSERT multi-fila de accesos (con RETURNING id), sus actividades y un commit"""
+        async with self.session_factory() as db:
+            for p in lote:
+                # Un intento anterior revertido deja asignado el id en el objeto
+                p.acceso.id = None
+                if p.actividad is not None:
+                    p.actividad.id = None
+            db.add_all([p.acceso for p in lote])
+            await db.flush()
+
+            actividades = []
+            for p in lote:
+                if p.actividad is not None:
+                    p.actividad.entidad_id = p.acceso.id
+                    actividades.append(p.actividad)
+            db.add_all(actividades)
+
+            await db.commit()
+
+    async def _persistir_por_fila(self, lote: List[_Pendiente]) -> int:
+        """Una transacción por acceso: un registro inválido no arrastra al resto"""
+        escritos = 0
+        reintentos = []
+        for p in lote:
+            try:
+                await self._persistir([p])
+            except Exception as e:
+                p.intentos += 1
+                if p.futuro is None and p.intentos < _MAX_INTENTOS:
+                    reintentos.append(p)
+                    continue
+                logger.error(
+                    f"[ERROR] No se pudo persistir acceso de miembro {p.acceso.miembro_id} "
+                    f"({p.acceso.fecha_hora}) tras {p.intentos} intento(s): {e}",
+                    exc_info=True
+                )
+                if p.futuro is not None and not p.futuro.done():
+                    p.futuro.set_exception(e)
+            else:
+                self._confirmar(p)
+                escritos += 1
+
+        if reintentos:
+            # Antes de lo encolado durante el flush, para conservar el orden
+            self._buffer[:0] = reintentos
+            logger.warning(f"[WARN] {len(reintentos)} accesos vuelven al buffer para reintentar")
+        return escritos
+
+    @staticmethod
+    def _confirmar(p: _Pendiente) -> None:
+        if p.actividad is not None:
+            AuditService._post_registro(p.actividad)
+        if p.futuro is not None and not p.futuro.done():
+            p.futuro.set_result(p.acceso.id)
+
+    async def _run(self) -> None:
+        """Bucle de flush: por intervalo o al llenarse el lote"""
+        while not self._cerrando:
+            try:
+                await asyncio.wait_for(self._hay_lote.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._hay_lote.clear()
+            await self.flush()
+
+
+# Instancia global (configurada desde settings)
+acceso_writer = AccesoWriteBehind(
+    flush_interval_ms=settings.ACCESS_WRITE_BEHIND_FLUSH_MS,
+    max_rows=settings.ACCESS_WRITE_BEHIND_MAX_ROWS,
+    durabilidad=settings.ACCESS_WRITE_BEHIND_DURABILITY,
+)
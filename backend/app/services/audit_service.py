@@ -3,6 +3,7 @@ Servicio de Auditoría
 backend/app/services/audit_service.py
 """
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Request
 from typing import Optional, Dict, Any
 import logging
@@ -61,23 +62,8 @@ class AuditService:
                 request=request
             )
         """
-        # Extraer IP y User-Agent del request
-        ip_address = None
-        user_agent = None
-        
-        if request:
-            # IP real (considerando proxies)
-            ip_address = request.headers.get("X-Forwarded-For")
-            if ip_address:
-                ip_address = ip_address.split(",")[0].strip()
-            else:
-                ip_address = request.client.host if request.client else None
-            
-            # User-Agent
-            user_agent = request.headers.get("User-Agent")
-        
         try:
-            actividad = Actividad.crear(
+            actividad = AuditService._crear_actividad(
                 tipo=tipo,
                 descripcion=descripcion,
                 usuario_id=usuario_id,
@@ -85,39 +71,121 @@ class AuditService:
                 entidad_id=entidad_id,
                 datos_adicionales=datos_adicionales,
                 severidad=severidad,
-                ip_address=ip_address,
-                user_agent=user_agent
+                request=request
             )
             
             db.add(actividad)
             db.commit()
             db.refresh(actividad)
             
-            # Log adicional para eventos críticos
-            if severidad in [NivelSeveridad.ERROR, NivelSeveridad.CRITICAL]:
-                logger.warning(
-                    f"[AUDIT] {severidad.value.upper()}: {descripcion}",
-                    extra={
-                        "tipo": tipo.value,
-                        "usuario_id": usuario_id,
-                        "entidad": f"{entidad_tipo}:{entidad_id}" if entidad_tipo else None
-                    }
-                )
+            AuditService._post_registro(actividad)
+            return actividad
             
-            # Métricas (no-op si prometheus no está disponible)
-            try:
-                metrics.inc_audit(tipo.value, severidad.value)
-            except Exception:
-                pass
+        except Exception as e:
+            logger.error(f"Error registrando actividad: {e}", exc_info=True)
+            db.rollback()
+            # No fallar la operación principal por error en auditoría
+            return None
+    
+    @staticmethod
+    async def registrar_async(
+        db: AsyncSession,
+        tipo: TipoActividad,
+        descripcion: str,
+        usuario_id: Optional[int] = None,
+        entidad_tipo: Optional[str] = None,
+        entidad_id: Optional[int] = None,
+        datos_adicionales: Optional[Dict[str, Any]] = None,
+        severidad: NivelSeveridad = NivelSeveridad.INFO,
+        request: Optional[Request] = None
+    ) -> Actividad:
+        """
+        Igual que `registrar`, pero para endpoints que usan `get_async_db`
+        """
+        try:
+            actividad = AuditService._crear_actividad(
+                tipo=tipo,
+                descripcion=descripcion,
+                usuario_id=usuario_id,
+                entidad_tipo=entidad_tipo,
+                entidad_id=entidad_id,
+                datos_adicionales=datos_adicionales,
+                severidad=severidad,
+                request=request
+            )
             
+            db.add(actividad)
+            await db.commit()
+            
+            AuditService._post_registro(actividad)
             return actividad
             
         except Exception as e:
             logger.error(f"Error registrando actividad: {e}", exc_info=True)
-            db.rollback()
+            await db.rollback()
             # No fallar la operación principal por error en auditoría
             return None
     
+    @staticmethod
+    def _crear_actividad(
+        tipo: TipoActividad,
+        descripcion: str,
+        usuario_id: Optional[int],
+        entidad_tipo: Optional[str],
+        entidad_id: Optional[int],
+        datos_adicionales: Optional[Dict[str, Any]],
+        severidad: NivelSeveridad,
+        request: Optional[Request]
+    ) -> Actividad:
+        """Construye la Actividad extrayendo IP y User-Agent del request"""
+        ip_address = None
+        user_agent = None
+        
+        if request:
+            # IP real (considerando proxies)
+            ip_address = request.headers.get("X-Forwarded-For")
+            if ip_address:
+                ip_address = ip_address.split(",")[0].strip()
+            else:
+                ip_address = request.client.host if request.client else None
+            
+            # User-Agent
+            user_agent = request.headers.get("User-Agent")
+        
+        return Actividad.crear(
+            tipo=tipo,
+            descripcion=descripcion,
+            usuario_id=usuario_id,
+            entidad_tipo=entidad_tipo,
+            entidad_id=entidad_id,
+            datos_adicionales=datos_adicionales,
+            severidad=severidad,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    
+    @staticmethod
+    def _post_registro(actividad: Actividad) -> None:
+        """Log adicional y métricas tras persistir una actividad"""
+        severidad = actividad.severidad
+        
+        # Log adicional para eventos críticos
+        if severidad in [NivelSeveridad.ERROR, NivelSeveridad.CRITICAL]:
+            logger.warning(
+                f"[AUDIT] {severidad.value.upper()}: {actividad.descripcion}",
+                extra={
+                    "tipo": actividad.tipo.value,
+                    "usuario_id": actividad.usuario_id,
+                    "entidad": f"{actividad.entidad_tipo}:{actividad.entidad_id}" if actividad.entidad_tipo else None
+                }
+            )
+        
+        # Métricas (no-op si prometheus no está disponible)
+        try:
+            metrics.inc_audit(actividad.tipo.value, severidad.value)
+        except Exception:
+            pass
+    
     @staticmethod
     def registrar_login_exitoso(
         db: Session,
@@ -227,6 +295,55 @@ class AuditService:
         request: Optional[Request] = None
     ):
         """Registrar intento de acceso"""
+        return AuditService.registrar(
+            db=db,
+            **AuditService._datos_acceso(acceso_id, miembro_nombre, permitido, motivo),
+            request=request
+        )
+    
+    @staticmethod
+    async def registrar_acceso_async(
+        db: AsyncSession,
+        acceso_id: int,
+        miembro_nombre: str,
+        permitido: bool,
+        motivo: Optional[str] = None,
+        request: Optional[Request] = None
+    ):
+        """Registrar intento de acceso (sesión asíncrona)"""
+        return await AuditService.registrar_async(
+            db=db,
+            **AuditService._datos_acceso(acceso_id, miembro_nombre, permitido, motivo),
+            request=request
+        )
+    
+    @staticmethod
+    def crear_actividad_acceso(
+        miembro_nombre: str,
+        permitido: bool,
+        motivo: Optional[str] = None,
+        request: Optional[Request] = None
+    ) -> Actividad:
+        """
+        Construir (sin persistir) la actividad de un intento de acceso
+        
+        Usado por la escritura diferida de accesos: entidad_id se completa
+        cuando el acceso obtiene su ID al hacer flush del lote.
+        """
+        return AuditService._crear_actividad(
+            **AuditService._datos_acceso(None, miembro_nombre, permitido, motivo),
+            usuario_id=None,
+            request=request
+        )
+    
+    @staticmethod
+    def _datos_acceso(
+        acceso_id: Optional[int],
+        miembro_nombre: str,
+        permitido: bool,
+        motivo: Optional[str]
+    ) -> Dict[str, Any]:
+        """Campos de la actividad de auditoría para un intento de acceso"""
         tipo = TipoActividad.ACCESO_PERMITIDO if permitido else TipoActividad.ACCESO_DENEGADO
         severidad = NivelSeveridad.INFO if permitido else NivelSeveridad.WARNING
         
@@ -234,20 +351,18 @@ class AuditService:
         if motivo and not permitido:
             descripcion += f": {motivo}"
         
-        return AuditService.registrar(
-            db=db,
-            tipo=tipo,
-            descripcion=descripcion,
-            entidad_tipo="acceso",
-            entidad_id=acceso_id,
-            severidad=severidad,
-            datos_adicionales={
+        return {
+            "tipo": tipo,
+            "descripcion": descripcion,
+            "entidad_tipo": "acceso",
+            "entidad_id": acceso_id,
+            "severidad": severidad,
+            "datos_adicionales": {
                 "miembro": miembro_nombre,
                 "permitido": permitido,
                 "motivo": motivo
-            },
-            request=request
-        )
+            }
+        }
     
     @staticmethod
     def obtener_actividades(
@@ -9,9 +9,9 @@ from fastapi import HTTPException, status
 import logging
 
 from app.models.usuario import Usuario, RolUsuario
+from app.services.principal_cache_service import PrincipalCacheService
+from app.services.password_pool import password_pool
 from app.utils.security import (
-    hash_password,
-    verify_password,
     create_access_token,
     create_refresh_token,
     validate_password_strength
@@ -24,7 +24,7 @@ class AuthService:
     """Servicio de autenticación y gestión de usuarios"""
     
     @staticmethod
-    def autenticar_usuario(
+    async def autenticar_usuario(
         db: Session,
         username: str,
         password: str
@@ -32,6 +32,9 @@ class AuthService:
         """
         Autentica un usuario por username/email y contraseña
         
+        bcrypt corre en password_pool. Si el hash guardado usa parámetros
+        viejos se reemplaza por uno nuevo (misma contraseña).
+        
         Args:
             db: Sesión de base de datos
             username: Username o email
@@ -50,7 +53,8 @@ class AuthService:
             return None
         
         # Verificar contraseña
-        if not verify_password(password, usuario.password_hash):
+        coincide, nuevo_hash = await password_pool.verificar(password, usuario.password_hash)
+        if not coincide:
             logger.warning(f"Contraseña incorrecta para usuario: {username}")
             return None
         
@@ -64,6 +68,11 @@ class AuthService:
             logger.warning(f"Intento de login con usuario eliminado: {username}")
             return None
         
+        # Actualizar hash con parámetros viejos (no revoca tokens)
+        if nuevo_hash:
+            usuario.password_hash = nuevo_hash
+            logger.info(f"[OK] Hash de contraseña actualizado: {username}")
+        
         # Actualizar último login
         usuario.last_login = datetime.utcnow().isoformat()
         db.commit()
@@ -72,7 +81,7 @@ class AuthService:
         return usuario
     
     @staticmethod
-    def crear_usuario(
+    async def crear_usuario(
         db: Session,
         username: str,
         email: str,
@@ -125,7 +134,7 @@ class AuthService:
             )
         
         # Hashear contraseña
-        password_hash = hash_password(password)
+        password_hash = await password_pool.hashear(password)
         
         # Crear usuario
         nuevo_usuario = Usuario(
@@ -163,11 +172,12 @@ class AuthService:
             "sub": usuario.username,
             "user_id": usuario.id,
             "rol": usuario.rol.value,
-            "email": usuario.email
+            "email": usuario.email,
+            "ver": usuario.token_version
         }
         
         access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token({"sub": usuario.username})
+        refresh_token = create_refresh_token({"sub": usuario.username, "ver": usuario.token_version})
         
         return {
             "access_token": access_token,
@@ -176,7 +186,7 @@ class AuthService:
         }
     
     @staticmethod
-    def cambiar_contraseña(
+    async def cambiar_contraseña(
         db: Session,
         usuario_id: int,
         password_actual: str,
@@ -206,7 +216,8 @@ class AuthService:
             )
         
         # Verificar contraseña actual
-        if not verify_password(password_actual, usuario.password_hash):
+        coincide, _ = await password_pool.verificar(password_actual, usuario.password_hash)
+        if not coincide:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="La contraseña actual es incorrecta"
@@ -221,9 +232,11 @@ class AuthService:
                 detail=str(e)
             )
         
-        # Actualizar contraseña
-        usuario.password_hash = hash_password(password_nueva)
+        # Actualizar contraseña (los tokens emitidos dejan de valer)
+        usuario.password_hash = await password_pool.hashear(password_nueva)
+        usuario.revocar_tokens()
         db.commit()
+        PrincipalCacheService.invalidar(usuario.id)
         
         logger.info(f"[OK] Contraseña cambiada para usuario: {usuario.username}")
         return True
@@ -254,8 +267,10 @@ class AuthService:
             )
         
         usuario.is_active = activar
+        usuario.revocar_tokens()
         db.commit()
         db.refresh(usuario)
+        PrincipalCacheService.invalidar(usuario.id)
         
         accion = "activado" if activar else "desactivado"
         logger.info(f"[OK] Usuario {accion}: {usuario.username}")
@@ -289,8 +304,10 @@ class AuthService:
         
         rol_anterior = usuario.rol.value
         usuario.rol = nuevo_rol
+        usuario.revocar_tokens()
         db.commit()
         db.refresh(usuario)
+        PrincipalCacheService.invalidar(usuario.id)
         
         logger.info(
             f"[OK] Rol cambiado para {usuario.username}: "
@@ -0,0 +1,128 @@
+"""
+Servicio de búsqueda de socios
+backend/app/services/busqueda_service.py
+
+Reemplaza el `ILIKE '%término%'` sobre cuatro columnas (siempre un full scan)
+por una búsqueda sobre miembros.texto_busqueda, una columna normalizada
+(apellido, nombre, documento y número sin tildes y en minúsculas):
+
+- PostgreSQL: `texto_busqueda LIKE '%término%'` resuelto por el índice GIN
+  de trigramas (pg_trgm); el ranking usa además similarity().
+- SQLite: tabla FTS5 con tokenizador trigram (miembros_fts). Los términos de
+  menos de 3 caracteres no tienen trigramas y se filtran con LIKE.
+- Otros motores: LIKE sobre la columna normalizada.
+
+Cada palabra del término debe aparecer (en cualquier orden). El ranking
+prioriza documento o número exacto, luego prefijo del apellido, luego
+comienzo de palabra.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, func, or_, select, text, true
+from sqlalchemy.orm import Session
+
+from app.models.categoria import Categoria
+from app.models.miembro import Miembro
+from app.utils.busqueda import terminos
+
+# Largo mínimo de un término para usar el índice de trigramas
+MIN_TRIGRAMA = 3
+
+
+class BusquedaMiembrosService:
+    """Filtro y ranking de la búsqueda de socios"""
+
+    @staticmethod
+    def filtro(q: Optional[str], dialecto: str):
+        """
+        Condición WHERE para la búsqueda `q`
+
+        Args:
+            q: Texto ingresado (nombre, apellido, documento o número)
+            dialecto: Nombre del dialecto de la sesión (db.get_bind().dialect.name)
+        """
+        palabras = terminos(q)
+        if not palabras:
+            return true()
+
+        condiciones = []
+        largas = [p for p in palabras if len(p) >= MIN_TRIGRAMA]
+        if dialecto == "sqlite" and largas:
+            # Frase por palabra: en trigram una frase es una subcadena
+            consulta_fts = " AND ".join('"' + p.replace('"', '""') + '"' for p in largas)
+            condiciones.append(Miembro.id.in_(
+                text("SELECT rowid FROM miembros_fts WHERE miembros_fts MATCH :consulta_fts")
+                .bindparams(consulta_fts=consulta_fts)
+            ))
+            palabras = [p for p in palabras if len(p) < MIN_TRIGRAMA]
+
+        condiciones.extend(
+            Miembro.texto_busqueda.contains(p, autoescape=True) for p in palabras
+        )
+        return and_(*condiciones)
+
+    @staticmethod
+    def orden(q: Optional[str], dialecto: str) -> List[Any]:
+        """Expresiones ORDER BY de mayor a menor relevancia"""
+        normalizado = " ".join(terminos(q))
+        relevancia = case(
+            (or_(
+                Miembro.numero_documento == normalizado,
+                func.lower(Miembro.numero_miembro) == normalizado
+            ), 0),
+            (Miembro.texto_busqueda.startswith(normalizado, autoescape=True), 1),
+            (Miembro.texto_busqueda.contains(" " + normalizado, autoescape=True), 2),
+            else_=3
+        )
+        orden = [relevancia]
+        if dialecto == "postgresql":
+            orden.append(func.similarity(Miembro.texto_busqueda, normalizado).desc())
+        orden.extend([Miembro.apellido, Miembro.nombre, Miembro.id])
+        return orden
+
+    @staticmethod
+    def autocompletar(db: Session, q: str, limite: int) -> List[Dict[str, Any]]:
+        """
+        Socios que coinciden con `q`, ordenados por relevancia
+
+        Proyección mínima (sin cargar el modelo completo) para sugerencias
+        mientras se escribe.
+        """
+        dialecto = db.get_bind().dialect.name
+        filas = db.execute(
+            select(
+                Miembro.id,
+                Miembro.numero_miembro,
+                Miembro.numero_documento,
+                Miembro.nombre,
+                Miembro.apellido,
+                Miembro.estado,
+                Miembro.saldo_cuenta,
+                Categoria.id.label("categoria_id"),
+                Categoria.nombre.label("categoria_nombre"),
+                Categoria.cuota_base,
+            )
+            .outerjoin(Categoria, Categoria.id == Miembro.categoria_id)
+            .where(
+                Miembro.is_deleted == False,
+                BusquedaMiembrosService.filtro(q, dialecto)
+            )
+            .order_by(*BusquedaMiembrosService.orden(q, dialecto))
+            .limit(limite)
+        ).all()
+        return [
+            {
+                "id": f.id,
+                "numero_miembro": f.numero_miembro,
+                "numero_documento": f.numero_documento,
+                "nombre_completo": f"{f.apellido}, {f.nombre}",
+                "estado": f.estado,
+                "saldo_cuenta": f.saldo_cuenta,
+                "categoria": {
+                    "id": f.categoria_id,
+                    "nombre": f.categoria_nombre,
+                    "cuota_base": f.cuota_base,
+                } if f.categoria_id is not None else None,
+            }
+            for f in filas
+        ]
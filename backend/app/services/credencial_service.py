@@ -0,0 +1,355 @@
+"""
+Generación masiva de credenciales (hoja PDF o ZIP de PNGs)
+backend/app/services/credencial_service.py
+
+Los QR se renderizan en un ProcessPoolExecutor (PIL + qrcode son CPU-bound
+y no liberan el GIL) y se consumen en orden a medida que terminan:
+- ZIP: cada PNG se escribe y se emite apenas llega, sin armar el archivo
+       completo en memoria.
+- PDF: las tarjetas se dibujan en la grilla A4 mientras los workers siguen
+       renderizando; reportlab escribe el documento al final, así que el
+       PDF se emite en bloques recién al cerrarlo.
+
+Cada worker usa QRRenderCache, por lo que una reimpresión reutiliza los PNG
+ya guardados en {UPLOAD_DIR}/qr_cache. El pool es compartido (se crea con el
+primer lote grande y se cierra en el shutdown): con spawn cada proceso nuevo
+reimporta la app, así que no se levanta uno por request.
+"""
+import io
+import logging
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from multiprocessing import get_context
+from typing import Iterator, List, Optional
+
+from PIL import Image
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas as pdf_canvas
+
+from app.config import settings
+from app.models.miembro import Miembro
+from app.services.qr_render_cache import QRRenderCache
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de bloque al emitir el PDF terminado
+_CHUNK_PDF = 64 * 1024
+# Resolución del QR embebido en el PDF (píxeles por módulo)
+_PX_POR_MODULO_PDF = 4
+
+# Pool de procesos compartido (se crea con el primer lote grande)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CredencialDatos:
+    """
+    Datos de un socio necesarios para su credencial
+
+    Es serializable (se envía a los procesos del pool) y expone los mismos
+    nombres de atributo que Miembro, de modo que QRRenderCache lo acepta
+    igual que al modelo.
+    """
+    id: int
+    numero_miembro: str
+    numero_documento: str
+    nombre_completo: str
+    categoria: Optional[str]
+    fecha_alta: Optional[date]
+    qr_generated_at: str
+    qr_hash: str
+
+    @classmethod
+    def desde_miembro(cls, miembro: Miembro) -> "CredencialDatos":
+        """Construir desde el modelo (requiere categoría precargada)"""
+        return cls(
+            id=miembro.id,
+            numero_miembro=miembro.numero_miembro,
+            numero_documento=miembro.numero_documento,
+            nombre_completo=miembro.nombre_completo,
+            categoria=miembro.categoria.nombre if miembro.categoria else None,
+            fecha_alta=miembro.fecha_alta,
+            qr_generated_at=miembro.qr_generated_at,
+            qr_hash=miembro.qr_hash,
+        )
+
+
+def _renderizar_qr(datos: CredencialDatos, personalizar: bool) -> bytes:
+    """Render de un QR (función de módulo para poder ejecutarse en el pool)"""
+    png, _ = QRRenderCache.obtener_png(datos, personalizar=personalizar)
+    return png
+
+
+def _renderizar_qr_tarjeta(datos: CredencialDatos) -> bytes:
+    """
+    QR reducido para la hoja PDF: 4 px por módulo, escala de grises
+
+    En la tarjeta el QR mide ~4 cm, así que la resolución original
+    (QR_BOX_SIZE px por módulo, RGB) solo engorda el PDF: reportlab
+    recomprime y codifica cada imagen y ese era el costo dominante.
+    """
+    png = _renderizar_qr(datos, personalizar=False)
+    factor = settings.QR_BOX_SIZE / _PX_POR_MODULO_PDF
+    with Image.open(io.BytesIO(png)) as img:
+        if factor > 1:
+            img = img.resize(
+                (round(img.width / factor), round(img.height / factor)),
+                Image.NEAREST
+            )
+        buffer = io.BytesIO()
+        img.convert("L").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _renderizar_bloque(funcion, upload_dir: str, bloque: List[CredencialDatos]) -> List[bytes]:
+    """
+    Aplicar funcion a un bloque de socios dentro de un worker del pool
+
+    Los workers (spawn) reimportan app.config y no ven cambios hechos en
+    settings del proceso principal: el directorio de la caché de disco
+    viaja con cada tarea.
+    """
+    settings.UPLOAD_DIR = upload_dir
+    return [funcion(d) for d in bloque]
+
+
+class _SalidaStream(io.RawIOBase):
+    """
+    Destino de escritura no posicionable que acumula bloques para emitir
+
+    zipfile detecta que no admite seek() y escribe cada entrada con data
+    descriptor, lo que permite generar el ZIP en streaming.
+    """
+
+    def __init__(self):
+        self._bloques: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._bloques.append(bytes(b))
+        return len(b)
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._bloques)
+        self._bloques.clear()
+        return datos
+
+
+class CredencialService:
+    """Servicio de generación de credenciales en lote"""
+
+    @staticmethod
+    def renderizar_qrs(
+        datos: List[CredencialDatos],
+        personalizar: bool = True,
+        workers: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Renderizar los QR de un lote, en orden, a medida que terminan
+
+        Args:
+            datos: Socios a renderizar
+            personalizar: Si True, PNG con nombre/número (como /qr-image)
+            workers: <= 1 renderiza en el proceso actual (default: CREDENCIALES_WORKERS)
+
+        Returns:
+            Iterador con el PNG de cada socio, en el mismo orden que datos
+        """
+        return CredencialService._mapear(partial(_renderizar_qr, personalizar=personalizar), datos, workers)
+
+    @staticmethod
+    def generar_zip(
+        datos: List[CredencialDatos],
+        workers: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        ZIP con un PNG personalizado por socio ({numero_miembro}.png)
+
+        Yields:
+            Bloques del archivo ZIP
+        """
+        salida = _SalidaStream()
+        # PNG ya está comprimido: ZIP_STORED evita recomprimir
+        with zipfile.ZipFile(salida, mode="w", compression=zipfile.ZIP_STORED) as zf:
+            pngs = CredencialService.renderizar_qrs(datos, personalizar=True, workers=workers)
+            for d, png in zip(datos, pngs):
+                zf.writestr(f"{d.numero_miembro}.png", png)
+                yield salida.vaciar()
+        yield salida.vaciar()
+
+    @staticmethod
+    def generar_pdf(
+        datos: List[CredencialDatos],
+        columnas: int = 2,
+        filas: int = 5,
+        workers: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        PDF A4 con columnas x filas credenciales por hoja
+
+        Args:
+            datos: Socios a incluir
+            columnas: Tarjetas por fila
+            filas: Filas por hoja
+
+        Yields:
+            Bloques del archivo PDF
+        """
+        buffer = io.BytesIO()
+        c = pdf_canvas.Canvas(buffer, pagesize=A4)
+        c.setTitle(f"Credenciales - {settings.ORG_NAME}")
+
+        ancho_hoja, alto_hoja = A4
+        margen = 10 * mm
+        ancho_celda = (ancho_hoja - 2 * margen) / columnas
+        alto_celda = (alto_hoja - 2 * margen) / filas
+        por_hoja = columnas * filas
+
+        # QR sin texto: nombre y datos se dibujan como texto vectorial
+        pngs = CredencialService._mapear(_renderizar_qr_tarjeta, datos, workers)
+        for i, (d, png) in enumerate(zip(datos, pngs)):
+            posicion = i % por_hoja
+            if i > 0 and posicion == 0:
+                c.showPage()
+            col, fila = posicion % columnas, posicion // columnas
+            x = margen + col * ancho_celda
+            y = alto_hoja - margen - (fila + 1) * alto_celda
+            CredencialService._dibujar_tarjeta(c, d, png, x, y, ancho_celda, alto_celda)
+
+        c.save()
+        buffer.seek(0)
+        while True:
+            bloque = buffer.read(_CHUNK_PDF)
+            if not bloque:
+                break
+            yield bloque
+
+    @staticmethod
+    def obtener_pool() -> ProcessPoolExecutor:
+        """Pool de procesos compartido de CREDENCIALES_WORKERS procesos"""
+        global _pool
+        with _pool_lock:
+            if _pool is None:
+                # spawn: el proceso del servidor tiene threads (uvicorn, pool de BD)
+                # y hacer fork con locks tomados puede colgar a los hijos
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, settings.CREDENCIALES_WORKERS),
+                    mp_context=get_context("spawn")
+                )
+            return _pool
+
+    @staticmethod
+    def cerrar_pool() -> None:
+        """Terminar los procesos del pool (shutdown de la app)"""
+        global _pool
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown(wait=True, cancel_futures=True)
+                _pool = None
+
+    # ==================== INTERNO ====================
+
+    @staticmethod
+    def _mapear(funcion, datos: List[CredencialDatos], workers: Optional[int]) -> Iterator[bytes]:
+        """
+        Aplicar funcion a cada socio, en orden, en el pool de procesos
+
+        Lotes chicos (menos de CREDENCIALES_MIN_LOTE_POOL) o workers <= 1 se
+        renderizan en el proceso actual: pasar por el pool cuesta más que
+        dibujar unas pocas imágenes.
+        """
+        if workers is None:
+            workers = settings.CREDENCIALES_WORKERS
+
+        if workers <= 1 or len(datos) < settings.CREDENCIALES_MIN_LOTE_POOL:
+            for d in datos:
+                yield funcion(d)
+            return
+
+        pool = CredencialService.obtener_pool()
+        tarea = partial(_renderizar_bloque, funcion, settings.UPLOAD_DIR)
+        chunksize = max(1, min(64, len(datos) // (workers * 4)))
+        futuros = [pool.submit(tarea, datos[i:i + chunksize]) for i in range(0, len(datos), chunksize)]
+        try:
+            for futuro in futuros:
+                yield from futuro.result()
+        except BrokenProcessPool:
+            # Un worker murió: el próximo lote arma un pool nuevo
+            CredencialService._descartar_pool(pool)
+            raise
+        finally:
+            # Si el cliente cortó la descarga no renderizar el resto del lote
+            for futuro in futuros:
+                futuro.cancel()
+
+    @staticmethod
+    def _descartar_pool(pool: ProcessPoolExecutor) -> None:
+        global _pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _dibujar_tarjeta(c, d: CredencialDatos, png: bytes, x: float, y: float, ancho: float, alto: float):
+        """Dibujar una credencial dentro de la celda (x, y = esquina inferior izquierda)"""
+        separacion = 2 * mm
+        x, y = x + separacion, y + separacion
+        ancho, alto = ancho - 2 * separacion, alto - 2 * separacion
+        pad = 3 * mm
+
+        # Borde de recorte
+        c.setStrokeColor(colors.lightgrey)
+        c.setLineWidth(0.5)
+        c.roundRect(x, y, ancho, alto, 3 * mm, stroke=1, fill=0)
+
+        # Organización
+        c.setFillColor(colors.HexColor('#366092'))
+        c.setFont('Helvetica-Bold', 9)
+        c.drawString(x + pad, y + alto - pad - 9, settings.ORG_NAME.upper()[:40])
+
+        # QR a la derecha
+        lado_qr = alto - 2 * pad - 12
+        c.drawImage(
+            ImageReader(io.BytesIO(png)),
+            x + ancho - pad - lado_qr,
+            y + pad,
+            width=lado_qr,
+            height=lado_qr
+        )
+
+        # Datos del socio a la izquierda (recortados al espacio libre)
+        max_ancho = ancho - 3 * pad - lado_qr
+        tx = x + pad
+        ty = y + alto - pad - 30
+        c.setFillColor(colors.black)
+        c.setFont('Helvetica-Bold', 10)
+        c.drawString(tx, ty, CredencialService._recortar(c, d.nombre_completo, 'Helvetica-Bold', 10, max_ancho))
+        c.setFont('Helvetica', 8)
+        lineas = [f"N° Socio: {d.numero_miembro}"]
+        if d.categoria:
+            lineas.append(f"Categoría: {d.categoria}")
+        if d.fecha_alta:
+            lineas.append(f"Desde: {d.fecha_alta.strftime('%d/%m/%Y')}")
+        for n, linea in enumerate(lineas, start=1):
+            c.drawString(tx, ty - 12 * n - 2, CredencialService._recortar(c, linea, 'Helvetica', 8, max_ancho))
+
+    @staticmethod
+    def _recortar(c, texto: str, fuente: str, tamaño: float, max_ancho: float) -> str:
+        """Truncar con "..." hasta que el texto entre en max_ancho"""
+        if c.stringWidth(texto, fuente, tamaño) <= max_ancho:
+            return texto
+        while texto and c.stringWidth(texto + "...", fuente, tamaño) > max_ancho:
+            texto = texto[:-1]
+        return texto.rstrip() + "..."
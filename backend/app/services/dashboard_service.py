@@ -0,0 +1,202 @@
+"""
+Servicio del snapshot del dashboard
+backend/app/services/dashboard_service.py
+
+Arma en un solo dict todo lo que muestra el dashboard del escritorio (KPIs,
+histórico de ingresos, accesos por hora, principales deudores y actividad
+reciente) con pocas consultas agregadas:
+
+1. Conteos de socios y deuda (agregación condicional sobre miembros)
+2. Principales deudores (LIMIT)
+3. Ingresos/egresos por día de los últimos meses (resumen_diario_caja)
+4. Accesos del día por hora y resultado
+5. Actividad reciente (solo si se pide)
+
+El resultado se cachea unos segundos con stale-while-revalidate (SWRCache):
+varios escritorios abiertos comparten el mismo cálculo.
+"""
+from datetime import date
+from typing import Any, Dict, List
+import logging
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.acceso import ResultadoAcceso
+from app.models.actividad import Actividad
+from app.models.miembro import EstadoMiembro, Miembro
+from app.models.usuario import Usuario
+from app.services.acceso_stats_service import AccesoStatsService
+from app.services.resumen_caja_service import ResumenCajaService
+from app.utils.cache import SWRCache
+from app.utils.helpers import ahora_utc
+
+logger = logging.getLogger(__name__)
+
+# Meses del gráfico de ingresos y cantidad de deudores / actividades listados
+MESES_HISTORICO = 6
+TOP_DEUDORES = 5
+ACTIVIDADES_RECIENTES = 15
+
+_cache = SWRCache(
+    "dashboard",
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    stale_seconds=settings.DASHBOARD_CACHE_STALE_SECONDS
+)
+
+
+class DashboardService:
+    """Snapshot consolidado del dashboard"""
+
+    # ==================== CONSULTAS ====================
+
+    @staticmethod
+    async def _socios(db: AsyncSession) -> Dict[str, Any]:
+        """Totales por estado y deuda en una sola pasada sobre miembros"""
+        def contar(condicion):
+            return func.coalesce(func.sum(case((condicion, 1), else_=0)), 0)
+
+        con_deuda = Miembro.saldo_cuenta < 0
+        fila = (await db.execute(
+            select(
+                func.count(Miembro.id).label("total"),
+                contar(Miembro.estado == EstadoMiembro.ACTIVO).label("activos"),
+                contar(Miembro.estado == EstadoMiembro.MOROSO).label("morosos"),
+                contar(con_deuda).label("con_deuda"),
+                func.coalesce(
+                    func.sum(case((con_deuda, -Miembro.saldo_cuenta), else_=0.0)), 0.0
+                ).label("total_deuda"),
+            ).where(Miembro.is_deleted == False)
+        )).one()
+        return {k: v for k, v in fila._mapping.items()}
+
+    @staticmethod
+    async def _top_deudores(db: AsyncSession, hoy: date) -> List[Dict[str, Any]]:
+        """Socios con mayor deuda (solo las columnas que se muestran)"""
+        filas = (await db.execute(
+            select(
+                Miembro.id,
+                Miembro.numero_miembro,
+                Miembro.nombre,
+                Miembro.apellido,
+                Miembro.saldo_cuenta,
+                Miembro.proximo_vencimiento,
+            )
+            .where(Miembro.is_deleted == False, Miembro.saldo_cuenta < 0)
+            .order_by(Miembro.saldo_cuenta.asc())
+            .limit(TOP_DEUDORES)
+        )).all()
+        return [
+            {
+                "id": f.id,
+                "numero_miembro": f.numero_miembro,
+                "nombre_completo": f"{f.apellido}, {f.nombre}",
+                "deuda": float(abs(f.saldo_cuenta)),
+                # Igual que Miembro.dias_mora
+                "dias_mora": max(0, (hoy - f.proximo_vencimiento).days) if f.proximo_vencimiento else 0,
+            }
+            for f in filas
+        ]
+
+    @staticmethod
+    async def _actividad_reciente(db: AsyncSession) -> List[Dict[str, Any]]:
+        """Últimas actividades de auditoría con el username del ejecutor"""
+        filas = (await db.execute(
+            select(Actividad, Usuario.username)
+            .outerjoin(Usuario, Usuario.id == Actividad.usuario_id)
+            .order_by(Actividad.fecha_hora.desc())
+            .limit(ACTIVIDADES_RECIENTES)
+        )).all()
+        return [
+            {
+                "id": act.id,
+                "tipo": act.tipo.value,
+                "severidad": act.severidad.value,
+                "descripcion": act.descripcion,
+                "usuario_id": act.usuario_id,
+                "usuario_username": username or "Sistema",
+                "entidad_tipo": act.entidad_tipo,
+                "entidad_id": act.entidad_id,
+                "fecha_hora": act.fecha_hora.isoformat(),
+            }
+            for act, username in filas
+        ]
+
+    # ==================== SNAPSHOT ====================
+
+    @staticmethod
+    async def calcular(db: AsyncSession, incluir_actividad: bool) -> Dict[str, Any]:
+        """Calcula el snapshot completo (sin caché)"""
+        hoy = date.today()
+
+        socios = await DashboardService._socios(db)
+        deudores = await DashboardService._top_deudores(db, hoy)
+
+        # Histórico y finanzas del mes salen de la misma consulta por día
+        desde, hasta = ResumenCajaService.rango_meses(hoy, MESES_HISTORICO)
+        filas = (await db.execute(ResumenCajaService.query_por_dia(desde, hasta))).all()
+        historico = ResumenCajaService.serie_mensual(
+            ResumenCajaService.agrupar_por_mes(filas), hoy, MESES_HISTORICO
+        )
+        inicio_mes = hoy.replace(day=1)
+        del_mes = [f for f in filas if inicio_mes <= f.fecha <= hoy]
+        ingresos_mes = sum(float(f.ingresos or 0) for f in del_mes)
+        egresos_mes = sum(float(f.egresos or 0) for f in del_mes)
+
+        accesos = await AccesoStatsService.estadisticas_dia_async(db, hoy)
+        hora_pico = max(accesos["por_hora"], key=lambda h: h["total"])
+
+        total = socios["total"]
+        return {
+            "socios": {
+                "total": total,
+                "activos": socios["activos"],
+                "morosos": socios["morosos"],
+                "porcentaje_morosos": round(socios["morosos"] / total * 100, 1) if total > 0 else 0
+            },
+            "finanzas_mes": {
+                "ingresos": ingresos_mes,
+                "egresos": egresos_mes,
+                "balance": ingresos_mes - egresos_mes
+            },
+            "ingresos_historicos": historico,
+            "accesos": {
+                "hoy": accesos["total"],
+                "permitidos": accesos["por_resultado"][ResultadoAcceso.PERMITIDO.value],
+                "rechazados": accesos["por_resultado"][ResultadoAcceso.RECHAZADO.value],
+                "hora_pico": hora_pico["hora"],
+                "accesos_hora_pico": hora_pico["total"],
+                "por_hora": accesos["por_hora"]
+            },
+            "morosidad": {
+                "cantidad": socios["con_deuda"],
+                "total_deuda": float(socios["total_deuda"]),
+                "top_deudores": deudores
+            },
+            "actividad_reciente": await DashboardService._actividad_reciente(db) if incluir_actividad else None,
+            "fecha": hoy.isoformat(),
+            "generado_at": ahora_utc().isoformat()
+        }
+
+    @staticmethod
+    async def obtener_snapshot(incluir_actividad: bool) -> Dict[str, Any]:
+        """
+        Snapshot cacheado (DASHBOARD_CACHE_*)
+
+        Usa su propia sesión: el recálculo en segundo plano puede terminar
+        después del request que lo disparó.
+        """
+        async def calcular():
+            async with AsyncSessionLocal() as db:
+                return await DashboardService.calcular(db, incluir_actividad)
+
+        if not settings.DASHBOARD_CACHE_ENABLED:
+            return await calcular()
+        return await _cache.obtener(("snapshot", incluir_actividad), calcular)
+
+    @staticmethod
+    def invalidar() -> None:
+        """Descarta los snapshots cacheados"""
+        _cache.clear()
@@ -0,0 +1,420 @@
+"""
+Proyecciones de exportación (consulta + columnas de cada reporte)
+backend/app/services/export_proyecciones.py
+
+Cada proyección describe QUÉ se exporta: una consulta de columnas (sin
+cargar entidades ORM), los títulos y tipos de columna y cómo convertir
+cada fila. ExportService decide CÓMO se escribe (formato de archivo).
+
+Las filas se recorren con yield_per, por lo que la memoria no depende de
+la cantidad de registros exportados.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.models.acceso import Acceso, ResultadoAcceso
+from app.models.categoria import Categoria
+from app.models.miembro import Miembro, EstadoMiembro
+from app.models.pago import Pago, EstadoPago
+from app.models.usuario import Usuario
+
+# Filas por lote al recorrer la consulta
+LOTE_EXPORTACION = 1000
+
+
+@dataclass(frozen=True)
+class Columna:
+    """
+    Columna exportada
+
+    tipo: texto | entero | decimal | moneda | fecha | fecha_hora
+    """
+    titulo: str
+    tipo: str = "texto"
+
+    @property
+    def campo(self) -> str:
+        """Nombre de campo para formatos de datos (ej: "N° Socio" -> "n_socio")"""
+        sin_acentos = unicodedata.normalize("NFKD", self.titulo).encode("ascii", "ignore").decode()
+        return re.sub(r"[^a-z0-9]+", "_", sin_acentos.lower()).strip("_")
+
+
+@dataclass
+class Proyeccion:
+    """Definición de un reporte exportable"""
+    nombre: str                     # Prefijo del archivo (ej: "socios")
+    titulo: str                     # Título del documento
+    hoja: str                       # Nombre de la hoja Excel
+    columnas: List[Columna]
+    consulta: Select
+    convertir: Callable[[Any], Sequence[Any]] = tuple
+    # Filas de resumen al pie (solo formatos de planilla)
+    resumen: Optional[Callable[[Session], List[Sequence[Any]]]] = None
+    # Color de relleno (hex) según la fila ya convertida, o None
+    resaltar: Optional[Callable[[Sequence[Any]], Optional[str]]] = None
+
+    def filas(self, db: Session, lote: int = LOTE_EXPORTACION) -> Iterator[Sequence[Any]]:
+        """Recorrer las filas convertidas en lotes de `lote` registros"""
+        resultado = db.execute(self.consulta.execution_options(yield_per=lote))
+        for fila in resultado:
+            yield self.convertir(fila)
+
+
+# ==================== HELPERS ====================
+
+def _nombre_completo(apellido: Optional[str], nombre: Optional[str]) -> str:
+    """Mismo formato que Miembro.nombre_completo"""
+    if apellido is None and nombre is None:
+        return ""
+    return f"{apellido}, {nombre}"
+
+
+def _dias_mora(proximo_vencimiento: Optional[date], hoy: date) -> int:
+    """Mismo cálculo que Miembro.dias_mora"""
+    if not proximo_vencimiento or proximo_vencimiento >= hoy:
+        return 0
+    return (hoy - proximo_vencimiento).days
+
+
+def _utc_naive(valor: Optional[datetime]) -> Optional[datetime]:
+    """Las planillas no admiten zona horaria: datetime en UTC sin tzinfo"""
+    if valor is None or valor.tzinfo is None:
+        return valor
+    return valor.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _valor(enum_o_texto) -> Optional[str]:
+    return enum_o_texto.value if hasattr(enum_o_texto, "value") else enum_o_texto
+
+
+# ==================== SOCIOS ====================
+
+def proyeccion_socios(
+    estado: Optional[EstadoMiembro] = None,
+    categoria_id: Optional[int] = None
+) -> Proyeccion:
+    """Listado de socios no eliminados"""
+    consulta = (
+        select(
+            Miembro.numero_miembro,
+            Miembro.numero_documento,
+            Miembro.apellido,
+            Miembro.nombre,
+            Miembro.email,
+            func.coalesce(Miembro.telefono, Miembro.celular),
+            Categoria.nombre,
+            Categoria.cuota_base,
+            Miembro.estado,
+            Miembro.fecha_alta,
+            Miembro.saldo_cuenta,
+            Miembro.proximo_vencimiento,
+        )
+        .outerjoin(Categoria, Miembro.categoria_id == Categoria.id)
+        .where(Miembro.is_deleted == False)
+        .order_by(Miembro.apellido, Miembro.nombre)
+    )
+    if estado:
+        consulta = consulta.where(Miembro.estado == estado)
+    if categoria_id:
+        consulta = consulta.where(Miembro.categoria_id == categoria_id)
+
+    hoy = date.today()
+
+    def convertir(f):
+        return (
+            f[0],
+            f[1],
+            _nombre_completo(f[2], f[3]),
+            f[4] or "Sin email",
+            f[5] or "Sin teléfono",
+            f[6] or "Sin categoría",
+            f[7] or 0.0,
+            _valor(f[8]),
+            f[9],
+            max(-(f[10] or 0.0), 0.0),
+            _dias_mora(f[11], hoy),
+        )
+
+    return Proyeccion(
+        nombre="socios",
+        titulo="Listado de Socios",
+        hoja="Socios",
+        columnas=[
+            Columna("N° Socio"),
+            Columna("DNI"),
+            Columna("Nombre Completo"),
+            Columna("Email"),
+            Columna("Teléfono"),
+            Columna("Categoría"),
+            Columna("Cuota Mensual", "moneda"),
+            Columna("Estado"),
+            Columna("Fecha Alta", "fecha"),
+            Columna("Deuda Actual", "moneda"),
+            Columna("Días Mora", "entero"),
+        ],
+        consulta=consulta,
+        convertir=convertir,
+    )
+
+
+# ==================== PAGOS ====================
+
+def proyeccion_pagos(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    miembro_id: Optional[int] = None
+) -> Proyeccion:
+    """Pagos con filtros de fecha (inclusive) y socio"""
+    condiciones = []
+    if fecha_desde:
+        condiciones.append(Pago.fecha_pago >= fecha_desde)
+    if fecha_hasta:
+        condiciones.append(Pago.fecha_pago <= fecha_hasta)
+    if miembro_id:
+        condiciones.append(Pago.miembro_id == miembro_id)
+
+    consulta = (
+        select(
+            Pago.id,
+            Pago.fecha_pago,
+            Miembro.numero_miembro,
+            Miembro.apellido,
+            Miembro.nombre,
+            Pago.concepto,
+            Pago.monto_final,
+            Pago.metodo_pago,
+            Pago.estado,
+            Pago.fecha_periodo,
+            Usuario.username,
+            Pago.observaciones,
+        )
+        .outerjoin(Miembro, Pago.miembro_id == Miembro.id)
+        .outerjoin(Usuario, Pago.registrado_por_id == Usuario.id)
+        .where(*condiciones)
+        .order_by(Pago.fecha_pago.desc(), Pago.id.desc())
+    )
+
+    def convertir(f):
+        return (
+            f[0],
+            f[1],
+            f[2] or "N/A",
+            _nombre_completo(f[3], f[4]) or "N/A",
+            f[5],
+            f[6],
+            _valor(f[7]),
+            _valor(f[8]),
+            f[9].strftime("%m/%Y") if f[9] else "",
+            f[10] or "Sistema",
+            f[11] or "",
+        )
+
+    def resumen(db: Session):
+        total = db.execute(
+            select(func.coalesce(func.sum(Pago.monto_final), 0.0))
+            .where(Pago.estado == EstadoPago.APROBADO, *condiciones)
+        ).scalar()
+        return [[], ["", "", "", "", "TOTAL:", total]]
+
+    return Proyeccion(
+        nombre="pagos",
+        titulo="Listado de Pagos",
+        hoja="Pagos",
+        columnas=[
+            Columna("ID Pago", "entero"),
+            Columna("Fecha", "fecha"),
+            Columna("N° Socio"),
+            Columna("Nombre Socio"),
+            Columna("Concepto"),
+            Columna("Monto", "moneda"),
+            Columna("Método Pago"),
+            Columna("Estado"),
+            Columna("Mes/Año Pago"),
+            Columna("Registrado Por"),
+            Columna("Observaciones"),
+        ],
+        consulta=consulta,
+        convertir=convertir,
+        resumen=resumen,
+    )
+
+
+# ==================== MOROSIDAD ====================
+
+def proyeccion_morosidad() -> Proyeccion:
+    """Socios con saldo negativo, de mayor a menor deuda"""
+    condiciones = [Miembro.is_deleted == False, Miembro.saldo_cuenta < 0]
+
+    consulta = (
+        select(
+            Miembro.numero_miembro,
+            Miembro.numero_documento,
+            Miembro.apellido,
+            Miembro.nombre,
+            Miembro.email,
+            func.coalesce(Miembro.telefono, Miembro.celular),
+            Categoria.nombre,
+            Categoria.cuota_base,
+            Miembro.saldo_cuenta,
+            Miembro.proximo_vencimiento,
+            Miembro.ultima_cuota_pagada,
+            Miembro.estado,
+        )
+        .outerjoin(Categoria, Miembro.categoria_id == Categoria.id)
+        .where(*condiciones)
+        .order_by(Miembro.saldo_cuenta.asc())
+    )
+
+    hoy = date.today()
+
+    def convertir(f):
+        return (
+            f[0],
+            f[1],
+            _nombre_completo(f[2], f[3]),
+            f[4] or "Sin email",
+            f[5] or "Sin teléfono",
+            f[6] or "Sin categoría",
+            f[7] or 0.0,
+            abs(f[8]),
+            _dias_mora(f[9], hoy),
+            f[10].strftime("%d/%m/%Y") if f[10] else "Nunca",
+            _valor(f[11]),
+        )
+
+    def resumen(db: Session):
+        cantidad, deuda = db.execute(
+            select(func.count(Miembro.id), func.coalesce(-func.sum(Miembro.saldo_cuenta), 0.0))
+            .where(*condiciones)
+        ).one()
+        return [
+            [],
+            ["RESUMEN:"],
+            [],
+            ["", "", "", "", "", "Total Socios Morosos:", cantidad, "Deuda Total:", deuda],
+        ]
+
+    def resaltar(fila):
+        if fila[8] > 30:
+            return "FFE6E6"
+        if fila[8] > 15:
+            return "FFF4E6"
+        return None
+
+    return Proyeccion(
+        nombre="morosidad",
+        titulo="Reporte de Morosidad",
+        hoja="Morosidad",
+        columnas=[
+            Columna("N° Socio"),
+            Columna("DNI"),
+            Columna("Nombre Completo"),
+            Columna("Email"),
+            Columna("Teléfono"),
+            Columna("Categoría"),
+            Columna("Cuota Mensual", "moneda"),
+            Columna("Deuda Total", "moneda"),
+            Columna("Días de Mora", "entero"),
+            Columna("Último Pago"),
+            Columna("Estado"),
+        ],
+        consulta=consulta,
+        convertir=convertir,
+        resumen=resumen,
+        resaltar=resaltar,
+    )
+
+
+# ==================== ACCESOS ====================
+
+def proyeccion_accesos(
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None
+) -> Proyeccion:
+    """Historial de accesos en el rango [desde, hasta) (UTC)"""
+    condiciones = []
+    if desde:
+        condiciones.append(Acceso.fecha_hora >= desde)
+    if hasta:
+        condiciones.append(Acceso.fecha_hora < hasta)
+
+    consulta = (
+        select(
+            Acceso.id,
+            Acceso.fecha_hora,
+            Miembro.numero_miembro,
+            Miembro.apellido,
+            Miembro.nombre,
+            Acceso.tipo_acceso,
+            Acceso.resultado,
+            Acceso.ubicacion,
+            Acceso.dispositivo_id,
+            Acceso.mensaje,
+        )
+        .outerjoin(Miembro, Acceso.miembro_id == Miembro.id)
+        .where(*condiciones)
+        .order_by(Acceso.fecha_hora.desc(), Acceso.id.desc())
+    )
+
+    def convertir(f):
+        return (
+            f[0],
+            _utc_naive(f[1]),
+            f[2] or "",
+            _nombre_completo(f[3], f[4]) or "Desconocido",
+            _valor(f[5]),
+            _valor(f[6]),
+            f[7] or "",
+            f[8] or "",
+            f[9] or "",
+        )
+
+    def resumen(db: Session):
+        conteos = dict(
+            db.execute(
+                select(Acceso.resultado, func.count(Acceso.id))
+                .where(*condiciones)
+                .group_by(Acceso.resultado)
+            ).all()
+        )
+        total = sum(conteos.values())
+        rechazados = conteos.get(ResultadoAcceso.RECHAZADO, 0)
+        return [
+            [],
+            ["ESTADÍSTICAS:"],
+            ["", "Total Accesos:", total, "", "Permitidos:", total - rechazados, "", "Rechazados:", rechazados],
+        ]
+
+    def resaltar(fila):
+        if fila[5] == ResultadoAcceso.RECHAZADO.value:
+            return "FCE8E6"
+        if fila[5] == ResultadoAcceso.PERMITIDO.value:
+            return "E6F4EA"
+        return None
+
+    return Proyeccion(
+        nombre="accesos",
+        titulo="Historial de Accesos",
+        hoja="Accesos",
+        columnas=[
+            Columna("ID", "entero"),
+            Columna("Fecha/Hora (UTC)", "fecha_hora"),
+            Columna("N° Socio"),
+            Columna("Nombre Socio"),
+            Columna("Tipo Acceso"),
+            Columna("Resultado"),
+            Columna("Ubicación"),
+            Columna("Dispositivo"),
+            Columna("Mensaje"),
+        ],
+        consulta=consulta,
+        convertir=convertir,
+        resumen=resumen,
+        resaltar=resaltar,
+    )
@@ -1,448 +1,314 @@
 """
-Servicio de exportación a Excel
+Servicio de exportación (Excel, CSV, Parquet)
 backend/app/services/export_service.py
+
+Escribe una Proyeccion (ver export_proyecciones.py) en el formato pedido.
+Los tres formatos recorren la misma consulta con yield_per, así que la
+memoria pico no depende de la cantidad de filas:
+- xlsx:    openpyxl en modo write-only hacia un archivo temporal que luego
+           se transmite en bloques.
+- csv:     se transmite fila a fila mientras se lee la consulta.
+- parquet: grupos de filas armados por columnas con pyarrow (dependencia
+           opcional) hacia un archivo temporal.
 """
+import csv
+import io
+import tempfile
+from datetime import datetime
+from itertools import chain, islice
+from typing import BinaryIO, Iterator, List, Sequence
+
+try:
+    # Import opcional: sin pyarrow el formato parquet queda deshabilitado
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    _PYARROW_AVAILABLE = False
+
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from io import BytesIO
-from typing import List
-from datetime import datetime
 from sqlalchemy.orm import Session
 
-from app.models.miembro import Miembro
-from app.models.categoria import Categoria
-from app.models.pago import Pago
-from app.models.categoria import Categoria
+from app.database import SessionLocal
+from app.services.export_proyecciones import Columna, Proyeccion
+
+# Filas usadas para estimar el ancho de las columnas
+FILAS_MUESTRA_ANCHO = 200
+# Ancho máximo de columna (caracteres)
+ANCHO_MAXIMO = 50
+# Tamaño de bloque al transmitir el archivo
+CHUNK_SIZE = 64 * 1024
+# Filas por bloque emitido en CSV
+FILAS_POR_BLOQUE_CSV = 500
+# Filas por row group de Parquet
+FILAS_POR_GRUPO_PARQUET = 50000
+
+# Formato de celda por tipo de columna
+_FORMATOS = {
+    "moneda": '"$"#,##0.00',
+    "decimal": "#,##0.00",
+    "fecha": "DD/MM/YYYY",
+    "fecha_hora": "DD/MM/YYYY HH:MM",
+}
+# Ancho fijo para columnas cuyo largo no depende del texto
+_ANCHOS_FIJOS = {
+    "fecha": 12,
+    "fecha_hora": 17,
+}
 
 
 class ExportService:
-    """Servicio para exportar datos a Excel"""
-    
-    @staticmethod
-    def _apply_header_style(worksheet, row_num: int = 1):
-        """Aplicar estilo a los headers de la tabla"""
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        alignment = Alignment(horizontal="center", vertical="center")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for cell in worksheet[row_num]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = alignment
-            cell.border = border
-    
-    @staticmethod
-    def _auto_adjust_columns(worksheet):
-        """Ajustar automáticamente el ancho de las columnas"""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)  # Máximo 50 caracteres
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-    
-    @staticmethod
-    def _add_metadata(worksheet, title: str):
-        """Agregar metadata al inicio del documento"""
-        # Título
-        worksheet.insert_rows(1, 2)
-        worksheet['A1'] = title
-        worksheet['A1'].font = Font(bold=True, size=14, color="366092")
-        
-        # Fecha de generación
-        worksheet['A2'] = f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-        worksheet['A2'].font = Font(italic=True, size=10, color="666666")
-        
-        # Ajustar fila de headers
-        worksheet.row_dimensions[3].height = 25
-    
+    """Servicio para exportar datos a Excel, CSV y Parquet"""
+
+    MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    MEDIA_TYPE_CSV = "text/csv; charset=utf-8"
+    MEDIA_TYPE_PARQUET = "application/vnd.apache.parquet"
+
     @staticmethod
-    def exportar_socios_excel(socios: List[dict]) -> BytesIO:
+    def generar_excel(db: Session, proyeccion: Proyeccion) -> BinaryIO:
         """
-        Exportar listado de socios a Excel
-        
+        Generar el Excel de una proyección
+
+        Layout: título (fila 1), fecha de generación (fila 2), encabezados
+        (fila 3, fija al desplazar), datos y filas de resumen al pie.
+
         Args:
-            socios: Lista de diccionarios con datos de socios
-        
+            db: Sesión de base de datos
+            proyeccion: Reporte a exportar
+
         Returns:
-            BytesIO: Archivo Excel como objeto BytesIO
+            Archivo temporal posicionado al inicio (se elimina al cerrarlo)
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Socios"
-        
-        # Headers
-        headers = [
-            "N° Socio",
-            "DNI",
-            "Nombre Completo",
-            "Email",
-            "Teléfono",
-            "Categoría",
-            "Cuota Mensual",
-            "Estado",
-            "Fecha Alta",
-            "Deuda Actual",
-            "Días Mora"
-        ]
-        ws.append(headers)
-        
-        # Datos
-        for socio in socios:
-            # Trabajar con diccionarios
-            categoria = socio.get('categoria', {})
-            categoria_nombre = categoria.get('nombre', 'Sin categoría') if categoria else 'Sin categoría'
-            
-            # Manejo de fecha
-            fecha_alta = socio.get('fecha_alta')
-            if fecha_alta:
-                if isinstance(fecha_alta, str):
-                    fecha_str = fecha_alta
-                else:
-                    fecha_str = fecha_alta.strftime('%d/%m/%Y')
-            else:
-                fecha_str = ""
-            
-            ws.append([
-                socio.get('numero_miembro', ''),
-                socio.get('numero_documento', ''),
-                socio.get('nombre_completo', ''),
-                socio.get('email', 'Sin email') or 'Sin email',
-                socio.get('telefono', 'Sin teléfono') or 'Sin teléfono',
-                categoria_nombre,
-                "$0.00",  # Cuota mensual (no disponible en dict actual)
-                socio.get('estado', ''),
-                fecha_str,
-                f"${socio.get('saldo_cuenta', 0):,.2f}",
-                0  # Días mora (requiere cálculo)
-            ])
-        
-        # Aplicar estilos
-        ExportService._apply_header_style(ws)
-        ExportService._auto_adjust_columns(ws)
-        ExportService._add_metadata(ws, "Listado de Socios")
-        
-        # Congelar primera fila (headers)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(proyeccion.hoja)
+        columnas = proyeccion.columnas
+
+        # Anchos estimados con una muestra (write-only exige definirlos
+        # antes de escribir filas; no se puede recorrer la hoja al final)
+        filas = proyeccion.filas(db)
+        muestra = list(islice(filas, FILAS_MUESTRA_ANCHO))
+        for i, ancho in enumerate(ExportService._estimar_anchos(columnas, muestra), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = ancho
         ws.freeze_panes = "A4"
-        
-        # Guardar en BytesIO
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer
-    
+
+        # Metadata
+        ws.append([ExportService._celda(ws, proyeccion.titulo, font=Font(bold=True, size=14, color="366092"))])
+        ws.append([ExportService._celda(
+            ws,
+            f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+            font=Font(italic=True, size=10, color="666666")
+        )])
+
+        # Encabezados
+        ws.row_dimensions[3].height = 25
+        ws.append(ExportService._encabezados(ws, columnas))
+
+        # Datos
+        formatos = [_FORMATOS.get(c.tipo) for c in columnas]
+        rellenos = {}
+        for fila in chain(muestra, filas):
+            color = proyeccion.resaltar(fila) if proyeccion.resaltar else None
+            if color is None and not any(formatos):
+                ws.append(fila)
+                continue
+            relleno = None
+            if color is not None:
+                relleno = rellenos.get(color)
+                if relleno is None:
+                    relleno = rellenos[color] = PatternFill(start_color=color, end_color=color, fill_type="solid")
+            ws.append(ExportService._fila_con_estilo(ws, fila, formatos, relleno))
+
+        # Resumen
+        if proyeccion.resumen:
+            for fila in proyeccion.resumen(db):
+                ws.append(ExportService._fila_resumen(ws, fila))
+
+        archivo = tempfile.TemporaryFile()
+        wb.save(archivo)
+        archivo.seek(0)
+        return archivo
+
     @staticmethod
-    def exportar_pagos_excel(pagos: List[dict], db: Session = None) -> BytesIO:
+    def generar_csv(
+        proyeccion: Proyeccion,
+        session_factory=SessionLocal,
+        filas_por_bloque: int = FILAS_POR_BLOQUE_CSV
+    ) -> Iterator[bytes]:
         """
-        Exportar listado de pagos a Excel
-        
-        Args:
-            pagos: Lista de diccionarios con datos de pagos
-            db: Sesión de base de datos (opcional, para compatibilidad)
-        
-        Returns:
-            BytesIO: Archivo Excel como objeto BytesIO
+        Transmitir la proyección como CSV (UTF-8, encabezados en la 1ra fila)
+
+        Usa su propia sesión: el generador se consume mientras se envía la
+        respuesta, fuera del ciclo de vida del endpoint. Fechas en ISO 8601,
+        importes sin formato (punto decimal).
+
+        Yields:
+            Bloques de filas CSV codificadas
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Pagos"
-        
-        # Headers
-        headers = [
-            "ID Pago",
-            "Fecha",
-            "N° Socio",
-            "Nombre Socio",
-            "Concepto",
-            "Monto",
-            "Método Pago",
-            "Estado",
-            "Mes/Año Pago",
-            "Registrado Por",
-            "Observaciones"
-        ]
-        ws.append(headers)
-        
-        # Datos
-        total_monto = 0
-        for pago in pagos:
-            # Trabajar con diccionarios
-            miembro = pago.get('miembro', {}) if isinstance(pago, dict) else None
-            numero_socio = miembro.get('numero_miembro', 'N/A') if miembro else 'N/A'
-            nombre_socio = pago.get('nombre_miembro', 'N/A')
-            
-            registrado_por = "Sistema"
-            
-            # Manejo de fecha
-            fecha_pago = pago.get('fecha_pago')
-            if fecha_pago:
-                if isinstance(fecha_pago, str):
-                    fecha_str = fecha_pago
-                else:
-                    fecha_str = fecha_pago.strftime('%d/%m/%Y %H:%M')
-            else:
-                fecha_str = ""
-            
-            ws.append([
-                pago.get('id', ''),
-                fecha_str,
-                numero_socio,
-                nombre_socio,
-                pago.get('concepto', 'Cuota mensual'),
-                f"${pago.get('monto', 0):,.2f}",
-                pago.get('metodo_pago', ''),
-                pago.get('estado', ''),
-                "",  # mes_anio (opcional)
-                registrado_por,
-                pago.get('observaciones', '')
-            ])
-            
-            if pago.get('estado') != "ANULADO":
-                total_monto += pago.get('monto', 0)
-        
-        # Fila de total
-        ws.append([])
-        total_row = ws.max_row
-        ws[f'E{total_row}'] = "TOTAL:"
-        ws[f'E{total_row}'].font = Font(bold=True)
-        ws[f'F{total_row}'] = f"${total_monto:,.2f}"
-        ws[f'F{total_row}'].font = Font(bold=True, color="006600")
-        
-        # Aplicar estilos
-        ExportService._apply_header_style(ws)
-        ExportService._auto_adjust_columns(ws)
-        ExportService._add_metadata(ws, "Listado de Pagos")
-        
-        # Congelar primera fila
-        ws.freeze_panes = "A4"
-        
-        # Guardar en BytesIO
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer
-    
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow([c.titulo for c in proyeccion.columnas])
+
+        db = session_factory()
+        try:
+            for i, fila in enumerate(proyeccion.filas(db), start=1):
+                writer.writerow(fila)
+                if i % filas_por_bloque == 0:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate(0)
+        finally:
+            db.close()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def parquet_disponible() -> bool:
+        """True si pyarrow está instalado"""
+        return _PYARROW_AVAILABLE
+
     @staticmethod
-    def exportar_morosidad_excel(morosos: List[dict]) -> BytesIO:
+    def generar_parquet(
+        db: Session,
+        proyeccion: Proyeccion,
+        filas_por_grupo: int = FILAS_POR_GRUPO_PARQUET
+    ) -> BinaryIO:
         """
-        Exportar reporte de morosidad a Excel
-        
-        Args:
-            morosos: Lista de diccionarios con datos de morosos
-        
+        Generar la proyección como Parquet (compresión snappy)
+
+        Cada grupo de filas se transpone a columnas tipadas (date32,
+        timestamp UTC, float64, int64, string) y se escribe como un row
+        group, de modo que solo un grupo está en memoria a la vez.
+
         Returns:
-            BytesIO: Archivo Excel como objeto BytesIO
+            Archivo temporal posicionado al inicio (se elimina al cerrarlo)
+
+        Raises:
+            RuntimeError: si pyarrow no está instalado
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Morosidad"
-        
-        # Headers
-        headers = [
-            "N° Socio",
-            "DNI",
-            "Nombre Completo",
-            "Email",
-            "Teléfono",
-            "Categoría",
-            "Cuota Mensual",
-            "Deuda Total",
-            "Días de Mora",
-            "Último Pago",
-            "Estado"
+        if not _PYARROW_AVAILABLE:
+            raise RuntimeError("Formato parquet no disponible: instalar pyarrow")
+
+        tipos = [ExportService._tipo_arrow(c) for c in proyeccion.columnas]
+        schema = pa.schema([(c.campo, t) for c, t in zip(proyeccion.columnas, tipos)])
+
+        archivo = tempfile.TemporaryFile()
+        with pq.ParquetWriter(archivo, schema, compression="snappy") as writer:
+            filas = proyeccion.filas(db)
+            while True:
+                grupo = list(islice(filas, filas_por_grupo))
+                if not grupo:
+                    break
+                columnas = zip(*grupo)
+                writer.write_batch(pa.record_batch(
+                    [pa.array(valores, type=t) for valores, t in zip(columnas, tipos)],
+                    schema=schema
+                ))
+        archivo.seek(0)
+        return archivo
+
+    @staticmethod
+    def iterar_archivo(archivo: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Transmitir un archivo en bloques y cerrarlo al terminar"""
+        try:
+            while True:
+                bloque = archivo.read(chunk_size)
+                if not bloque:
+                    break
+                yield bloque
+        finally:
+            archivo.close()
+
+    # ==================== INTERNO ====================
+
+    @staticmethod
+    def _tipo_arrow(columna: Columna):
+        """Tipo pyarrow de cada tipo de columna"""
+        return {
+            "entero": pa.int64(),
+            "decimal": pa.float64(),
+            "moneda": pa.float64(),
+            "fecha": pa.date32(),
+            "fecha_hora": pa.timestamp("us", tz="UTC"),
+        }.get(columna.tipo, pa.string())
+
+    @staticmethod
+    def _estimar_anchos(columnas: List[Columna], muestra: List[Sequence]) -> List[int]:
+        """Ancho por columna según el texto más largo de la muestra"""
+        anchos = []
+        for i, columna in enumerate(columnas):
+            largo = len(columna.titulo)
+            if columna.tipo in _ANCHOS_FIJOS:
+                largo = max(largo, _ANCHOS_FIJOS[columna.tipo])
+            else:
+                for fila in muestra:
+                    valor = fila[i]
+                    if columna.tipo in ("moneda", "decimal") and isinstance(valor, (int, float)):
+                        texto = f"${valor:,.2f}"
+                    else:
+                        texto = "" if valor is None else str(valor)
+                    largo = max(largo, len(texto))
+            anchos.append(min(largo + 2, ANCHO_MAXIMO))
+        return anchos
+
+    @staticmethod
+    def _celda(ws, valor, font=None, fill=None, number_format=None, alignment=None, border=None) -> WriteOnlyCell:
+        celda = WriteOnlyCell(ws, value=valor)
+        if font is not None:
+            celda.font = font
+        if fill is not None:
+            celda.fill = fill
+        if number_format is not None:
+            celda.number_format = number_format
+        if alignment is not None:
+            celda.alignment = alignment
+        if border is not None:
+            celda.border = border
+        return celda
+
+    @staticmethod
+    def _encabezados(ws, columnas: List[Columna]) -> list:
+        """Fila de encabezados con el estilo de la organización"""
+        fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        font = Font(bold=True, color="FFFFFF", size=11)
+        alignment = Alignment(horizontal="center", vertical="center")
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        return [
+            ExportService._celda(ws, c.titulo, font=font, fill=fill, alignment=alignment, border=border)
+            for c in columnas
         ]
-        ws.append(headers)
-        
-        # Datos
-        total_deuda = 0
-        for moroso in morosos:
-            ws.append([
-                moroso.get("numero_miembro", ""),
-                moroso.get("dni", ""),
-                moroso.get("nombre_completo", ""),
-                moroso.get("email", "Sin email"),
-                moroso.get("telefono", "Sin teléfono"),
-                moroso.get("categoria", "Sin categoría"),
-                f"${moroso.get('cuota_mensual', 0):,.2f}",
-                f"${moroso.get('deuda', 0):,.2f}",
-                moroso.get("dias_mora", 0),
-                moroso.get("ultimo_pago", "Nunca"),
-                moroso.get("estado", "MOROSO")
-            ])
-            total_deuda += moroso.get("deuda", 0)
-        
-        # Fila de totales
-        ws.append([])
-        summary_row = ws.max_row
-        ws[f'A{summary_row}'] = "RESUMEN:"
-        ws[f'A{summary_row}'].font = Font(bold=True, size=12)
-        
-        ws.append([])
-        ws.append([
-            "",
-            "",
-            "",
-            "",
-            "",
-            "Total Socios Morosos:",
-            len(morosos),
-            "Deuda Total:",
-            f"${total_deuda:,.2f}",
-            "",
-            ""
-        ])
-        
-        summary_data_row = ws.max_row
-        ws[f'F{summary_data_row}'].font = Font(bold=True)
-        ws[f'H{summary_data_row}'].font = Font(bold=True)
-        ws[f'I{summary_data_row}'].font = Font(bold=True, color="CC0000")
-        
-        # Aplicar estilos
-        ExportService._apply_header_style(ws)
-        ExportService._auto_adjust_columns(ws)
-        ExportService._add_metadata(ws, "Reporte de Morosidad")
-        
-        # Congelar primera fila
-        ws.freeze_panes = "A4"
-        
-        # Resaltar filas según días de mora
-        red_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-        orange_fill = PatternFill(start_color="FFF4E6", end_color="FFF4E6", fill_type="solid")
-        
-        for row in range(4, ws.max_row - 2):  # Excluir headers y resumen
-            dias_mora_cell = ws[f'I{row}']
-            try:
-                dias_mora = int(dias_mora_cell.value) if dias_mora_cell.value else 0
-                if dias_mora > 30:
-                    for col in range(1, 12):
-                        ws.cell(row=row, column=col).fill = red_fill
-                elif dias_mora > 15:
-                    for col in range(1, 12):
-                        ws.cell(row=row, column=col).fill = orange_fill
-            except:
-                pass
-        
-        # Guardar en BytesIO
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer
-    
+
     @staticmethod
-    def exportar_accesos_excel(accesos: List[dict]) -> BytesIO:
-        """
-        Exportar historial de accesos a Excel
-        
-        Args:
-            accesos: Lista de diccionarios con datos de accesos
-        
-        Returns:
-            BytesIO: Archivo Excel como objeto BytesIO
-        """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Accesos"
-        
-        # Headers
-        headers = [
-            "ID",
-            "Fecha/Hora",
-            "N° Socio",
-            "Nombre Socio",
-            "Tipo Acceso",
-            "Resultado",
-            "Ubicación",
-            "Dispositivo",
-            "Observaciones"
+    def _fila_con_estilo(ws, fila: Sequence, formatos: list, relleno) -> list:
+        """Fila con formato numérico/fecha por columna y relleno opcional"""
+        if relleno is None:
+            return [
+                ExportService._celda(ws, valor, number_format=fmt) if fmt else valor
+                for valor, fmt in zip(fila, formatos)
+            ]
+        return [
+            ExportService._celda(ws, valor, fill=relleno, number_format=fmt)
+            for valor, fmt in zip(fila, formatos)
         ]
-        ws.append(headers)
-        
-        # Contadores
-        total_exitosos = 0
-        total_denegados = 0
-        
-        # Datos
-        for acceso in accesos:
-            resultado = acceso.get("permitido", False)
-            if resultado:
-                total_exitosos += 1
+
+    @staticmethod
+    def _fila_resumen(ws, fila: Sequence) -> list:
+        """Fila de resumen: etiquetas en negrita, importes con formato moneda"""
+        celdas = []
+        for valor in fila:
+            if isinstance(valor, str) and valor:
+                celdas.append(ExportService._celda(ws, valor, font=Font(bold=True)))
+            elif isinstance(valor, float):
+                celdas.append(ExportService._celda(
+                    ws, valor, font=Font(bold=True), number_format=_FORMATOS["moneda"]
+                ))
             else:
-                total_denegados += 1
-            
-            ws.append([
-                acceso.get("id", ""),
-                acceso.get("fecha_hora", ""),
-                acceso.get("numero_miembro", ""),
-                acceso.get("nombre_socio", ""),
-                acceso.get("tipo_acceso", "QR"),
-                "EXITOSO" if resultado else "DENEGADO",
-                acceso.get("ubicacion", "Principal"),
-                acceso.get("dispositivo_id", "N/A"),
-                acceso.get("motivo_denegacion", "") if not resultado else ""
-            ])
-        
-        # Resumen
-        ws.append([])
-        summary_row = ws.max_row
-        ws[f'A{summary_row}'] = "ESTADÍSTICAS:"
-        ws[f'A{summary_row}'].font = Font(bold=True, size=12)
-        
-        ws.append([
-            "",
-            "Total Accesos:",
-            len(accesos),
-            "",
-            "Exitosos:",
-            total_exitosos,
-            "",
-            "Denegados:",
-            total_denegados
-        ])
-        
-        stats_row = ws.max_row
-        ws[f'B{stats_row}'].font = Font(bold=True)
-        ws[f'E{stats_row}'].font = Font(bold=True)
-        ws[f'F{stats_row}'].font = Font(color="006600")
-        ws[f'H{stats_row}'].font = Font(bold=True)
-        ws[f'I{stats_row}'].font = Font(color="CC0000")
-        
-        # Aplicar estilos
-        ExportService._apply_header_style(ws)
-        ExportService._auto_adjust_columns(ws)
-        ExportService._add_metadata(ws, "Historial de Accesos")
-        
-        # Congelar primera fila
-        ws.freeze_panes = "A4"
-        
-        # Colorear según resultado
-        green_fill = PatternFill(start_color="E6F4EA", end_color="E6F4EA", fill_type="solid")
-        red_fill = PatternFill(start_color="FCE8E6", end_color="FCE8E6", fill_type="solid")
-        
-        for row in range(4, ws.max_row - 1):
-            resultado_cell = ws[f'F{row}']
-            if resultado_cell.value == "EXITOSO":
-                for col in range(1, 10):
-                    ws.cell(row=row, column=col).fill = green_fill
-            elif resultado_cell.value == "DENEGADO":
-                for col in range(1, 10):
-                    ws.cell(row=row, column=col).fill = red_fill
-        
-        # Guardar en BytesIO
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer
\ No newline at end of file
+                celdas.append(valor)
+        return celdas
@@ -0,0 +1,245 @@
+"""
+Pool de conexiones SMTP persistentes para envíos masivos
+backend/app/services/mail_pool.py
+
+Antes cada recordatorio abría una conexión nueva (TCP + STARTTLS + login) y
+la cerraba al terminar. El pool mantiene hasta SMTP_POOL_SIZE conexiones ya
+autenticadas y las reutiliza:
+- enviar():       toma una conexión libre, envía y la devuelve al pool.
+- enviar_lote():  reparte los mensajes entre SMTP_POOL_SIZE threads, cada uno
+                  con su propia conexión (smtplib no es thread-safe).
+
+Cada conexión respeta un límite de SMTP_POOL_RATE_PER_SECOND mensajes por
+segundo (los proveedores bloquean ráfagas). Si el servidor corta la conexión
+(desconexión, 421, timeout) se reconecta y se reintenta el mensaje hasta
+SMTP_POOL_MAX_RETRIES veces; los rechazos definitivos (5xx, destinatario
+inválido) no se reintentan.
+"""
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import List, Optional
+
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Modos de conexión soportados
+MODOS = ("starttls", "ssl", "plano")
+
+
+class _ConexionSMTP:
+    """Conexión del pool: sesión smtplib + control de ritmo propio"""
+
+    def __init__(self, pool: "SMTPPool"):
+        self.pool = pool
+        self.smtp: Optional[smtplib.SMTP] = None
+        self.ultimo_uso = 0.0
+        self.proximo_envio = 0.0
+
+    def asegurar(self) -> smtplib.SMTP:
+        """Devolver la sesión abierta, reconectando si hace falta"""
+        if self.smtp is not None and time.monotonic() - self.ultimo_uso > self.pool.idle_segundos:
+            # Los servidores cierran sesiones ociosas: verificar antes de usarla
+            try:
+                codigo, _ = self.smtp.noop()
+                if codigo != 250:
+                    self.cerrar()
+            except (smtplib.SMTPException, OSError):
+                self.cerrar()
+        if self.smtp is None:
+            self.smtp = self.pool._conectar()
+        return self.smtp
+
+    def esperar_turno(self) -> None:
+        """Aplicar el límite de mensajes por segundo de esta conexión"""
+        if self.pool.intervalo <= 0:
+            return
+        ahora = time.monotonic()
+        if self.proximo_envio > ahora:
+            time.sleep(self.proximo_envio - ahora)
+            ahora = self.proximo_envio
+        self.proximo_envio = ahora + self.pool.intervalo
+
+    def cerrar(self) -> None:
+        """Cerrar la sesión (QUIT si el servidor sigue respondiendo)"""
+        if self.smtp is None:
+            return
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+        self.smtp = None
+
+
+class SMTPPool:
+    """Pool de conexiones SMTP autenticadas, seguro entre threads"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        usuario: Optional[str] = None,
+        password: Optional[str] = None,
+        modo: str = "starttls",
+        tamaño: int = 4,
+        envios_por_segundo: float = 0.0,
+        max_reintentos: int = 2,
+        timeout: float = 30.0,
+        idle_segundos: float = 60.0
+    ):
+        if modo not in MODOS:
+            raise ValueError(f"Modo SMTP inválido: {modo}")
+        self.host = host
+        self.port = port
+        self.usuario = usuario
+        self.password = password
+        self.modo = modo
+        self.tamaño = max(1, tamaño)
+        self.intervalo = 1 / envios_por_segundo if envios_por_segundo > 0 else 0.0
+        self.max_reintentos = max_reintentos
+        self.timeout = timeout
+        self.idle_segundos = idle_segundos
+
+        # LIFO: se reutiliza primero la conexión usada más recientemente
+        self._libres: "queue.LifoQueue[_ConexionSMTP]" = queue.LifoQueue()
+        for _ in range(self.tamaño):
+            self._libres.put(_ConexionSMTP(self))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_settings(cls) -> "SMTPPool":
+        """Crear el pool con la configuración SMTP de settings"""
+        if not settings.SMTP_HOST or not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+            raise ValueError("Configuración SMTP incompleta")
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            usuario=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            modo="starttls" if settings.SMTP_TLS else "ssl",
+            tamaño=settings.SMTP_POOL_SIZE,
+            envios_por_segundo=settings.SMTP_POOL_RATE_PER_SECOND,
+            max_reintentos=settings.SMTP_POOL_MAX_RETRIES,
+            timeout=settings.SMTP_TIMEOUT,
+            idle_segundos=settings.SMTP_POOL_IDLE_SECONDS,
+        )
+
+    # ==================== ENVÍO ====================
+
+    def enviar(self, msg: Message) -> None:
+        """
+        Enviar un mensaje usando una conexión del pool
+
+        Bloquea hasta que haya una conexión libre.
+
+        Raises:
+            smtplib.SMTPException / OSError: si el envío falla definitivamente
+        """
+        conexion = self._libres.get()
+        try:
+            self._enviar_con(conexion, msg)
+        finally:
+            self._libres.put(conexion)
+
+    def enviar_lote(self, mensajes: List[Message]) -> List[Optional[str]]:
+        """
+        Enviar varios mensajes en paralelo (un thread por conexión)
+
+        Returns:
+            Un elemento por mensaje, en el mismo orden: None si se envió,
+            o el texto del error si falló
+        """
+        if not mensajes:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.tamaño, len(mensajes)), thread_name_prefix="smtp") as executor:
+            return list(executor.map(self._intentar, mensajes))
+
+    def cerrar(self) -> None:
+        """Cerrar todas las conexiones libres del pool"""
+        with self._lock:
+            conexiones = []
+            while True:
+                try:
+                    conexiones.append(self._libres.get_nowait())
+                except queue.Empty:
+                    break
+            for conexion in conexiones:
+                conexion.cerrar()
+                self._libres.put(conexion)
+
+    # ==================== INTERNO ====================
+
+    def _intentar(self, msg: Message) -> Optional[str]:
+        """
+        enviar() devolviendo el error como texto en lugar de lanzarlo
+
+        Cualquier error queda como falla de ese destinatario: el resto del
+        lote se sigue enviando.
+        """
+        try:
+            self.enviar(msg)
+            return None
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning(f"[WARN] Email a {msg.get('To')} no enviado: {e}")
+            return str(e)
+        except Exception as e:
+            # Error del mensaje (codificación, contenido inválido): no del servidor
+            logger.error(f"[ERROR] Email a {msg.get('To')} no enviado: {e}", exc_info=True)
+            return str(e) or type(e).__name__
+
+    def _conectar(self) -> smtplib.SMTP:
+        """Abrir y autenticar una sesión nueva"""
+        if self.modo == "ssl":
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.modo == "starttls":
+                smtp.starttls()
+        try:
+            if self.usuario:
+                smtp.login(self.usuario, self.password or "")
+        except Exception:
+            smtp.close()
+            raise
+        logger.debug(f"Conexión SMTP abierta con {self.host}:{self.port}")
+        return smtp
+
+    def _enviar_con(self, conexion: _ConexionSMTP, msg: Message) -> None:
+        """Enviar por una conexión, reconectando ante cortes del servidor"""
+        for intento in range(self.max_reintentos + 1):
+            try:
+                smtp = conexion.asegurar()
+                conexion.esperar_turno()
+                smtp.send_message(msg)
+                conexion.ultimo_uso = time.monotonic()
+                metrics.inc_mail("enviado")
+                return
+            except Exception as e:
+                if not self._es_recuperable(e):
+                    metrics.inc_mail("rechazado")
+                    raise
+                conexion.cerrar()
+                if intento == self.max_reintentos:
+                    metrics.inc_mail("fallido")
+                    raise
+                metrics.inc_mail("reintento")
+                logger.warning(f"[WARN] Conexión SMTP perdida ({e}), reintentando ({intento + 1}/{self.max_reintentos})")
+                time.sleep(min(0.5 * 2 ** intento, 5))
+
+    @staticmethod
+    def _es_recuperable(error: Exception) -> bool:
+        """True si el error se resuelve reconectando (corte, 421, red)"""
+        if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code == 421
+        if isinstance(error, smtplib.SMTPException):
+            # Destinatarios rechazados, autenticación, etc.
+            return False
+        return isinstance(error, OSError)
@@ -0,0 +1,404 @@
+"""
+Cola persistente de envíos masivos de notificaciones
+backend/app/services/notification_jobs.py
+
+POST /api/notificaciones/recordatorios-masivos solo crea el trabajo: una fila
+en notificacion_jobs y una por destinatario en notificacion_envios, en la
+misma transacción. Un worker (embebido en la API o aparte con
+scripts/notification_worker.py) lo procesa en lotes:
+
+1. Reserva el job con un UPDATE condicional (worker_id + lease_hasta). Si el
+   proceso muere, al vencer el lease otro worker lo retoma.
+2. Toma hasta NOTIFICATION_JOB_BATCH_SIZE envíos PENDIENTES ya vencidos, los
+   manda por el SMTPPool y guarda el resultado de cada uno y los contadores
+   del job en un commit por lote (GET /jobs/{id} ve el avance).
+3. Un envío fallido se reprograma con backoff exponencial hasta
+   NOTIFICATION_JOB_MAX_ATTEMPTS intentos.
+
+Cada destinatario tiene su propio estado, así que reprocesar un job no
+reenvía lo ya ENVIADO. Si el proceso muere entre el envío SMTP y el commit,
+ese único lote puede reenviarse (entrega al menos una vez).
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.miembro import Miembro
+from app.models.notificacion import NotificacionJob, NotificacionEnvio, EstadoJob, EstadoEnvio
+from app.services.notification_service import NotificationService
+from app.utils.helpers import ahora_utc
+
+logger = logging.getLogger(__name__)
+
+TIPO_RECORDATORIO = "recordatorio_cuota"
+
+# Estados de job que un worker puede tomar
+_ESTADOS_ACTIVOS = (EstadoJob.PENDIENTE, EstadoJob.EN_CURSO)
+
+
+class NotificationJobService:
+    """Alta, consulta y procesamiento de trabajos de notificación"""
+
+    @staticmethod
+    def crear_recordatorios(
+        db: Session,
+        solo_morosos: bool,
+        dias_mora_minimo: int,
+        usuario_id: Optional[int] = None
+    ) -> NotificacionJob:
+        """
+        Encolar un envío masivo de recordatorios de cuota
+
+        Los destinatarios se fijan al crear el job (mismo criterio que el
+        preview) con un único INSERT ... SELECT: los socios no pasan por
+        Python. Al enviar se vuelve a verificar que sigan con deuda.
+
+        Returns:
+            Job creado (COMPLETADO de entrada si no hay destinatarios)
+        """
+        job = NotificacionJob(
+            tipo=TIPO_RECORDATORIO,
+            estado=EstadoJob.PENDIENTE,
+            parametros={"solo_morosos": solo_morosos, "dias_mora_minimo": dias_mora_minimo},
+            total=0,
+            enviados=0,
+            fallidos=0,
+            omitidos=0,
+            creado_por_id=usuario_id,
+        )
+        db.add(job)
+        db.flush()
+
+        destinatarios = select(
+            literal(job.id),
+            Miembro.id,
+            Miembro.email,
+            literal(EstadoEnvio.PENDIENTE, NotificacionEnvio.estado.type),
+            literal(0),
+        ).where(*NotificationService.filtros_destinatarios(solo_morosos, dias_mora_minimo))
+        db.execute(insert(NotificacionEnvio).from_select(
+            ["job_id", "miembro_id", "email", "estado", "intentos"],
+            destinatarios
+        ))
+
+        job.total = db.query(func.count(NotificacionEnvio.id)).filter(
+            NotificacionEnvio.job_id == job.id
+        ).scalar()
+        if job.total == 0:
+            job.estado = EstadoJob.COMPLETADO
+            job.finalizado_at = ahora_utc()
+        db.commit()
+        db.refresh(job)
+
+        logger.info(f"[OK] Job de notificaciones {job.id} encolado ({job.total} destinatarios)")
+        return job
+
+    @staticmethod
+    def obtener(db: Session, job_id: int) -> Optional[NotificacionJob]:
+        """Job por ID (None si no existe)"""
+        return db.query(NotificacionJob).filter(NotificacionJob.id == job_id).first()
+
+    @staticmethod
+    def reclamar(db: Session, worker_id: str, excluir: Sequence[int] = ()) -> Optional[int]:
+        """
+        Reservar el próximo job disponible para este worker
+
+        Disponible = PENDIENTE/EN_CURSO sin lease o con lease vencido. La
+        reserva es un UPDATE condicional, así que entre varios workers solo
+        uno la obtiene.
+
+        Args:
+            db: Sesión de base de datos
+            worker_id: Identificador del worker
+            excluir: Jobs ya procesados en esta pasada (solo con reintentos futuros)
+
+        Returns:
+            ID del job reservado o None
+        """
+        ahora = ahora_utc()
+        disponible = (
+            NotificacionJob.estado.in_(_ESTADOS_ACTIVOS),
+            or_(NotificacionJob.lease_hasta.is_(None), NotificacionJob.lease_hasta < ahora),
+        )
+        query = db.query(NotificacionJob.id).filter(*disponible)
+        if excluir:
+            query = query.filter(NotificacionJob.id.notin_(excluir))
+        candidatos = [job_id for (job_id,) in query.order_by(NotificacionJob.id).limit(5)]
+        for job_id in candidatos:
+            resultado = db.execute(
+                update(NotificacionJob)
+                .where(NotificacionJob.id == job_id, *disponible)
+                .values(
+                    estado=EstadoJob.EN_CURSO,
+                    worker_id=worker_id,
+                    lease_hasta=ahora + timedelta(seconds=settings.NOTIFICATION_JOB_LEASE_SECONDS),
+                )
+            )
+            db.commit()
+            if resultado.rowcount == 1:
+                return job_id
+        return None
+
+    @staticmethod
+    def procesar(
+        db: Session,
+        job_id: int,
+        pool,
+        lote: Optional[int] = None,
+        debe_parar: Callable[[], bool] = lambda: False
+    ) -> int:
+        """
+        Procesar un job reservado hasta terminarlo o quedar solo con reintentos
+
+        Args:
+            db: Sesión de base de datos
+            job_id: Job reservado con reclamar()
+            pool: SMTPPool (o compatible con enviar_lote)
+            lote: Destinatarios por lote (default: NOTIFICATION_JOB_BATCH_SIZE)
+            debe_parar: Se consulta entre lotes (cierre del worker)
+
+        Returns:
+            Cantidad de envíos procesados
+        """
+        lote = lote or settings.NOTIFICATION_JOB_BATCH_SIZE
+        job = db.get(NotificacionJob, job_id)
+        if job.iniciado_at is None:
+            job.iniciado_at = ahora_utc()
+            db.commit()
+
+        procesados = 0
+        while not debe_parar():
+            ahora = ahora_utc()
+            envios = (
+                db.query(NotificacionEnvio)
+                .filter(
+                    NotificacionEnvio.job_id == job_id,
+                    NotificacionEnvio.estado == EstadoEnvio.PENDIENTE,
+                    or_(NotificacionEnvio.proximo_intento.is_(None), NotificacionEnvio.proximo_intento <= ahora),
+                )
+                .order_by(NotificacionEnvio.id)
+                .limit(lote)
+                .all()
+            )
+            if not envios:
+                break
+            NotificationJobService._enviar_lote(db, job, envios, pool)
+            procesados += len(envios)
+
+        NotificationJobService._liberar(db, job)
+        return procesados
+
+    @staticmethod
+    def marcar_fallido(db: Session, job_id: int, error: str) -> None:
+        """Terminar el job por un error general (p.ej. SMTP sin configurar)"""
+        db.rollback()
+        job = db.get(NotificacionJob, job_id)
+        job.estado = EstadoJob.FALLIDO
+        job.error = error[:1000]
+        job.finalizado_at = ahora_utc()
+        job.worker_id = None
+        job.lease_hasta = None
+        db.commit()
+        logger.error(f"[ERROR] Job de notificaciones {job_id} fallido: {error}")
+
+    # ==================== INTERNO ====================
+
+    @staticmethod
+    def _enviar_lote(db: Session, job: NotificacionJob, envios: List[NotificacionEnvio], pool) -> None:
+        """Enviar un lote y guardar el resultado de cada destinatario en un commit"""
+        miembros = {
+            m.id: m for m in
+            db.query(Miembro)
+            .options(joinedload(Miembro.categoria))
+            .filter(Miembro.id.in_([e.miembro_id for e in envios]))
+        }
+
+        a_enviar, mensajes = [], []
+        for envio in envios:
+            miembro = miembros.get(envio.miembro_id)
+            if miembro is None or miembro.is_deleted or miembro.saldo_cuenta >= 0:
+                # Pagó o fue dado de baja desde que se creó el job
+                envio.estado = EstadoEnvio.OMITIDO
+                job.omitidos += 1
+                continue
+            msg = NotificationService._crear_email_recordatorio(
+                miembro=miembro,
+                deuda=abs(miembro.saldo_cuenta),
+                dias_mora=miembro.dias_mora or 0
+            )
+            del msg["To"]
+            msg["To"] = envio.email
+            a_enviar.append(envio)
+            mensajes.append(msg)
+
+        errores = pool.enviar_lote(mensajes) if mensajes else []
+
+        ahora = ahora_utc()
+        for envio, error in zip(a_enviar, errores):
+            envio.intentos += 1
+            if error is None:
+                envio.estado = EstadoEnvio.ENVIADO
+                envio.enviado_at = ahora
+                envio.ultimo_error = None
+                job.enviados += 1
+            elif envio.intentos >= settings.NOTIFICATION_JOB_MAX_ATTEMPTS:
+                envio.estado = EstadoEnvio.FALLIDO
+                envio.ultimo_error = error[:500]
+                job.fallidos += 1
+            else:
+                espera = settings.NOTIFICATION_JOB_RETRY_BASE_SECONDS * 2 ** (envio.intentos - 1)
+                envio.proximo_intento = ahora + timedelta(seconds=espera)
+                envio.ultimo_error = error[:500]
+
+        # Renovar la reserva: el lote terminó y el worker sigue vivo
+        job.lease_hasta = ahora + timedelta(seconds=settings.NOTIFICATION_JOB_LEASE_SECONDS)
+        db.commit()
+
+    @staticmethod
+    def _liberar(db: Session, job: NotificacionJob) -> None:
+        """Completar el job si no quedan pendientes, o liberarlo hasta el próximo reintento"""
+        quedan = db.query(NotificacionEnvio.id).filter(
+            NotificacionEnvio.job_id == job.id,
+            NotificacionEnvio.estado == EstadoEnvio.PENDIENTE
+        ).first() is not None
+
+        if not quedan:
+            job.estado = EstadoJob.COMPLETADO
+            job.finalizado_at = ahora_utc()
+            logger.info(
+                f"[OK] Job de notificaciones {job.id} completado: "
+                f"{job.enviados} enviados, {job.fallidos} fallidos, {job.omitidos} omitidos"
+            )
+        job.worker_id = None
+        job.lease_hasta = None
+        db.commit()
+
+
+class NotificationWorker:
+    """
+    Worker que procesa la cola de notificaciones
+
+    Puede correr dentro de la API (start/stop desde el lifespan, sondeando
+    en un thread para no bloquear el event loop) o como proceso aparte con
+    run_forever().
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        pool_factory=NotificationService.obtener_pool,
+        intervalo: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.session_factory = session_factory
+        self.pool_factory = pool_factory
+        self.intervalo = intervalo if intervalo is not None else settings.NOTIFICATION_WORKER_POLL_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._parar = threading.Event()
+        self._despertar: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tarea: Optional[asyncio.Task] = None
+
+    def ejecutar_una_vez(self) -> int:
+        """
+        Procesar todos los jobs disponibles ahora
+
+        Returns:
+            Cantidad de envíos procesados
+        """
+        procesados = 0
+        vistos: List[int] = []
+        db = self.session_factory()
+        try:
+            while not self._parar.is_set():
+                job_id = NotificationJobService.reclamar(db, self.worker_id, excluir=vistos)
+                if job_id is None:
+                    break
+                vistos.append(job_id)
+                try:
+                    pool = self.pool_factory()
+                    procesados += NotificationJobService.procesar(
+                        db, job_id, pool, debe_parar=self._parar.is_set
+                    )
+                except Exception as e:
+                    NotificationJobService.marcar_fallido(db, job_id, str(e))
+        finally:
+            db.close()
+        return procesados
+
+    def run_forever(self) -> None:
+        """Bucle bloqueante para el proceso worker dedicado"""
+        logger.info(f"[OK] Worker de notificaciones {self.worker_id} iniciado (cada {self.intervalo}s)")
+        while not self._parar.is_set():
+            try:
+                self.ejecutar_una_vez()
+            except Exception as e:
+                logger.error(f"[ERROR] Worker de notificaciones: {e}")
+            self._parar.wait(self.intervalo)
+
+    def detener(self) -> None:
+        """Pedir al bucle que termine después del lote en curso"""
+        self._parar.set()
+
+    # ==================== MODO EMBEBIDO ====================
+
+    async def start(self) -> None:
+        """Iniciar el sondeo en el event loop actual"""
+        if self._tarea is not None and not self._tarea.done():
+            return
+        self._parar.clear()
+        self._despertar = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._tarea = asyncio.create_task(self._run(), name="notification-worker")
+        logger.info(f"[OK] Worker de notificaciones embebido iniciado (cada {self.intervalo}s)")
+
+    async def stop(self) -> None:
+        """Detener el sondeo (espera a que termine el lote en curso)"""
+        if self._tarea is None:
+            return
+        self.detener()
+        self._despertar.set()
+        try:
+            await self._tarea
+        finally:
+            self._tarea = None
+        logger.info("[OK] Worker de notificaciones detenido")
+
+    def despertar(self) -> None:
+        """
+        Procesar sin esperar al próximo sondeo (job recién encolado)
+
+        Se puede llamar desde cualquier thread (endpoints def del threadpool).
+        """
+        if self._despertar is None or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._despertar.set)
+        except RuntimeError:
+            # Event loop cerrado (shutdown)
+            pass
+
+    async def _run(self) -> None:
+        while not self._parar.is_set():
+            try:
+                await asyncio.to_thread(self.ejecutar_una_vez)
+            except Exception as e:
+                logger.error(f"[ERROR] Worker de notificaciones: {e}")
+            try:
+                await asyncio.wait_for(self._despertar.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despertar.clear()
+
+
+# Instancia global (embebida en la API si NOTIFICATION_WORKER_EMBEDDED)
+notification_worker = NotificationWorker()
@@ -1,24 +1,77 @@
 """
 Servicio de Notificaciones por Email
 backend/app/services/notification_service.py
+
+Los recordatorios se envían por un SMTPPool compartido (ver mail_pool.py):
+conexiones autenticadas reutilizables y envíos concurrentes, ejecutados
+fuera del event loop.
 """
+import asyncio
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, Dict, Any
 from datetime import datetime
 import logging
 
-from sqlalchemy.orm import Session
-from app.models.miembro import Miembro
+from sqlalchemy.orm import Session, joinedload
+from app.models.miembro import Miembro, EstadoMiembro
 from app.config import settings
+from app.services.mail_pool import SMTPPool
 
 logger = logging.getLogger(__name__)
 
+# Pool SMTP compartido (se crea al primer envío)
+_pool: Optional[SMTPPool] = None
+_pool_lock = threading.Lock()
+
 
 class NotificationService:
     """Servicio para envío de notificaciones por email"""
     
+    @staticmethod
+    def obtener_pool() -> SMTPPool:
+        """
+        Pool SMTP compartido, creado con la configuración de settings
+
+        Raises:
+            ValueError: si la configuración SMTP está incompleta
+        """
+        global _pool
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPPool.desde_settings()
+            return _pool
+    
+    @staticmethod
+    def cerrar_pool() -> None:
+        """Cerrar las conexiones del pool (shutdown de la app)"""
+        global _pool
+        with _pool_lock:
+            if _pool is not None:
+                _pool.cerrar()
+                _pool = None
+    
+    @staticmethod
+    def filtros_destinatarios(solo_morosos: bool, dias_mora_minimo: int) -> list:
+        """
+        Condiciones SQL de los socios que reciben recordatorios
+        
+        Socios no eliminados, con email, saldo negativo y al menos
+        dias_mora_minimo días de mora (opcionalmente solo en estado MOROSO).
+        Compartidas por el envío, el preview y la cola de trabajos.
+        """
+        filtros = [
+            Miembro.is_deleted == False,
+            Miembro.email.isnot(None),
+            Miembro.saldo_cuenta < 0,
+            Miembro.filtro_dias_mora(dias_mora_minimo),
+        ]
+        if solo_morosos:
+            filtros.append(Miembro.estado == EstadoMiembro.MOROSO)
+        return filtros
+    
     @staticmethod
     def _get_smtp_connection():
         """
@@ -78,7 +131,7 @@ Te recordamos que tienes una deuda pendiente de ${deuda:,.2f}.
 
 Días de mora: {dias_mora}
 Categoría: {miembro.categoria.nombre if miembro.categoria else 'N/A'}
-Cuota mensual: ${miembro.categoria.cuota_mensual if miembro.categoria else 0:,.2f}
+Cuota mensual: ${miembro.categoria.cuota_base if miembro.categoria else 0:,.2f}
 
 Por favor, acércate a nuestras oficinas para regularizar tu situación.
 
@@ -170,7 +223,7 @@ Este es un mensaje automático, por favor no responder.
                 <span class="info-label">Categoría:</span> {miembro.categoria.nombre if miembro.categoria else 'N/A'}
             </div>
             <div class="info-row">
-                <span class="info-label">Cuota Mensual:</span> ${miembro.categoria.cuota_mensual if miembro.categoria else 0:,.2f}
+                <span class="info-label">Cuota Mensual:</span> ${miembro.categoria.cuota_base if miembro.categoria else 0:,.2f}
             </div>
             
             <p style="margin-top: 20px;">
@@ -254,10 +307,9 @@ Este es un mensaje automático, por favor no responder.
             if email_override:
                 msg['To'] = email_override
             
-            # Enviar
-            smtp = NotificationService._get_smtp_connection()
-            smtp.send_message(msg)
-            smtp.quit()
+            # Enviar (fuera del event loop)
+            pool = NotificationService.obtener_pool()
+            await asyncio.to_thread(pool.enviar, msg)
             
             logger.info(f"Recordatorio enviado a {email_destino} (Socio: {miembro.numero_miembro})")
             
@@ -297,51 +349,38 @@ Este es un mensaje automático, por favor no responder.
         errores = []
         
         try:
-            # Construir query
-            query = db.query(Miembro).filter(
-                Miembro.is_deleted == False,
-                Miembro.email.isnot(None),
-                Miembro.saldo_cuenta < 0  # Tiene deuda
+            # Solo los destinatarios, filtrados en SQL (categoría precargada:
+            # la usa el cuerpo del email)
+            socios_filtrados = (
+                db.query(Miembro)
+                .options(joinedload(Miembro.categoria))
+                .filter(*NotificationService.filtros_destinatarios(solo_morosos, dias_mora_minimo))
+                .order_by(Miembro.id)
+                .all()
             )
             
-            # Filtro por estado
-            if solo_morosos:
-                from app.models.miembro import EstadoMiembro
-                query = query.filter(Miembro.estado == EstadoMiembro.MOROSO)
-            
-            socios = query.all()
+            logger.info(f"Enviando recordatorios a {len(socios_filtrados)} socios...")
             
-            # Filtrar por días de mora
-            socios_filtrados = [
-                s for s in socios
-                if (s.dias_mora or 0) >= dias_mora_minimo
+            mensajes = [
+                NotificationService._crear_email_recordatorio(
+                    miembro=socio,
+                    deuda=abs(socio.saldo_cuenta),
+                    dias_mora=socio.dias_mora or 0
+                )
+                for socio in socios_filtrados
             ]
             
-            logger.info(f"Enviando recordatorios a {len(socios_filtrados)} socios...")
+            # Envío concurrente por el pool, fuera del event loop
+            pool = NotificationService.obtener_pool()
+            resultados = await asyncio.to_thread(pool.enviar_lote, mensajes)
             
-            # Enviar a cada uno
-            for socio in socios_filtrados:
-                try:
-                    deuda = abs(socio.saldo_cuenta)
-                    dias_mora = socio.dias_mora or 0
-                    
-                    # Crear y enviar email
-                    msg = NotificationService._crear_email_recordatorio(
-                        miembro=socio,
-                        deuda=deuda,
-                        dias_mora=dias_mora
-                    )
-                    
-                    smtp = NotificationService._get_smtp_connection()
-                    smtp.send_message(msg)
-                    smtp.quit()
-                    
+            for socio, error in zip(socios_filtrados, resultados):
+                if error is None:
                     enviados += 1
                     logger.info(f"✓ Enviado a {socio.email} ({socio.numero_miembro})")
-                
-                except Exception as e:
+                else:
                     fallidos += 1
-                    error_msg = f"Error con {socio.numero_miembro}: {str(e)}"
+                    error_msg = f"Error con {socio.numero_miembro}: {error}"
                     errores.append(error_msg)
                     logger.error(error_msg)
             
@@ -0,0 +1,125 @@
+"""
+Pool acotado para hash y verificación de contraseñas (bcrypt)
+backend/app/services/password_pool.py
+
+bcrypt cuesta ~100-300 ms de CPU por operación. Ejecutado dentro de un
+endpoint `async def` bloquea el event loop: en un cambio de turno, con todos
+los porteros iniciando sesión a la vez, se frena el resto del tráfico
+(incluido validar-qr).
+
+PasswordPool ejecuta cada operación en un ThreadPoolExecutor propio de
+PASSWORD_HASH_WORKERS threads (bcrypt libera el GIL mientras calcula) y
+admite como máximo PASSWORD_HASH_MAX_QUEUE operaciones esperando; por encima
+responde 503 con Retry-After en lugar de encolar sin límite. Registra la
+espera en cola y la duración de cada operación (password_hash_queue_seconds,
+password_hash_seconds).
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+from app import metrics
+from app.config import settings
+from app.utils.security import hash_password, verify_and_update_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordPool:
+    """Ejecutor de bcrypt con concurrencia y cola acotadas"""
+
+    def __init__(self, workers: int, max_cola: int):
+        self.workers = max(1, workers)
+        self.max_cola = max(0, max_cola)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Operaciones admitidas (en ejecución + esperando)
+        self._pendientes = 0
+
+    def _obtener_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    def _admitir(self) -> None:
+        """Reservar un lugar o rechazar con 503 si la cola está llena"""
+        with self._lock:
+            if self._pendientes >= self.workers + self.max_cola:
+                rechazar = True
+            else:
+                self._pendientes += 1
+                rechazar = False
+        if rechazar:
+            metrics.inc_password_hash_rechazado()
+            logger.warning("[WARN] Pool de contraseñas saturado: operación rechazada")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Demasiados inicios de sesión simultáneos, reintentar en unos segundos",
+                headers={"Retry-After": "1"}
+            )
+
+    def _liberar(self) -> None:
+        with self._lock:
+            self._pendientes -= 1
+
+    async def _ejecutar(self, operacion: str, funcion: Callable[..., T], *args) -> T:
+        """Ejecutar `funcion(*args)` en el pool midiendo espera y duración"""
+        self._admitir()
+        encolado = time.perf_counter()
+
+        def tarea():
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args)
+            finally:
+                metrics.observe_password_hash(operacion, inicio - encolado, time.perf_counter() - inicio)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._obtener_executor(), tarea)
+        finally:
+            self._liberar()
+
+    async def hashear(self, password: str) -> str:
+        """Hash bcrypt de una contraseña nueva"""
+        return await self._ejecutar("hash", hash_password, password)
+
+    async def verificar(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verificar una contraseña contra su hash
+
+        Returns:
+            (coincide, nuevo_hash): nuevo_hash no es None si el hash guardado
+            usa parámetros viejos (menos de BCRYPT_ROUNDS) y conviene
+            reemplazarlo
+        """
+        return await self._ejecutar("verify", verify_and_update_password, password, password_hash)
+
+    @property
+    def pendientes(self) -> int:
+        """Operaciones en ejecución o esperando"""
+        with self._lock:
+            return self._pendientes
+
+    def cerrar(self) -> None:
+        """Terminar los threads del pool (shutdown de la app)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_cola=settings.PASSWORD_HASH_MAX_QUEUE
+)
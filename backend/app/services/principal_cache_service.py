@@ -0,0 +1,93 @@
+"""
+Caché de usuarios autenticados (principal del JWT)
+backend/app/services/principal_cache_service.py
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.config import settings
+from app.models.usuario import Usuario, RolUsuario
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UsuarioPrincipal:
+    """
+    Foto inmutable del usuario de un token (sin password_hash)
+
+    Expone los mismos nombres de atributo que Usuario: los routers y
+    RoleChecker la usan igual que al modelo, y /me la serializa con
+    UsuarioResponse.
+    """
+    id: int
+    username: str
+    email: str
+    nombre: str
+    apellido: str
+    telefono: Optional[str]
+    rol: RolUsuario
+    is_active: bool
+    is_verified: bool
+    is_deleted: bool
+    last_login: Optional[str]
+    token_version: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @property
+    def nombre_completo(self) -> str:
+        return f"{self.apellido}, {self.nombre}"
+
+    @classmethod
+    def desde_usuario(cls, usuario: Usuario) -> "UsuarioPrincipal":
+        """Construir desde el modelo"""
+        return cls(**{f.name: getattr(usuario, f.name) for f in fields(cls)})
+
+
+class PrincipalCacheService:
+    """
+    Caché LRU/TTL en memoria de UsuarioPrincipal, por id de usuario
+
+    Cada entrada guarda la token_version con la que se leyó: un token con
+    otra versión no la usa. Los caminos que revocan tokens (cambio de
+    contraseña, de rol, activar/desactivar, baja) incrementan la versión
+    (Usuario.revocar_tokens) y llaman a invalidar(); con varios workers el
+    TTL acota cuánto puede sobrevivir un token revocado en los demás.
+    """
+
+    _cache = TTLCache(
+        "usuarios_principal",
+        max_size=settings.AUTH_PRINCIPAL_CACHE_MAX_SIZE,
+        ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    )
+
+    @staticmethod
+    def obtener(usuario_id: int, token_version: int) -> Optional[UsuarioPrincipal]:
+        """Principal cacheado para esa versión de token, o None"""
+        if not settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+            return None
+        principal = PrincipalCacheService._cache.get(usuario_id)
+        if principal is None or principal.token_version != token_version:
+            return None
+        return principal
+
+    @staticmethod
+    def guardar(principal: UsuarioPrincipal) -> None:
+        """Guardar/actualizar la entrada del usuario"""
+        if settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+            PrincipalCacheService._cache.set(principal.id, principal)
+
+    @staticmethod
+    def invalidar(usuario_id: int) -> None:
+        """Descartar la entrada de un usuario (tras revocar sus tokens)"""
+        PrincipalCacheService._cache.invalidate(usuario_id)
+        logger.debug(f"Caché de principal invalidada para usuario {usuario_id}")
+
+    @staticmethod
+    def limpiar() -> None:
+        """Vaciar la caché completa"""
+        PrincipalCacheService._cache.clear()
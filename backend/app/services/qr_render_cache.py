@@ -0,0 +1,154 @@
+"""
+Caché de imágenes QR renderizadas (PNG de credencial)
+backend/app/services/qr_render_cache.py
+
+La imagen de un socio depende solo de su qr_hash y de los parámetros de
+render (versión, corrección de errores, tamaño, borde, ORG_NAME, nombre y
+número impresos). La clave es un SHA256 de todo eso, así que una entrada
+nunca queda desactualizada: si algo cambia, cambia la clave.
+
+Dos niveles:
+- Memoria: LRU acotada por proceso (QR_RENDER_CACHE_MAX_SIZE).
+- Disco:   {UPLOAD_DIR}/qr_cache/{clave}.png, compartido entre workers y
+           reinicios. Se escribe con archivo temporal + rename atómico.
+
+La clave también se usa como ETag del endpoint /qr-image.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.models.miembro import Miembro
+from app.services.qr_service import QRService
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class QRRenderCache:
+    """Caché direccionada por contenido de PNGs de QR (memoria + disco)"""
+
+    _cache = TTLCache(
+        "qr_render",
+        max_size=settings.QR_RENDER_CACHE_MAX_SIZE,
+        ttl_seconds=settings.QR_RENDER_CACHE_TTL_SECONDS,
+    )
+
+    @staticmethod
+    def clave(
+        qr_hash: str,
+        nombre_completo: Optional[str],
+        numero_miembro: str,
+        personalizar: bool = True
+    ) -> str:
+        """
+        Clave de contenido del render
+
+        Incluye todo lo que altera los píxeles de la imagen.
+        """
+        partes = [
+            qr_hash,
+            str(settings.QR_VERSION),
+            settings.QR_ERROR_CORRECTION,
+            str(settings.QR_BOX_SIZE),
+            str(settings.QR_BORDER),
+            "1" if personalizar else "0",
+        ]
+        if personalizar and nombre_completo:
+            partes += [settings.ORG_NAME, nombre_completo, numero_miembro]
+        return hashlib.sha256("|".join(partes).encode()).hexdigest()
+
+    @staticmethod
+    def clave_miembro(miembro: Miembro, personalizar: bool = True) -> str:
+        """Clave de render de la credencial de un socio"""
+        return QRRenderCache.clave(
+            miembro.qr_hash,
+            miembro.nombre_completo,
+            miembro.numero_miembro,
+            personalizar
+        )
+
+    @staticmethod
+    def obtener_png(miembro: Miembro, personalizar: bool = True) -> Tuple[bytes, str]:
+        """
+        PNG de la credencial del socio (desde caché o renderizado)
+
+        Returns:
+            Tuple (image_bytes, clave)
+        """
+        clave = QRRenderCache.clave_miembro(miembro, personalizar)
+
+        if not settings.QR_RENDER_CACHE_ENABLED:
+            return QRRenderCache._renderizar(miembro, personalizar), clave
+
+        # 1) Memoria
+        png = QRRenderCache._cache.get(clave)
+        if png is not None:
+            return png, clave
+
+        # 2) Disco
+        png = QRRenderCache._leer_disco(clave)
+        if png is None:
+            # 3) Render
+            png = QRRenderCache._renderizar(miembro, personalizar)
+            QRRenderCache._escribir_disco(clave, png)
+
+        QRRenderCache._cache.set(clave, png)
+        return png, clave
+
+    @staticmethod
+    def limpiar_memoria() -> None:
+        """Vaciar el nivel en memoria (el disco se conserva)"""
+        QRRenderCache._cache.clear()
+
+    # ==================== INTERNO ====================
+
+    @staticmethod
+    def _directorio() -> Path:
+        return Path(settings.UPLOAD_DIR) / "qr_cache"
+
+    @staticmethod
+    def _renderizar(miembro: Miembro, personalizar: bool) -> bytes:
+        qr_data = QRService.generar_qr_miembro(
+            miembro_id=miembro.id,
+            numero_documento=miembro.numero_documento,
+            numero_miembro=miembro.numero_miembro,
+            nombre_completo=miembro.nombre_completo,
+            timestamp=miembro.qr_generated_at,
+            personalizar=personalizar
+        )
+        return qr_data["image_bytes"]
+
+    @staticmethod
+    def _leer_disco(clave: str) -> Optional[bytes]:
+        ruta = QRRenderCache._directorio() / f"{clave}.png"
+        try:
+            return ruta.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"[WARN] No se pudo leer QR cacheado {ruta}: {e}")
+            return None
+
+    @staticmethod
+    def _escribir_disco(clave: str, png: bytes) -> None:
+        directorio = QRRenderCache._directorio()
+        try:
+            directorio.mkdir(parents=True, exist_ok=True)
+            # Temporal en el mismo directorio + rename: otro worker nunca
+            # lee un archivo a medio escribir
+            fd, tmp = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(png)
+                os.replace(tmp, directorio / f"{clave}.png")
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            # La caché en disco es una optimización: nunca romper el request
+            logger.warning(f"[WARN] No se pudo guardar QR en caché de disco: {e}")
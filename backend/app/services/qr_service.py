@@ -7,7 +7,7 @@ import hashlib
 from io import BytesIO
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
 from app.config import settings
@@ -15,6 +15,38 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
+def _cargar_fuentes() -> Tuple:
+    """
+    Cargar las fuentes de la credencial (título, texto, texto chico)
+
+    Se resuelve una sola vez al importar el módulo: buscar el archivo TTF en
+    cada render costaba más que dibujar el texto.
+    """
+    try:
+        return (
+            ImageFont.truetype("arial.ttf", 28),
+            ImageFont.truetype("arial.ttf", 22),
+            ImageFont.truetype("arial.ttf", 18),
+        )
+    except OSError:
+        pass
+    try:
+        # Intentar con DejaVu (Linux)
+        return (
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 22),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18),
+        )
+    except OSError:
+        # Usar fuente por defecto
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+# Fuentes compartidas por todos los renders (ImageFont es de solo lectura)
+_FUENTES = _cargar_fuentes()
+
+
 class QRService:
     """Servicio para gestión de códigos QR únicos e inmutables"""
     
@@ -56,12 +88,8 @@ class QRService:
         if timestamp is None:
             timestamp = datetime.utcnow().isoformat()
         
-        # Crear payload base
-        data_string = f"{miembro_id}|{numero_documento}|{timestamp}"
-        
         # Generar checksum seguro usando SECRET_KEY
-        hash_input = f"{data_string}|{settings.QR_SECRET_KEY}"
-        checksum = hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+        checksum = QRService._checksum(miembro_id, numero_documento, timestamp)
         
         # Formato final del QR
         qr_payload = f"{settings.ORG_PREFIX}-{miembro_id}-{checksum}"
@@ -151,22 +179,7 @@ class QRService:
         # Preparar para dibujar texto
         draw = ImageDraw.Draw(canvas)
         
-        # Intentar cargar fuentes, si falla usar default
-        try:
-            font_title = ImageFont.truetype("arial.ttf", 28)
-            font_text = ImageFont.truetype("arial.ttf", 22)
-            font_small = ImageFont.truetype("arial.ttf", 18)
-        except:
-            try:
-                # Intentar con DejaVu (Linux)
-                font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28)
-                font_text = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 22)
-                font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
-            except:
-                # Usar fuente por defecto
-                font_title = ImageFont.load_default()
-                font_text = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+        font_title, font_text, font_small = _FUENTES
         
         # Título superior
         titulo = settings.ORG_NAME.upper()
@@ -255,21 +268,78 @@ class QRService:
             
             # Recalcular checksum esperado
             # Usar fecha_alta como timestamp (el QR es inmutable)
-            data_string = f"{miembro_id}|{numero_documento}|{fecha_alta}"
-            hash_input = f"{data_string}|{settings.QR_SECRET_KEY}"
-            checksum_esperado = hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+            checksum_esperado = QRService._checksum(miembro_id, numero_documento, fecha_alta)
             
             # Comparar checksums
             if checksum_recibido != checksum_esperado:
                 return False, "QR adulterado o inválido"
             
-            logger.info(f"[OK] QR válido para miembro #{miembro_id}")
+            logger.debug(f"[OK] QR válido para miembro #{miembro_id}")
             return True, None
         
         except Exception as e:
             logger.error(f"[ERROR] Error validando QR: {e}")
             return False, f"Error de validación: {str(e)}"
     
+    @staticmethod
+    def validar_qr_lote(
+        escaneos: Iterable[Tuple[str, int, str, str]]
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Valida la integridad de varios códigos QR en una sola pasada
+        
+        Mismas reglas que validar_qr, pero el checksum esperado se calcula
+        una vez por socio (una cola offline suele repetir socios) y no se
+        loguea cada QR válido.
+        
+        Args:
+            escaneos: Tuplas (qr_code, miembro_id, numero_documento, fecha_alta)
+        
+        Returns:
+            Lista de (es_valido, mensaje_error) en el mismo orden
+        """
+        prefijo = settings.ORG_PREFIX
+        esperados: Dict[Tuple[int, str, str], str] = {}
+        resultados: List[Tuple[bool, Optional[str]]] = []
+        
+        for qr_code, miembro_id, numero_documento, fecha_alta in escaneos:
+            parts = qr_code.split('-')
+            if len(parts) != 3:
+                resultados.append((False, "Formato de QR inválido"))
+                continue
+            
+            prefix, id_str, checksum_recibido = parts
+            if prefix != prefijo:
+                resultados.append((False, "QR no pertenece a esta organización"))
+                continue
+            try:
+                qr_miembro_id = int(id_str)
+            except ValueError:
+                resultados.append((False, "ID de miembro inválido en QR"))
+                continue
+            if qr_miembro_id != miembro_id:
+                resultados.append((False, "QR no corresponde a este miembro"))
+                continue
+            
+            clave = (miembro_id, numero_documento, fecha_alta)
+            checksum_esperado = esperados.get(clave)
+            if checksum_esperado is None:
+                checksum_esperado = QRService._checksum(miembro_id, numero_documento, fecha_alta)
+                esperados[clave] = checksum_esperado
+            
+            if checksum_recibido != checksum_esperado:
+                resultados.append((False, "QR adulterado o inválido"))
+            else:
+                resultados.append((True, None))
+        
+        return resultados
+    
+    @staticmethod
+    def _checksum(miembro_id: int, numero_documento: str, timestamp: str) -> str:
+        """Checksum de 16 caracteres (SHA256 del payload + QR_SECRET_KEY)"""
+        hash_input = f"{miembro_id}|{numero_documento}|{timestamp}|{settings.QR_SECRET_KEY}"
+        return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+    
     @staticmethod
     def extraer_id_de_qr(qr_code: str) -> Optional[int]:
         """
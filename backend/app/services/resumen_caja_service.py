@@ -0,0 +1,308 @@
+"""
+Servicio del resumen diario de caja
+backend/app/services/resumen_caja_service.py
+
+Mantiene la tabla resumen_diario_caja (ingresos/egresos/cantidades por día y
+categoría contable) y la consulta para los reportes. Los totales de un mes o
+de un histórico de 24 meses son un rango sobre la clave primaria
+(fecha, categoria_contable) en vez de un SUM sobre movimientos_caja.
+
+Actualización incremental: quien crea un MovimientoCaja llama a
+aplicar_movimiento() en la MISMA transacción, así el resumen nunca queda
+adelantado ni atrasado respecto de los movimientos. reconstruir() lo recalcula
+desde cero (scripts/rebuild_resumen_caja.py).
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, case, delete, func, select, true
+from sqlalchemy.orm import Session
+
+from app.models.pago import EstadoPago, MovimientoCaja, Pago, ResumenDiarioCaja
+
+logger = logging.getLogger(__name__)
+
+# Nombres de meses en español (gráficos)
+NOMBRES_MESES = [
+    "Ene", "Feb", "Mar", "Abr", "May", "Jun",
+    "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"
+]
+
+# Métricas que suman los deltas (el resto de columnas son la clave)
+_METRICAS = ("ingresos", "egresos", "cantidad_ingresos", "cantidad_egresos", "cantidad_pagos")
+
+
+class ResumenCajaService:
+    """Agregado diario de movimientos de caja"""
+
+    # ==================== ACTUALIZACIÓN INCREMENTAL ====================
+
+    @staticmethod
+    def _upsert(db: Session, fecha: date, categoria: Optional[str], **deltas: float) -> None:
+        """
+        Suma los deltas a la fila (fecha, categoría), creándola si no existe
+
+        INSERT ... ON CONFLICT DO UPDATE en PostgreSQL y SQLite: es atómico
+        aunque dos operadores registren pagos del mismo día a la vez.
+        """
+        valores = {m: deltas.get(m, 0) for m in _METRICAS}
+        clave = {"fecha": fecha, "categoria_contable": categoria or ""}
+        dialecto = db.get_bind().dialect.name
+
+        if dialecto in ("postgresql", "sqlite"):
+            if dialecto == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            tabla = ResumenDiarioCaja.__table__
+            stmt = insert(tabla).values(**clave, **valores)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["fecha", "categoria_contable"],
+                set_={
+                    **{m: tabla.c[m] + stmt.excluded[m] for m in _METRICAS},
+                    "updated_at": func.now(),
+                }
+            )
+            db.execute(stmt)
+            return
+
+        # Otros motores: leer con bloqueo y actualizar
+        fila = db.query(ResumenDiarioCaja).filter_by(**clave).with_for_update().first()
+        if fila is None:
+            db.add(ResumenDiarioCaja(**clave, **valores))
+            return
+        for m, delta in valores.items():
+            setattr(fila, m, getattr(fila, m) + delta)
+
+    @staticmethod
+    def aplicar_movimiento(db: Session, movimiento: MovimientoCaja) -> None:
+        """
+        Refleja un movimiento nuevo en el resumen (no hace commit)
+
+        Llamar en la misma transacción que crea el movimiento.
+        """
+        if movimiento.tipo == "egreso":
+            deltas = {"egresos": movimiento.monto, "cantidad_egresos": 1}
+        else:
+            deltas = {"ingresos": movimiento.monto, "cantidad_ingresos": 1}
+        ResumenCajaService._upsert(
+            db,
+            movimiento.fecha_movimiento or date.today(),
+            movimiento.categoria_contable,
+            **deltas
+        )
+
+    @staticmethod
+    def ajustar_pagos(db: Session, fecha: date, categoria: Optional[str], delta: int) -> None:
+        """
+        Suma (o resta, al anular) pagos aprobados del día
+
+        Args:
+            fecha: fecha_pago del pago
+            categoria: Categoría contable del movimiento de ingreso del pago
+            delta: +1 al registrar, -1 al anular
+        """
+        ResumenCajaService._upsert(db, fecha, categoria, cantidad_pagos=delta)
+
+    # ==================== CONSULTAS ====================
+
+    @staticmethod
+    def query_totales(desde: date, hasta: date):
+        """
+        Totales del rango [desde, hasta] en una sola fila
+
+        Columnas: ingresos, egresos, cantidad_movimientos, cantidad_pagos.
+        """
+        r = ResumenDiarioCaja
+        return select(
+            func.coalesce(func.sum(r.ingresos), 0.0).label("ingresos"),
+            func.coalesce(func.sum(r.egresos), 0.0).label("egresos"),
+            func.coalesce(func.sum(r.cantidad_ingresos + r.cantidad_egresos), 0).label("cantidad_movimientos"),
+            func.coalesce(func.sum(r.cantidad_pagos), 0).label("cantidad_pagos"),
+        ).where(r.fecha >= desde, r.fecha <= hasta)
+
+    @staticmethod
+    def query_por_categoria(desde: date, hasta: date):
+        """Totales del rango agrupados por categoría contable"""
+        r = ResumenDiarioCaja
+        return (
+            select(
+                r.categoria_contable,
+                func.sum(r.ingresos).label("ingresos"),
+                func.sum(r.egresos).label("egresos"),
+                func.sum(r.cantidad_ingresos).label("cantidad_ingresos"),
+                func.sum(r.cantidad_egresos).label("cantidad_egresos"),
+            )
+            .where(r.fecha >= desde, r.fecha <= hasta)
+            .group_by(r.categoria_contable)
+        )
+
+    @staticmethod
+    def query_por_dia(desde: date, hasta: date):
+        """Ingresos y egresos por día del rango (para agrupar por mes en Python)"""
+        r = ResumenDiarioCaja
+        return (
+            select(
+                r.fecha,
+                func.sum(r.ingresos).label("ingresos"),
+                func.sum(r.egresos).label("egresos"),
+            )
+            .where(r.fecha >= desde, r.fecha <= hasta)
+            .group_by(r.fecha)
+        )
+
+    @staticmethod
+    def totales(db: Session, desde: date, hasta: date) -> Dict[str, Any]:
+        """Totales del rango [desde, hasta] (sesión síncrona)"""
+        fila = db.execute(ResumenCajaService.query_totales(desde, hasta)).one()
+        return {
+            "ingresos": float(fila.ingresos),
+            "egresos": float(fila.egresos),
+            "cantidad_movimientos": int(fila.cantidad_movimientos),
+            "cantidad_pagos": int(fila.cantidad_pagos),
+        }
+
+    @staticmethod
+    def egresos_por_categoria(db: Session, desde: date, hasta: date) -> List[Dict[str, Any]]:
+        """Egresos del rango por categoría (las categorías sin egresos se omiten)"""
+        filas = db.execute(ResumenCajaService.query_por_categoria(desde, hasta)).all()
+        return [
+            {
+                "categoria": f.categoria_contable or "Sin categoría",
+                "cantidad": int(f.cantidad_egresos),
+                "total": float(f.egresos),
+            }
+            for f in filas
+            if f.cantidad_egresos
+        ]
+
+    @staticmethod
+    def agrupar_por_mes(filas) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Suma las filas de query_por_dia() por (año, mes)"""
+        meses: Dict[Tuple[int, int], Dict[str, float]] = defaultdict(lambda: {"ingresos": 0.0, "egresos": 0.0})
+        for fila in filas:
+            mes = meses[(fila.fecha.year, fila.fecha.month)]
+            mes["ingresos"] += float(fila.ingresos or 0)
+            mes["egresos"] += float(fila.egresos or 0)
+        return dict(meses)
+
+    @staticmethod
+    def mensual(db: Session, desde: date, hasta: date) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """
+        Ingresos y egresos por (año, mes) del rango
+
+        Una sola consulta por rango de fechas; los meses sin movimientos no
+        aparecen en el resultado.
+        """
+        filas = db.execute(ResumenCajaService.query_por_dia(desde, hasta))
+        return ResumenCajaService.agrupar_por_mes(filas)
+
+    @staticmethod
+    def rango_meses(hoy: date, meses: int) -> Tuple[date, date]:
+        """Primer día de hace `meses - 1` meses y último día del mes de `hoy`"""
+        desde = (hoy - relativedelta(months=meses - 1)).replace(day=1)
+        hasta = hoy.replace(day=1) + relativedelta(months=1) - relativedelta(days=1)
+        return desde, hasta
+
+    @staticmethod
+    def serie_mensual(
+        por_mes: Dict[Tuple[int, int], Dict[str, float]],
+        hoy: date,
+        meses: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista de los últimos `meses` meses, del más antiguo al actual
+
+        Los meses sin movimientos van en cero.
+        """
+        serie = []
+        for i in range(meses - 1, -1, -1):
+            primer_dia = (hoy - relativedelta(months=i)).replace(day=1)
+            ultimo_dia = primer_dia + relativedelta(months=1) - relativedelta(days=1)
+            totales = por_mes.get((primer_dia.year, primer_dia.month), {"ingresos": 0.0, "egresos": 0.0})
+            serie.append({
+                "mes": NOMBRES_MESES[primer_dia.month - 1],
+                "anio": primer_dia.year,
+                "mes_numero": primer_dia.month,
+                "ingresos": float(totales["ingresos"]),
+                "egresos": float(totales["egresos"]),
+                "balance": float(totales["ingresos"] - totales["egresos"]),
+                "fecha_inicio": primer_dia.isoformat(),
+                "fecha_fin": ultimo_dia.isoformat()
+            })
+        return serie
+
+    # ==================== RECONSTRUCCIÓN ====================
+
+    @staticmethod
+    def reconstruir(db: Session, desde: Optional[date] = None, hasta: Optional[date] = None) -> int:
+        """
+        Recalcula el resumen desde movimientos_caja y pagos (hace commit)
+
+        Borra y vuelve a insertar las filas del rango (todo si no se indica),
+        en una transacción.
+
+        Returns:
+            Cantidad de filas (día, categoría) escritas
+        """
+        def en_rango(columna):
+            condiciones = []
+            if desde:
+                condiciones.append(columna >= desde)
+            if hasta:
+                condiciones.append(columna <= hasta)
+            return and_(true(), *condiciones)
+
+        filas: Dict[Tuple[date, str], Dict[str, float]] = defaultdict(lambda: {m: 0 for m in _METRICAS})
+
+        m = MovimientoCaja
+        es_ingreso = m.tipo == "ingreso"
+        movimientos = db.execute(
+            select(
+                m.fecha_movimiento,
+                func.coalesce(m.categoria_contable, ""),
+                func.sum(case((es_ingreso, m.monto), else_=0.0)),
+                func.sum(case((es_ingreso, 0.0), else_=m.monto)),
+                func.sum(case((es_ingreso, 1), else_=0)),
+                func.sum(case((es_ingreso, 0), else_=1)),
+            )
+            .where(en_rango(m.fecha_movimiento))
+            .group_by(m.fecha_movimiento, func.coalesce(m.categoria_contable, ""))
+        )
+        for fecha, categoria, ingresos, egresos, c_ing, c_egr in movimientos:
+            fila = filas[(fecha, categoria)]
+            fila.update(ingresos=ingresos or 0.0, egresos=egresos or 0.0,
+                        cantidad_ingresos=c_ing or 0, cantidad_egresos=c_egr or 0)
+
+        # Pagos aprobados, en la categoría de su movimiento de ingreso
+        categoria_pago = func.coalesce(m.categoria_contable, "")
+        pagos = db.execute(
+            select(Pago.fecha_pago, categoria_pago, func.count(Pago.id))
+            .outerjoin(m, and_(m.pago_id == Pago.id, es_ingreso))
+            .where(Pago.estado == EstadoPago.APROBADO, en_rango(Pago.fecha_pago))
+            .group_by(Pago.fecha_pago, categoria_pago)
+        )
+        for fecha, categoria, cantidad in pagos:
+            filas[(fecha, categoria)]["cantidad_pagos"] = cantidad
+
+        try:
+            db.execute(delete(ResumenDiarioCaja).where(en_rango(ResumenDiarioCaja.fecha)))
+            if filas:
+                db.execute(
+                    ResumenDiarioCaja.__table__.insert(),
+                    [
+                        {"fecha": fecha, "categoria_contable": categoria, **valores}
+                        for (fecha, categoria), valores in filas.items()
+                    ]
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(f"[OK] Resumen diario de caja reconstruido: {len(filas)} filas")
+        return len(filas)
@@ -0,0 +1,114 @@
+"""
+Servicio de marcas de versión (caché HTTP condicional)
+backend/app/services/version_service.py
+
+Lee las versiones de recursos (tabla versiones_recurso) o de un socio
+(miembros.sync_version) con una sola consulta por PK. El resultado alimenta
+el ETag y el Last-Modified de las lecturas (ver app/utils/cache_http.py).
+
+Los recursos de solo inserción (accesos) no tienen contador: su versión es
+el último id de la tabla, que sale del índice de la PK.
+"""
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.acceso import Acceso
+from app.models.miembro import Miembro
+from app.models.version import RECURSOS, VersionRecurso
+
+# Recurso de solo inserción -> modelo; la marca es (max(id), created_at del último)
+RECURSOS_SOLO_INSERCION = {"accesos": Acceso}
+
+
+class Marca(NamedTuple):
+    """Valores que identifican una versión de los datos y su última modificación"""
+    partes: Tuple
+    modificado: Optional[datetime]
+
+
+def _utc(valor: Optional[datetime]) -> Optional[datetime]:
+    """SQLite devuelve fechas sin zona: se interpretan como UTC"""
+    if valor is not None and valor.tzinfo is None:
+        return valor.replace(tzinfo=timezone.utc)
+    return valor
+
+
+class VersionService:
+    """Consultas de versión para ETag / Last-Modified"""
+
+    @staticmethod
+    def query_versiones(recursos: Iterable[str]):
+        """SELECT recurso, version, updated_at de cada recurso pedido, ordenado por recurso"""
+        recursos = sorted(set(recursos))
+        desconocidos = set(recursos) - set(RECURSOS) - set(RECURSOS_SOLO_INSERCION)
+        if desconocidos:
+            raise ValueError(f"Recursos sin versión: {', '.join(sorted(desconocidos))}")
+
+        contadores = [r for r in recursos if r in RECURSOS]
+        consultas = [
+            select(VersionRecurso.recurso, VersionRecurso.version, VersionRecurso.updated_at)
+            .where(VersionRecurso.recurso.in_(contadores))
+        ] if contadores else []
+        for recurso in recursos:
+            modelo = RECURSOS_SOLO_INSERCION.get(recurso)
+            if modelo is None:
+                continue
+            # Ambas subconsultas se resuelven recorriendo el índice de la PK
+            ultimo = select(modelo.created_at).order_by(modelo.id.desc()).limit(1).scalar_subquery()
+            consultas.append(select(
+                literal(recurso).label("recurso"),
+                func.coalesce(select(func.max(modelo.id)).scalar_subquery(), 0).label("version"),
+                ultimo.label("updated_at"),
+            ))
+
+        if len(consultas) == 1:
+            return consultas[0].order_by("recurso")
+        return union_all(*consultas).order_by("recurso")
+
+    @staticmethod
+    def _marca(filas) -> Marca:
+        partes = tuple((fila.recurso, fila.version) for fila in filas)
+        fechas = [_utc(fila.updated_at) for fila in filas if fila.updated_at is not None]
+        return Marca(partes, max(fechas) if fechas else None)
+
+    @staticmethod
+    def marca(db: Session, *recursos: str) -> Marca:
+        """Marca de uno o más recursos (sesión síncrona)"""
+        return VersionService._marca(db.execute(VersionService.query_versiones(recursos)).all())
+
+    @staticmethod
+    async def marca_async(db: AsyncSession, *recursos: str) -> Marca:
+        """Marca de uno o más recursos (sesión asíncrona)"""
+        return VersionService._marca((await db.execute(VersionService.query_versiones(recursos))).all())
+
+    @staticmethod
+    def marca_miembro(db: Session, miembro_id: int) -> Optional[Marca]:
+        """
+        Marca del detalle de un socio: su sync_version y la versión de las
+        categorías (la respuesta incluye la categoría anidada)
+
+        Returns:
+            None si el socio no existe o está dado de baja
+        """
+        categorias = (
+            select(VersionRecurso.version)
+            .where(VersionRecurso.recurso == "categorias")
+            .scalar_subquery()
+        )
+        fila = db.execute(
+            select(
+                Miembro.sync_version,
+                func.coalesce(Miembro.updated_at, Miembro.created_at).label("modificado"),
+                categorias.label("version_categorias"),
+            ).where(Miembro.id == miembro_id, Miembro.is_deleted == False)
+        ).first()
+        if fila is None:
+            return None
+        return Marca(
+            (("miembro", miembro_id, fila.sync_version), ("categorias", fila.version_categorias)),
+            _utc(fila.modificado)
+        )
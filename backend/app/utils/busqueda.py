@@ -0,0 +1,37 @@
+"""
+Normalización de texto para búsquedas
+backend/app/utils/busqueda.py
+
+La búsqueda de socios compara siempre texto normalizado (minúsculas, sin
+tildes ni espacios repetidos), tanto en la columna indexada como en el
+término buscado: "Muñoz" y "MUNOZ" encuentran lo mismo en cualquier motor.
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sin diacríticos y con espacios simples"""
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(" ", sin_tildes).strip().lower()
+
+
+def terminos(q: Optional[str]) -> List[str]:
+    """Palabras normalizadas de una búsqueda (todas deben aparecer)"""
+    return normalizar(q).split()
+
+
+def texto_busqueda(apellido: str, nombre: str, numero_documento: str, numero_miembro: str) -> str:
+    """
+    Texto indexado de un socio
+
+    El apellido va primero: un término que coincide con el comienzo del
+    texto es un prefijo del apellido (mejor ranking).
+    """
+    return normalizar(f"{apellido or ''} {nombre or ''} {numero_documento or ''} {numero_miembro or ''}")
@@ -0,0 +1,147 @@
+"""
+Caché en memoria LRU con expiración (TTL)
+backend/app/utils/cache.py
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Caché LRU acotada con TTL por entrada, segura entre threads
+
+    Los endpoints síncronos corren en el threadpool de FastAPI, por lo que
+    todas las operaciones se hacen bajo un lock. Cada get() registra un hit
+    o miss en la métrica cache_requests_total{cache=<nombre>}.
+    """
+
+    def __init__(self, nombre: str, max_size: int, ttl_seconds: float):
+        self.nombre = nombre
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obtener valor vigente (None si no existe o expiró)"""
+        with self._lock:
+            entrada = self._data.get(key)
+            if entrada is not None:
+                expira, valor = entrada
+                if expira > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    metrics.inc_cache(self.nombre, hit=True)
+                    return valor
+                del self._data[key]
+            self.misses += 1
+        metrics.inc_cache(self.nombre, hit=False)
+        return None
+
+    def set(self, key: Hashable, valor: Any) -> None:
+        """Guardar valor, desalojando el menos usado si se supera max_size"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, valor)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Eliminar una entrada"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vaciar la caché"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SWRCache:
+    """
+    Caché asíncrona con stale-while-revalidate
+
+    - Entrada con menos de ttl_seconds: se devuelve tal cual.
+    - Entre ttl_seconds y ttl_seconds + stale_seconds: se devuelve la copia
+      vieja y se recalcula en segundo plano.
+    - Más vieja (o inexistente): el request espera el cálculo.
+
+    Hay a lo sumo un cálculo en curso por clave (single-flight): los requests
+    simultáneos esperan el mismo. Pensada para pocos valores caros (snapshots),
+    no acota el tamaño. Usar solo desde el event loop.
+    """
+
+    def __init__(self, nombre: str, ttl_seconds: float, stale_seconds: float):
+        self.nombre = nombre
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._data: Dict[Hashable, "tuple[float, Any]"] = {}
+        self._en_curso: Dict[Hashable, asyncio.Task] = {}
+
+    async def obtener(self, key: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Valor de la clave, calculándolo con `calcular()` si hace falta
+
+        `calcular` no debe depender de recursos del request (p.ej. su sesión
+        de DB): puede ejecutarse después de que el request terminó.
+        """
+        entrada = self._data.get(key)
+        if entrada is not None:
+            edad = time.monotonic() - entrada[0]
+            if edad < self.ttl_seconds + self.stale_seconds:
+                metrics.inc_cache(self.nombre, hit=True)
+                if edad >= self.ttl_seconds:
+                    self._revalidar(key, calcular)
+                return entrada[1]
+
+        metrics.inc_cache(self.nombre, hit=False)
+        # shield: si el cliente corta, el cálculo sigue para los demás
+        return await asyncio.shield(self._revalidar(key, calcular))
+
+    def _revalidar(self, key: Hashable, calcular: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Tarea de cálculo de la clave (reutiliza la que esté en curso)"""
+        loop = asyncio.get_running_loop()
+        tarea = self._en_curso.get(key)
+        if tarea is None or tarea.get_loop() is not loop:
+            tarea = loop.create_task(self._calcular(key, calcular))
+            tarea.add_done_callback(self._registrar_error)
+            self._en_curso[key] = tarea
+        return tarea
+
+    async def _calcular(self, key: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            valor = await calcular()
+            self._data[key] = (time.monotonic(), valor)
+            return valor
+        finally:
+            if self._en_curso.get(key) is asyncio.current_task():
+                del self._en_curso[key]
+
+    def _registrar_error(self, tarea: asyncio.Task) -> None:
+        """Loguea fallos de recálculos en segundo plano (nadie los espera)"""
+        if not tarea.cancelled() and tarea.exception() is not None:
+            logger.warning(f"[WARN] Caché {self.nombre}: fallo al recalcular: {tarea.exception()}")
+
+    def invalidate(self, key: Hashable) -> None:
+        """Eliminar una entrada (el próximo request recalcula)"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vaciar la caché"""
+        self._data.clear()
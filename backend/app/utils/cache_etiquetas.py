@@ -0,0 +1,384 @@
+"""
+Caché de resultados invalidada por etiquetas (recursos)
+backend/app/utils/cache_etiquetas.py
+
+Cachea el resultado de funciones de consulta (reportes) por nombre y
+parámetros normalizados. Cada función declara las etiquetas que lee
+(miembros, categorias, pagos, accesos: ver app/models/version.py) y la
+clave incluye la versión actual de esas etiquetas (VersionService.marca).
+Toda escritura ORM sobre una tabla incrementa su versión en la misma
+transacción (en accesos, un alta cambia el último id), así que después
+del commit la clave vieja ya no se consulta:
+vale igual con varios workers y con cualquier backend, y un cálculo que
+empezó antes de la escritura queda guardado bajo la clave vieja.
+
+Además, después de cada commit se descartan del backend en memoria las
+entradas de las etiquetas con contador escritas (no esperan al LRU/TTL).
+
+Single-flight: requests simultáneos con la misma clave esperan el cálculo
+en curso en lugar de repetir la consulta (por proceso, como SWRCache).
+Si el cálculo falla, el siguiente en espera lo reintenta.
+
+Backends: MemoriaBackend (LRU por proceso) y RedisBackend (compartido entre
+workers; cliente síncrono de redis). Si el backend falla, el valor se
+calcula sin caché.
+
+Ejemplo:
+    @cache_reportes.cacheado("miembros", "categorias")
+    def reporte_socios(db: Session, estado: Optional[EstadoMiembro]) -> Dict[str, Any]:
+        ...
+"""
+import asyncio
+import enum
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError as FuturoCancelado, Future
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Set, Tuple
+
+import anyio
+
+from app import metrics
+from app.config import settings
+from app.models.version import al_confirmar
+from app.services.version_service import VersionService
+
+try:
+    # Import opcional: sin redis solo está disponible el backend en memoria
+    import redis
+    _REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    _REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre avisos de backend caído (evita un log por request)
+_INTERVALO_AVISO_BACKEND = 60.0
+
+# Marca de "no está en caché" (None puede ser un resultado válido)
+_AUSENTE = object()
+
+
+def normalizar(valor: Any) -> Any:
+    """Parámetro en forma canónica para la clave (enums, fechas, colecciones)"""
+    if isinstance(valor, enum.Enum):
+        return normalizar(valor.value)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, (list, tuple)):
+        return [normalizar(v) for v in valor]
+    if isinstance(valor, (set, frozenset)):
+        return sorted(normalizar(v) for v in valor)
+    if isinstance(valor, dict):
+        return {str(k): normalizar(v) for k, v in sorted(valor.items())}
+    return valor
+
+
+# ==================== BACKENDS ====================
+
+class MemoriaBackend:
+    """LRU con TTL por proceso, con índice etiqueta -> claves"""
+
+    bloqueante = False
+
+    def __init__(self, max_entradas: int, reloj: Callable[[], float] = time.monotonic):
+        self.max_entradas = max_entradas
+        self.reloj = reloj
+        # clave -> (expira, valor, etiquetas)
+        self._data: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._por_etiqueta: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _quitar(self, clave: str) -> None:
+        _, _, etiquetas = self._data.pop(clave)
+        for etiqueta in etiquetas:
+            claves = self._por_etiqueta.get(etiqueta)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._por_etiqueta[etiqueta]
+
+    def obtener(self, clave: str) -> Any:
+        with self._lock:
+            entrada = self._data.get(clave)
+            if entrada is None:
+                return _AUSENTE
+            if entrada[0] <= self.reloj():
+                self._quitar(clave)
+                return _AUSENTE
+            self._data.move_to_end(clave)
+            return entrada[1]
+
+    def guardar(self, clave: str, valor: Any, etiquetas: Tuple[str, ...], ttl: float) -> None:
+        if self.max_entradas <= 0:
+            return
+        with self._lock:
+            if clave in self._data:
+                self._quitar(clave)
+            self._data[clave] = (self.reloj() + ttl, valor, etiquetas)
+            for etiqueta in etiquetas:
+                self._por_etiqueta.setdefault(etiqueta, set()).add(clave)
+            while len(self._data) > self.max_entradas:
+                self._quitar(next(iter(self._data)))
+
+    def invalidar(self, etiquetas: Iterable[str]) -> None:
+        """Descartar las entradas con alguna de las etiquetas"""
+        with self._lock:
+            for etiqueta in etiquetas:
+                for clave in list(self._por_etiqueta.get(etiqueta, ())):
+                    self._quitar(clave)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._por_etiqueta.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class RedisBackend:
+    """
+    Entradas compartidas en Redis (JSON con expiración)
+
+    Las claves ya incluyen las versiones de sus etiquetas: una escritura no
+    necesita borrar nada, las entradas viejas dejan de leerse y expiran con
+    el TTL. Acepta cualquier cliente con get/set(ex=) de redis-py.
+    """
+
+    bloqueante = True
+
+    def __init__(self, cliente: Any, prefijo: str = "cache:"):
+        self.cliente = cliente
+        self.prefijo = prefijo
+
+    @classmethod
+    def desde_url(cls, url: str, db: int = 0, prefijo: str = "cache:") -> "RedisBackend":
+        if not _REDIS_AVAILABLE:
+            raise RuntimeError("REPORTES_CACHE_BACKEND=redis requiere el paquete redis")
+        return cls(redis.Redis.from_url(url, db=db, socket_timeout=1.0), prefijo)
+
+    def obtener(self, clave: str) -> Any:
+        datos = self.cliente.get(self.prefijo + clave)
+        return _AUSENTE if datos is None else json.loads(datos)
+
+    def guardar(self, clave: str, valor: Any, etiquetas: Tuple[str, ...], ttl: float) -> None:
+        self.cliente.set(self.prefijo + clave, json.dumps(valor, ensure_ascii=False), ex=max(1, int(ttl)))
+
+    def invalidar(self, etiquetas: Iterable[str]) -> None:
+        pass
+
+    def limpiar(self) -> None:
+        pass
+
+
+# ==================== CACHÉ ====================
+
+class CacheEtiquetada:
+    """Decorador de caché por parámetros y versiones de etiquetas"""
+
+    def __init__(self, nombre: str, backend: Any = None, ttl_seconds: float = 600.0, max_entradas: int = 256):
+        self.nombre = nombre
+        self.backend = backend if backend is not None else MemoriaBackend(max_entradas)
+        self.ttl_seconds = ttl_seconds
+        self.habilitada = True
+        self._en_curso: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._ultimo_aviso = 0.0
+
+    @classmethod
+    def desde_settings(cls, nombre: str) -> "CacheEtiquetada":
+        backend = None
+        if settings.REPORTES_CACHE_BACKEND == "redis":
+            try:
+                backend = RedisBackend.desde_url(settings.REDIS_URL, settings.REDIS_DB, prefijo=f"{nombre}:")
+            except RuntimeError as e:
+                logger.error(f"[ERROR] {e}; caché de {nombre} en memoria (por proceso)")
+        cache = cls(nombre, backend, settings.REPORTES_CACHE_TTL_SECONDS, settings.REPORTES_CACHE_MAX_ENTRIES)
+        cache.habilitada = settings.REPORTES_CACHE_ENABLED
+        return cache
+
+    # ---------- claves ----------
+
+    def clave(self, funcion: str, parametros: Dict[str, Any], versiones: Tuple) -> str:
+        """Clave de una llamada: función, parámetros normalizados, versiones y día"""
+        contenido = json.dumps(
+            [funcion, normalizar(parametros), versiones, date.today().isoformat()],
+            sort_keys=True, default=str
+        )
+        return f"{funcion}:{hashlib.sha1(contenido.encode('utf-8')).hexdigest()}"
+
+    # ---------- backend con manejo de errores ----------
+
+    def _error_backend(self, e: Exception) -> None:
+        metrics.inc_cache_error_backend(self.nombre)
+        ahora = time.monotonic()
+        if ahora - self._ultimo_aviso > _INTERVALO_AVISO_BACKEND:
+            self._ultimo_aviso = ahora
+            logger.warning(f"[WARN] Caché {self.nombre}: backend no disponible ({e}); se calcula sin caché")
+
+    def _leer(self, clave: str) -> Any:
+        try:
+            valor = self.backend.obtener(clave)
+        except Exception as e:
+            self._error_backend(e)
+            return _AUSENTE
+        metrics.inc_cache(self.nombre, hit=valor is not _AUSENTE)
+        return valor
+
+    def _escribir(self, clave: str, valor: Any, etiquetas: Tuple[str, ...]) -> None:
+        try:
+            self.backend.guardar(clave, valor, etiquetas, self.ttl_seconds)
+        except Exception as e:
+            self._error_backend(e)
+
+    async def _leer_async(self, clave: str) -> Any:
+        if getattr(self.backend, "bloqueante", False):
+            return await anyio.to_thread.run_sync(self._leer, clave)
+        return self._leer(clave)
+
+    async def _escribir_async(self, clave: str, valor: Any, etiquetas: Tuple[str, ...]) -> None:
+        if getattr(self.backend, "bloqueante", False):
+            await anyio.to_thread.run_sync(self._escribir, clave, valor, etiquetas)
+        else:
+            self._escribir(clave, valor, etiquetas)
+
+    # ---------- single-flight ----------
+
+    def _obtener_sync(self, clave: str, etiquetas: Tuple[str, ...], calcular: Callable[[], Any]) -> Any:
+        while True:
+            valor = self._leer(clave)
+            if valor is not _AUSENTE:
+                return valor
+            with self._lock:
+                futuro = self._en_curso.get(clave)
+                lider = futuro is None
+                if lider:
+                    futuro = self._en_curso[clave] = Future()
+            if lider:
+                break
+            try:
+                return futuro.result()
+            except FuturoCancelado:
+                continue  # el cálculo del líder falló: reintentar
+
+        try:
+            valor = calcular()
+        except BaseException:
+            futuro.cancel()
+            raise
+        else:
+            self._escribir(clave, valor, etiquetas)
+            futuro.set_result(valor)
+            return valor
+        finally:
+            with self._lock:
+                if self._en_curso.get(clave) is futuro:
+                    del self._en_curso[clave]
+
+    async def _obtener_async(self, clave: str, etiquetas: Tuple[str, ...], calcular: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        # Los cálculos de otro event loop (TestClient) no se comparten
+        clave_vuelo = (id(loop), clave)
+        while True:
+            valor = await self._leer_async(clave)
+            if valor is not _AUSENTE:
+                return valor
+            futuro = self._en_curso.get(clave_vuelo)
+            if futuro is None:
+                futuro = self._en_curso[clave_vuelo] = loop.create_future()
+                break
+            try:
+                return await asyncio.shield(futuro)
+            except asyncio.CancelledError:
+                if futuro.cancelled():
+                    continue  # el cálculo del líder falló: reintentar
+                raise
+
+        try:
+            valor = await calcular()
+        except BaseException:
+            futuro.cancel()
+            raise
+        else:
+            await self._escribir_async(clave, valor, etiquetas)
+            futuro.set_result(valor)
+            return valor
+        finally:
+            if self._en_curso.get(clave_vuelo) is futuro:
+                del self._en_curso[clave_vuelo]
+
+    # ---------- decorador ----------
+
+    def cacheado(self, *etiquetas: str) -> Callable:
+        """
+        Cachear una función `f(db, **parametros)` (síncrona o async)
+
+        El primer parámetro es la sesión (Session o AsyncSession): no forma
+        parte de la clave y se usa para leer las versiones de las etiquetas.
+        El resultado debe ser serializable a JSON (backend Redis).
+        """
+        etiquetas = tuple(sorted(etiquetas))
+
+        def decorador(funcion: Callable) -> Callable:
+            firma = inspect.signature(funcion)
+            nombre_db = next(iter(firma.parameters))
+            nombre_funcion = funcion.__qualname__
+
+            def parametros(args, kwargs) -> Tuple[Any, Dict[str, Any]]:
+                ligados = firma.bind(*args, **kwargs)
+                ligados.apply_defaults()
+                valores = dict(ligados.arguments)
+                return valores.pop(nombre_db), valores
+
+            if inspect.iscoroutinefunction(funcion):
+                @functools.wraps(funcion)
+                async def envoltorio_async(*args, **kwargs):
+                    if not self.habilitada:
+                        return await funcion(*args, **kwargs)
+                    db, valores = parametros(args, kwargs)
+                    marca = await VersionService.marca_async(db, *etiquetas)
+                    clave = self.clave(nombre_funcion, valores, marca.partes)
+                    return await self._obtener_async(clave, etiquetas, lambda: funcion(*args, **kwargs))
+                return envoltorio_async
+
+            @functools.wraps(funcion)
+            def envoltorio(*args, **kwargs):
+                if not self.habilitada:
+                    return funcion(*args, **kwargs)
+                db, valores = parametros(args, kwargs)
+                marca = VersionService.marca(db, *etiquetas)
+                clave = self.clave(nombre_funcion, valores, marca.partes)
+                return self._obtener_sync(clave, etiquetas, lambda: funcion(*args, **kwargs))
+            return envoltorio
+
+        return decorador
+
+    # ---------- invalidación ----------
+
+    def invalidar(self, etiquetas: Iterable[str]) -> None:
+        """Descartar las entradas de las etiquetas (llamado tras cada commit)"""
+        etiquetas = set(etiquetas)
+        for etiqueta in etiquetas:
+            metrics.inc_cache_invalidacion(self.nombre, etiqueta)
+        try:
+            self.backend.invalidar(etiquetas)
+        except Exception as e:
+            self._error_backend(e)
+
+    def limpiar(self) -> None:
+        """Vaciar las entradas en memoria"""
+        self.backend.limpiar()
+
+
+# Reportes (app/routers/reportes.py)
+cache_reportes = CacheEtiquetada.desde_settings("reportes")
+al_confirmar(cache_reportes.invalidar)
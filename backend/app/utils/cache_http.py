@@ -0,0 +1,108 @@
+"""
+Caché HTTP condicional (ETag / Last-Modified)
+backend/app/utils/cache_http.py
+
+Las lecturas calculan una marca de versión barata (VersionService) antes de
+la consulta completa. Si coincide con If-None-Match (o, sin If-None-Match,
+con If-Modified-Since) se responde 304 sin cuerpo; si no, la respuesta lleva
+ETag, Last-Modified, Cache-Control y Vary.
+
+Ejemplo:
+    validador = ValidadorHTTP.desde_marca(request, VersionService.marca(db, "categorias"))
+    if validador.vigente:
+        return validador.no_modificado()
+    ...
+    validador.aplicar(response)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.services.version_service import Marca
+
+
+def _etags(valor: str):
+    """Etiquetas de If-None-Match sin el prefijo de ETag débil"""
+    for parte in valor.split(","):
+        parte = parte.strip()
+        yield parte[2:] if parte.startswith("W/") else parte
+
+
+class ValidadorHTTP:
+    """Validadores de caché de una lectura y su comparación con la request"""
+
+    # Las respuestas dependen del usuario autenticado (permisos)
+    VARY = "Authorization"
+
+    def __init__(self, request: Request, etag: str, modificado: Optional[datetime] = None):
+        self.request = request
+        self.etag = etag
+        # Last-Modified tiene resolución de segundos; sin zona se asume UTC
+        if modificado is not None:
+            modificado = modificado.replace(microsecond=0)
+            if modificado.tzinfo is None:
+                modificado = modificado.replace(tzinfo=timezone.utc)
+        self.modificado = modificado
+
+    @classmethod
+    def desde_marca(cls, request: Request, marca: Marca, *extra: Any) -> "ValidadorHTTP":
+        """
+        ETag débil a partir de la marca de versión
+
+        Incluye la ruta, los query params (ordenados), la versión de la API y
+        los valores de `extra` (p. ej. la fecha del día en los reportes).
+        """
+        clave = repr((
+            settings.APP_VERSION,
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            marca.partes,
+            extra,
+        ))
+        digest = hashlib.sha1(clave.encode("utf-8")).hexdigest()[:32]
+        return cls(request, f'W/"{digest}"', marca.modificado)
+
+    @property
+    def vigente(self) -> bool:
+        """¿La copia del cliente sigue siendo válida?"""
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            propio = next(_etags(self.etag))
+            return any(etag == "*" or etag == propio for etag in _etags(if_none_match))
+
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_modified_since and self.modificado is not None:
+            try:
+                desde = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if desde.tzinfo is None:
+                desde = desde.replace(tzinfo=timezone.utc)
+            return self.modificado <= desde
+        return False
+
+    @property
+    def encabezados(self) -> Dict[str, str]:
+        encabezados = {
+            "ETag": self.etag,
+            "Cache-Control": settings.HTTP_CACHE_CONTROL,
+        }
+        if self.modificado is not None:
+            encabezados["Last-Modified"] = format_datetime(self.modificado.astimezone(timezone.utc), usegmt=True)
+        return encabezados
+
+    def aplicar(self, response: Response) -> Response:
+        """Agregar los validadores a la respuesta (o a la Response inyectada)"""
+        headers: MutableHeaders = response.headers
+        headers.update(self.encabezados)
+        headers.add_vary_header(self.VARY)
+        return response
+
+    def no_modificado(self) -> Response:
+        """304 sin cuerpo con los mismos validadores"""
+        return self.aplicar(Response(status_code=status.HTTP_304_NOT_MODIFIED))
@@ -2,13 +2,18 @@
 FastAPI Dependencies para autenticación y autorización
 backend/app/utils/dependencies.py
 """
+import base64
+import json
+from datetime import date, datetime
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.usuario import Usuario, RolUsuario
+from app.services.principal_cache_service import PrincipalCacheService, UsuarioPrincipal
 from app.utils.security import decode_token, verify_token_type
 
 # Esquema de seguridad Bearer
@@ -17,11 +22,19 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Usuario:
+    db: AsyncSession = Depends(get_async_db)
+) -> UsuarioPrincipal:
     """
     Dependency para obtener el usuario actual desde el JWT token
     
+    El usuario se toma de PrincipalCacheService (por id y versión de token);
+    solo ante un miss se consulta la base. El rol del token debe coincidir
+    con el del usuario y la versión con la vigente: un token emitido antes
+    de revocarlos (contraseña, rol, estado, baja) se rechaza.
+    
+    Devuelve un UsuarioPrincipal (mismos atributos que Usuario, de solo
+    lectura).
+    
     Uso en routers:
     @router.get("/protected")
     def protected_route(current_user: Usuario = Depends(get_current_user)):
@@ -35,17 +48,25 @@ async def get_current_user(
     # Verificar que sea un access token
     verify_token_type(payload, "access")
     
-    # Obtener username del token
-    username: str = payload.get("sub")
-    if username is None:
+    # Obtener id del usuario del token
+    usuario_id = payload.get("user_id")
+    if usuario_id is None or payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido: no contiene username",
+            detail="Token inválido: no contiene usuario",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    version = payload.get("ver", 0)
+    rol = payload.get("rol")
     
-    # Buscar usuario en BD
-    usuario = db.query(Usuario).filter(Usuario.username == username).first()
+    # Camino caliente: sin consulta a la base
+    principal = PrincipalCacheService.obtener(usuario_id, version)
+    if principal is not None and principal.rol.value == rol:
+        return principal
+    
+    # Miss (o rol distinto al cacheado): leer el usuario vigente
+    result = await db.execute(select(Usuario).where(Usuario.id == usuario_id))
+    usuario = result.scalar_one_or_none()
     
     if usuario is None:
         raise HTTPException(
@@ -68,7 +89,17 @@ async def get_current_user(
             detail="Usuario eliminado"
         )
     
-    return usuario
+    # Verificar que el token siga vigente y con el rol actual
+    if usuario.token_version != version or usuario.rol.value != rol:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado: volver a iniciar sesión",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    principal = UsuarioPrincipal.desde_usuario(usuario)
+    PrincipalCacheService.guardar(principal)
+    return principal
 
 
 async def get_current_active_user(
@@ -166,12 +197,22 @@ class PaginationParams:
     def get_items(pagination: PaginationParams = Depends()):
         skip = pagination.skip
         limit = pagination.limit
+    
+    Modo cursor (keyset, opcional): si el cliente envía `cursor` (vacío para
+    la primera página) se pagina con WHERE (orden, id) < (último visto) en
+    lugar de OFFSET y no se cuenta el total. El costo por página no crece con
+    la profundidad. Ver aplicar_cursor() / pagina_cursor().
     """
     
     def __init__(
         self,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = Query(
+            None,
+            description="Paginación por cursor: vacío para la primera página, "
+                        "luego next_cursor/prev_cursor de la respuesta"
+        )
     ):
         from app.config import settings
         
@@ -188,6 +229,11 @@ class PaginationParams:
         self.page_size = page_size
         self.skip = (page - 1) * page_size
         self.limit = page_size
+        
+        # Modo cursor
+        self.usa_cursor = cursor is not None
+        self._cursor = _decodificar_cursor(cursor) if cursor else None
+        self._orden = None
     
     def get_metadata(self, total: int) -> dict:
         """
@@ -211,6 +257,131 @@ class PaginationParams:
             "has_next": self.page < total_pages,
             "has_prev": self.page > 1
         }
+    
+    # ==================== MODO CURSOR ====================
+    
+    def aplicar_cursor(self, query, columna, id_columna, descendente: bool = True):
+        """
+        Agrega WHERE/ORDER BY/LIMIT del modo cursor a una Query o select()
+        
+        Args:
+            query: Query ORM (sesión síncrona) o select() (asíncrona)
+            columna: Columna de orden (None para ordenar solo por id)
+            id_columna: Clave única de desempate (normalmente Model.id)
+            descendente: Orden de la lista (los más nuevos primero)
+        
+        Trae page_size + 1 filas para saber si hay más sin contar.
+        """
+        columnas = [c for c in (columna, id_columna) if c is not None]
+        self._orden = (columnas, descendente)
+        
+        # "prev" recorre hacia atrás: comparación y orden invertidos
+        hacia_atras = bool(self._cursor) and self._cursor["d"] == "p"
+        desc_efectivo = descendente != hacia_atras
+        
+        if self._cursor:
+            valores = self._valores_cursor(columnas)
+            query = query.filter(_keyset_despues_de(columnas, valores, desc_efectivo))
+        
+        return query.order_by(
+            *(c.desc() if desc_efectivo else c.asc() for c in columnas)
+        ).limit(self.page_size + 1)
+    
+    def pagina_cursor(self, filas: list) -> "tuple[list, dict]":
+        """
+        Recorta las filas traídas por aplicar_cursor() y arma la metadata
+        
+        Returns:
+            (filas de la página en orden de la lista, metadata con
+            next_cursor / prev_cursor; total y total_pages van en None)
+        """
+        columnas, _ = self._orden
+        hacia_atras = bool(self._cursor) and self._cursor["d"] == "p"
+        hay_mas = len(filas) > self.page_size
+        filas = list(filas[:self.page_size])
+        if hacia_atras:
+            filas.reverse()
+        
+        # Yendo hacia adelante, hay anteriores si se vino de un cursor; yendo
+        # hacia atrás, siempre hay siguientes (la página de la que se vino)
+        has_next = hay_mas if not hacia_atras else True
+        has_prev = hay_mas if hacia_atras else self._cursor is not None
+        
+        def clave(fila):
+            return [getattr(fila, c.key) for c in columnas]
+        
+        return filas, {
+            "page": None,
+            "page_size": self.page_size,
+            "total": None,
+            "total_pages": None,
+            "has_next": bool(filas) and has_next,
+            "has_prev": bool(filas) and has_prev,
+            "next_cursor": _codificar_cursor(columnas, clave(filas[-1]), "n") if filas and has_next else None,
+            "prev_cursor": _codificar_cursor(columnas, clave(filas[0]), "p") if filas and has_prev else None
+        }
+    
+    def _valores_cursor(self, columnas) -> list:
+        """Valores del cursor convertidos al tipo de cada columna"""
+        cursor = self._cursor
+        if cursor["c"] != [c.key for c in columnas] or len(cursor["v"]) != len(columnas):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido para este listado"
+            )
+        valores = []
+        for columna, valor in zip(columnas, cursor["v"]):
+            tipo = columna.type.python_type
+            try:
+                if tipo in (datetime, date) and isinstance(valor, str):
+                    valor = tipo.fromisoformat(valor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido"
+                )
+            valores.append(valor)
+        return valores
+
+
+def _keyset_despues_de(columnas, valores, descendente: bool):
+    """
+    (c1, c2) < (v1, v2) en orden descendente, > en ascendente
+    
+    Expandido a OR/AND (portátil entre motores y usa el índice de c1).
+    """
+    c1 = columnas[0]
+    v1 = valores[0]
+    mayor_menor = (lambda c, v: c < v) if descendente else (lambda c, v: c > v)
+    if len(columnas) == 1:
+        return mayor_menor(c1, v1)
+    c2, v2 = columnas[1], valores[1]
+    return or_(mayor_menor(c1, v1), and_(c1 == v1, mayor_menor(c2, v2)))
+
+
+def _codificar_cursor(columnas, valores: list, direccion: str) -> str:
+    """Cursor opaco: base64 url-safe de {c: columnas, v: valores, d: n|p}"""
+    datos = {
+        "c": [c.key for c in columnas],
+        "v": [v.isoformat() if isinstance(v, (datetime, date)) else v for v in valores],
+        "d": direccion
+    }
+    return base64.urlsafe_b64encode(json.dumps(datos, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decodificar_cursor(cursor: str) -> dict:
+    """Inverso de _codificar_cursor (400 si el cursor no es válido)"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if datos.get("d") not in ("n", "p") or not isinstance(datos.get("c"), list) or not isinstance(datos.get("v"), list):
+            raise ValueError
+        return datos
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
 
 
 # ==================== FILTROS ====================
@@ -1 +1,51 @@
-# Funciones auxiliares
\ No newline at end of file
+"""
+Funciones auxiliares de fecha/hora
+backend/app/utils/helpers.py
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+
+def ahora_utc() -> datetime:
+    """Fecha y hora actual con zona horaria UTC"""
+    return datetime.now(timezone.utc)
+
+
+def inicio_dia_utc(fecha: date) -> datetime:
+    """Medianoche (UTC) del día indicado"""
+    return datetime.combine(fecha, time.min, tzinfo=timezone.utc)
+
+
+def rango_dia_utc(fecha: date) -> tuple[datetime, datetime]:
+    """Rango semiabierto [inicio, fin) del día en UTC"""
+    inicio = inicio_dia_utc(fecha)
+    return inicio, inicio + timedelta(days=1)
+
+
+def parse_fecha_param(valor: Optional[str], fin: bool = False) -> Optional[datetime]:
+    """
+    Convertir un parámetro de query (fecha o timestamp ISO) a datetime UTC
+
+    Args:
+        valor: 'YYYY-MM-DD' o timestamp ISO (con o sin zona horaria)
+        fin: Si es True y el valor es solo una fecha, devuelve el inicio del
+            día siguiente (para usar como límite exclusivo y abarcar el día completo)
+
+    Returns:
+        datetime aware en UTC, o None si no se indicó valor
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    if not valor:
+        return None
+
+    valor = valor.strip()
+    if len(valor) == 10:
+        dia = date.fromisoformat(valor)
+        return inicio_dia_utc(dia + timedelta(days=1)) if fin else inicio_dia_utc(dia)
+
+    dt = datetime.fromisoformat(valor.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
@@ -0,0 +1,81 @@
+"""
+Serialización rápida de respuestas JSON
+backend/app/utils/respuestas.py
+
+- RespuestaJSON: response class por defecto de la app; serializa con orjson
+  (si está instalado) en lugar de json.dumps.
+- SerializadorJSON: TypeAdapter compilado una vez por tipo de respuesta.
+  Los listados devuelven directamente los bytes de dump_json (pydantic-core)
+  y se saltean el camino de FastAPI para response_model (model_dump,
+  revalidación, serialización a dict y json.dumps). El response_model de
+  la ruta se mantiene para la documentación OpenAPI.
+"""
+from decimal import Decimal
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+try:
+    # Import opcional: sin orjson se usa json.dumps de la librería estándar
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    _ORJSON_AVAILABLE = False
+
+
+def _orjson_default(valor: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+class RespuestaJSON(JSONResponse):
+    """JSONResponse serializada con orjson (mismo JSON compacto, UTF-8)"""
+
+    def render(self, content: Any) -> bytes:
+        if not _ORJSON_AVAILABLE:
+            return super().render(content)
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+class SerializadorJSON:
+    """
+    Respuesta JSON a partir de un TypeAdapter precompilado
+
+    Ejemplo:
+        _PAGINA = SerializadorJSON(PaginatedResponse[MiembroListItem])
+        return _PAGINA.respuesta({"items": filas, "pagination": metadata})
+    """
+
+    def __init__(self, tipo: Any):
+        self.tipo = tipo
+        self.adapter = TypeAdapter(tipo)
+
+    def serializar(self, contenido: Any) -> bytes:
+        """
+        Validar (acepta modelos, dicts u objetos ORM) y serializar a JSON
+
+        Las instancias del propio modelo no se revalidan.
+        """
+        valor = self.adapter.validate_python(contenido, from_attributes=True)
+        return self.adapter.dump_json(valor, by_alias=True)
+
+    def respuesta(
+        self,
+        contenido: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> Response:
+        return Response(
+            content=self.serializar(contenido),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json"
+        )
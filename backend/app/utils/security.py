@@ -3,7 +3,7 @@ Utilidades de seguridad: JWT, hashing, validaciones
 backend/app/utils/security.py
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -11,7 +11,21 @@ from fastapi import HTTPException, status
 from app.config import settings
 
 # ==================== PASSWORD HASHING ====================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds = rounds: verify_and_update marca para rehacer los hashes más débiles
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+def _truncar_72_bytes(password: str) -> str:
+    """bcrypt solo usa los primeros 72 bytes"""
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) > 72:
+        password = password_bytes[:72].decode('utf-8', errors='ignore')
+    return password
 
 
 def hash_password(password: str) -> str:
@@ -19,7 +33,8 @@ def hash_password(password: str) -> str:
     Hashea una contraseña usando bcrypt
     
     NOTA: bcrypt tiene un límite de 72 bytes, pero eso es suficiente
-    para contraseñas normales
+    para contraseñas normales. Es CPU intensivo (~100-300 ms): desde el
+    event loop usar password_pool.hashear().
     
     Args:
         password: Contraseña en texto plano
@@ -27,13 +42,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hash de la contraseña
     """
-    # Truncar a 72 bytes si es necesario (bcrypt limitation)
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-        password = password_bytes.decode('utf-8', errors='ignore')
-    
-    return pwd_context.hash(password)
+    return pwd_context.hash(_truncar_72_bytes(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -47,13 +56,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True si coinciden, False si no
     """
-    # Truncar a 72 bytes igual que en hash_password
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-        plain_password = password_bytes.decode('utf-8', errors='ignore')
+    return pwd_context.verify(_truncar_72_bytes(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña y, si el hash usa parámetros viejos, genera uno nuevo
     
-    return pwd_context.verify(plain_password, hashed_password)
+    Returns:
+        (coincide, nuevo_hash): nuevo_hash es None si no hace falta actualizarlo
+    """
+    return pwd_context.verify_and_update(_truncar_72_bytes(plain_password), hashed_password)
 
 
 # ==================== JWT TOKENS ====================
@@ -0,0 +1,172 @@
+"""
+Benchmark de búsqueda de socios
+backend/scripts/bench_busqueda_miembros.py
+
+Crea una base temporal con N socios sintéticos (apellidos y nombres con
+tildes) y mide la latencia de la búsqueda anterior (ILIKE '%término%' sobre
+cuatro columnas) contra BusquedaMiembrosService (FTS5 en SQLite, trigramas
+en PostgreSQL) para términos típicos del autocompletado. Reporta p50/p95 en
+milisegundos y cantidad de resultados.
+
+Con --database-url se puede medir contra un PostgreSQL vacío (se recrean
+las tablas; requiere permiso para CREATE EXTENSION pg_trgm).
+
+Uso:
+    # 100k socios en SQLite temporal
+    python -m scripts.bench_busqueda_miembros
+
+    # Otro tamaño y más repeticiones
+    python -m scripts.bench_busqueda_miembros --socios 20000 --repeticiones 50
+
+    # PostgreSQL de pruebas (¡borra las tablas!)
+    python -m scripts.bench_busqueda_miembros --database-url postgresql://u:p@localhost/bench
+"""
+import sys
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _args():
+    parser = argparse.ArgumentParser(description="Benchmark de búsqueda de socios")
+    parser.add_argument("--socios", type=int, default=100000, help="Cantidad de socios sintéticos")
+    parser.add_argument("--repeticiones", type=int, default=20, help="Consultas por término")
+    parser.add_argument("--limite", type=int, default=10, help="Resultados por consulta (autocompletado)")
+    parser.add_argument("--database-url", default=None, help="Base a usar (default: SQLite temporal)")
+    return parser.parse_args()
+
+
+ARGS = _args()
+
+# Base ANTES de importar la app (el engine se crea al importar)
+os.environ["DATABASE_URL"] = ARGS.database_url or (
+    f"sqlite:///{tempfile.mkdtemp(prefix='bench_busqueda_')}/bench.db"
+)
+
+from sqlalchemy import insert, or_, select
+
+from app.database import Base, SessionLocal, engine
+from app.models.miembro import Miembro, EstadoMiembro
+from app.services.busqueda_service import BusquedaMiembrosService
+from app.utils.busqueda import texto_busqueda
+
+LOTE_INSERT = 10000
+APELLIDOS = [
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez",
+    "García", "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez",
+    "Flores", "Benítez", "Acosta", "Medina", "Herrera", "Suárez", "Aguirre", "Giménez",
+    "Gutiérrez", "Pereyra", "Rojas", "Molina", "Castro", "Ortiz", "Núñez", "Ibáñez",
+]
+NOMBRES = [
+    "María", "José", "Juan", "Ana", "Luis", "Lucía", "Martín", "Sofía", "Carlos", "Valentina",
+    "Jorge", "Camila", "Andrés", "Julián", "Inés", "Tomás", "Mónica", "Raúl", "Belén", "Ramón",
+]
+TERMINOS = ["gonz", "ibanez", "nunez maria", "perez ju", "3001234", "M-0005", "xyzxyz"]
+
+
+def sembrar(cantidad: int) -> None:
+    """Recrear las tablas y cargar `cantidad` socios"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    azar = random.Random(42)
+    with engine.begin() as conn:
+        for inicio in range(0, cantidad, LOTE_INSERT):
+            filas = []
+            for i in range(inicio + 1, min(inicio + LOTE_INSERT, cantidad) + 1):
+                apellido = f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+                nombre = azar.choice(NOMBRES)
+                documento = str(30000000 + i)
+                numero = f"M-{i:06d}"
+                filas.append({
+                    "numero_miembro": numero,
+                    "numero_documento": documento,
+                    "nombre": nombre,
+                    "apellido": apellido,
+                    # insert() de Core no dispara los eventos del ORM
+                    "texto_busqueda": texto_busqueda(apellido, nombre, documento, numero),
+                    "qr_code": f"BENCH-{i}",
+                    "qr_hash": f"{i:064d}",
+                    "qr_generated_at": "2024-01-01T00:00:00",
+                    "estado": EstadoMiembro.ACTIVO,
+                    "saldo_cuenta": 0.0,
+                })
+            conn.execute(insert(Miembro), filas)
+
+
+def consulta_ilike(q: str, limite: int):
+    """Búsqueda anterior (ILIKE con comodín inicial)"""
+    termino = f"%{q}%"
+    return (
+        select(Miembro.id)
+        .where(
+            Miembro.is_deleted == False,
+            or_(
+                Miembro.nombre.ilike(termino),
+                Miembro.apellido.ilike(termino),
+                Miembro.numero_documento.ilike(termino),
+                Miembro.numero_miembro.ilike(termino)
+            )
+        )
+        .order_by(Miembro.apellido, Miembro.nombre)
+        .limit(limite)
+    )
+
+
+def consulta_indexada(q: str, limite: int):
+    """Búsqueda nueva (misma consulta que /api/miembros/buscar)"""
+    dialecto = engine.dialect.name
+    return (
+        select(Miembro.id)
+        .where(Miembro.is_deleted == False, BusquedaMiembrosService.filtro(q, dialecto))
+        .order_by(*BusquedaMiembrosService.orden(q, dialecto))
+        .limit(limite)
+    )
+
+
+def medir(db, consulta, repeticiones: int) -> tuple:
+    """Ejecutar la consulta `repeticiones` veces; devuelve (p50_ms, p95_ms, filas)"""
+    latencias = []
+    filas = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = len(db.execute(consulta).all())
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    latencias.sort()
+    p95 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))]
+    return statistics.median(latencias), p95, filas
+
+
+def main():
+    print(f"Sembrando {ARGS.socios} socios ({engine.dialect.name})...")
+    inicio = time.perf_counter()
+    sembrar(ARGS.socios)
+    print(f"[OK] Carga en {time.perf_counter() - inicio:.1f} s")
+
+    print("=" * 78)
+    print(f"{'Término':<14}{'ILIKE p50':>11}{'p95':>9}{'filas':>7}{'Índice p50':>13}{'p95':>9}{'filas':>7}{'x':>8}")
+    print("-" * 78)
+    db = SessionLocal()
+    try:
+        for q in TERMINOS:
+            antes = medir(db, consulta_ilike(q, ARGS.limite), ARGS.repeticiones)
+            ahora = medir(db, consulta_indexada(q, ARGS.limite), ARGS.repeticiones)
+            print(
+                f"{q:<14}{antes[0]:>11.2f}{antes[1]:>9.2f}{antes[2]:>7}"
+                f"{ahora[0]:>13.2f}{ahora[1]:>9.2f}{ahora[2]:>7}{antes[0] / max(ahora[0], 1e-6):>8.1f}"
+            )
+    finally:
+        db.close()
+    print("=" * 78)
+    print("Nota: ILIKE no encuentra términos sin tildes ('ibanez') en apellidos con tildes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de generación de credenciales en lote
+backend/scripts/bench_credenciales.py
+
+Genera N socios sintéticos (sin base de datos) y mide el tiempo de armar
+el PDF y el ZIP renderizando en serie y con el pool de procesos. La caché
+de renders en disco se apunta a un directorio temporal vacío, de modo que
+cada corrida mide el render completo (usar --con-cache para medir una
+reimpresión).
+
+Uso:
+    # 5000 socios, 4 procesos
+    python -m scripts.bench_credenciales
+
+    # Solo ZIP, 8 procesos
+    python -m scripts.bench_credenciales --formatos zip --workers 8
+"""
+import sys
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def generar_datos(n: int):
+    """Socios sintéticos con qr_hash real"""
+    from app.services.credencial_service import CredencialDatos
+    from app.services.qr_service import QRService
+
+    datos = []
+    for i in range(1, n + 1):
+        documento = str(20000000 + i)
+        timestamp = "2024-01-01T00:00:00"
+        qr = QRService.generar_qr_miembro(
+            miembro_id=i, numero_documento=documento, numero_miembro=f"M-{i:05d}",
+            timestamp=timestamp, personalizar=False
+        )
+        datos.append(CredencialDatos(
+            id=i,
+            numero_miembro=f"M-{i:05d}",
+            numero_documento=documento,
+            nombre_completo=f"Apellido{i}, Nombre{i}",
+            categoria="Activo",
+            fecha_alta=date(2024, 1, 1),
+            qr_generated_at=timestamp,
+            qr_hash=qr["qr_hash"],
+        ))
+    return datos
+
+
+def medir(generador) -> tuple:
+    """Consumir el generador y devolver (segundos, bytes, segundos al primer bloque)"""
+    inicio = time.perf_counter()
+    primer_bloque = None
+    total = 0
+    for bloque in generador:
+        if primer_bloque is None and bloque:
+            primer_bloque = time.perf_counter() - inicio
+        total += len(bloque)
+    return time.perf_counter() - inicio, total, primer_bloque or 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de credenciales en lote (PDF/ZIP)")
+    parser.add_argument("--socios", type=int, default=5000, help="Cantidad de socios sintéticos")
+    parser.add_argument("--workers", type=int, default=4, help="Procesos del pool")
+    parser.add_argument("--formatos", nargs="+", choices=["pdf", "zip"], default=["pdf", "zip"])
+    parser.add_argument("--con-cache", action="store_true",
+                        help="Reutilizar la caché de renders entre corridas")
+    args = parser.parse_args()
+
+    # Directorio de caché aislado (los workers spawn lo leen del entorno)
+    os.environ["UPLOAD_DIR"] = tempfile.mkdtemp(prefix="bench_credenciales_")
+
+    from app.config import settings
+    from app.services.credencial_service import CredencialService
+    from app.services.qr_render_cache import QRRenderCache
+
+    settings.CREDENCIALES_MIN_LOTE_POOL = 1
+    if not args.con_cache:
+        settings.QR_RENDER_CACHE_ENABLED = False
+        os.environ["QR_RENDER_CACHE_ENABLED"] = "false"
+
+    print(f"Generando {args.socios} socios sintéticos...")
+    datos = generar_datos(args.socios)
+
+    print("=" * 72)
+    print(f"{'Formato':<8}{'Workers':>8}{'Total (s)':>12}{'Socios/s':>12}{'1er bloque (s)':>16}{'MB':>10}")
+    print("-" * 72)
+    for formato in args.formatos:
+        for workers in (1, args.workers):
+            QRRenderCache.limpiar_memoria()
+            if formato == "zip":
+                gen = CredencialService.generar_zip(datos, workers=workers)
+            else:
+                gen = CredencialService.generar_pdf(datos, workers=workers)
+            segundos, tamaño, primero = medir(gen)
+            print(
+                f"{formato:<8}{workers:>8}{segundos:>12.2f}{len(datos) / segundos:>12.0f}"
+                f"{primero:>16.2f}{tamaño / 1_048_576:>10.1f}"
+            )
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark de exportación de pagos
+backend/scripts/bench_exportaciones.py
+
+Para cada tamaño pedido crea una base SQLite temporal con N pagos
+sintéticos y la exporta en cada formato (xlsx, csv, parquet) con la misma
+proyección que usa /api/reportes/exportar/pagos. Reporta tiempo, filas/s,
+tamaño del archivo y memoria pico de Python (tracemalloc). La memoria pico
+debe mantenerse prácticamente igual entre 1k y 500k filas.
+
+Uso:
+    # 1k y 100k pagos, los tres formatos
+    python -m scripts.bench_exportaciones
+
+    # Tamaños y formatos personalizados
+    python -m scripts.bench_exportaciones --filas 1000 50000 500000 --formatos csv parquet
+"""
+import sys
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Base temporal ANTES de importar la app (el engine se crea al importar)
+_DIR_BENCH = tempfile.mkdtemp(prefix="bench_export_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DIR_BENCH}/bench.db"
+
+from sqlalchemy import insert
+
+from app.database import Base, SessionLocal, engine
+from app.models.miembro import Miembro, EstadoMiembro
+from app.models.pago import Pago, TipoPago, MetodoPago, EstadoPago
+from app.services.export_proyecciones import proyeccion_pagos
+from app.services.export_service import ExportService
+
+SOCIOS = 500
+LOTE_INSERT = 10000
+
+
+def sembrar(filas: int) -> None:
+    """Recrear las tablas y cargar SOCIOS socios y `filas` pagos"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Miembro), [
+            {
+                "numero_miembro": f"M-{i:05d}",
+                "numero_documento": str(30000000 + i),
+                "nombre": f"Nombre{i}",
+                "apellido": f"Apellido{i}",
+                "qr_code": f"BENCH-{i}",
+                "qr_hash": f"{i:064d}",
+                "qr_generated_at": "2024-01-01T00:00:00",
+                "estado": EstadoMiembro.ACTIVO,
+                "saldo_cuenta": 0.0,
+            }
+            for i in range(1, SOCIOS + 1)
+        ])
+
+        base = date(2020, 1, 1)
+        for inicio in range(0, filas, LOTE_INSERT):
+            conn.execute(insert(Pago), [
+                {
+                    "miembro_id": i % SOCIOS + 1,
+                    "tipo": TipoPago.CUOTA,
+                    "concepto": "Cuota mensual",
+                    "monto": 1500.0 + i % 7,
+                    "descuento": 0.0,
+                    "recargo": 0.0,
+                    "monto_final": 1500.0 + i % 7,
+                    "metodo_pago": MetodoPago.EFECTIVO,
+                    "estado": EstadoPago.APROBADO,
+                    "fecha_pago": base + timedelta(days=i % 1800),
+                    "numero_comprobante": f"R-{i:08d}",
+                }
+                for i in range(inicio, min(inicio + LOTE_INSERT, filas))
+            ])
+
+
+def _generar(db, formato: str):
+    """Iterador de bloques del archivo en el formato pedido"""
+    if formato == "csv":
+        return ExportService.generar_csv(proyeccion_pagos())
+    if formato == "parquet":
+        return ExportService.iterar_archivo(ExportService.generar_parquet(db, proyeccion_pagos()))
+    return ExportService.iterar_archivo(ExportService.generar_excel(db, proyeccion_pagos()))
+
+
+def medir(formato: str) -> tuple:
+    """Exportar los pagos; devuelve (segundos, bytes, pico_mb)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        tamaño = sum(len(b) for b in _generar(db, formato))
+    finally:
+        db.close()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, tamaño, pico / 1_048_576
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de exportación de pagos (memoria y throughput)")
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 100000],
+                        help="Cantidades de pagos a exportar")
+    parser.add_argument("--formatos", nargs="+", choices=["xlsx", "csv", "parquet"],
+                        default=["xlsx", "csv", "parquet"], help="Formatos a medir")
+    args = parser.parse_args()
+
+    if "parquet" in args.formatos and not ExportService.parquet_disponible():
+        print("[WARN] pyarrow no instalado: se omite parquet")
+        args.formatos.remove("parquet")
+
+    print("=" * 64)
+    print(f"{'Formato':<8}{'Filas':>10}{'Total (s)':>12}{'Filas/s':>12}{'MB archivo':>12}{'Pico MB':>10}")
+    print("-" * 64)
+    for filas in args.filas:
+        sembrar(filas)
+        for formato in args.formatos:
+            segundos, tamaño, pico = medir(formato)
+            print(
+                f"{formato:<8}{filas:>10}{segundos:>12.2f}{filas / segundos:>12.0f}"
+                f"{tamaño / 1_048_576:>12.1f}{pico:>10.1f}"
+            )
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
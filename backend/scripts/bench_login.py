@@ -0,0 +1,112 @@
+"""
+Prueba de carga de inicios de sesión simultáneos
+backend/scripts/bench_login.py
+
+Simula un cambio de turno: N clientes hacen POST /api/auth/login a la vez
+mientras otro cliente consulta /health en bucle. Reporta la latencia de los
+logins (p50/p95/max), cuántos recibieron 503 (pool de bcrypt saturado) y la
+latencia de /health durante la ráfaga: si bcrypt corriera en el event loop,
+/health quedaría frenado detrás de los logins.
+
+Requiere un servidor en ejecución y un usuario existente (se usa el mismo
+para todos los logins).
+
+Uso:
+    # 50 logins simultáneos
+    python -m scripts.bench_login --username admin --password Admin123
+
+    # Varias ráfagas seguidas
+    python -m scripts.bench_login --username admin --password Admin123 --concurrency 50 --rondas 3
+"""
+import sys
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+
+def percentil(valores, p):
+    """Percentil simple por posición"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+async def login(client, username, password, latencias, estados):
+    """Un login; guarda latencia y código de estado"""
+    inicio = time.perf_counter()
+    try:
+        resp = await client.post("/api/auth/login", json={"username": username, "password": password})
+        estados.append(resp.status_code)
+    except httpx.HTTPError as e:
+        estados.append(type(e).__name__)
+    latencias.append(time.perf_counter() - inicio)
+
+
+async def sondear_health(client, terminar: asyncio.Event, latencias):
+    """Consultar /health en bucle hasta que terminen los logins"""
+    while not terminar.is_set():
+        inicio = time.perf_counter()
+        try:
+            await client.get("/health")
+            latencias.append(time.perf_counter() - inicio)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.01)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60.0, limits=limits) as client:
+        for ronda in range(1, args.rondas + 1):
+            logins, estados, health = [], [], []
+            terminar = asyncio.Event()
+            sonda = asyncio.create_task(sondear_health(client, terminar, health))
+
+            inicio = time.perf_counter()
+            await asyncio.gather(*(
+                login(client, args.username, args.password, logins, estados)
+                for _ in range(args.concurrency)
+            ))
+            transcurrido = time.perf_counter() - inicio
+            terminar.set()
+            await sonda
+
+            ok = sum(1 for e in estados if e == 200)
+            saturados = sum(1 for e in estados if e == 503)
+            print("=" * 60)
+            print(f"Ronda {ronda}: {args.concurrency} logins en {transcurrido:.2f}s")
+            print(f"OK / 503 / otros:     {ok} / {saturados} / {len(estados) - ok - saturados}")
+            print(f"Login p50/p95/max:    "
+                  f"{percentil(logins, 50) * 1000:.0f} / "
+                  f"{percentil(logins, 95) * 1000:.0f} / "
+                  f"{max(logins) * 1000:.0f} ms")
+            if health:
+                print(f"/health durante la ráfaga ({len(health)}): p50/p95/max "
+                      f"{percentil(health, 50) * 1000:.1f} / "
+                      f"{percentil(health, 95) * 1000:.1f} / "
+                      f"{max(health) * 1000:.1f} ms")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de logins simultáneos (bcrypt)")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del backend")
+    parser.add_argument("--username", required=True, help="Usuario existente")
+    parser.add_argument("--password", required=True, help="Contraseña")
+    parser.add_argument("--concurrency", type=int, default=50, help="Logins simultáneos")
+    parser.add_argument("--rondas", type=int, default=1, help="Ráfagas a ejecutar")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
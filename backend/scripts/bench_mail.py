@@ -0,0 +1,118 @@
+"""
+Benchmark de envío masivo de emails
+backend/scripts/bench_mail.py
+
+Levanta un servidor SMTP local (aiosmtpd) que simula la latencia de red de
+un proveedor real y compara:
+- una conexión por mensaje (comportamiento anterior: conectar, enviar, QUIT)
+- SMTPPool con N conexiones persistentes y envíos concurrentes
+
+No requiere base de datos ni credenciales.
+
+Uso:
+    # 2000 mensajes, 20 ms de latencia por comando, pool de 4 conexiones
+    python -m scripts.bench_mail
+
+    # Personalizado (omitir el modo anterior, que es el lento)
+    python -m scripts.bench_mail --mensajes 5000 --conexiones 8 --latencia-ms 50 --solo-pool
+"""
+import sys
+import argparse
+import asyncio
+import smtplib
+import socket
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiosmtpd.controller import Controller
+
+from app.services.mail_pool import SMTPPool
+
+
+class _ReceptorLento:
+    """Handler que demora cada respuesta como lo haría un servidor remoto"""
+
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.recibidos = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.latencia)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latencia)
+        self.recibidos += 1
+        return "250 OK"
+
+
+def _mensajes(n: int):
+    for i in range(n):
+        msg = EmailMessage()
+        msg["From"] = "club@example.com"
+        msg["To"] = f"socio{i}@example.com"
+        msg["Subject"] = "Recordatorio de Cuota"
+        msg.set_content("Tienes una cuota pendiente.")
+        yield msg
+
+
+def medir_por_mensaje(host: str, port: int, n: int) -> float:
+    """Una conexión por mensaje, en serie"""
+    inicio = time.perf_counter()
+    for msg in _mensajes(n):
+        smtp = smtplib.SMTP(host, port)
+        smtp.send_message(msg)
+        smtp.quit()
+    return time.perf_counter() - inicio
+
+
+def medir_pool(host: str, port: int, n: int, conexiones: int) -> float:
+    """SMTPPool con conexiones persistentes"""
+    pool = SMTPPool(host, port, modo="plano", tamaño=conexiones)
+    inicio = time.perf_counter()
+    errores = pool.enviar_lote(list(_mensajes(n)))
+    segundos = time.perf_counter() - inicio
+    pool.cerrar()
+    fallidos = sum(1 for e in errores if e)
+    if fallidos:
+        print(f"[WARN] {fallidos} envíos fallidos en el pool")
+    return segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de envío masivo SMTP (por mensaje vs pool)")
+    parser.add_argument("--mensajes", type=int, default=2000, help="Cantidad de emails")
+    parser.add_argument("--conexiones", type=int, default=4, help="Conexiones del pool")
+    parser.add_argument("--latencia-ms", type=float, default=20, help="Latencia simulada por comando SMTP")
+    parser.add_argument("--solo-pool", action="store_true", help="No medir el modo de una conexión por mensaje")
+    args = parser.parse_args()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    receptor = _ReceptorLento(args.latencia_ms / 1000)
+    controller = Controller(receptor, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    try:
+        print("=" * 56)
+        print(f"{'Modo':<22}{'Mensajes':>10}{'Total (s)':>12}{'Msg/s':>12}")
+        print("-" * 56)
+        if not args.solo_pool:
+            segundos = medir_por_mensaje(controller.hostname, port, args.mensajes)
+            print(f"{'una conexión/mensaje':<22}{args.mensajes:>10}{segundos:>12.2f}{args.mensajes / segundos:>12.0f}")
+        segundos = medir_pool(controller.hostname, port, args.mensajes, args.conexiones)
+        modo = f"pool x{args.conexiones}"
+        print(f"{modo:<22}{args.mensajes:>10}{segundos:>12.2f}{args.mensajes / segundos:>12.0f}")
+        print("=" * 56)
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Costo por request del logging HTTP (antes / después)
+backend/scripts/bench_request_logging.py
+
+Compara, sobre una ruta trivial y sin red (llamadas ASGI directas):
+- sin:       sin middleware de logging (referencia)
+- anterior:  @app.middleware("http") (BaseHTTPMiddleware) con json.dumps y
+             FileHandler síncrono en el event loop
+- asgi:      RequestLoggingMiddleware + ColaLogs (escritura en un thread)
+- muestreo:  igual que asgi con LOG_REQUEST_SAMPLE_RATE de --sample-rate
+
+Reporta p50/p99/media por request y el sobrecosto frente a "sin".
+
+Uso:
+    python -m scripts.bench_request_logging
+    python -m scripts.bench_request_logging --requests 20000 --concurrency 50 --sample-rate 0.05
+"""
+import sys
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+
+from app import metrics
+from app.config import settings
+from app.middleware.logging import ColaLogs, RequestLoggingMiddleware
+
+
+def percentil(valores, p):
+    """Percentil simple por posición"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+def crear_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def middleware_anterior(app: FastAPI, logger: logging.Logger) -> None:
+    """Versión previa de log_requests (app/main.py)"""
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        request.state.request_id = req_id
+        t0 = metrics.now()
+        response = await call_next(request)
+        duration = max(metrics.now() - t0, 0.0)
+        response.headers["X-Request-ID"] = req_id
+        route = request.scope.get("route")
+        path_template = getattr(route, "path", request.url.path)
+        metrics.track_http(request.method, path_template, response.status_code, duration)
+        logger.info(json.dumps({
+            "msg": "request",
+            "request_id": req_id,
+            "method": request.method,
+            "path": request.url.path,
+            "route": path_template,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "client": getattr(request.client, "host", None),
+        }, ensure_ascii=False))
+        return response
+
+
+async def una_request(app, latencias):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/ping", "raw_path": b"/ping",
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    inicio = time.perf_counter()
+    await app(scope, receive, send)
+    latencias.append(time.perf_counter() - inicio)
+
+
+async def medir(app, total: int, concurrency: int):
+    # Calentar (construcción del middleware stack, imports perezosos)
+    await asyncio.gather(*(una_request(app, []) for _ in range(min(200, total))))
+    latencias = []
+    inicio = time.perf_counter()
+    for desde in range(0, total, concurrency):
+        await asyncio.gather(*(una_request(app, latencias) for _ in range(min(concurrency, total - desde))))
+    return latencias, time.perf_counter() - inicio
+
+
+FORMATO = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def archivo_log(directorio: str, nombre: str) -> logging.FileHandler:
+    handler = logging.FileHandler(str(Path(directorio) / f"{nombre}.log"))
+    handler.setFormatter(logging.Formatter(FORMATO))
+    return handler
+
+
+async def run(args):
+    logger_mw = logging.getLogger("app.middleware.logging")
+    logger_mw.propagate = False
+    logger_mw.setLevel(logging.INFO)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        # Referencia
+        resultados["sin"] = await medir(crear_app(), args.requests, args.concurrency)
+
+        # Anterior: escritura síncrona en el event loop
+        logger_anterior = logging.getLogger("bench.anterior")
+        logger_anterior.propagate = False
+        logger_anterior.setLevel(logging.INFO)
+        handler = archivo_log(directorio, "anterior")
+        logger_anterior.handlers = [handler]
+        app = crear_app()
+        middleware_anterior(app, logger_anterior)
+        resultados["anterior"] = await medir(app, args.requests, args.concurrency)
+        handler.close()
+
+        # ASGI + cola, sin y con muestreo
+        settings.LOG_SLOW_REQUEST_MS = 60000.0
+        for nombre, tasa in (("asgi", 1.0), ("muestreo", args.sample_rate)):
+            settings.LOG_REQUEST_SAMPLE_RATE = tasa
+            settings.LOG_REQUEST_SAMPLE_RATES = {}
+            handler = archivo_log(directorio, nombre)
+            cola = ColaLogs([handler], formato=FORMATO, max_cola=settings.LOG_QUEUE_MAX_SIZE)
+            logger_mw.handlers = [cola.handler]
+            cola.iniciar()
+            app = crear_app()
+            app.add_middleware(RequestLoggingMiddleware)
+            resultados[nombre] = await medir(app, args.requests, args.concurrency)
+            cola.detener()
+            handler.close()
+            if cola.descartados:
+                print(f"[WARN] {nombre}: {cola.descartados} logs descartados por cola llena")
+
+    base = sum(resultados["sin"][0]) / len(resultados["sin"][0])
+    print("=" * 72)
+    print(f"{args.requests} requests, {args.concurrency} concurrentes")
+    print(f"{'variante':<10} {'req/s':>9} {'p50 us':>9} {'p99 us':>9} {'media us':>9} {'sobrecosto us':>14}")
+    for nombre, (latencias, transcurrido) in resultados.items():
+        media = sum(latencias) / len(latencias)
+        print(f"{nombre:<10} {len(latencias) / transcurrido:>9.0f} "
+              f"{percentil(latencias, 50) * 1e6:>9.0f} {percentil(latencias, 99) * 1e6:>9.0f} "
+              f"{media * 1e6:>9.0f} {(media - base) * 1e6:>14.0f}")
+    print("=" * 72)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por request del logging HTTP")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests por variante")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests simultáneas")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="Tasa de la variante 'muestreo'")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark de serialización JSON y bytes transferidos
+backend/scripts/bench_serializacion.py
+
+Compara el camino anterior (response_model / dict + JSONResponse estándar)
+con el nuevo (TypeAdapter precompilado / orjson) para:
+- una página de listar_miembros (--page-size socios, por defecto 100)
+- el reporte de morosidad completo (--morosos deudores)
+
+Las requests se ejecutan contra una app mínima con llamadas ASGI directas
+(sin red ni base). Reporta tiempo por request (p50/media) y el tamaño del
+cuerpo sin comprimir, con gzip y con brotli (si el paquete está instalado).
+
+Uso:
+    python -m scripts.bench_serializacion
+    python -m scripts.bench_serializacion --page-size 100 --morosos 5000 --repeticiones 300
+"""
+import sys
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# No se usa la base, pero el engine se crea al importar los modelos
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_serializacion.db")
+
+from fastapi import FastAPI
+
+from app.middleware.compression import _BROTLI_AVAILABLE, comprimir
+from app.models.miembro import EstadoMiembro
+from app.schemas.common import PaginatedResponse
+from app.schemas.miembro import MiembroListItem
+from app.utils.respuestas import RespuestaJSON, SerializadorJSON
+
+
+def percentil(valores, p):
+    """Percentil simple por posición"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+def socios_sinteticos(n: int):
+    """Objetos con los atributos que lee MiembroListItem (como filas ORM)"""
+    categoria = SimpleNamespace(
+        id=1, nombre="Activo", descripcion="Socio activo pleno", cuota_base=15000.0,
+        tiene_cuota_fija=True, caracteristicas=None, activa=True,
+        created_at=date(2023, 1, 1), updated_at=None,
+    )
+    return [
+        SimpleNamespace(
+            id=i,
+            numero_miembro=f"CLUB-{i:06d}",
+            numero_documento=str(30000000 + i),
+            nombre_completo=f"Apellido{i} Núñez, Nombre{i}",
+            email=f"socio{i}@example.com",
+            telefono=f"+54 11 4{i:07d}",
+            estado=EstadoMiembro.ACTIVO if i % 7 else EstadoMiembro.MOROSO,
+            saldo_cuenta=-1500.0 * (i % 5),
+            categoria=categoria,
+            fecha_alta=date(2020, 1, 1) + timedelta(days=i),
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def reporte_morosidad(n: int) -> Dict[str, Any]:
+    """Mismo formato que /api/reportes/morosidad"""
+    morosos = [
+        {
+            "id": i,
+            "numero_miembro": f"CLUB-{i:06d}",
+            "nombre_completo": f"Apellido{i} Núñez, Nombre{i}",
+            "email": f"socio{i}@example.com",
+            "telefono": f"+54 11 4{i:07d}",
+            "deuda": 250.0 * (i % 40 + 1),
+            "dias_mora": 30 + i % 300,
+            "ultima_cuota_pagada": (date(2024, 1, 1) + timedelta(days=i % 365)).isoformat(),
+            "categoria": "Activo",
+            "estado": "moroso",
+        }
+        for i in range(1, n + 1)
+    ]
+    total = sum(m["deuda"] for m in morosos)
+    return {
+        "cantidad_morosos": n,
+        "total_deuda": total,
+        "deuda_promedio": total / n if n else 0,
+        "morosos": morosos,
+        "por_rango": {"menos_500": 0, "500_a_1000": 0, "mas_1000": 0},
+        "fecha_reporte": date.today().isoformat(),
+    }
+
+
+def crear_app(socios, reporte, metadata) -> FastAPI:
+    app = FastAPI()
+    pagina = SerializadorJSON(PaginatedResponse[MiembroListItem])
+
+    @app.get("/miembros/anterior", response_model=PaginatedResponse[MiembroListItem])
+    async def miembros_anterior():
+        items = [
+            MiembroListItem(
+                id=m.id, numero_miembro=m.numero_miembro, numero_documento=m.numero_documento,
+                nombre_completo=m.nombre_completo, email=m.email, telefono=m.telefono,
+                estado=m.estado, saldo_cuenta=m.saldo_cuenta, categoria=m.categoria,
+                fecha_alta=m.fecha_alta,
+            )
+            for m in socios
+        ]
+        return PaginatedResponse(items=items, pagination=metadata)
+
+    @app.get("/miembros/nuevo", response_model=PaginatedResponse[MiembroListItem])
+    async def miembros_nuevo():
+        return pagina.respuesta({"items": socios, "pagination": metadata})
+
+    @app.get("/morosidad/anterior")
+    async def morosidad_anterior() -> Dict[str, Any]:
+        return reporte
+
+    @app.get("/morosidad/nuevo", response_model=Dict[str, Any])
+    async def morosidad_nuevo():
+        return RespuestaJSON(reporte)
+
+    return app
+
+
+async def una_request(app, path: str, latencias) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    cuerpo = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            cuerpo.extend(message.get("body", b""))
+
+    inicio = time.perf_counter()
+    await app(scope, receive, send)
+    latencias.append(time.perf_counter() - inicio)
+    return bytes(cuerpo)
+
+
+async def run(args):
+    metadata = {"page": 1, "page_size": args.page_size, "total": 5000,
+                "total_pages": 50, "has_next": True, "has_prev": False}
+    app = crear_app(socios_sinteticos(args.page_size), reporte_morosidad(args.morosos), metadata)
+
+    print("=" * 86)
+    print(f"{'caso':<22} {'p50 ms':>8} {'media ms':>9} {'bytes':>10} {'gzip':>9} {'br':>9} {'gzip ms':>8}")
+    for caso in ("miembros", "morosidad"):
+        for variante in ("anterior", "nuevo"):
+            path = f"/{caso}/{variante}"
+            await una_request(app, path, [])      # calentar
+            latencias = []
+            for _ in range(args.repeticiones):
+                cuerpo = await una_request(app, path, latencias)
+
+            inicio = time.perf_counter()
+            gz = comprimir(cuerpo, "gzip")
+            gzip_ms = (time.perf_counter() - inicio) * 1000
+            br = len(comprimir(cuerpo, "br")) if _BROTLI_AVAILABLE else None
+
+            print(f"{path:<22} {percentil(latencias, 50) * 1000:>8.2f} "
+                  f"{sum(latencias) / len(latencias) * 1000:>9.2f} {len(cuerpo):>10} {len(gz):>9} "
+                  f"{br if br is not None else '-':>9} {gzip_ms:>8.2f}")
+    print("=" * 86)
+    if not _BROTLI_AVAILABLE:
+        print("brotli no instalado: solo se negocia gzip")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialización JSON y bytes transferidos")
+    parser.add_argument("--page-size", type=int, default=100, help="Socios por página")
+    parser.add_argument("--morosos", type=int, default=2000, help="Deudores en el reporte")
+    parser.add_argument("--repeticiones", type=int, default=200, help="Requests por caso")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark de throughput de validación QR bajo carga de reportes
+backend/scripts/bench_validar_qr.py
+
+Dispara validaciones concurrentes contra /api/accesos/validar-qr mientras
+otro grupo de clientes consulta /api/reportes/morosidad en bucle, y reporta
+validaciones por segundo y latencias (p50/p95/p99). Sirve para comparar el
+comportamiento con sesiones síncronas vs asíncronas (get_async_db).
+
+Requiere un servidor en ejecución y un usuario con rol portero o superior.
+
+Uso:
+    # Servidor local, 20 clientes QR durante 15 segundos
+    python -m scripts.bench_validar_qr --username admin --password admin123
+
+    # Más concurrencia y sin carga de reportes (línea base)
+    python -m scripts.bench_validar_qr --username admin --password admin123 \\
+        --concurrency 50 --report-workers 0
+
+    # Usar un socio específico
+    python -m scripts.bench_validar_qr --username admin --password admin123 --miembro-id 12
+"""
+import sys
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    """Obtener access token"""
+    resp = await client.post(
+        "/api/auth/login",
+        json={"username": username, "password": password}
+    )
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+async def obtener_qr(client: httpx.AsyncClient, miembro_id: int = None) -> str:
+    """Obtener el código QR de un socio (el primero del listado si no se indica)"""
+    if miembro_id is None:
+        resp = await client.get("/api/miembros", params={"page": 1, "page_size": 1})
+        resp.raise_for_status()
+        items = resp.json().get("items", [])
+        if not items:
+            raise SystemExit("[ERROR] No hay socios cargados (ejecutar scripts.seed_data)")
+        miembro_id = items[0]["id"]
+
+    resp = await client.get(f"/api/miembros/{miembro_id}")
+    resp.raise_for_status()
+    return resp.json()["qr_code"]
+
+
+async def worker_qr(client, qr_code, deadline, latencias, errores):
+    """Cliente que valida el mismo QR en bucle hasta el deadline"""
+    payload = {"qr_code": qr_code, "dispositivo_id": "bench", "ubicacion": "Benchmark"}
+    while time.perf_counter() < deadline:
+        inicio = time.perf_counter()
+        try:
+            resp = await client.post("/api/accesos/validar-qr", json=payload)
+            # 403 es una respuesta válida (socio moroso/suspendido)
+            if resp.status_code in (200, 403):
+                latencias.append(time.perf_counter() - inicio)
+            else:
+                errores.append(resp.status_code)
+        except httpx.HTTPError as e:
+            errores.append(type(e).__name__)
+
+
+async def worker_reportes(client, deadline, contador):
+    """Cliente que consulta el reporte de morosidad en bucle"""
+    while time.perf_counter() < deadline:
+        try:
+            resp = await client.get("/api/reportes/morosidad")
+            if resp.status_code == 200:
+                contador.append(1)
+        except httpx.HTTPError:
+            pass
+
+
+def percentil(valores, p):
+    """Percentil simple por posición"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + args.report_workers + 5)
+    async with httpx.AsyncClient(base_url=args.url, timeout=30.0, limits=limits) as client:
+        token = await login(client, args.username, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+        qr_code = await obtener_qr(client, args.miembro_id)
+
+        latencias, errores, reportes = [], [], []
+        deadline = time.perf_counter() + args.duration
+
+        tareas = [
+            worker_qr(client, qr_code, deadline, latencias, errores)
+            for _ in range(args.concurrency)
+        ]
+        tareas += [
+            worker_reportes(client, deadline, reportes)
+            for _ in range(args.report_workers)
+        ]
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*tareas)
+        transcurrido = time.perf_counter() - inicio
+
+    print("=" * 60)
+    print(f"Validaciones QR:      {len(latencias)} en {transcurrido:.1f}s")
+    print(f"Throughput:           {len(latencias) / transcurrido:.1f} req/s")
+    if latencias:
+        print(f"Latencia media:       {statistics.mean(latencias) * 1000:.1f} ms")
+        print(f"Latencia p50/p95/p99: "
+              f"{percentil(latencias, 50) * 1000:.1f} / "
+              f"{percentil(latencias, 95) * 1000:.1f} / "
+              f"{percentil(latencias, 99) * 1000:.1f} ms")
+    print(f"Reportes morosidad:   {len(reportes)}")
+    print(f"Errores:              {len(errores)}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de /api/accesos/validar-qr con carga concurrente de reportes"
+    )
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del backend")
+    parser.add_argument("--username", required=True, help="Usuario (portero o superior)")
+    parser.add_argument("--password", required=True, help="Contraseña")
+    parser.add_argument("--miembro-id", type=int, default=None, help="Socio cuyo QR se valida")
+    parser.add_argument("--concurrency", type=int, default=20, help="Clientes QR concurrentes")
+    parser.add_argument("--report-workers", type=int, default=4,
+                        help="Clientes concurrentes consultando /reportes/morosidad")
+    parser.add_argument("--duration", type=float, default=15.0, help="Duración en segundos")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Script para crear usuario administrador inicial
 backend/scripts/create_admin.py
 """
 import sys
+import asyncio
 from pathlib import Path
 
 # Agregar el directorio padre al path
@@ -30,7 +31,7 @@ def create_admin():
             return
         
         # Crear super admin
-        admin = AuthService.crear_usuario(
+        admin = asyncio.run(AuthService.crear_usuario(
             db=db,
             username="admin",
             email="admin@sistema.com",
@@ -39,7 +40,7 @@ def create_admin():
             apellido="Sistema",
             rol=RolUsuario.SUPER_ADMIN,
             telefono="1234567890"
-        )
+        ))
         
         print("[OK] Usuario administrador creado exitosamente:")
         print(f"   Username: {admin.username}")
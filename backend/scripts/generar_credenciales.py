@@ -0,0 +1,93 @@
+"""
+Generar credenciales en lote desde la línea de comandos
+backend/scripts/generar_credenciales.py
+
+Mismo resultado que GET /api/miembros/credenciales pero sin pasar por la
+API (útil para reimprimir todo el padrón).
+
+Uso:
+    # PDF con todos los socios activos (10 por hoja A4)
+    python -m scripts.generar_credenciales --salida credenciales.pdf
+
+    # ZIP de PNGs de una categoría, 8 procesos
+    python -m scripts.generar_credenciales --formato zip --categoria-id 2 \\
+        --salida credenciales.zip --workers 8
+"""
+import sys
+import argparse
+import logging
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.miembro import Miembro, EstadoMiembro
+from app.services.credencial_service import CredencialService, CredencialDatos
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def cargar_socios(estado=None, categoria_id=None):
+    """Socios no eliminados que cumplen los filtros, ordenados por apellido"""
+    db = SessionLocal()
+    try:
+        query = db.query(Miembro).options(joinedload(Miembro.categoria)).filter(Miembro.is_deleted == False)
+        if estado:
+            query = query.filter(Miembro.estado == EstadoMiembro(estado))
+        if categoria_id:
+            query = query.filter(Miembro.categoria_id == categoria_id)
+        return [
+            CredencialDatos.desde_miembro(m)
+            for m in query.order_by(Miembro.apellido, Miembro.nombre).all()
+        ]
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar credenciales de socios en PDF o ZIP")
+    parser.add_argument("--formato", choices=["pdf", "zip"], default="pdf", help="Formato de salida")
+    parser.add_argument("--salida", required=True, help="Archivo de salida")
+    parser.add_argument("--estado", choices=[e.value for e in EstadoMiembro], default=None,
+                        help="Filtrar por estado")
+    parser.add_argument("--categoria-id", type=int, default=None, help="Filtrar por categoría")
+    parser.add_argument("--columnas", type=int, default=2, help="Credenciales por fila (PDF)")
+    parser.add_argument("--filas", type=int, default=5, help="Filas por hoja (PDF)")
+    parser.add_argument("--workers", type=int, default=settings.CREDENCIALES_WORKERS,
+                        help=f"Procesos de render (default: {settings.CREDENCIALES_WORKERS})")
+    args = parser.parse_args()
+
+    datos = cargar_socios(args.estado, args.categoria_id)
+    if not datos:
+        logger.error("[ERROR] No hay socios que coincidan con los filtros")
+        sys.exit(1)
+
+    inicio = time.perf_counter()
+    if args.formato == "zip":
+        contenido = CredencialService.generar_zip(datos, workers=args.workers)
+    else:
+        contenido = CredencialService.generar_pdf(
+            datos, columnas=args.columnas, filas=args.filas, workers=args.workers
+        )
+
+    with open(args.salida, "wb") as f:
+        for bloque in contenido:
+            f.write(bloque)
+
+    logger.info(
+        f"[OK] {len(datos)} credenciales escritas en {args.salida} "
+        f"({time.perf_counter() - inicio:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Worker dedicado de envíos masivos de notificaciones
+backend/scripts/notification_worker.py
+
+Procesa la cola notificacion_jobs fuera de la API. Usarlo con
+NOTIFICATION_WORKER_EMBEDDED=false en la API; pueden correr varios a la vez
+(cada job lo toma un solo worker gracias al lease).
+
+Uso:
+    # Sondear la cola cada NOTIFICATION_WORKER_POLL_SECONDS
+    python -m scripts.notification_worker
+
+    # Procesar lo pendiente y salir (cron)
+    python -m scripts.notification_worker --una-vez
+"""
+import sys
+import argparse
+import logging
+import signal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.notification_jobs import NotificationWorker
+from app.services.notification_service import NotificationService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de envíos masivos de notificaciones")
+    parser.add_argument("--intervalo", type=float, default=settings.NOTIFICATION_WORKER_POLL_SECONDS,
+                        help="Segundos entre sondeos de la cola")
+    parser.add_argument("--una-vez", action="store_true", help="Procesar lo pendiente y salir")
+    args = parser.parse_args()
+
+    worker = NotificationWorker(intervalo=args.intervalo)
+    try:
+        if args.una_vez:
+            procesados = worker.ejecutar_una_vez()
+            logger.info(f"[OK] {procesados} envíos procesados")
+            return
+
+        # SIGTERM/SIGINT: terminar el lote en curso y salir
+        signal.signal(signal.SIGTERM, lambda *_: worker.detener())
+        signal.signal(signal.SIGINT, lambda *_: worker.detener())
+        worker.run_forever()
+    finally:
+        NotificationService.cerrar_pool()
+        logger.info("[OK] Worker detenido")
+
+
+if __name__ == "__main__":
+    main()
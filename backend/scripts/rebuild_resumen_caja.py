@@ -0,0 +1,53 @@
+"""
+Reconstrucción del resumen diario de caja
+backend/scripts/rebuild_resumen_caja.py
+
+Recalcula resumen_diario_caja desde movimientos_caja y pagos. Los endpoints lo
+mantienen al día solos; usarlo después de cargar datos por fuera de la API
+(seed, importaciones, correcciones manuales en la base).
+
+Uso:
+    # Todo el histórico
+    python -m scripts.rebuild_resumen_caja
+
+    # Solo un rango de fechas (inclusive)
+    python -m scripts.rebuild_resumen_caja --desde 2025-01-01 --hasta 2025-12-31
+"""
+import sys
+import argparse
+import logging
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.services.resumen_caja_service import ResumenCajaService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruir el resumen diario de caja")
+    parser.add_argument("--desde", type=date.fromisoformat, default=None, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=None, help="Fecha final (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        filas = ResumenCajaService.reconstruir(db, desde=args.desde, hasta=args.hasta)
+        logger.info(f"[OK] {filas} filas (día, categoría) recalculadas")
+    except Exception as e:
+        logger.error(f"[ERROR] No se pudo reconstruir el resumen: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ Crea:
 """
 import sys
 from pathlib import Path
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from random import randint, choice, uniform
 
 # Agregar el directorio padre al path
@@ -21,6 +21,7 @@ from app.database import SessionLocal
 from app.models.usuario import Usuario, RolUsuario
 from app.models.miembro import Miembro, Categoria, EstadoMiembro, TipoDocumento
 from app.models.pago import Pago, MovimientoCaja, TipoPago, MetodoPago, EstadoPago
+from app.services.resumen_caja_service import ResumenCajaService
 from app.models.acceso import Acceso, TipoAcceso, ResultadoAcceso
 from app.services.qr_service import QRService
 from app.utils.security import hash_password
@@ -339,7 +340,7 @@ def crear_accesos(db, socios, usuarios):
         dias_atras = randint(0, 7)
         hora = randint(8, 20)
         minuto = randint(0, 59)
-        fecha_hora = datetime.now() - timedelta(days=dias_atras, hours=24-hora, minutes=60-minuto)
+        fecha_hora = datetime.now(timezone.utc) - timedelta(days=dias_atras, hours=24-hora, minutes=60-minuto)
         
         # Determinar resultado según estado del socio
         if socio.estado == EstadoMiembro.ACTIVO:
@@ -354,7 +355,7 @@ def crear_accesos(db, socios, usuarios):
         
         acceso = Acceso(
             miembro_id=socio.id,
-            fecha_hora=fecha_hora.isoformat(),
+            fecha_hora=fecha_hora,
             tipo_acceso=TipoAcceso.QR,
             resultado=resultado,
             ubicacion=choice(["Entrada Principal", "Cancha 1", "Gimnasio", "Pileta"]),
@@ -409,6 +410,9 @@ def main():
         pagos = crear_pagos(db, socios, usuarios)
         accesos = crear_accesos(db, socios, usuarios)
         
+        # Los pagos de ejemplo se insertan directo: recalcular el resumen de caja
+        ResumenCajaService.reconstruir(db)
+        
         print("\n" + "=" * 60)
         print("[OK] DATOS DE PRUEBA CREADOS EXITOSAMENTE")
         print("=" * 60)
@@ -17,6 +17,10 @@ os.environ.setdefault("ENVIRONMENT", "test")
 # Usamos una base SQLite temporal por ejecución
 _TEST_DB = os.path.join(tempfile.gettempdir(), f"gestion_socios_test_{int(time.time())}.db")
 os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DB}")
+# Los tests de notificaciones ejecutan el worker explícitamente
+os.environ.setdefault("NOTIFICATION_WORKER_EMBEDDED", "false")
+# Muchos tests hacen login seguido; los de rate limiting lo habilitan
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
 
 
 @pytest.fixture(scope="session")
@@ -42,9 +46,10 @@ def client() -> Generator[TestClient, None, None]:
 def make_user(client):
 	"""Helper para registrar usuarios vía API.
 
-	Retorna un dict con (username, password, json).
+	Retorna un dict con (username, password, json). `rol` opcional
+	(administrador, operador, portero, consulta...).
 	"""
-	def _maker(username: str = None, password: str = None):
+	def _maker(username: str = None, password: str = None, rol: str = None):
 		import uuid
 		username = username or f"user_{uuid.uuid4().hex[:8]}"
 		password = password or "Admin1234"
@@ -56,6 +61,8 @@ def make_user(client):
 			"nombre": "Test",
 			"apellido": "User",
 		}
+		if rol:
+			payload["rol"] = rol
 		r = client.post("/api/auth/register", json=payload)
 		assert r.status_code == 201, r.text
 		return {"username": username, "password": password, "json": r.json()}
@@ -71,3 +78,62 @@ def auth_tokens(client, make_user):
 	assert r.status_code == 200, r.text
 	data = r.json()
 	return data
+
+
+@pytest.fixture
+def headers(auth_tokens):
+	"""Header Authorization con el access token de auth_tokens."""
+	return {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+
+
+@pytest.fixture
+def headers_rol(client, make_user):
+	"""Factory: header Authorization de un usuario nuevo con el rol indicado.
+
+	Uso: admin = headers_rol("administrador")
+	"""
+	def _headers(rol: str) -> dict:
+		u = make_user(rol=rol)
+		r = client.post("/api/auth/login", json={"username": u["username"], "password": u["password"]})
+		assert r.status_code == 200, r.text
+		return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+	return _headers
+
+
+@pytest.fixture
+def crear_miembro(client):
+	"""Factory: crea un socio vía API y retorna su JSON.
+
+	Uso: crear_miembro(admin, categoria_id=cat["id"], nombre="Lote")
+	"""
+	def _crear(headers: dict, categoria_id: int = None, nombre: str = "Test", apellido: str = "Socio"):
+		import uuid
+		uid = uuid.uuid4().hex[:8]
+		payload = {
+			"nombre": nombre,
+			"apellido": f"{apellido}{uid}",
+			"tipo_documento": "dni",
+			"numero_documento": str(int(uid, 16))[:8],
+		}
+		if categoria_id is not None:
+			payload["categoria_id"] = categoria_id
+		r = client.post("/api/miembros", headers=headers, json=payload)
+		assert r.status_code == 201, r.text
+		return r.json()
+
+	return _crear
+
+
+@pytest.fixture
+def escenario_acceso(client, headers_rol, crear_miembro):
+	"""Administrador, portero y tres socios de una categoría nueva con cuota fija."""
+	import uuid
+	admin = headers_rol("administrador")
+	portero = headers_rol("portero")
+	r = client.post("/api/miembros/categorias", headers=admin, json={
+		"nombre": f"Acceso_{uuid.uuid4().hex[:8]}", "cuota_base": 1000.0, "tiene_cuota_fija": True
+	})
+	assert r.status_code in (200, 201), r.text
+	miembros = [crear_miembro(admin, r.json()["id"], apellido="Offline") for _ in range(3)]
+	return admin, portero, miembros
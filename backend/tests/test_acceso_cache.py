@@ -0,0 +1,119 @@
+"""
+Tests para la caché de decisiones de acceso (validar-qr)
+backend/tests/test_acceso_cache.py
+"""
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.services.acceso_cache_service import AccesoCacheService
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+# ==================== TTLCache ====================
+
+def test_ttl_cache_lru_desaloja_menos_usado():
+    cache = TTLCache("test", max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" pasa a ser el más reciente
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_ttl_cache_expira(monkeypatch):
+    reloj = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: reloj[0])
+
+    cache = TTLCache("test", max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    reloj[0] += 4
+    assert cache.get("a") == 1
+    reloj[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+# ==================== INTEGRACIÓN validar-qr ====================
+
+@pytest.fixture
+def escenario(client, headers_rol, crear_miembro):
+    admin = headers_rol("administrador")
+    portero = headers_rol("portero")
+    cat = client.post("/api/miembros/categorias", headers=admin, json={
+        "nombre": f"Cache_{uuid.uuid4().hex[:8]}", "cuota_base": 1000.0, "tiene_cuota_fija": True
+    }).json()
+    miembro = crear_miembro(admin, cat["id"], nombre="Ana", apellido="Caché")
+    return admin, portero, miembro
+
+
+def _contar_selects_miembros(sentencias):
+    return sum(1 for s in sentencias if s.lstrip().upper().startswith("SELECT") and "FROM miembros" in s)
+
+
+def test_segundo_escaneo_sin_select_de_miembro(client, escenario):
+    _, portero, miembro = escenario
+    AccesoCacheService.invalidar(miembro["id"])
+    payload = {"qr_code": miembro["qr_code"], "ubicacion": "Test"}
+
+    sentencias = []
+    listener = lambda conn, cursor, stmt, *a: sentencias.append(stmt)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        r1 = client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+        primeras = _contar_selects_miembros(sentencias)
+        r2 = client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+        segundas = _contar_selects_miembros(sentencias) - primeras
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert r1.status_code == 200 and r2.status_code == 200
+    assert r1.json()["miembro"] == r2.json()["miembro"]
+    assert primeras >= 1
+    assert segundas == 0
+
+
+def test_cambio_de_estado_invalida_cache(client, escenario):
+    admin, portero, miembro = escenario
+    payload = {"qr_code": miembro["qr_code"], "ubicacion": "Test"}
+
+    r = client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+    assert r.json()["acceso_permitido"] is True
+
+    r = client.post(
+        f"/api/miembros/{miembro['id']}/cambiar-estado",
+        headers=admin,
+        json={"miembro_id": miembro["id"], "nuevo_estado": "suspendido", "motivo": "test caché"},
+    )
+    assert r.status_code == 200
+
+    r = client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+    assert r.status_code == 200
+    assert r.json()["acceso_permitido"] is False
+    assert r.json()["miembro"]["estado"] == "suspendido"
+
+
+def test_pago_invalida_cache(client, escenario):
+    admin, portero, miembro = escenario
+    payload = {"qr_code": miembro["qr_code"], "ubicacion": "Test"}
+
+    client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+    r = client.post("/api/pagos", headers=admin, json={
+        "miembro_id": miembro["id"],
+        "tipo": "cuota",
+        "concepto": "Cuota test caché",
+        "monto": 250.0,
+        "metodo_pago": "efectivo",
+        "fecha_pago": "2020-01-10",
+    })
+    assert r.status_code == 201, r.text
+
+    r = client.post("/api/accesos/validar-qr", headers=portero, json=payload)
+    assert r.json()["miembro"]["saldo_cuenta"] == pytest.approx(miembro["saldo_cuenta"] + 250.0)
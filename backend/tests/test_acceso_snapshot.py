@@ -0,0 +1,123 @@
+"""
+Tests del snapshot offline de decisiones de acceso (/api/accesos/snapshot)
+backend/tests/test_acceso_snapshot.py
+"""
+import hashlib
+import json
+
+import pytest
+
+from app.models.miembro import EstadoMiembro
+from app.services.acceso_snapshot_service import AccesoSnapshotService, ClaseAcceso, _CABECERA, _REGISTRO
+
+
+def _jsonl(client, headers, since=None):
+    params = {} if since is None else {"since": since}
+    r = client.get("/api/accesos/snapshot", headers=headers, params=params)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lineas = r.text.splitlines()
+    cabecera = json.loads(lineas[0])
+    assert cabecera["version"] == int(r.headers["X-Snapshot-Version"])
+    filas = {fila[0]: fila for fila in map(json.loads, lineas[1:])}
+    return cabecera, filas
+
+
+def test_snapshot_completo(client, escenario_acceso):
+    _, portero, miembros = escenario_acceso
+    cabecera, filas = _jsonl(client, portero)
+
+    assert cabecera["completo"] is True
+    assert cabecera["campos"] == ["id", "qr", "clase", "deuda", "nombre"]
+    for m in miembros:
+        id_, qr, clase, deuda, nombre = filas[m["id"]]
+        # El dispositivo compara el hash del QR escaneado, no el código
+        assert qr == hashlib.sha256(m["qr_code"].encode()).hexdigest()[:16]
+        assert m["qr_code"] not in json.dumps(filas[m["id"]])
+        assert clase == "permitido"
+        assert deuda == 0
+        assert nombre == f"{m['apellido']}, {m['nombre']}"
+
+
+def test_delta_solo_trae_cambios_y_bajas(client, escenario_acceso):
+    admin, portero, miembros = escenario_acceso
+    cabecera, _ = _jsonl(client, portero)
+    version = cabecera["version"]
+
+    # Sin cambios: delta vacío
+    vacio, filas = _jsonl(client, portero, since=version)
+    assert vacio["completo"] is False and vacio["version"] == version
+    assert filas == {}
+
+    suspendido, eliminado, sin_cambios = miembros
+    r = client.post(
+        f"/api/miembros/{suspendido['id']}/cambiar-estado",
+        headers=admin,
+        json={"miembro_id": suspendido["id"], "nuevo_estado": "suspendido", "motivo": "test snapshot"},
+    )
+    assert r.status_code == 200, r.text
+    r = client.delete(f"/api/miembros/{eliminado['id']}", headers=admin)
+    assert r.status_code == 200, r.text
+
+    delta, filas = _jsonl(client, portero, since=version)
+    assert delta["version"] > version
+    assert set(filas) == {suspendido["id"], eliminado["id"]}
+    assert filas[suspendido["id"]][2] == "suspendido"
+    assert filas[eliminado["id"]] == [eliminado["id"], None, "eliminado", 0, None]
+    assert sin_cambios["id"] not in filas
+
+    # El completo ya no incluye al eliminado
+    _, completo = _jsonl(client, portero)
+    assert eliminado["id"] not in completo
+    assert sin_cambios["id"] in completo
+
+
+def test_since_mayor_que_la_version_devuelve_completo(client, escenario_acceso):
+    _, portero, miembros = escenario_acceso
+    cabecera, filas = _jsonl(client, portero, since=10**12)
+    assert cabecera["completo"] is True and cabecera["since"] is None
+    assert {m["id"] for m in miembros} <= set(filas)
+
+
+def test_snapshot_binario(client, escenario_acceso):
+    _, portero, miembros = escenario_acceso
+    r = client.get("/api/accesos/snapshot", headers=portero, params={"formato": "binario"})
+    assert r.status_code == 200, r.text
+    contenido = r.content
+
+    magic, formato, version, since, completo, tramo = _CABECERA.unpack_from(contenido, 0)
+    assert (magic, formato, completo) == (b"SNAP", 1, True)
+    assert version == int(r.headers["X-Snapshot-Version"])
+
+    registros = {}
+    pos = _CABECERA.size
+    while pos < len(contenido):
+        id_, qr, codigo, deuda, largo = _REGISTRO.unpack_from(contenido, pos)
+        pos += _REGISTRO.size
+        registros[id_] = (qr, list(ClaseAcceso)[codigo], deuda, contenido[pos:pos + largo].decode("utf-8"))
+        pos += largo
+    assert pos == len(contenido)
+
+    for m in miembros:
+        qr, clase, deuda, nombre = registros[m["id"]]
+        assert qr == hashlib.sha256(m["qr_code"].encode()).digest()[:8]
+        assert clase == ClaseAcceso.PERMITIDO
+        assert nombre == f"{m['apellido']}, {m['nombre']}"
+
+
+def test_requiere_rol_de_acceso(client, headers_rol):
+    consulta = headers_rol("consulta")
+    assert client.get("/api/accesos/snapshot", headers=consulta).status_code == 403
+
+
+@pytest.mark.parametrize("estado, saldo, clase, tramo", [
+    (EstadoMiembro.ACTIVO, 0.0, ClaseAcceso.PERMITIDO, 0),
+    (EstadoMiembro.ACTIVO, -150.0, ClaseAcceso.ADVERTENCIA, 2),
+    (EstadoMiembro.ACTIVO, -5000.0, ClaseAcceso.DEUDA_EXCESIVA, 50),
+    (EstadoMiembro.MOROSO, -100.0, ClaseAcceso.MOROSO, 1),
+    (EstadoMiembro.SUSPENDIDO, 0.0, ClaseAcceso.SUSPENDIDO, 0),
+    (EstadoMiembro.BAJA, 0.0, ClaseAcceso.BAJA, 0),
+])
+def test_clasificar_y_tramo(estado, saldo, clase, tramo):
+    assert AccesoSnapshotService.clasificar(estado, saldo) == clase
+    assert AccesoSnapshotService.tramo_deuda(saldo) == tramo
@@ -0,0 +1,108 @@
+"""
+Tests para AccesoStatsService (agregación de accesos en una sola consulta)
+backend/tests/test_acceso_stats.py
+"""
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.acceso import Acceso, TipoAcceso, ResultadoAcceso
+from app.services.acceso_stats_service import AccesoStatsService
+
+
+DIA = date(2024, 3, 15)
+
+
+@pytest.fixture
+def db():
+    """Base de datos en memoria con accesos de prueba"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    def acceso(fecha_hora: datetime, resultado: ResultadoAcceso):
+        return Acceso(
+            miembro_id=1,
+            fecha_hora=fecha_hora.replace(tzinfo=timezone.utc),
+            tipo_acceso=TipoAcceso.QR,
+            resultado=resultado,
+        )
+
+    session.add_all([
+        acceso(datetime(2024, 3, 15, 8, 5), ResultadoAcceso.PERMITIDO),
+        acceso(datetime(2024, 3, 15, 8, 59, 59, 999), ResultadoAcceso.RECHAZADO),
+        acceso(datetime(2024, 3, 15, 18, 30), ResultadoAcceso.PERMITIDO),
+        acceso(datetime(2024, 3, 15, 23, 59, 59), ResultadoAcceso.ADVERTENCIA),
+        # Fuera del día
+        acceso(datetime(2024, 3, 14, 23, 59), ResultadoAcceso.PERMITIDO),
+        acceso(datetime(2024, 3, 16, 0, 0), ResultadoAcceso.PERMITIDO),
+    ])
+    session.commit()
+
+    # Contar sentencias ejecutadas
+    sentencias = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **k: sentencias.append(a[2]))
+    session.sentencias = sentencias
+
+    yield session
+    session.close()
+
+
+def test_estadisticas_dia_totales_e_histograma(db):
+    stats = AccesoStatsService.estadisticas_dia(db, DIA)
+
+    assert stats["total"] == 4
+    assert stats["por_resultado"] == {"permitido": 2, "rechazado": 1, "advertencia": 1}
+
+    por_hora = stats["por_hora"]
+    assert len(por_hora) == 24
+    assert por_hora[8] == {"hora": "08:00", "total": 2, "permitidos": 1, "rechazados": 1, "advertencias": 0}
+    assert por_hora[18]["permitidos"] == 1
+    assert por_hora[23]["advertencias"] == 1
+    assert sum(h["total"] for h in por_hora) == 4
+
+
+def test_estadisticas_dia_una_sola_consulta(db):
+    AccesoStatsService.estadisticas_dia(db, DIA)
+    assert len(db.sentencias) == 1
+    assert "GROUP BY" in db.sentencias[0]
+
+
+def test_dia_sin_accesos(db):
+    stats = AccesoStatsService.estadisticas_dia(db, date(2020, 1, 1))
+    assert stats["total"] == 0
+    assert all(h["total"] == 0 for h in stats["por_hora"])
+
+
+def test_estadisticas_periodo_por_dia_una_sola_consulta(db):
+    stats = AccesoStatsService.estadisticas_periodo(db, date(2024, 3, 14), date(2024, 3, 17))
+
+    assert len(db.sentencias) == 1
+    assert stats["total"] == 6
+    assert stats["por_resultado"] == {"permitido": 4, "rechazado": 1, "advertencia": 1}
+    assert stats["por_dia"] == [
+        {"fecha": "2024-03-14", "cantidad": 1},
+        {"fecha": "2024-03-15", "cantidad": 4},
+        {"fecha": "2024-03-16", "cantidad": 1},
+        {"fecha": "2024-03-17", "cantidad": 0},
+    ]
+
+
+def test_endpoints_resumen_y_estadisticas(client, auth_tokens):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+
+    r = client.get("/api/accesos/resumen", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["hoy"] <= body["semana"]
+    assert body["hoy"] <= body["mes"]
+    assert body["rechazos_hoy"] <= body["hoy"]
+
+    r = client.get("/api/accesos/estadisticas", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["accesos_por_hora"]) == 24
+    assert sum(h["cantidad"] for h in body["accesos_por_hora"]) == body["total_hoy"]
+    assert body["entradas_hoy"] + body["rechazos_hoy"] + body["advertencias_hoy"] == body["total_hoy"]
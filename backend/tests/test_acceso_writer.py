@@ -0,0 +1,167 @@
+"""
+Tests para la escritura diferida (write-behind) de accesos
+backend/tests/test_acceso_writer.py
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.models.acceso import Acceso, TipoAcceso, ResultadoAcceso
+from app.models.actividad import Actividad
+from app.services.acceso_writer import AccesoWriteBehind, acceso_writer
+from app.services.audit_service import AuditService
+from app.utils.helpers import ahora_utc
+
+
+@pytest.fixture
+def miembro(headers_rol, crear_miembro):
+    return crear_miembro(headers_rol("administrador"), nombre="Wally", apellido="Behind")
+
+
+def _acceso(miembro_id: int) -> Acceso:
+    return Acceso(
+        miembro_id=miembro_id,
+        fecha_hora=ahora_utc(),
+        tipo_acceso=TipoAcceso.QR,
+        resultado=ResultadoAcceso.PERMITIDO,
+        mensaje="write-behind test",
+    )
+
+
+@pytest.fixture
+def commits():
+    """Cuenta los commits emitidos por el engine asíncrono"""
+    contador = []
+    listener = lambda conn: contador.append(1)
+    event.listen(async_engine.sync_engine, "commit", listener)
+    yield contador
+    event.remove(async_engine.sync_engine, "commit", listener)
+
+
+async def test_modo_wait_un_commit_por_lote(miembro, commits):
+    writer = AccesoWriteBehind(flush_interval_ms=200, max_rows=100, durabilidad="wait")
+    await writer.start()
+    try:
+        actividades = [
+            AuditService.crear_actividad_acceso("test", permitido=True) for _ in range(5)
+        ]
+        ids = await asyncio.gather(*[
+            writer.encolar(_acceso(miembro["id"]), actividad) for actividad in actividades
+        ])
+    finally:
+        await writer.stop()
+
+    assert len(set(ids)) == 5 and all(isinstance(i, int) for i in ids)
+    assert len(commits) == 1
+    assert [a.entidad_id for a in actividades] == ids
+
+    with SessionLocal() as db:
+        guardadas = db.query(Actividad).filter(
+            Actividad.entidad_tipo == "acceso",
+            Actividad.entidad_id.in_(ids)
+        ).count()
+    assert guardadas == 5
+
+
+async def test_flush_por_tamano_de_lote(miembro, commits):
+    writer = AccesoWriteBehind(flush_interval_ms=60_000, max_rows=3, durabilidad="wait")
+    await writer.start()
+    try:
+        ids = await asyncio.wait_for(
+            asyncio.gather(*[writer.encolar(_acceso(miembro["id"])) for _ in range(3)]),
+            timeout=5
+        )
+    finally:
+        await writer.stop()
+    assert len(ids) == 3
+    assert len(commits) == 1
+
+
+async def test_modo_async_persiste_al_detener(miembro):
+    writer = AccesoWriteBehind(flush_interval_ms=60_000, max_rows=1000, durabilidad="async")
+    await writer.start()
+    accesos = [_acceso(miembro["id"]) for _ in range(4)]
+    for a in accesos:
+        assert await writer.encolar(a) is None
+    assert all(a.id is None for a in accesos)
+
+    await writer.stop()  # flush-on-shutdown
+
+    assert all(a.id is not None for a in accesos)
+    with SessionLocal() as db:
+        assert db.query(Acceso).filter(Acceso.id.in_([a.id for a in accesos])).count() == 4
+
+
+async def test_fila_invalida_no_arrastra_al_lote(miembro):
+    writer = AccesoWriteBehind(flush_interval_ms=60_000, max_rows=1000, durabilidad="wait")
+    await writer.start()
+    try:
+        invalido = _acceso(miembro["id"])
+        invalido.miembro_id = None  # NOT NULL
+        resultados = await asyncio.gather(
+            writer.encolar(_acceso(miembro["id"])),
+            writer.encolar(invalido),
+            writer.encolar(_acceso(miembro["id"])),
+            writer.flush(),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.stop()
+
+    assert isinstance(resultados[1], Exception)
+    ids = [resultados[0], resultados[2]]
+    assert all(isinstance(i, int) for i in ids)
+    with SessionLocal() as db:
+        assert db.query(Acceso).filter(Acceso.id.in_(ids)).count() == 2
+
+
+async def test_modo_async_reintenta_tras_falla_transitoria(miembro):
+    fallas = [3]  # el lote y los dos reintentos por fila
+
+    def sesion():
+        if fallas[0]:
+            fallas[0] -= 1
+            raise ConnectionError("base de datos no disponible")
+        return AsyncSessionLocal()
+
+    writer = AccesoWriteBehind(flush_interval_ms=60_000, max_rows=1000, durabilidad="async", session_factory=sesion)
+    accesos = [_acceso(miembro["id"]) for _ in range(2)]
+    for a in accesos:
+        await writer.encolar(a)
+
+    assert await writer.flush() == 0
+    assert len(writer._buffer) == 2
+    assert await writer.flush() == 2
+    with SessionLocal() as db:
+        assert db.query(Acceso).filter(Acceso.id.in_([a.id for a in accesos])).count() == 2
+
+
+def test_durabilidad_invalida():
+    with pytest.raises(ValueError, match="ACCESS_WRITE_BEHIND_DURABILITY"):
+        AccesoWriteBehind(flush_interval_ms=200, max_rows=100, durabilidad="asinc")
+
+
+def test_validar_qr_con_write_behind(client, miembro, headers_rol):
+    portero = headers_rol("portero")
+    client.portal.call(acceso_writer.start)
+    try:
+        r = client.post(
+            "/api/accesos/validar-qr",
+            headers=portero,
+            json={"qr_code": miembro["qr_code"], "ubicacion": "Test"},
+        )
+    finally:
+        client.portal.call(acceso_writer.stop)
+
+    assert r.status_code == 200, r.text
+    acceso_id = r.json()["acceso_id"]
+    assert acceso_id is not None
+
+    with SessionLocal() as db:
+        actividad = db.query(Actividad).filter(
+            Actividad.entidad_tipo == "acceso",
+            Actividad.entidad_id == acceso_id
+        ).first()
+    assert actividad is not None
@@ -0,0 +1,30 @@
+"""
+Tests para la capa de sesiones asíncronas
+backend/tests/test_async_db.py
+"""
+import pytest
+from sqlalchemy import select, func
+
+from app.database import get_async_database_url, get_async_db
+from app.models import Usuario
+
+
+@pytest.mark.parametrize("url,esperado", [
+    ("sqlite:///./socios.db", "sqlite+aiosqlite:///./socios.db"),
+    ("postgresql://u:p@host:5432/db", "postgresql+asyncpg://u:p@host:5432/db"),
+    ("postgresql+psycopg2://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+    ("postgresql+asyncpg://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+])
+def test_get_async_database_url(url, esperado):
+    assert get_async_database_url(url) == esperado
+
+
+async def test_get_async_db_ejecuta_consultas(client):
+    """La dependency asíncrona debe poder consultar la misma base que la síncrona"""
+    gen = get_async_db()
+    db = await gen.__anext__()
+    try:
+        total = await db.scalar(select(func.count(Usuario.id)))
+        assert total is not None and total >= 0
+    finally:
+        await gen.aclose()
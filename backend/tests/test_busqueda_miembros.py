@@ -0,0 +1,92 @@
+"""
+Tests de la búsqueda indexada de socios
+backend/tests/test_busqueda_miembros.py
+"""
+import uuid
+
+from app.utils.busqueda import normalizar, texto_busqueda
+
+
+def _crear_socio(client, headers, nombre, apellido, categoria_id=None):
+    dni = str(uuid.uuid4().int)[:8]
+    payload = {"numero_documento": dni, "nombre": nombre, "apellido": apellido}
+    if categoria_id:
+        payload["categoria_id"] = categoria_id
+    r = client.post("/api/miembros", headers=headers, json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _buscar(client, headers, q, **params):
+    r = client.get("/api/miembros/buscar", headers=headers, params={"q": q, **params})
+    assert r.status_code == 200, r.text
+    return [s["id"] for s in r.json()]
+
+
+def _listar(client, headers, q):
+    r = client.get("/api/miembros", headers=headers, params={"q": q, "page_size": 100})
+    assert r.status_code == 200, r.text
+    return [s["id"] for s in r.json()["items"]]
+
+
+def test_normalizar():
+    assert normalizar("  Ibáñez   MÜLLER ") == "ibanez muller"
+    assert normalizar(None) == ""
+    assert texto_busqueda("Muñoz", "José", "30111222", "M-00001") == "munoz jose 30111222 m-00001"
+
+
+def test_busqueda_sin_tildes_ni_mayusculas(client, headers):
+    tag = uuid.uuid4().hex[:6]
+    socio = _crear_socio(client, headers, "José", f"Ibáñez{tag}")
+
+    for q in (f"ibanez{tag}", f"IBÁÑEZ{tag}", f"jose ibañez{tag}", tag, f"jo {tag}"):
+        assert socio["id"] in _buscar(client, headers, q), q
+        assert socio["id"] in _listar(client, headers, q), q
+
+    # Todas las palabras deben aparecer
+    assert _buscar(client, headers, f"maria ibanez{tag}") == []
+    # Por documento y número de socio
+    assert _buscar(client, headers, socio["numero_documento"])[0] == socio["id"]
+    assert _buscar(client, headers, socio["numero_miembro"].lower())[0] == socio["id"]
+
+
+def test_ranking_prefijo_de_apellido_primero(client, headers):
+    tag = uuid.uuid4().hex[:6]
+    por_nombre = _crear_socio(client, headers, f"Zeta{tag}", "Alvarez")
+    por_apellido = _crear_socio(client, headers, "Ana", f"Zeta{tag}")
+    en_medio = _crear_socio(client, headers, "Ana", f"Mazeta{tag}")
+
+    assert _buscar(client, headers, f"zeta{tag}") == [por_apellido["id"], por_nombre["id"], en_medio["id"]]
+    assert _buscar(client, headers, f"zeta{tag}", limit=1) == [por_apellido["id"]]
+
+
+def test_autocompletar_proyeccion_minima(client, headers):
+    tag = uuid.uuid4().hex[:6]
+    rc = client.post("/api/miembros/categorias", headers=headers, json={
+        "nombre": f"CatBusqueda_{tag}", "cuota_base": 1500, "tiene_cuota_fija": True,
+    })
+    assert rc.status_code == 201, rc.text
+    socio = _crear_socio(client, headers, "Luis", f"Proyeccion{tag}", categoria_id=rc.json()["id"])
+
+    r = client.get("/api/miembros/buscar", headers=headers, params={"q": f"proyeccion{tag}"})
+    item = r.json()[0]
+    assert set(item) == {
+        "id", "numero_miembro", "numero_documento", "nombre_completo", "estado", "saldo_cuenta", "categoria"
+    }
+    assert item["nombre_completo"] == socio["nombre_completo"]
+    assert item["categoria"]["cuota_base"] == 1500
+
+    # Mínimo 2 caracteres
+    r = client.get("/api/miembros/buscar", headers=headers, params={"q": "a"})
+    assert r.status_code == 422
+
+
+def test_indice_sigue_las_ediciones(client, headers):
+    tag = uuid.uuid4().hex[:6]
+    socio = _crear_socio(client, headers, "Pedro", f"Antes{tag}")
+
+    r = client.put(f"/api/miembros/{socio['id']}", headers=headers, json={"apellido": f"Después{tag}"})
+    assert r.status_code == 200, r.text
+
+    assert _buscar(client, headers, f"antes{tag}") == []
+    assert _buscar(client, headers, f"despues{tag}") == [socio["id"]]
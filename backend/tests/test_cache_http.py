@@ -0,0 +1,184 @@
+"""
+Tests de caché HTTP condicional (ETag / Last-Modified / 304)
+backend/tests/test_cache_http.py
+"""
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.acceso import Acceso, ResultadoAcceso, TipoAcceso
+from app.models.pago import MovimientoCaja
+from app.services.version_service import VersionService
+
+
+@contextmanager
+def consultas_sql():
+    """Sentencias SQL ejecutadas por el engine síncrono dentro del bloque"""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+@pytest.fixture
+def admin(headers_rol):
+    return headers_rol("administrador")
+
+
+@pytest.fixture
+def miembro(client, admin, crear_miembro):
+    cat = client.post("/api/miembros/categorias", headers=admin, json={
+        "nombre": f"Etag_{uuid.uuid4().hex[:8]}", "cuota_base": 1000.0, "tiene_cuota_fija": True
+    }).json()
+    return crear_miembro(admin, cat["id"], nombre="Elena", apellido="Etag")
+
+
+def test_categorias_304_sin_consultar(client, admin):
+    r1 = client.get("/api/miembros/categorias", headers=admin)
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+    assert etag.startswith('W/"')
+    assert r1.headers["cache-control"] == settings.HTTP_CACHE_CONTROL
+    assert "Authorization" in r1.headers["vary"]
+    assert "last-modified" in r1.headers
+
+    with consultas_sql() as sentencias:
+        r2 = client.get("/api/miembros/categorias", headers={**admin, "If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    assert r2.headers["etag"] == etag
+    assert not [s for s in sentencias if "FROM categorias" in s]
+
+
+def test_categorias_etag_cambia_al_escribir(client, admin):
+    etag = client.get("/api/miembros/categorias", headers=admin).headers["etag"]
+    client.post("/api/miembros/categorias", headers=admin, json={
+        "nombre": f"Nueva_{uuid.uuid4().hex[:8]}", "cuota_base": 500.0, "tiene_cuota_fija": True
+    })
+
+    r = client.get("/api/miembros/categorias", headers={**admin, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()
+
+
+def test_if_modified_since(client, admin):
+    r1 = client.get("/api/miembros/categorias", headers=admin)
+    r2 = client.get("/api/miembros/categorias", headers={
+        **admin, "If-Modified-Since": r1.headers["last-modified"]
+    })
+    assert r2.status_code == 304
+    # If-None-Match tiene prioridad sobre If-Modified-Since
+    r3 = client.get("/api/miembros/categorias", headers={
+        **admin, "If-None-Match": 'W/"otro"', "If-Modified-Since": r1.headers["last-modified"]
+    })
+    assert r3.status_code == 200
+
+
+def test_detalle_miembro(client, admin, miembro):
+    url = f"/api/miembros/{miembro['id']}"
+    etag = client.get(url, headers=admin).headers["etag"]
+    assert client.get(url, headers={**admin, "If-None-Match": etag}).status_code == 304
+
+    # Otro socio: otro ETag
+    otro = client.get("/api/miembros", headers=admin).json()["items"][0]["id"]
+    if otro != miembro["id"]:
+        assert client.get(f"/api/miembros/{otro}", headers=admin).headers["etag"] != etag
+
+    client.put(url, headers=admin, json={"telefono": "+54 11 5555-0000"})
+    r = client.get(url, headers={**admin, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["telefono"] == "+54 11 5555-0000"
+    assert r.headers["etag"] != etag
+
+
+def test_detalle_miembro_inexistente(client, admin):
+    r = client.get("/api/miembros/999999", headers={**admin, "If-None-Match": "*"})
+    assert r.status_code == 404
+    assert "etag" not in r.headers
+
+
+def test_reporte_socios(client, admin, miembro):
+    r1 = client.get("/api/reportes/socios", headers=admin)
+    etag = r1.headers["etag"]
+    assert client.get("/api/reportes/socios", headers={**admin, "If-None-Match": etag}).status_code == 304
+
+    # Los query params forman parte del ETag
+    filtrado = client.get("/api/reportes/socios", headers=admin, params={"estado": "activo"})
+    assert filtrado.headers["etag"] != etag
+
+    client.post(f"/api/miembros/{miembro['id']}/cambiar-estado", headers=admin,
+                json={"miembro_id": miembro["id"], "nuevo_estado": "suspendido", "motivo": "test etag"})
+    r2 = client.get("/api/reportes/socios", headers={**admin, "If-None-Match": etag})
+    assert r2.status_code == 200
+    assert r2.json()["total"] == r1.json()["total"]
+
+
+@pytest.mark.parametrize("ruta", [
+    "/api/reportes/morosidad",
+    "/api/reportes/dashboard",
+    "/api/reportes/financiero",
+    "/api/reportes/accesos",
+    "/api/reportes/ingresos-historicos",
+    "/api/reportes/accesos-detallados",
+])
+def test_reportes_revalidan(client, admin, ruta):
+    r1 = client.get(ruta, headers=admin)
+    assert r1.status_code == 200
+    r2 = client.get(ruta, headers={**admin, "If-None-Match": r1.headers["etag"]})
+    assert r2.status_code == 304
+    assert r2.headers["cache-control"] == settings.HTTP_CACHE_CONTROL
+
+
+def test_304_requiere_autenticacion(client, admin):
+    etag = client.get("/api/miembros/categorias", headers=admin).headers["etag"]
+    r = client.get("/api/miembros/categorias", headers={"If-None-Match": etag})
+    assert r.status_code in (401, 403)
+
+
+def test_version_en_la_misma_transaccion():
+    with SessionLocal() as db:
+        antes = VersionService.marca(db, "pagos", "miembros")
+
+        db.add(MovimientoCaja(tipo="egreso", concepto="Test versión", monto=10.0))
+        db.flush()
+        db.rollback()
+        assert VersionService.marca(db, "pagos", "miembros") == antes
+
+        db.add(MovimientoCaja(tipo="egreso", concepto="Test versión", monto=10.0))
+        db.commit()
+        despues = VersionService.marca(db, "pagos", "miembros")
+
+    assert dict(despues.partes)["pagos"] == dict(antes.partes)["pagos"] + 1
+    assert dict(despues.partes)["miembros"] == dict(antes.partes)["miembros"]
+
+
+def test_accesos_sin_contador(client, miembro):
+    with SessionLocal() as db:
+        antes = VersionService.marca(db, "accesos", "miembros")
+
+        with consultas_sql() as sentencias:
+            db.add(Acceso(
+                miembro_id=miembro["id"], fecha_hora=datetime.now(timezone.utc),
+                tipo_acceso=TipoAcceso.QR, resultado=ResultadoAcceso.PERMITIDO
+            ))
+            db.commit()
+        # El alta de un acceso no toca versiones_recurso (fila caliente)
+        assert not [s for s in sentencias if "versiones_recurso" in s]
+
+        despues = VersionService.marca(db, "accesos", "miembros")
+
+    assert dict(despues.partes)["accesos"] > dict(antes.partes)["accesos"]
+    assert dict(despues.partes)["miembros"] == dict(antes.partes)["miembros"]
+    assert despues.modificado is not None
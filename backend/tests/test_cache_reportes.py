@@ -0,0 +1,249 @@
+"""
+Tests de la caché de reportes invalidada por etiquetas
+backend/tests/test_cache_reportes.py
+"""
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, async_engine, engine
+from app.models.miembro import EstadoMiembro
+from app.models.pago import MovimientoCaja
+from app.utils.cache_etiquetas import CacheEtiquetada, MemoriaBackend, RedisBackend, cache_reportes, normalizar
+
+
+class RedisLocal:
+    """Sustituto local del cliente redis síncrono (get/set con ex)"""
+
+    def __init__(self):
+        self.datos = {}
+        self.falla = False
+
+    def get(self, clave):
+        if self.falla:
+            raise ConnectionError("redis caído")
+        return self.datos.get(clave)
+
+    def set(self, clave, valor, ex=None):
+        if self.falla:
+            raise ConnectionError("redis caído")
+        self.datos[clave] = valor.encode("utf-8")
+
+
+@contextmanager
+def consultas_sql(motor=engine):
+    """Sentencias SQL ejecutadas dentro del bloque"""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(motor, "before_cursor_execute", registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(motor, "before_cursor_execute", registrar)
+
+
+def _egreso(db):
+    db.add(MovimientoCaja(tipo="egreso", concepto="Test caché", monto=1.0))
+    db.commit()
+
+
+@pytest.fixture
+def cache(client):
+    # client: crea las tablas (versiones_recurso)
+    return CacheEtiquetada("test", MemoriaBackend(16), ttl_seconds=60)
+
+
+def test_hit_y_parametros_normalizados(cache):
+    llamadas = []
+
+    @cache.cacheado("miembros")
+    def reporte(db, estado=None, categoria_id=None):
+        llamadas.append((estado, categoria_id))
+        return {"n": len(llamadas)}
+
+    with SessionLocal() as db:
+        assert reporte(db, EstadoMiembro.ACTIVO, categoria_id=3) == {"n": 1}
+        # Mismo valor como enum o como texto, posicional o por nombre
+        assert reporte(db, estado="activo", categoria_id=3) == {"n": 1}
+        assert reporte(db, categoria_id=3, estado=EstadoMiembro.ACTIVO) == {"n": 1}
+        assert reporte(db, estado="moroso", categoria_id=3) == {"n": 2}
+    assert len(llamadas) == 2
+
+
+def test_escritura_invalida_solo_sus_etiquetas(cache):
+    calculos = {"pagos": 0, "accesos": 0}
+
+    @cache.cacheado("pagos")
+    def de_pagos(db):
+        calculos["pagos"] += 1
+        return calculos["pagos"]
+
+    @cache.cacheado("accesos")
+    def de_accesos(db):
+        calculos["accesos"] += 1
+        return calculos["accesos"]
+
+    with SessionLocal() as db:
+        de_pagos(db), de_accesos(db)
+        de_pagos(db), de_accesos(db)
+        assert calculos == {"pagos": 1, "accesos": 1}
+
+        # La clave incluye la versión de pagos: tras el commit se recalcula
+        # aunque esta instancia no reciba el aviso (otro worker)
+        _egreso(db)
+        assert de_pagos(db) == 2
+        assert de_accesos(db) == 1
+
+
+def test_commit_descarta_entradas_en_memoria():
+    backend = MemoriaBackend(16)
+    backend.guardar("a", 1, ("pagos",), 60)
+    backend.guardar("b", 2, ("accesos",), 60)
+    backend.guardar("c", 3, ("accesos", "pagos"), 60)
+
+    backend.invalidar({"pagos"})
+    assert len(backend) == 1
+    assert backend.obtener("b") == 2
+
+
+def test_cache_global_suscripta_a_commits(client):
+    cache_reportes.backend.guardar("x", {"v": 1}, ("pagos",), 60)
+    cache_reportes.backend.guardar("y", {"v": 2}, ("accesos",), 60)
+    with SessionLocal() as db:
+        _egreso(db)
+    assert "x" not in cache_reportes.backend._data
+    assert cache_reportes.backend.obtener("y") == {"v": 2}
+
+
+def test_lru_y_ttl():
+    reloj = [100.0]
+    backend = MemoriaBackend(2, reloj=lambda: reloj[0])
+    backend.guardar("a", 1, (), 10)
+    backend.guardar("b", 2, (), 10)
+    backend.obtener("a")
+    backend.guardar("c", 3, (), 10)
+    assert "b" not in backend._data and backend.obtener("a") == 1
+
+    reloj[0] += 11
+    assert backend.obtener("a") != 1
+    assert len(backend) == 1
+
+
+def test_single_flight_threads(cache):
+    calculos = []
+    barrera = threading.Event()
+
+    def calcular():
+        calculos.append(1)
+        barrera.wait(2)
+        return {"ok": True}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futuros = [pool.submit(cache._obtener_sync, "k", (), calcular) for _ in range(8)]
+        time.sleep(0.1)
+        barrera.set()
+        resultados = [f.result(timeout=5) for f in futuros]
+
+    assert resultados == [{"ok": True}] * 8
+    assert len(calculos) == 1
+
+
+def test_single_flight_async_y_reintento_tras_error(cache):
+    intentos = []
+
+    async def calcular():
+        intentos.append(1)
+        await asyncio.sleep(0.05)
+        if len(intentos) == 1:
+            raise RuntimeError("falla transitoria")
+        return 42
+
+    async def escenario():
+        return await asyncio.gather(
+            *(cache._obtener_async("k", (), calcular) for _ in range(5)),
+            return_exceptions=True
+        )
+
+    resultados = asyncio.run(escenario())
+    # El primero falla; uno de los que esperaban recalcula y el resto lo comparte
+    assert sum(isinstance(r, RuntimeError) for r in resultados) == 1
+    assert resultados.count(42) == 4
+    assert len(intentos) == 2
+
+
+def test_redis_compartido_entre_workers(client):
+    redis = RedisLocal()
+    worker_a = CacheEtiquetada("test", RedisBackend(redis), ttl_seconds=60)
+    worker_b = CacheEtiquetada("test", RedisBackend(redis), ttl_seconds=60)
+    calculos = []
+
+    def reporte(db, meses=6):
+        calculos.append(meses)
+        return {"meses": meses, "nombre": "Núñez"}
+
+    en_a, en_b = worker_a.cacheado("pagos")(reporte), worker_b.cacheado("pagos")(reporte)
+    with SessionLocal() as db:
+        assert en_a(db) == {"meses": 6, "nombre": "Núñez"}
+        assert en_b(db) == {"meses": 6, "nombre": "Núñez"}
+        assert calculos == [6]
+
+        # Redis caído: se calcula sin caché (sin error)
+        redis.falla = True
+        assert en_b(db, meses=3) == {"meses": 3, "nombre": "Núñez"}
+
+
+def test_normalizar():
+    assert normalizar({"b": {2, 1}, "a": EstadoMiembro.MOROSO}) == {"a": "moroso", "b": [1, 2]}
+
+
+# ==================== ENDPOINTS ====================
+
+@pytest.fixture
+def admin(headers_rol):
+    return headers_rol("administrador")
+
+
+def test_reporte_socios_cacheado_e_invalidado(client, admin, crear_miembro):
+    r1 = client.get("/api/reportes/socios", headers=admin)
+    assert r1.status_code == 200
+
+    with consultas_sql() as sentencias:
+        r2 = client.get("/api/reportes/socios", headers=admin)
+    assert r2.json() == r1.json()
+    assert not [s for s in sentencias if "count(miembros.id)" in s.lower()]
+
+    cat = client.post("/api/miembros/categorias", headers=admin, json={
+        "nombre": f"Rep_{uuid.uuid4().hex[:8]}", "cuota_base": 100.0, "tiene_cuota_fija": True
+    }).json()
+    crear_miembro(admin, cat["id"], nombre="Rita", apellido="Reporte")
+
+    r3 = client.get("/api/reportes/socios", headers=admin)
+    assert r3.json()["total"] == r1.json()["total"] + 1
+
+
+def test_reporte_morosidad_cacheado(client, admin):
+    r1 = client.get("/api/reportes/morosidad", headers=admin)
+    with consultas_sql(async_engine.sync_engine) as sentencias:
+        r2 = client.get("/api/reportes/morosidad", headers=admin)
+    assert r2.json() == r1.json()
+    assert not [s for s in sentencias if "saldo_cuenta <" in s]
+
+
+def test_reportes_por_periodo(client, admin):
+    for ruta in ("/api/reportes/financiero", "/api/reportes/accesos"):
+        r1 = client.get(ruta, headers=admin)
+        assert r1.status_code == 200, r1.text
+        # Período por defecto explícito: misma entrada que sin parámetros
+        r2 = client.get(ruta, headers=admin, params={
+            "fecha_desde": r1.json()["fecha_desde"], "fecha_hasta": r1.json()["fecha_hasta"]
+        })
+        assert r2.json() == r1.json()
@@ -0,0 +1,105 @@
+"""
+Tests de generación de credenciales en lote (PDF / ZIP)
+backend/tests/test_credenciales.py
+"""
+import io
+import uuid
+import zipfile
+from datetime import date
+
+import pytest
+
+from app.config import settings
+from app.services.credencial_service import CredencialService, CredencialDatos
+from app.services.qr_render_cache import QRRenderCache
+from app.services.qr_service import QRService
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    QRRenderCache.limpiar_memoria()
+    yield
+    QRRenderCache.limpiar_memoria()
+
+
+def _datos(n: int):
+    lote = []
+    for i in range(1, n + 1):
+        qr = QRService.generar_qr_miembro(
+            miembro_id=i, numero_documento=f"{30000000 + i}", numero_miembro=f"M-{i:05d}",
+            timestamp="2024-01-01T00:00:00", personalizar=False
+        )
+        lote.append(CredencialDatos(
+            id=i,
+            numero_miembro=f"M-{i:05d}",
+            numero_documento=f"{30000000 + i}",
+            nombre_completo=f"Apellido Muy Largo Para Recortar {i}, Nombre",
+            categoria="Activo",
+            fecha_alta=date(2024, 1, 1),
+            qr_generated_at="2024-01-01T00:00:00",
+            qr_hash=qr["qr_hash"],
+        ))
+    return lote
+
+
+def test_zip_un_png_por_socio_en_orden():
+    contenido = b"".join(CredencialService.generar_zip(_datos(3), workers=1))
+
+    with zipfile.ZipFile(io.BytesIO(contenido)) as zf:
+        assert zf.namelist() == ["M-00001.png", "M-00002.png", "M-00003.png"]
+        assert all(zf.read(n).startswith(b"\x89PNG") for n in zf.namelist())
+
+
+def test_pdf_paginado_por_grilla():
+    contenido = b"".join(CredencialService.generar_pdf(_datos(5), columnas=2, filas=2, workers=1))
+
+    assert contenido.startswith(b"%PDF")
+    # 5 credenciales a 4 por hoja -> 2 páginas
+    assert contenido.count(b"/Type /Page\n") + contenido.count(b"/Type /Page ") == 2
+
+
+def test_pool_de_procesos_mantiene_orden(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "CREDENCIALES_MIN_LOTE_POOL", 1)
+    datos = _datos(4)
+
+    try:
+        en_pool = list(CredencialService.renderizar_qrs(datos, personalizar=True, workers=2))
+        # El pool es compartido entre lotes
+        pool = CredencialService.obtener_pool()
+        list(CredencialService.renderizar_qrs(datos[:2], personalizar=True, workers=2))
+        assert CredencialService.obtener_pool() is pool
+    finally:
+        CredencialService.cerrar_pool()
+
+    # Los workers escriben la caché de disco en el UPLOAD_DIR del proceso principal
+    assert len(list((tmp_path / "qr_cache").glob("*.png"))) == 4
+    en_serie = list(CredencialService.renderizar_qrs(datos, personalizar=True, workers=1))
+
+    assert en_pool == en_serie
+
+
+def test_endpoint_credenciales_zip(client, auth_tokens):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    uid = uuid.uuid4().hex[:8]
+    r = client.post("/api/miembros", headers=headers, json={
+        "nombre": "Lote",
+        "apellido": f"Cred{uid}",
+        "tipo_documento": "dni",
+        "numero_documento": str(int(uid, 16))[:8],
+    })
+    assert r.status_code in (200, 201), r.text
+    numero = r.json()["numero_miembro"]
+
+    r = client.get("/api/miembros/credenciales", headers=headers, params={"formato": "zip", "q": f"Cred{uid}"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
+        assert zf.namelist() == [f"{numero}.png"]
+
+    r = client.get("/api/miembros/credenciales", headers=headers, params={"q": f"Cred{uid}"})
+    assert r.status_code == 200
+    assert r.content.startswith(b"%PDF")
+
+    r = client.get("/api/miembros/credenciales", headers=headers, params={"q": "no-existe-xyz"})
+    assert r.status_code == 404
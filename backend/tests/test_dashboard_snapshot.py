@@ -0,0 +1,124 @@
+"""
+Tests del snapshot del dashboard y de SWRCache
+backend/tests/test_dashboard_snapshot.py
+"""
+import asyncio
+
+import pytest
+
+from app.services.dashboard_service import DashboardService
+from app.utils import cache as cache_module
+from app.utils.cache import SWRCache
+from tests.test_usuarios_permissions import elevate_to_super_admin, login_headers
+
+
+@pytest.fixture
+def sin_cache():
+    DashboardService.invalidar()
+    yield
+    DashboardService.invalidar()
+
+
+def test_snapshot_consolida_el_dashboard(client, headers, sin_cache):
+    r = client.get("/api/reportes/dashboard/snapshot", headers=headers)
+    assert r.status_code == 200, r.text
+    snapshot = r.json()
+
+    # Mismos KPIs que /dashboard
+    dashboard = client.get("/api/reportes/dashboard", headers=headers).json()
+    assert snapshot["socios"] == dashboard["socios"]
+    assert snapshot["finanzas_mes"] == pytest.approx(dashboard["finanzas_mes"])
+    assert snapshot["accesos"]["hoy"] == dashboard["accesos"]["hoy"]
+
+    assert len(snapshot["ingresos_historicos"]) == 6
+    assert len(snapshot["accesos"]["por_hora"]) == 24
+
+    morosidad = client.get("/api/reportes/morosidad", headers=headers).json()
+    assert snapshot["morosidad"]["cantidad"] == morosidad["cantidad_morosos"]
+    assert snapshot["morosidad"]["total_deuda"] == pytest.approx(morosidad["total_deuda"])
+    assert [d["deuda"] for d in snapshot["morosidad"]["top_deudores"]] == [
+        m["deuda"] for m in morosidad["morosos"][:5]
+    ]
+
+    # La actividad reciente es solo para administradores
+    assert snapshot["actividad_reciente"] is None
+
+
+def test_snapshot_admin_incluye_actividad(client, make_user, sin_cache):
+    admin = make_user()
+    elevate_to_super_admin(admin["username"])
+    headers = login_headers(client, admin["username"], admin["password"])
+
+    snapshot = client.get("/api/reportes/dashboard/snapshot", headers=headers).json()
+    actividad = snapshot["actividad_reciente"]
+    assert isinstance(actividad, list) and actividad  # al menos su propio login
+    assert {"tipo", "descripcion", "usuario_username", "fecha_hora"}.issubset(actividad[0])
+
+
+def test_snapshot_cacheado(client, headers, sin_cache):
+    primero = client.get("/api/reportes/dashboard/snapshot", headers=headers).json()
+    segundo = client.get("/api/reportes/dashboard/snapshot", headers=headers).json()
+    assert segundo["generado_at"] == primero["generado_at"]
+
+    DashboardService.invalidar()
+    tercero = client.get("/api/reportes/dashboard/snapshot", headers=headers).json()
+    assert tercero["generado_at"] != primero["generado_at"]
+
+
+def test_swr_devuelve_viejo_y_recalcula(monkeypatch):
+    reloj = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: reloj[0])
+    cache = SWRCache("test_swr", ttl_seconds=5, stale_seconds=30)
+    llamadas = []
+
+    async def calcular():
+        llamadas.append(1)
+        return len(llamadas)
+
+    async def escenario():
+        assert await cache.obtener("k", calcular) == 1
+        reloj[0] += 3
+        assert await cache.obtener("k", calcular) == 1   # fresco
+        reloj[0] += 10
+        assert await cache.obtener("k", calcular) == 1   # viejo, recalcula atrás
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await cache.obtener("k", calcular) == 2   # ya recalculado
+        reloj[0] += 100
+        assert await cache.obtener("k", calcular) == 3   # vencido: espera
+
+    asyncio.run(escenario())
+    assert len(llamadas) == 3
+
+
+def test_swr_single_flight():
+    cache = SWRCache("test_swr", ttl_seconds=5, stale_seconds=0)
+    llamadas = []
+
+    async def calcular():
+        llamadas.append(1)
+        await asyncio.sleep(0.05)
+        return "valor"
+
+    async def escenario():
+        return await asyncio.gather(*(cache.obtener("k", calcular) for _ in range(10)))
+
+    assert asyncio.run(escenario()) == ["valor"] * 10
+    assert len(llamadas) == 1
+
+
+def test_swr_error_no_se_cachea():
+    cache = SWRCache("test_swr", ttl_seconds=5, stale_seconds=0)
+
+    async def falla():
+        raise RuntimeError("db caída")
+
+    async def ok():
+        return "ok"
+
+    async def escenario():
+        with pytest.raises(RuntimeError):
+            await cache.obtener("k", falla)
+        return await cache.obtener("k", ok)
+
+    assert asyncio.run(escenario()) == "ok"
@@ -85,3 +85,125 @@ def test_exportar_socios_sin_autenticacion(client: TestClient):
     
     r = client.get("/api/reportes/exportar/morosidad/excel")
     assert r.status_code in [401, 403], "Debe requerir autenticación"
+
+
+def test_exportar_pagos_excel_contenido(client: TestClient, auth_tokens: dict):
+    """
+    El Excel conserva el layout (título, fecha, encabezados en fila 3),
+    escribe montos y fechas como valores tipados y agrega el total al pie
+    """
+    import io
+    import uuid
+    from openpyxl import load_workbook
+
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    uid = uuid.uuid4().hex[:8]
+    r = client.post("/api/miembros", headers=headers, json={
+        "nombre": "Export",
+        "apellido": f"Pagos{uid}",
+        "numero_documento": str(int(uid, 16))[:8],
+    })
+    assert r.status_code == 201, r.text
+    miembro_id = r.json()["id"]
+
+    for monto in (100.0, 250.5):
+        r = client.post("/api/pagos", headers=headers, json={
+            "miembro_id": miembro_id,
+            "tipo": "cuota",
+            "concepto": "Cuota Mensual",
+            "monto": monto,
+            "metodo_pago": "efectivo",
+            "fecha_pago": "2020-01-10",
+        })
+        assert r.status_code == 201, r.text
+
+    r = client.get(
+        "/api/reportes/exportar/pagos/excel",
+        headers=headers,
+        params={"miembro_id": miembro_id},
+    )
+    assert r.status_code == 200, r.text
+
+    ws = load_workbook(io.BytesIO(r.content)).active
+    assert ws["A1"].value == "Listado de Pagos"
+    assert ws["A3"].value == "ID Pago" and ws["F3"].value == "Monto"
+    assert ws.freeze_panes == "A4"
+
+    filas = [fila for fila in ws.iter_rows(min_row=4, values_only=True) if fila and fila[0]]
+    assert len(filas) == 2
+    assert {f[5] for f in filas} == {100.0, 250.5}
+    assert filas[0][1].date().isoformat() == "2020-01-10"
+    assert filas[0][3] == f"Pagos{uid}, Export"
+
+    total = [fila for fila in ws.iter_rows(values_only=True) if fila and "TOTAL:" in fila]
+    assert total and total[0][5] == 350.5
+
+
+def test_exportar_pagos_fecha_invalida(client: TestClient, auth_tokens: dict):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    r = client.get("/api/reportes/exportar/pagos/excel", headers=headers, params={"fecha_desde": "10/01/2020"})
+    assert r.status_code == 400
+
+
+def test_exportar_pagos_csv(client: TestClient, auth_tokens: dict):
+    """CSV transmitido con encabezados y valores sin formato"""
+    import csv
+    import io
+    import uuid
+
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    uid = uuid.uuid4().hex[:8]
+    r = client.post("/api/miembros", headers=headers, json={
+        "nombre": "Csv",
+        "apellido": f"Pagos{uid}",
+        "numero_documento": str(int(uid, 16))[:8],
+    })
+    assert r.status_code == 201, r.text
+    miembro_id = r.json()["id"]
+    r = client.post("/api/pagos", headers=headers, json={
+        "miembro_id": miembro_id,
+        "tipo": "cuota",
+        "concepto": "Cuota, marzo",
+        "monto": 99.5,
+        "metodo_pago": "efectivo",
+        "fecha_pago": "2020-01-10",
+    })
+    assert r.status_code == 201, r.text
+
+    r = client.get(
+        "/api/reportes/exportar/pagos",
+        headers=headers,
+        params={"format": "csv", "miembro_id": miembro_id},
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/csv")
+    assert ".csv" in r.headers["content-disposition"]
+
+    filas = list(csv.reader(io.StringIO(r.text)))
+    assert filas[0][:2] == ["ID Pago", "Fecha"]
+    assert len(filas) == 2
+    assert filas[1][1] == "2020-01-10"
+    assert filas[1][4] == "Cuota, marzo"
+    assert float(filas[1][5]) == 99.5
+
+
+def test_exportar_formato_invalido(client: TestClient, auth_tokens: dict):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    r = client.get("/api/reportes/exportar/socios", headers=headers, params={"format": "pdf"})
+    assert r.status_code == 422
+
+
+def test_exportar_pagos_parquet(client: TestClient, auth_tokens: dict):
+    """Parquet con tipos nativos (requiere pyarrow)"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    import io
+
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    r = client.get("/api/reportes/exportar/pagos/excel", headers=headers, params={"format": "parquet"})
+    assert r.status_code == 200, r.text
+    assert ".parquet" in r.headers["content-disposition"]
+
+    tabla = pq.read_table(io.BytesIO(r.content))
+    assert tabla.schema.field("fecha").type == "date32[day]"
+    assert tabla.schema.field("monto").type == "double"
+    assert tabla.schema.field("id_pago").type == "int64"
@@ -0,0 +1,38 @@
+"""
+Tests para funciones auxiliares de fecha/hora
+backend/tests/test_helpers.py
+"""
+import pytest
+from datetime import date, datetime, timezone
+
+from app.utils.helpers import parse_fecha_param, rango_dia_utc
+
+
+def test_parse_fecha_param_fecha_sola():
+    assert parse_fecha_param("2024-03-15") == datetime(2024, 3, 15, tzinfo=timezone.utc)
+    # Como límite final abarca el día completo (exclusivo)
+    assert parse_fecha_param("2024-03-15", fin=True) == datetime(2024, 3, 16, tzinfo=timezone.utc)
+
+
+def test_parse_fecha_param_timestamps():
+    assert parse_fecha_param("2024-03-15T10:30:00") == datetime(2024, 3, 15, 10, 30, tzinfo=timezone.utc)
+    assert parse_fecha_param("2024-03-15T10:30:00Z") == datetime(2024, 3, 15, 10, 30, tzinfo=timezone.utc)
+    assert parse_fecha_param("2024-03-15T07:30:00-03:00") == datetime(2024, 3, 15, 10, 30, tzinfo=timezone.utc)
+    assert parse_fecha_param(None) is None
+
+
+def test_parse_fecha_param_invalida():
+    with pytest.raises(ValueError):
+        parse_fecha_param("15/03/2024")
+
+
+def test_rango_dia_utc():
+    inicio, fin = rango_dia_utc(date(2024, 2, 29))
+    assert inicio == datetime(2024, 2, 29, tzinfo=timezone.utc)
+    assert fin == datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def test_historial_fecha_invalida(client, auth_tokens):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    r = client.get("/api/accesos/historial?fecha_inicio=no-es-fecha", headers=headers)
+    assert r.status_code == 400
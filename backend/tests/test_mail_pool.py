@@ -0,0 +1,190 @@
+"""
+Tests del pool SMTP contra un servidor local (aiosmtpd)
+backend/tests/test_mail_pool.py
+"""
+import socket
+import time
+from email.message import EmailMessage
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from app.services import notification_service
+from app.services.mail_pool import SMTPPool
+from app.services.notification_jobs import NotificationWorker
+
+
+class _Receptor:
+    """Handler aiosmtpd que guarda los mensajes y cuenta las sesiones"""
+
+    def __init__(self):
+        self.mensajes = []
+        self.sesiones = 0
+        self.rechazar_data = 0
+        self.rechazados = set()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sesiones += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.rechazados:
+            return "550 Buzón inexistente"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.rechazar_data > 0:
+            self.rechazar_data -= 1
+            return "421 Servicio no disponible"
+        self.mensajes.append(envelope)
+        return "250 OK"
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _iniciar(receptor: _Receptor, port: int):
+    controller = aiosmtpd_controller.Controller(receptor, hostname="127.0.0.1", port=port)
+    controller.start()
+    return controller
+
+
+@pytest.fixture
+def servidor():
+    receptor = _Receptor()
+    controller = _iniciar(receptor, _puerto_libre())
+    yield controller, receptor
+    controller.stop()
+
+
+def _mensaje(i: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "club@example.com"
+    msg["To"] = f"socio{i}@example.com"
+    msg["Subject"] = f"Recordatorio {i}"
+    msg.set_content("Cuota pendiente")
+    return msg
+
+
+def _pool(controller, **kwargs) -> SMTPPool:
+    return SMTPPool(controller.hostname, controller.port, modo="plano", **kwargs)
+
+
+def test_lote_reutiliza_conexiones(servidor):
+    controller, receptor = servidor
+    pool = _pool(controller, tamaño=3)
+
+    resultados = pool.enviar_lote([_mensaje(i) for i in range(30)])
+    pool.cerrar()
+
+    assert resultados == [None] * 30
+    assert len(receptor.mensajes) == 30
+    # Una sesión por conexión del pool, no una por mensaje
+    assert receptor.sesiones <= 3
+
+
+def test_reconecta_tras_421(servidor):
+    controller, receptor = servidor
+    pool = _pool(controller, tamaño=1)
+    receptor.rechazar_data = 1
+
+    pool.enviar(_mensaje(1))
+    pool.cerrar()
+
+    assert len(receptor.mensajes) == 1
+    assert receptor.sesiones == 2
+
+
+def test_reconecta_si_el_servidor_se_reinicia():
+    receptor = _Receptor()
+    puerto = _puerto_libre()
+    controller = _iniciar(receptor, puerto)
+    pool = _pool(controller, tamaño=1)
+    pool.enviar(_mensaje(1))
+
+    # El servidor corta todas las sesiones y vuelve a levantar en el mismo puerto
+    controller.stop()
+    controller = _iniciar(receptor, puerto)
+    try:
+        pool.enviar(_mensaje(2))
+        pool.cerrar()
+    finally:
+        controller.stop()
+
+    assert len(receptor.mensajes) == 2
+    assert receptor.sesiones == 2
+
+
+def test_rechazo_definitivo_no_se_reintenta(servidor):
+    controller, receptor = servidor
+    pool = _pool(controller, tamaño=1, max_reintentos=3)
+    receptor.rechazados.add("socio1@example.com")
+
+    resultados = pool.enviar_lote([_mensaje(1), _mensaje(2)])
+    pool.cerrar()
+
+    assert resultados[0] is not None
+    assert resultados[1] is None
+    assert receptor.sesiones == 1
+
+
+def test_mensaje_invalido_no_corta_el_lote(servidor):
+    controller, receptor = servidor
+    pool = _pool(controller, tamaño=1)
+    roto = _mensaje(2)
+    roto.set_payload(object())  # falla al serializar
+
+    resultados = pool.enviar_lote([_mensaje(1), roto, _mensaje(3)])
+    pool.cerrar()
+
+    assert resultados[0] is None and resultados[2] is None
+    assert resultados[1]
+    assert len(receptor.mensajes) == 2
+
+
+def test_limite_de_envios_por_conexion(servidor):
+    controller, _ = servidor
+    pool = _pool(controller, tamaño=1, envios_por_segundo=20)
+
+    inicio = time.monotonic()
+    pool.enviar_lote([_mensaje(i) for i in range(5)])
+    pool.cerrar()
+
+    # 5 mensajes a 20/s en una sola conexión: al menos 4 intervalos de 50 ms
+    assert time.monotonic() - inicio >= 0.2
+
+
+def test_recordatorios_masivos_por_el_pool(client, auth_tokens, servidor, monkeypatch):
+    from tests.test_notificaciones import _crear_categoria, _crear_miembro, _forzar_deuda
+
+    controller, receptor = servidor
+    monkeypatch.setattr(notification_service, "_pool", _pool(controller, tamaño=2))
+
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    cat_id = _crear_categoria(client, headers)
+    socio = _crear_miembro(client, headers, cat_id, con_email=True)
+    _forzar_deuda(socio["id"], monto=300, dias_mora=40)
+
+    r = client.post(
+        "/api/notificaciones/recordatorios-masivos",
+        headers=headers,
+        params={"solo_morosos": True, "dias_mora_minimo": 30},
+    )
+    assert r.status_code == 202, r.text
+    job_id = r.json()["job_id"]
+
+    NotificationWorker(worker_id="test").ejecutar_una_vez()
+    notification_service.NotificationService.cerrar_pool()
+
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "completado"
+    assert body["fallidos"] == 0
+    assert body["enviados"] >= 1
+    destinatarios = {rcpt for env in receptor.mensajes for rcpt in env.rcpt_tos}
+    assert socio["email"] in destinatarios
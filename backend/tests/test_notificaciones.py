@@ -138,3 +138,55 @@ def test_test_email_config_sin_config(client: TestClient, monkeypatch):
     assert r.status_code == 200
     body = r.json()
     assert body["configured"] is False
+
+
+def test_filtro_dias_mora_equivale_a_la_propiedad(client: TestClient):
+    from app.models.miembro import Miembro
+
+    headers = _auth_headers(client)
+    cat_id = _crear_categoria(client, headers)
+    ids = []
+    for dias in (4, 5, 6):
+        socio = _crear_miembro(client, headers, cat_id, con_email=True)
+        _forzar_deuda(socio["id"], monto=100, dias_mora=dias)
+        ids.append(socio["id"])
+
+    db = SessionLocal()
+    try:
+        en_sql = {
+            i for (i,) in db.query(Miembro.id).filter(Miembro.id.in_(ids), Miembro.filtro_dias_mora(5))
+        }
+        en_python = {m.id for m in db.query(Miembro).filter(Miembro.id.in_(ids)) if m.dias_mora >= 5}
+        sin_filtro = {i for (i,) in db.query(Miembro.id).filter(Miembro.id.in_(ids), Miembro.filtro_dias_mora(0))}
+    finally:
+        db.close()
+
+    assert en_sql == en_python == set(ids[1:])
+    assert sin_filtro == set(ids)
+
+
+def test_preview_totales_en_sql(client: TestClient):
+    headers = _auth_headers(client)
+    cat_id = _crear_categoria(client, headers)
+    socio = _crear_miembro(client, headers, cat_id, con_email=True)
+    _forzar_deuda(socio["id"], monto=250, dias_mora=700)
+
+    params = {"solo_morosos": "true", "dias_mora_minimo": 700}
+    r = client.get("/api/notificaciones/preview-morosos", headers=headers, params=params)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["total_destinatarios"] == len(body["preview_primeros_50"]) >= 1
+    assert body["total_deuda"] == sum(p["deuda"] for p in body["preview_primeros_50"])
+    assert socio["numero_miembro"] in {p["numero_miembro"] for p in body["preview_primeros_50"]}
+
+    r = client.post(
+        "/api/notificaciones/recordatorios-masivos",
+        headers=headers,
+        params={**params, "incluir_email": "false"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["preview"] is True
+    assert r.json()["total_procesados"] == body["total_destinatarios"]
+
+    # Limpiar la deuda para no afectar otros tests
+    _forzar_deuda(socio["id"], monto=0, dias_mora=0)
@@ -0,0 +1,174 @@
+"""
+Tests de la cola persistente de envíos masivos
+backend/tests/test_notification_jobs.py
+"""
+from datetime import timedelta
+
+import pytest
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.miembro import Miembro
+from app.models.notificacion import NotificacionJob, NotificacionEnvio, EstadoEnvio, EstadoJob
+from app.services import notification_service
+from app.services.notification_jobs import NotificationJobService, NotificationWorker
+from app.utils.helpers import ahora_utc
+from tests.test_mail_pool import _pool, servidor  # noqa: F401 (fixture)
+from tests.test_notificaciones import _crear_categoria, _crear_miembro, _forzar_deuda
+
+# Mora alta para que solo entren los socios creados en estos tests
+DIAS_MORA = 900
+
+
+@pytest.fixture
+def moroso(client, headers):
+    """Socio con deuda y DIAS_MORA días de mora"""
+    cat_id = _crear_categoria(client, headers)
+    socio = _crear_miembro(client, headers, cat_id, con_email=True)
+    _forzar_deuda(socio["id"], monto=500, dias_mora=DIAS_MORA)
+    yield socio
+    # Sin deuda: no entra en los jobs de otros tests
+    db = SessionLocal()
+    try:
+        db.query(Miembro).filter(Miembro.id == socio["id"]).update({"saldo_cuenta": 0.0})
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def smtp(servidor, monkeypatch):
+    controller, receptor = servidor
+    monkeypatch.setattr(notification_service, "_pool", _pool(controller, tamaño=2))
+    yield receptor
+    notification_service.NotificationService.cerrar_pool()
+
+
+def _encolar(client, headers) -> int:
+    r = client.post(
+        "/api/notificaciones/recordatorios-masivos",
+        headers=headers,
+        params={"solo_morosos": True, "dias_mora_minimo": DIAS_MORA},
+    )
+    assert r.status_code == 202, r.text
+    return r.json()["job_id"]
+
+
+def _envio(job_id: int) -> NotificacionEnvio:
+    db = SessionLocal()
+    try:
+        return db.query(NotificacionEnvio).filter(NotificacionEnvio.job_id == job_id).one()
+    finally:
+        db.close()
+
+
+def test_job_se_encola_y_procesa_una_sola_vez(client, headers, moroso, smtp):
+    job_id = _encolar(client, headers)
+
+    r = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["estado"] == "pendiente"
+    assert r.json()["total"] == r.json()["pendientes"] == 1
+    assert smtp.mensajes == []
+
+    worker = NotificationWorker(worker_id="test")
+    worker.ejecutar_una_vez()
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "completado"
+    assert (body["enviados"], body["fallidos"], body["pendientes"]) == (1, 0, 0)
+    assert body["iniciado_at"] and body["finalizado_at"]
+
+    # Reprocesar no reenvía
+    worker.ejecutar_una_vez()
+    assert [env.rcpt_tos for env in smtp.mensajes] == [[moroso["email"]]]
+
+
+def test_reintento_con_backoff(client, headers, moroso, smtp, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_JOB_RETRY_BASE_SECONDS", 3600)
+    smtp.rechazados.add(moroso["email"])
+    job_id = _encolar(client, headers)
+    worker = NotificationWorker(worker_id="test")
+
+    worker.ejecutar_una_vez()
+    envio = _envio(job_id)
+    assert envio.estado == EstadoEnvio.PENDIENTE
+    assert envio.intentos == 1
+    assert envio.ultimo_error
+    assert envio.proximo_intento > ahora_utc().replace(tzinfo=None) + timedelta(minutes=59)
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "en_curso"
+    assert body["pendientes"] == 1
+
+    # Antes de vencer el backoff no se reintenta
+    worker.ejecutar_una_vez()
+    assert _envio(job_id).intentos == 1
+
+    # Sin espera: agota los intentos y queda fallido
+    monkeypatch.setattr(settings, "NOTIFICATION_JOB_RETRY_BASE_SECONDS", 0)
+    db = SessionLocal()
+    db.query(NotificacionEnvio).filter(NotificacionEnvio.job_id == job_id).update({"proximo_intento": None})
+    db.commit()
+    db.close()
+    worker.ejecutar_una_vez()
+
+    envio = _envio(job_id)
+    assert envio.estado == EstadoEnvio.FALLIDO
+    assert envio.intentos == settings.NOTIFICATION_JOB_MAX_ATTEMPTS
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "completado"
+    assert body["fallidos"] == 1
+
+
+def test_job_abandonado_se_retoma_al_vencer_el_lease(client, headers, moroso, smtp):
+    job_id = _encolar(client, headers)
+
+    # Otro worker lo reservó y murió
+    db = SessionLocal()
+    db.query(NotificacionJob).filter(NotificacionJob.id == job_id).update({
+        "estado": EstadoJob.EN_CURSO,
+        "worker_id": "muerto",
+        "lease_hasta": ahora_utc() + timedelta(minutes=5),
+    })
+    db.commit()
+    assert NotificationJobService.reclamar(db, "test") is None
+
+    db.query(NotificacionJob).filter(NotificacionJob.id == job_id).update({
+        "lease_hasta": ahora_utc() - timedelta(seconds=1),
+    })
+    db.commit()
+    db.close()
+
+    NotificationWorker(worker_id="test").ejecutar_una_vez()
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "completado"
+    assert body["enviados"] == 1
+
+
+def test_socio_que_pago_se_omite(client, headers, moroso, smtp):
+    job_id = _encolar(client, headers)
+    db = SessionLocal()
+    db.query(Miembro).filter(Miembro.id == moroso["id"]).update({"saldo_cuenta": 0.0})
+    db.commit()
+    db.close()
+
+    NotificationWorker(worker_id="test").ejecutar_una_vez()
+
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert (body["enviados"], body["omitidos"], body["estado"]) == (0, 1, "completado")
+    assert smtp.mensajes == []
+
+
+def test_smtp_sin_configurar_marca_job_fallido(client, headers, moroso, monkeypatch):
+    monkeypatch.setattr(settings, "SMTP_USER", "")
+    job_id = _encolar(client, headers)
+
+    NotificationWorker(worker_id="test").ejecutar_una_vez()
+
+    body = client.get(f"/api/notificaciones/jobs/{job_id}", headers=headers).json()
+    assert body["estado"] == "fallido"
+    assert "SMTP" in body["error"]
+
+
+def test_job_inexistente(client, headers):
+    r = client.get("/api/notificaciones/jobs/999999", headers=headers)
+    assert r.status_code == 404
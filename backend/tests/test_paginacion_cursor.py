@@ -0,0 +1,134 @@
+"""
+Tests de la paginación por cursor (keyset)
+backend/tests/test_paginacion_cursor.py
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.acceso import Acceso, TipoAcceso, ResultadoAcceso
+from app.utils.helpers import ahora_utc
+from tests.test_pagos_api import _crear_categoria_y_miembro
+from tests.test_usuarios_permissions import elevate_to_super_admin, login_headers
+
+
+def _recorrer(client, headers, url, params, page_size):
+    """Recorre todas las páginas hacia adelante; devuelve (ids, metadatas)"""
+    ids, metas = [], []
+    cursor = ""
+    while cursor is not None:
+        r = client.get(url, headers=headers, params={**params, "page_size": page_size, "cursor": cursor})
+        assert r.status_code == 200, r.text
+        body = r.json()
+        ids.extend(item["id"] for item in body["items"])
+        metas.append(body["pagination"])
+        cursor = body["pagination"]["next_cursor"]
+    return ids, metas
+
+
+@pytest.fixture
+def socio_con_pagos(client, headers):
+    """Socio con 7 pagos, dos de ellos el mismo día (empate en fecha_pago)"""
+    socio = _crear_categoria_y_miembro(client, headers)
+    for i, dias in enumerate([0, 1, 1, 3, 4, 5, 6]):
+        r = client.post("/api/pagos", headers=headers, json={
+            "miembro_id": socio["id"],
+            "tipo": "cuota",
+            "concepto": f"Cuota {i}",
+            "monto": 100.0,
+            "metodo_pago": "efectivo",
+            "fecha_pago": (date(2020, 1, 10) + timedelta(days=dias)).isoformat(),
+        })
+        assert r.status_code == 201, r.text
+    return socio
+
+
+def test_pagos_cursor_equivale_a_offset(client, headers, socio_con_pagos):
+    params = {"miembro_id": socio_con_pagos["id"]}
+    ids, metas = _recorrer(client, headers, "/api/pagos", params, page_size=3)
+
+    assert len(ids) == 7 and len(set(ids)) == 7
+    assert len(metas) == 3
+    assert metas[0]["total"] is None and metas[0]["has_prev"] is False
+    assert metas[-1]["has_next"] is False
+
+    # Mismo orden que fecha_pago desc (empates por id desc)
+    r = client.get("/api/pagos", headers=headers, params={**params, "page_size": 100})
+    items = r.json()["items"]
+    esperado = [p["id"] for p in sorted(items, key=lambda p: (p["fecha_pago"], p["id"]), reverse=True)]
+    assert ids == esperado
+
+
+def test_pagos_cursor_hacia_atras(client, headers, socio_con_pagos):
+    params = {"miembro_id": socio_con_pagos["id"], "page_size": 3}
+    primera = client.get("/api/pagos", headers=headers, params={**params, "cursor": ""}).json()
+    segunda = client.get(
+        "/api/pagos", headers=headers, params={**params, "cursor": primera["pagination"]["next_cursor"]}
+    ).json()
+    assert segunda["pagination"]["has_prev"] is True
+
+    volver = client.get(
+        "/api/pagos", headers=headers, params={**params, "cursor": segunda["pagination"]["prev_cursor"]}
+    ).json()
+    assert [p["id"] for p in volver["items"]] == [p["id"] for p in primera["items"]]
+    assert volver["pagination"]["has_prev"] is False
+    assert volver["pagination"]["has_next"] is True
+
+
+def test_cursor_invalido(client, headers, socio_con_pagos):
+    r = client.get("/api/pagos", headers=headers, params={"cursor": "no-es-un-cursor"})
+    assert r.status_code == 400
+
+    # Un cursor de otro listado (otra columna de orden) se rechaza
+    pagos = client.get("/api/pagos", headers=headers, params={"cursor": "", "page_size": 1}).json()
+    r = client.get("/api/miembros", headers=headers, params={"cursor": pagos["pagination"]["next_cursor"]})
+    assert r.status_code == 400
+
+
+def test_miembros_cursor(client, headers):
+    creados = {_crear_categoria_y_miembro(client, headers)["id"] for _ in range(3)}
+    ids, _ = _recorrer(client, headers, "/api/miembros", {}, page_size=2)
+    assert ids == sorted(ids, reverse=True)
+    assert creados <= set(ids)
+
+    offset = client.get("/api/miembros", headers=headers, params={"page_size": 100}).json()
+    assert offset["pagination"]["total"] == len(ids)
+
+
+def test_historial_accesos_cursor(client, headers):
+    socio = _crear_categoria_y_miembro(client, headers)
+    base = ahora_utc().replace(microsecond=0)
+    db = SessionLocal()
+    try:
+        # Tres accesos con la misma fecha_hora: el id desempata
+        for minutos in [0, 0, 0, 5, 10]:
+            db.add(Acceso(
+                miembro_id=socio["id"],
+                fecha_hora=base - timedelta(minutes=minutos),
+                tipo_acceso=TipoAcceso.QR,
+                resultado=ResultadoAcceso.PERMITIDO,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    ids, metas = _recorrer(client, headers, "/api/accesos/historial", {"miembro_id": socio["id"]}, page_size=2)
+    offset = client.get(
+        "/api/accesos/historial", headers=headers, params={"miembro_id": socio["id"], "page_size": 100}
+    ).json()
+    assert len(ids) == 5 and set(ids) == {a["id"] for a in offset["items"]}
+    assert len(metas) == 3
+
+
+def test_auditoria_cursor(client, make_user):
+    admin = make_user()
+    elevate_to_super_admin(admin["username"])
+    headers = login_headers(client, admin["username"], admin["password"])
+
+    offset = client.get("/api/auditoria", headers=headers, params={"page_size": 100}).json()
+
+    ids, metas = _recorrer(client, headers, "/api/auditoria", {}, page_size=7)
+    assert len(ids) == len(set(ids))
+    assert {a["id"] for a in offset["items"]} <= set(ids)
+    assert all(m["total"] is None for m in metas)
@@ -0,0 +1,113 @@
+"""
+Tests del pool de bcrypt y la actualización transparente de hashes
+backend/tests/test_password_pool.py
+"""
+import asyncio
+import time
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from app import metrics
+from app.config import settings
+from app.database import SessionLocal
+from app.models.usuario import Usuario
+from app.services.password_pool import PasswordPool
+from app.utils.security import hash_password
+
+
+def _hash_debil(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(4)).decode()
+
+
+def test_login_actualiza_hash_con_parametros_viejos(client, make_user):
+    usuario = make_user()
+    db = SessionLocal()
+    try:
+        u = db.query(Usuario).filter(Usuario.username == usuario["username"]).first()
+        u.password_hash = _hash_debil(usuario["password"])
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.post("/api/auth/login", json={"username": usuario["username"], "password": usuario["password"]})
+    assert r.status_code == 200, r.text
+
+    db = SessionLocal()
+    try:
+        u = db.query(Usuario).filter(Usuario.username == usuario["username"]).first()
+        assert u.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    finally:
+        db.close()
+
+    # Sigue entrando con la misma contraseña
+    r = client.post("/api/auth/login", json={"username": usuario["username"], "password": usuario["password"]})
+    assert r.status_code == 200, r.text
+
+
+def test_verificar_no_bloquea_el_event_loop():
+    pool = PasswordPool(workers=2, max_cola=10)
+    password_hash = hash_password("Clave1234")
+
+    async def escenario():
+        huecos = []
+        terminado = asyncio.Event()
+
+        async def tic():
+            ultimo = time.perf_counter()
+            while not terminado.is_set():
+                await asyncio.sleep(0.005)
+                ahora = time.perf_counter()
+                huecos.append(ahora - ultimo)
+                ultimo = ahora
+
+        ticker = asyncio.create_task(tic())
+        resultados = await asyncio.gather(*(pool.verificar("Clave1234", password_hash) for _ in range(3)))
+        terminado.set()
+        await ticker
+        return resultados, huecos
+
+    try:
+        resultados, huecos = asyncio.run(escenario())
+    finally:
+        pool.cerrar()
+
+    assert resultados == [(True, None)] * 3
+    # Cada verificación tarda cientos de ms: el loop nunca quedó frenado tanto
+    assert max(huecos) < 0.2
+
+
+def test_cola_llena_responde_503(monkeypatch):
+    observaciones = []
+    monkeypatch.setattr(
+        metrics, "observe_password_hash",
+        lambda operacion, espera, duracion: observaciones.append((operacion, espera))
+    )
+    pool = PasswordPool(workers=1, max_cola=1)
+    password_hash = _hash_debil("Clave1234")
+
+    async def escenario():
+        return await asyncio.gather(
+            *(pool.verificar("Clave1234", password_hash) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    try:
+        resultados = asyncio.run(escenario())
+    finally:
+        pool.cerrar()
+
+    rechazados = [r for r in resultados if isinstance(r, HTTPException)]
+    assert len(rechazados) == 1
+    assert rechazados[0].status_code == 503
+    assert rechazados[0].headers["Retry-After"] == "1"
+
+    # El hash débil se verifica y se propone uno nuevo
+    ok = [r for r in resultados if not isinstance(r, HTTPException)]
+    assert all(coincide and nuevo for coincide, nuevo in ok)
+
+    # Con un solo worker la segunda operación esperó en cola
+    assert [o for o, _ in observaciones] == ["verify", "verify"]
+    assert max(espera for _, espera in observaciones) > 0
+    assert pool.pendientes == 0
@@ -0,0 +1,110 @@
+"""
+Tests de la caché de usuarios autenticados y la revocación de tokens
+backend/tests/test_principal_cache.py
+"""
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.services.principal_cache_service import PrincipalCacheService
+from tests.test_usuarios_permissions import elevate_to_super_admin, login_headers
+
+
+class _ContadorSelectUsuarios:
+    """Cuenta los SELECT sobre usuarios ejecutados por la sesión asíncrona"""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM usuarios" in statement:
+            self.total += 1
+
+    def __enter__(self):
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self)
+
+
+def _admin(client, make_user):
+    admin = make_user()
+    elevate_to_super_admin(admin["username"])
+    return login_headers(client, admin["username"], admin["password"])
+
+
+def _id_de(client, headers):
+    return client.get("/api/auth/me", headers=headers).json()["id"]
+
+
+def test_requests_autenticadas_sin_select(client, make_user):
+    usuario = make_user()
+    headers = login_headers(client, usuario["username"], usuario["password"])
+    PrincipalCacheService.limpiar()
+
+    with _ContadorSelectUsuarios() as contador:
+        for _ in range(5):
+            r = client.get("/api/auth/validate-token", headers=headers)
+            assert r.status_code == 200, r.text
+    assert contador.total == 1
+
+    me = client.get("/api/auth/me", headers=headers).json()
+    assert me["username"] == usuario["username"]
+    assert "password_hash" not in me
+
+
+def test_cambiar_rol_revoca_el_token(client, make_user):
+    admin_headers = _admin(client, make_user)
+    usuario = make_user()
+    headers = login_headers(client, usuario["username"], usuario["password"])
+    usuario_id = _id_de(client, headers)
+
+    r = client.post("/api/usuarios/cambiar-rol", headers=admin_headers, json={
+        "usuario_id": usuario_id, "nuevo_rol": "consulta",
+    })
+    assert r.status_code == 200, r.text
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    nuevo = login_headers(client, usuario["username"], usuario["password"])
+    assert client.get("/api/auth/me", headers=nuevo).json()["rol"] == "consulta"
+
+
+def test_desactivar_y_eliminar_revocan(client, make_user):
+    admin_headers = _admin(client, make_user)
+
+    inactivo = make_user()
+    headers = login_headers(client, inactivo["username"], inactivo["password"])
+    inactivo_id = _id_de(client, headers)
+    r = client.post("/api/usuarios/toggle-active", headers=admin_headers, json={
+        "usuario_id": inactivo_id, "activar": False,
+    })
+    assert r.status_code == 200, r.text
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+
+    eliminado = make_user()
+    headers = login_headers(client, eliminado["username"], eliminado["password"])
+    r = client.delete(f"/api/usuarios/{_id_de(client, headers)}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+
+
+def test_cambio_de_contrasena_revoca_access_y_refresh(client, make_user):
+    usuario = make_user()
+    r = client.post("/api/auth/login", json={"username": usuario["username"], "password": usuario["password"]})
+    tokens = r.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    r = client.post("/api/auth/change-password", headers=headers, json={
+        "current_password": usuario["password"],
+        "new_password": "OtraClave123",
+        "confirm_password": "OtraClave123",
+    })
+    assert r.status_code == 200, r.text
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    r = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 401
+
+    nuevo = login_headers(client, usuario["username"], "OtraClave123")
+    assert client.get("/api/auth/me", headers=nuevo).status_code == 200
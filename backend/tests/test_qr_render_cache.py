@@ -0,0 +1,95 @@
+"""
+Tests para la caché de imágenes QR renderizadas (/qr-image)
+backend/tests/test_qr_render_cache.py
+"""
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.services.qr_render_cache import QRRenderCache
+from app.services.qr_service import QRService
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    QRRenderCache.limpiar_memoria()
+    yield tmp_path / "qr_cache"
+    QRRenderCache.limpiar_memoria()
+
+
+@pytest.fixture
+def miembro(client, auth_tokens):
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    uid = uuid.uuid4().hex[:8]
+    r = client.post("/api/miembros", headers=headers, json={
+        "nombre": "Luis",
+        "apellido": "Render",
+        "tipo_documento": "dni",
+        "numero_documento": str(int(uid, 16))[:8],
+    })
+    assert r.status_code in (200, 201), r.text
+    return headers, r.json()
+
+
+def test_clave_cambia_con_parametros_de_render(monkeypatch):
+    base = QRRenderCache.clave("abc", "Ana Pérez", "M-00001")
+
+    assert base == QRRenderCache.clave("abc", "Ana Pérez", "M-00001")
+    assert base != QRRenderCache.clave("abd", "Ana Pérez", "M-00001")
+    assert base != QRRenderCache.clave("abc", "Ana Gómez", "M-00001")
+    assert base != QRRenderCache.clave("abc", "Ana Pérez", "M-00001", personalizar=False)
+
+    monkeypatch.setattr(settings, "ORG_NAME", "Otro Club")
+    assert base != QRRenderCache.clave("abc", "Ana Pérez", "M-00001")
+
+
+def test_qr_image_renderiza_una_vez_y_responde_304(client, miembro, cache_dir, monkeypatch):
+    headers, datos = miembro
+    renders = []
+    original = QRService.generar_qr_miembro
+
+    def _contar(*args, **kwargs):
+        renders.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(QRService, "generar_qr_miembro", _contar)
+    url = f"/api/miembros/{datos['id']}/qr-image"
+
+    r1 = client.get(url, headers=headers)
+    assert r1.status_code == 200
+    assert r1.headers["content-type"] == "image/png"
+    assert r1.content.startswith(b"\x89PNG")
+    etag = r1.headers["etag"]
+    assert len(list(cache_dir.glob("*.png"))) == 1
+
+    # Segundo pedido: desde memoria, mismo contenido y ETag
+    r2 = client.get(url, headers=headers)
+    assert r2.content == r1.content
+    assert r2.headers["etag"] == etag
+
+    # Sin la caché en memoria se lee del disco
+    QRRenderCache.limpiar_memoria()
+    r3 = client.get(url, headers=headers)
+    assert r3.content == r1.content
+    assert len(renders) == 1
+
+    # Revalidación condicional
+    r4 = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r4.status_code == 304
+    assert r4.content == b""
+    assert r4.headers["etag"] == etag
+
+
+def test_qr_image_cambia_etag_al_editar_nombre(client, miembro, cache_dir):
+    headers, datos = miembro
+    url = f"/api/miembros/{datos['id']}/qr-image"
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    r = client.put(f"/api/miembros/{datos['id']}", headers=headers, json={"nombre": "Luciano"})
+    assert r.status_code == 200, r.text
+
+    r = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
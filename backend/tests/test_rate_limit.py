@@ -0,0 +1,261 @@
+"""
+Tests del rate limiting (ventana deslizante, backends y middleware)
+backend/tests/test_rate_limit.py
+"""
+import asyncio
+import uuid
+
+import pytest
+
+from app import metrics
+from app.config import settings
+from app.middleware.rate_limit import (
+    Limite, MemoriaBackend, RateLimiter, RedisBackend, Regla, rate_limiter
+)
+
+
+class Reloj:
+    def __init__(self, ahora: float = 1000.0):
+        self.ahora = ahora
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+class RedisLocal:
+    """Sustituto local de redis.asyncio con los comandos que usa RedisBackend"""
+
+    def __init__(self):
+        self.datos = {}
+        self.ttl = {}
+        self.falla = False
+        self.cerrado = False
+
+    def pipeline(self, transaction=True):
+        return _PipelineLocal(self)
+
+    async def decr(self, clave):
+        self.datos[clave] = int(self.datos.get(clave, 0)) - 1
+        return self.datos[clave]
+
+    async def aclose(self):
+        self.cerrado = True
+
+
+class _PipelineLocal:
+    def __init__(self, redis: RedisLocal):
+        self.redis = redis
+        self.comandos = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, clave):
+        self.comandos.append(("incr", clave, None))
+
+    def expire(self, clave, segundos):
+        self.comandos.append(("expire", clave, segundos))
+
+    def get(self, clave):
+        self.comandos.append(("get", clave, None))
+
+    async def execute(self):
+        if self.redis.falla:
+            raise ConnectionError("redis caído")
+        resultados = []
+        for comando, clave, arg in self.comandos:
+            if comando == "incr":
+                self.redis.datos[clave] = int(self.redis.datos.get(clave, 0)) + 1
+                resultados.append(self.redis.datos[clave])
+            elif comando == "expire":
+                self.redis.ttl[clave] = arg
+                resultados.append(True)
+            else:
+                valor = self.redis.datos.get(clave)
+                resultados.append(None if valor is None else str(valor))
+        return resultados
+
+
+def _registrar(backend, clave, limite):
+    return asyncio.run(backend.registrar(clave, limite))
+
+
+@pytest.mark.parametrize("crear", [
+    lambda reloj: MemoriaBackend(100, reloj=reloj),
+    lambda reloj: RedisBackend(RedisLocal(), reloj=reloj),
+], ids=["memoria", "redis"])
+def test_ventana_deslizante_y_retry_after(crear):
+    reloj = Reloj(600.0)          # Inicio exacto de una ventana de 60s
+    backend = crear(reloj)
+    limite = Limite.parsear("5/60")
+
+    for _ in range(5):
+        assert _registrar(backend, "k", limite)[0] is True
+    permitida, espera, _ = _registrar(backend, "k", limite)
+    assert permitida is False
+    # Las 5 siguen pesando en la ventana siguiente hasta que cubren 4/5 de ella
+    assert espera == pytest.approx(72.0)
+
+    # Un rechazo no consume cupo: pasado el tiempo indicado vuelve a entrar
+    reloj.ahora += espera         # 5 * 0.8 + 1 = 5
+    assert _registrar(backend, "k", limite)[0] is True
+    assert _registrar(backend, "k", limite)[0] is False
+
+    reloj.ahora = 690.0           # mitad de la ventana: 5 * 0.5 + 1 + 1 = 4.5
+    assert _registrar(backend, "k", limite)[0] is True
+    permitida, espera, _ = _registrar(backend, "k", limite)
+    assert permitida is False     # 2.5 + 3 = 5.5
+    reloj.ahora += espera
+    assert _registrar(backend, "k", limite)[0] is True
+
+
+@pytest.mark.parametrize("inicio", [600.0, 615.0, 659.0])
+def test_espera_es_la_minima(inicio):
+    """Antes de Retry-After la request sigue rechazada; al cumplirse entra"""
+    reloj = Reloj(inicio)
+    backend = MemoriaBackend(100, reloj=reloj)
+    limite = Limite.parsear("4/60")
+    while _registrar(backend, "k", limite)[0]:
+        pass
+    reloj.ahora += 7.0
+    while _registrar(backend, "k", limite)[0]:
+        pass
+
+    _, espera, _ = _registrar(backend, "k", limite)
+    base = reloj.ahora
+    reloj.ahora = base + espera - 0.01
+    assert _registrar(backend, "k", limite)[0] is False
+    reloj.ahora = base + espera + 1e-6
+    assert _registrar(backend, "k", limite)[0] is True
+
+
+def test_memoria_lru_acotado():
+    backend = MemoriaBackend(3, reloj=Reloj())
+    limite = Limite.parsear("1/60")
+    for i in range(5):
+        _registrar(backend, f"k{i}", limite)
+    assert list(backend._contadores) == ["k2", "k3", "k4"]
+
+
+def test_redis_compartido_entre_workers():
+    redis = RedisLocal()
+    reloj = Reloj(600.0)
+    worker_a = RedisBackend(redis, reloj=reloj)
+    worker_b = RedisBackend(redis, reloj=reloj)
+    limite = Limite.parsear("3/60")
+
+    assert _registrar(worker_a, "k", limite)[0]
+    assert _registrar(worker_b, "k", limite)[0]
+    assert _registrar(worker_a, "k", limite)[0]
+    assert _registrar(worker_b, "k", limite)[0] is False
+    # El rechazo se descuenta y las claves expiran a las dos ventanas
+    assert redis.datos["ratelimit:k:10"] == 3
+    assert redis.ttl["ratelimit:k:10"] == 120
+
+
+def test_rechazo_devuelve_cupo_de_las_otras_claves():
+    limiter = RateLimiter({"POST /x": {"ip": "10/60", "dispositivo": "1/60"}})
+    regla = limiter.regla_para("POST", "/x")
+
+    assert asyncio.run(limiter.verificar(regla, {"ip": "1.2.3.4", "dispositivo": "d1"})) is None
+    for _ in range(5):
+        tipo, espera = asyncio.run(limiter.verificar(regla, {"ip": "1.2.3.4", "dispositivo": "d1"}))
+        assert tipo == "dispositivo" and espera > 0
+
+    # La IP solo gastó 1 de 10: los rechazos por dispositivo no la consumieron
+    anterior, actual = limiter.respaldo._leer("POST /x|ip|1.2.3.4", limiter.respaldo._contadores[
+        "POST /x|ip|1.2.3.4"][0])
+    assert actual == 1
+
+
+def test_backend_caido_usa_memoria(monkeypatch):
+    errores = []
+    monkeypatch.setattr(metrics, "inc_rate_limit_error_backend", lambda: errores.append(1))
+    redis = RedisLocal()
+    redis.falla = True
+    limiter = RateLimiter({"POST /x": {"ip": "2/60"}}, backend=RedisBackend(redis))
+    regla = limiter.regla_para("POST", "/x")
+
+    assert asyncio.run(limiter.verificar(regla, {"ip": "a"})) is None
+    assert asyncio.run(limiter.verificar(regla, {"ip": "a"})) is None
+    assert asyncio.run(limiter.verificar(regla, {"ip": "a"}))[0] == "ip"
+    assert len(errores) == 3
+
+    asyncio.run(limiter.cerrar())
+    assert redis.cerrado
+
+
+def test_reglas_invalidas():
+    with pytest.raises(ValueError):
+        Limite.parsear("10 por minuto")
+    with pytest.raises(ValueError):
+        Limite.parsear("0/60")
+    with pytest.raises(ValueError):
+        Regla.parsear("POST /x", {"cookie": "1/60"})
+
+
+# ==================== MIDDLEWARE ====================
+
+@pytest.fixture
+def limitado(monkeypatch):
+    """Rate limiting habilitado con contadores limpios"""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    rate_limiter.limpiar()
+    yield rate_limiter
+    rate_limiter.configurar(settings.RATE_LIMIT_RULES)
+    rate_limiter.limpiar()
+
+
+def test_login_por_usuario_responde_429(client, limitado, monkeypatch):
+    rechazos = []
+    monkeypatch.setattr(metrics, "inc_rate_limit_rechazado", lambda regla, clave: rechazos.append((regla, clave)))
+    limitado.configurar({"POST /api/auth/login": {"ip": "100/60", "usuario": "3/60"}})
+    objetivo = f"victima_{uuid.uuid4().hex[:8]}"
+
+    for _ in range(3):
+        r = client.post("/api/auth/login", json={"username": objetivo, "password": "incorrecta"})
+        assert r.status_code == 401
+    # Mayúsculas/espacios no evaden el límite
+    r = client.post("/api/auth/login", json={"username": f" {objetivo.upper()} ", "password": "incorrecta"})
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+    assert r.json()["success"] is False
+    assert rechazos == [("POST /api/auth/login", "usuario")]
+
+    # Otro usuario desde la misma IP no está bloqueado
+    r = client.post("/api/auth/login", json={"username": f"otro_{uuid.uuid4().hex[:8]}", "password": "incorrecta"})
+    assert r.status_code == 401
+
+
+def test_validar_qr_por_dispositivo(client, limitado, headers_rol):
+    portero = headers_rol("portero")
+    limitado.configurar({"POST /api/accesos/validar-qr": {"usuario": "100/60", "dispositivo": "2/60"}})
+
+    def escanear(dispositivo):
+        return client.post("/api/accesos/validar-qr", headers=portero, json={
+            "qr_code": "CLUB-99999999-abcdef0123456789", "dispositivo_id": dispositivo
+        })
+
+    assert escanear("molinete-1").status_code != 429
+    assert escanear("molinete-1").status_code != 429
+    r = escanear("molinete-1")
+    assert r.status_code == 429
+    assert "Retry-After" in r.headers
+    # El body se reenvía intacto a la ruta cuando hay cupo
+    r = escanear("molinete-2")
+    assert r.status_code != 429 and r.status_code != 422
+
+
+def test_deshabilitado_no_limita(client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    rate_limiter.configurar({"POST /api/auth/login": {"usuario": "1/60"}})
+    try:
+        for _ in range(3):
+            r = client.post("/api/auth/login", json={"username": "nadie_limite", "password": "incorrecta"})
+            assert r.status_code == 401
+    finally:
+        rate_limiter.configurar(settings.RATE_LIMIT_RULES)
+        rate_limiter.limpiar()
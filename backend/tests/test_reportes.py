@@ -34,3 +34,21 @@ def test_ingresos_historicos_y_accesos_detallados(client: TestClient):
     body = r.json()
     assert "accesos_por_hora" in body and len(body["accesos_por_hora"]) == 24
     assert "estadisticas" in body
+
+
+def test_morosidad_filtra_dias_mora_en_sql(client: TestClient):
+    headers = _headers(client)
+
+    todos = client.get("/api/reportes/morosidad", headers=headers)
+    assert todos.status_code == 200, todos.text
+
+    r = client.get("/api/reportes/morosidad", headers=headers, params={"dias_mora_minimo": 30})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert all(m["dias_mora"] >= 30 for m in body["morosos"])
+    assert body["cantidad_morosos"] == sum(
+        1 for m in todos.json()["morosos"] if m["dias_mora"] >= 30
+    )
+
+    r = client.get("/api/reportes/morosidad", headers=headers, params={"dias_mora_minimo": -1})
+    assert r.status_code == 422
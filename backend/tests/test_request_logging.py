@@ -0,0 +1,123 @@
+"""
+Tests del log por request (middleware ASGI, muestreo y cola de logs)
+backend/tests/test_request_logging.py
+"""
+import json
+import logging
+import threading
+
+import pytest
+
+from app.config import settings
+from app.middleware.logging import ColaLogs, tasa_muestreo
+
+LOGGER = "app.middleware.logging"
+
+
+def _logs_request(caplog):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == LOGGER]
+
+
+def test_propaga_request_id_del_cliente(client, caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    r = client.get("/", headers={"X-Request-ID": "abc-123"})
+    assert r.headers["X-Request-ID"] == "abc-123"
+
+    # Los handlers de error lo leen de request.state
+    r = client.post("/api/auth/login", headers={"X-Request-ID": "err-456"}, json={})
+    assert r.status_code == 422
+    assert r.json()["request_id"] == "err-456"
+
+    logs = {log["request_id"]: log for log in _logs_request(caplog)}
+    assert logs["abc-123"]["route"] == "/" and logs["abc-123"]["status"] == 200
+    assert logs["err-456"]["status"] == 422
+
+
+def test_muestreo_de_respuestas_exitosas(client, caplog, monkeypatch):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    monkeypatch.setattr(settings, "LOG_REQUEST_SAMPLE_RATES", {"/health": 0.0})
+    monkeypatch.setattr(settings, "LOG_SLOW_REQUEST_MS", 60000.0)
+
+    for _ in range(5):
+        assert client.get("/health").status_code == 200
+    assert client.get("/api/no-existe").status_code == 404
+
+    logs = _logs_request(caplog)
+    # Exitosas de /health muestreadas a 0; los errores se registran siempre
+    assert [log["path"] for log in logs] == ["/api/no-existe"]
+    assert logs[0]["sample_rate"] == 1.0
+
+
+def test_requests_lentas_se_registran_siempre(client, caplog, monkeypatch):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    monkeypatch.setattr(settings, "LOG_REQUEST_SAMPLE_RATES", {"/health": 0.0})
+    monkeypatch.setattr(settings, "LOG_SLOW_REQUEST_MS", 0.0)
+
+    client.get("/health")
+    assert [log["route"] for log in _logs_request(caplog)] == ["/health"]
+
+
+class _Destino(logging.Handler):
+    def __init__(self, bloqueo: threading.Event = None):
+        super().__init__()
+        self.lineas = []
+        self.threads = set()
+        self.bloqueo = bloqueo
+
+    def emit(self, record):
+        if self.bloqueo is not None:
+            self.bloqueo.wait(5)
+        self.threads.add(threading.get_ident())
+        self.lineas.append(self.format(record))
+
+
+def _logger_con(cola: ColaLogs, nombre: str) -> logging.Logger:
+    log = logging.getLogger(nombre)
+    log.handlers = [cola.handler]
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    return log
+
+
+def test_cola_escribe_desde_otro_thread():
+    destino = _Destino()
+    cola = ColaLogs([destino], formato="%(levelname)s %(message)s")
+    log = _logger_con(cola, "test.cola_logs")
+    cola.iniciar()
+    try:
+        log.info("socio %s", 42)
+        try:
+            raise ValueError("falla")
+        except ValueError:
+            log.exception("con traceback")
+    finally:
+        cola.detener()
+
+    assert destino.lineas[0] == "INFO socio 42"
+    assert destino.lineas[1].startswith("ERROR con traceback")
+    assert "ValueError: falla" in destino.lineas[1]
+    assert threading.get_ident() not in destino.threads
+
+
+def test_cola_llena_descarta_sin_bloquear():
+    liberar = threading.Event()
+    destino = _Destino(bloqueo=liberar)
+    cola = ColaLogs([destino], formato="%(message)s", max_cola=3)
+    log = _logger_con(cola, "test.cola_logs_llena")
+    cola.iniciar()
+    try:
+        for i in range(50):
+            log.info(f"linea {i}")
+        assert cola.descartados > 0
+    finally:
+        liberar.set()
+        cola.detener()
+    assert len(destino.lineas) + cola.descartados == 50
+
+
+@pytest.mark.parametrize("estado, rate", [(200, 0.25), (302, 0.25), (404, 1.0), (500, 1.0)])
+def test_tasa_muestreo(monkeypatch, estado, rate):
+    monkeypatch.setattr(settings, "LOG_REQUEST_SAMPLE_RATES", {"/api/x": 0.25})
+    monkeypatch.setattr(settings, "LOG_SLOW_REQUEST_MS", 1000.0)
+    assert tasa_muestreo("/api/x", estado, 0.01) == rate
+    assert tasa_muestreo("/api/x", estado, 2.0) == 1.0
@@ -0,0 +1,103 @@
+"""
+Tests de serialización (orjson / TypeAdapter precompilado) y compresión de respuestas
+backend/tests/test_respuestas.py
+"""
+import gzip
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.middleware.compression import comprimir, elegir_codificacion
+from app.models.miembro import EstadoMiembro
+from app.schemas.common import PaginatedResponse
+from app.schemas.miembro import MiembroListItem
+from app.utils.respuestas import RespuestaJSON, SerializadorJSON
+
+
+@pytest.fixture
+def admin(client, headers_rol, crear_miembro):
+    headers = headers_rol("administrador")
+    cat = client.post("/api/miembros/categorias", headers=headers, json={
+        "nombre": f"Comp_{uuid.uuid4().hex[:8]}", "cuota_base": 1000.0, "tiene_cuota_fija": True
+    }).json()
+    for _ in range(8):
+        crear_miembro(headers, cat["id"], nombre="Compresión", apellido="Núñez")
+    return headers
+
+
+def test_listado_comprimido_con_gzip(client, admin):
+    r = client.get("/api/miembros", headers={**admin, "Accept-Encoding": "gzip"}, params={"page_size": 100})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    # httpx ya descomprimió: el largo declarado es el del cuerpo comprimido
+    assert int(r.headers["content-length"]) < len(r.content)
+    datos = r.json()
+    assert len(datos["items"]) >= 8 and datos["pagination"]["total"] >= 8
+    assert {"id", "numero_miembro", "nombre_completo", "estado", "categoria", "fecha_alta"} <= set(datos["items"][0])
+
+
+def test_sin_compresion_si_el_cliente_no_la_acepta(client, admin):
+    r = client.get("/api/miembros", headers={**admin, "Accept-Encoding": "identity"}, params={"page_size": 100})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+    assert int(r.headers["content-length"]) == len(r.content)
+
+
+def test_respuestas_chicas_no_se_comprimen(client, monkeypatch):
+    r = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 1)
+    r = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.json()["status"]
+
+
+def test_streaming_no_se_comprime(client, headers_rol):
+    portero = {**headers_rol("portero"), "Accept-Encoding": "gzip"}
+    r = client.get("/api/accesos/snapshot", headers=portero)
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+
+
+@pytest.mark.parametrize("accept, esperado", [
+    ("gzip, deflate", "gzip"),
+    ("deflate", None),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+    ("", None),
+    ("identity", None),
+])
+def test_elegir_codificacion(accept, esperado):
+    assert elegir_codificacion(accept) == esperado
+
+
+def test_serializador_igual_al_camino_de_fastapi():
+    serializador = SerializadorJSON(PaginatedResponse[MiembroListItem])
+    pagina = PaginatedResponse[MiembroListItem](
+        items=[MiembroListItem(
+            id=1, numero_miembro="M-1", numero_documento="123", nombre_completo="Peña, José",
+            estado=EstadoMiembro.ACTIVO, saldo_cuenta=-10.5, fecha_alta=date(2024, 1, 2)
+        )],
+        pagination={"total": 1, "page": 1, "page_size": 20, "total_pages": 1, "has_next": False, "has_prev": False},
+    )
+    assert json.loads(serializador.serializar(pagina)) == jsonable_encoder(pagina)
+    # Un dict con los mismos datos se valida igual
+    assert serializador.serializar(pagina.model_dump()) == serializador.serializar(pagina)
+
+
+def test_respuesta_json_orjson():
+    r = RespuestaJSON({"monto": Decimal("10.50"), "nombre": "Muñoz", "cuando": datetime(2024, 5, 1, 12, 0)})
+    assert json.loads(r.body) == {"monto": 10.5, "nombre": "Muñoz", "cuando": "2024-05-01T12:00:00"}
+    assert "Muñoz".encode("utf-8") in r.body
+
+
+def test_gzip_decodificable():
+    cuerpo = json.dumps([{"i": i} for i in range(500)]).encode()
+    assert gzip.decompress(comprimir(cuerpo, "gzip")) == cuerpo
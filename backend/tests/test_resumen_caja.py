@@ -0,0 +1,129 @@
+"""
+Tests del resumen diario de caja
+backend/tests/test_resumen_caja.py
+"""
+from datetime import date
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.pago import ResumenDiarioCaja
+from app.services.resumen_caja_service import ResumenCajaService
+from tests.test_pagos_api import _crear_categoria_y_miembro
+
+# Mes sin datos de otros tests
+ANIO, MES = 2031, 3
+
+
+def _filas(desde: date, hasta: date):
+    db = SessionLocal()
+    try:
+        filas = db.query(ResumenDiarioCaja).filter(
+            ResumenDiarioCaja.fecha >= desde,
+            ResumenDiarioCaja.fecha <= hasta
+        ).all()
+        return {
+            (f.fecha, f.categoria_contable): (
+                round(f.ingresos, 2), round(f.egresos, 2),
+                f.cantidad_ingresos, f.cantidad_egresos, f.cantidad_pagos
+            )
+            for f in filas
+        }
+    finally:
+        db.close()
+
+
+def _movimiento(client, headers, tipo, monto, dia, categoria=None):
+    payload = {
+        "tipo": tipo,
+        "concepto": f"{tipo} resumen",
+        "monto": monto,
+        "fecha_movimiento": date(ANIO, MES, dia).isoformat(),
+    }
+    if categoria:
+        payload["categoria_contable"] = categoria
+    r = client.post("/api/pagos/movimientos", headers=headers, json=payload)
+    assert r.status_code == 201, r.text
+
+
+def test_resumen_incremental_y_reconstruccion(client, headers):
+    socio = _crear_categoria_y_miembro(client, headers)
+    r = client.post("/api/pagos", headers=headers, json={
+        "miembro_id": socio["id"],
+        "tipo": "cuota",
+        "concepto": "Cuota resumen",
+        "monto": 1000.0,
+        "descuento": 100.0,
+        "recargo": 0.0,
+        "metodo_pago": "efectivo",
+        "fecha_pago": date(ANIO, MES, 10).isoformat(),
+    })
+    assert r.status_code == 201, r.text
+    pago_id = r.json()["id"]
+
+    _movimiento(client, headers, "ingreso", 300.0, 12)
+    _movimiento(client, headers, "egreso", 50.0, 15, categoria="Mantenimiento")
+    _movimiento(client, headers, "egreso", 25.0, 15, categoria="Mantenimiento")
+
+    inicio, fin = date(ANIO, MES, 1), date(ANIO, MES, 31)
+    filas = _filas(inicio, fin)
+    assert filas[(date(ANIO, MES, 10), "Cuotas y Pagos")] == (900.0, 0.0, 1, 0, 1)
+    assert filas[(date(ANIO, MES, 12), "")] == (300.0, 0.0, 1, 0, 0)
+    assert filas[(date(ANIO, MES, 15), "Mantenimiento")] == (0.0, 75.0, 0, 2, 0)
+
+    resumen = client.get(f"/api/pagos/resumen/financiero?mes={MES}&anio={ANIO}", headers=headers).json()
+    assert resumen["total_ingresos"] == pytest.approx(1200.0)
+    assert resumen["total_egresos"] == pytest.approx(75.0)
+    assert resumen["cantidad_pagos"] == 1
+
+    # Al anular, el pago deja de contar en su día (la devolución va a hoy)
+    r = client.post(f"/api/pagos/{pago_id}/anular", headers=headers, json={"motivo": "Prueba de resumen"})
+    assert r.status_code == 200, r.text
+    resumen = client.get(f"/api/pagos/resumen/financiero?mes={MES}&anio={ANIO}", headers=headers).json()
+    assert resumen["cantidad_pagos"] == 0
+    assert resumen["total_ingresos"] == pytest.approx(1200.0)
+
+    financiero = client.get(
+        "/api/reportes/financiero",
+        headers=headers,
+        params={"fecha_desde": inicio.isoformat(), "fecha_hasta": fin.isoformat()},
+    ).json()
+    assert financiero["total_ingresos"] == pytest.approx(1200.0)
+    assert financiero["cantidad_transacciones"] == 4
+    assert financiero["egresos_detalle"] == [{"categoria": "Mantenimiento", "cantidad": 2, "total": 75.0}]
+
+    # Lo mantenido en cada escritura coincide con recalcular desde cero
+    incremental = _filas(inicio, fin)
+    db = SessionLocal()
+    try:
+        ResumenCajaService.reconstruir(db, desde=inicio, hasta=fin)
+    finally:
+        db.close()
+    assert _filas(inicio, fin) == incremental
+
+
+def test_ingresos_historicos_desde_resumen(client, headers):
+    hoy = date.today()
+    db = SessionLocal()
+    try:
+        antes = ResumenCajaService.mensual(db, hoy.replace(day=1), hoy)
+    finally:
+        db.close()
+
+    r = client.post("/api/pagos/movimientos", headers=headers, json={
+        "tipo": "ingreso",
+        "concepto": "Ingreso histórico",
+        "monto": 123.0,
+        "fecha_movimiento": hoy.isoformat(),
+    })
+    assert r.status_code == 201, r.text
+
+    body = client.get("/api/reportes/ingresos-historicos?meses=24", headers=headers).json()
+    assert body["total_meses"] == 24
+    actual = body["historico"][-1]
+    assert (actual["anio"], actual["mes_numero"]) == (hoy.year, hoy.month)
+    previo = antes.get((hoy.year, hoy.month), {"ingresos": 0.0})["ingresos"]
+    assert actual["ingresos"] == pytest.approx(previo + 123.0)
+
+    dashboard = client.get("/api/reportes/dashboard", headers=headers).json()
+    assert dashboard["finanzas_mes"]["ingresos"] == pytest.approx(actual["ingresos"])
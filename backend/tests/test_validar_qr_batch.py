@@ -0,0 +1,142 @@
+"""
+Tests de la sincronización en lote de escaneos offline (validar-qr/batch)
+backend/tests/test_validar_qr_batch.py
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.services.acceso_cache_service import AccesoCacheService
+from app.services.qr_service import QRService
+
+
+def _hace(minutos: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(minutes=minutos)).isoformat()
+
+
+def test_lote_decide_por_escaneo_y_registra(client, escenario_acceso):
+    admin, portero, miembros = escenario_acceso
+    r = client.post(
+        f"/api/miembros/{miembros[1]['id']}/cambiar-estado",
+        headers=admin,
+        json={"miembro_id": miembros[1]["id"], "nuevo_estado": "suspendido", "motivo": "test lote"},
+    )
+    assert r.status_code == 200, r.text
+
+    adulterado = miembros[2]["qr_code"][:-4] + "0000"
+    escaneos = [
+        {"qr_code": miembros[0]["qr_code"], "fecha_hora": _hace(30), "id_local": "a"},
+        {"qr_code": miembros[1]["qr_code"], "fecha_hora": _hace(20), "id_local": "b"},
+        {"qr_code": adulterado, "fecha_hora": _hace(10), "id_local": "c"},
+        {"qr_code": "basura-sin-formato", "fecha_hora": _hace(5), "id_local": "d"},
+        {"qr_code": "CLUB-99999999-abcdef0123456789", "fecha_hora": _hace(5), "id_local": "e"},
+        {"qr_code": miembros[0]["qr_code"], "fecha_hora": _hace(-60), "id_local": "f"},
+    ]
+    r = client.post("/api/accesos/validar-qr/batch", headers=portero, json={
+        "dispositivo_id": f"disp-{uuid.uuid4().hex[:8]}", "escaneos": escaneos,
+    })
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert [x["indice"] for x in data["resultados"]] == list(range(6))
+    assert [x["id_local"] for x in data["resultados"]] == list("abcdef")
+    estados = [x["estado"] for x in data["resultados"]]
+    assert estados == ["registrado", "registrado", "registrado", "qr_invalido", "no_encontrado", "fecha_invalida"]
+    assert (data["total"], data["registrados"], data["duplicados"], data["invalidos"]) == (6, 3, 0, 3)
+
+    ok, suspendido, fraude = data["resultados"][:3]
+    assert ok["acceso_permitido"] is True and ok["nivel_alerta"] == "success"
+    assert suspendido["acceso_permitido"] is False and suspendido["resultado"] == "rechazado"
+    assert fraude["acceso_permitido"] is False and "adulterado" in fraude["mensaje"]
+    assert all(x["acceso_id"] for x in data["resultados"][:3])
+
+    # Se registra la fecha/hora del dispositivo, no la de sincronización
+    r = client.get(f"/api/accesos/historial?miembro_id={miembros[0]['id']}", headers=admin)
+    assert r.status_code == 200, r.text
+    fechas = [datetime.fromisoformat(x["fecha_hora"]) for x in r.json()["items"]]
+    esperado = datetime.fromisoformat(escaneos[0]["fecha_hora"])
+    assert any(abs((f.replace(tzinfo=timezone.utc) - esperado).total_seconds()) < 1 for f in fechas)
+
+
+def test_reenvio_no_duplica(client, escenario_acceso):
+    _, portero, miembros = escenario_acceso
+    payload = {
+        "dispositivo_id": f"disp-{uuid.uuid4().hex[:8]}",
+        "escaneos": [
+            {"qr_code": m["qr_code"], "fecha_hora": _hace(i + 1), "id_local": str(i)}
+            for i, m in enumerate(miembros)
+        ],
+    }
+    # El mismo escaneo dos veces dentro del lote
+    payload["escaneos"].append(dict(payload["escaneos"][0], id_local="repetido"))
+
+    r1 = client.post("/api/accesos/validar-qr/batch", headers=portero, json=payload)
+    assert r1.status_code == 200, r1.text
+    primero = r1.json()
+    assert (primero["registrados"], primero["duplicados"]) == (3, 1)
+    assert primero["resultados"][3]["acceso_id"] == primero["resultados"][0]["acceso_id"]
+
+    # La app reintenta porque no recibió la respuesta
+    r2 = client.post("/api/accesos/validar-qr/batch", headers=portero, json=payload)
+    assert r2.status_code == 200, r2.text
+    segundo = r2.json()
+    assert (segundo["registrados"], segundo["duplicados"]) == (0, 4)
+    assert [x["acceso_id"] for x in segundo["resultados"]] == [x["acceso_id"] for x in primero["resultados"]]
+    assert [x["acceso_permitido"] for x in segundo["resultados"]] == [x["acceso_permitido"] for x in primero["resultados"]]
+
+
+def test_un_select_de_miembros_y_un_commit(client, escenario_acceso):
+    _, portero, miembros = escenario_acceso
+    for m in miembros:
+        AccesoCacheService.invalidar(m["id"])
+    escaneos = [
+        {"qr_code": m["qr_code"], "fecha_hora": _hace(i)}
+        for i, m in enumerate(miembros * 4)
+    ]
+
+    sentencias = []
+    listener = lambda conn, cursor, stmt, *a: sentencias.append(stmt)
+    commits = []
+    listener_commit = lambda conn: commits.append(1)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    event.listen(async_engine.sync_engine, "commit", listener_commit)
+    try:
+        r = client.post("/api/accesos/validar-qr/batch", headers=portero, json={"escaneos": escaneos})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+        event.remove(async_engine.sync_engine, "commit", listener_commit)
+
+    assert r.status_code == 200, r.text
+    assert r.json()["registrados"] == 12
+    selects = [s for s in sentencias if s.lstrip().upper().startswith("SELECT") and "FROM miembros" in s]
+    assert len(selects) == 1
+    assert " IN " in selects[0]
+    assert len(commits) == 1
+
+
+def test_lote_demasiado_grande(client, escenario_acceso, monkeypatch):
+    from app.config import settings
+
+    _, portero, miembros = escenario_acceso
+    monkeypatch.setattr(settings, "ACCESS_BATCH_MAX_SCANS", 2)
+    escaneos = [{"qr_code": miembros[0]["qr_code"], "fecha_hora": _hace(i)} for i in range(3)]
+    r = client.post("/api/accesos/validar-qr/batch", headers=portero, json={"escaneos": escaneos})
+    assert r.status_code == 413
+
+
+def test_validar_qr_lote_coincide_con_validar_qr():
+    qr = QRService.generar_qr_miembro(7, "30111222", "M-00007", personalizar=False, timestamp="2024-01-01T00:00:00")
+    codigo = qr["qr_code"]
+    casos = [
+        (codigo, 7, "30111222", "2024-01-01T00:00:00"),
+        (codigo, 8, "30111222", "2024-01-01T00:00:00"),
+        (codigo[:-1] + "x", 7, "30111222", "2024-01-01T00:00:00"),
+        ("OTRO-7-abc", 7, "30111222", "2024-01-01T00:00:00"),
+        ("sin-formato", 7, "30111222", "2024-01-01T00:00:00"),
+    ]
+    lote = QRService.validar_qr_lote(casos)
+    individuales = [QRService.validar_qr(*caso) for caso in casos]
+    assert lote == individuales
+    assert lote[0] == (True, None)
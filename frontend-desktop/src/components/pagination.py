@@ -52,3 +52,45 @@ def create_pagination_controls(pagination: dict, on_page_change) -> ft.Row:
         alignment=ft.MainAxisAlignment.CENTER,
         spacing=5
     )
+
+
+def create_cursor_pagination_controls(pagination: dict, on_cursor_change) -> ft.Row:
+    """
+    Crear controles de paginación por cursor (sin total ni saltos de página)
+    
+    Args:
+        pagination: Dict con información de paginación del backend (modo cursor)
+        on_cursor_change: Callback que recibe el cursor a pedir ("" = primera página)
+    
+    Returns:
+        ft.Row con los controles de paginación
+    """
+    has_prev = pagination.get("has_prev", False)
+    has_next = pagination.get("has_next", False)
+    prev_cursor = pagination.get("prev_cursor")
+    next_cursor = pagination.get("next_cursor")
+    
+    return ft.Row(
+        [
+            ft.IconButton(
+                icon=ft.Icons.FIRST_PAGE,
+                disabled=not has_prev,
+                on_click=lambda _: on_cursor_change(""),
+                tooltip="Primera página"
+            ),
+            ft.IconButton(
+                icon=ft.Icons.ARROW_BACK,
+                disabled=not has_prev,
+                on_click=lambda _: on_cursor_change(prev_cursor),
+                tooltip="Página anterior"
+            ),
+            ft.IconButton(
+                icon=ft.Icons.ARROW_FORWARD,
+                disabled=not has_next,
+                on_click=lambda _: on_cursor_change(next_cursor),
+                tooltip="Página siguiente"
+            ),
+        ],
+        alignment=ft.MainAxisAlignment.CENTER,
+        spacing=5
+    )
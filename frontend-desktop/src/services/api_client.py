@@ -3,7 +3,9 @@ Cliente HTTP para comunicación con la API
 frontend-desktop/src/services/api_client.py
 """
 import httpx
-from typing import Optional, Dict, Any, Union
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Union, Tuple
+import json
 import uuid
 import os
 from dotenv import load_dotenv
@@ -12,6 +14,8 @@ load_dotenv()
 
 API_URL = os.getenv("API_URL", "http://localhost:8000/api")
 API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
+# Respuestas GET con ETag guardadas para revalidar con If-None-Match
+API_ETAG_CACHE_SIZE = int(os.getenv("API_ETAG_CACHE_SIZE", "200"))
 
 
 # ==================== EXCEPCIONES PERSONALIZADAS ====================
@@ -58,6 +62,25 @@ class APIClient:
         self.timeout = API_TIMEOUT
         self.token: Optional[str] = None
         self.refresh_token: Optional[str] = None
+        # (url, params) -> (etag, cuerpo); el servidor responde 304 si no cambió
+        self._cache_etag: "OrderedDict[Tuple[str, Tuple], Tuple[str, bytes]]" = OrderedDict()
+    
+    @staticmethod
+    def _clave_cache(url: str, params: Any) -> Tuple[str, Tuple]:
+        """Clave de la caché de ETags: URL + query params ordenados"""
+        if isinstance(params, dict):
+            params = sorted((k, str(v)) for k, v in params.items() if v is not None)
+        return url, tuple(params or ())
+    
+    def _guardar_etag(self, clave: Tuple[str, Tuple], response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        if not etag:
+            self._cache_etag.pop(clave, None)
+            return
+        self._cache_etag[clave] = (etag, response.content)
+        self._cache_etag.move_to_end(clave)
+        while len(self._cache_etag) > API_ETAG_CACHE_SIZE:
+            self._cache_etag.popitem(last=False)
     
     def _get_headers(self) -> Dict[str, str]:
         """Headers para las peticiones"""
@@ -109,6 +132,15 @@ class APIClient:
         req_id = kwargs['headers'].get('X-Request-ID') or uuid.uuid4().hex
         kwargs['headers']['X-Request-ID'] = req_id
         
+        # GET: revalidar la copia guardada (304 Not Modified = sin cuerpo)
+        clave_cache = None
+        en_cache = None
+        if method.upper() == "GET":
+            clave_cache = self._clave_cache(url, kwargs.get('params'))
+            en_cache = self._cache_etag.get(clave_cache)
+            if en_cache:
+                kwargs['headers']['If-None-Match'] = en_cache[0]
+        
         try:
             async with httpx.AsyncClient(timeout=timeout) as client:
                 response = await client.request(method, url, **kwargs)
@@ -147,6 +179,12 @@ class APIClient:
                     self.refresh_token = None
                     raise AuthenticationError("Sesión expirada. Por favor inicia sesión nuevamente.", request_id=resp_request_id or req_id)
                 
+                # Sin cambios desde la copia guardada
+                if response.status_code == 304 and en_cache:
+                    self._cache_etag.move_to_end(clave_cache)
+                    cuerpo = en_cache[1]
+                    return cuerpo if response_type == "bytes" else json.loads(cuerpo)
+                
                 # Manejo de otros códigos de error
                 if response.status_code == 404:
                     # Intentar extraer detalle
@@ -169,6 +207,9 @@ class APIClient:
                 # Para otros errores, usar raise_for_status de httpx
                 response.raise_for_status()
                 
+                if clave_cache is not None:
+                    self._guardar_etag(clave_cache, response)
+                
                 # Retornar según tipo de respuesta
                 if response_type == "bytes":
                     return response.content
@@ -241,9 +282,10 @@ class APIClient:
         return await self._request("GET", "auth/me")
     
     def logout(self):
-        """Cerrar sesión (limpiar tokens)"""
+        """Cerrar sesión (limpiar tokens y respuestas guardadas)"""
         self.token = None
         self.refresh_token = None
+        self._cache_etag.clear()
     
     # ==================== MIEMBROS ====================
     
@@ -252,10 +294,13 @@ class APIClient:
         page: int = 1,
         page_size: int = 20,
         q: Optional[str] = None,
-        estado: Optional[str] = None
+        estado: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Obtener lista de miembros"""
+        """Obtener lista de miembros (cursor="" inicia la paginación por cursor)"""
         params = {"page": page, "page_size": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
         if q:
             params["q"] = q
         if estado:
@@ -263,6 +308,10 @@ class APIClient:
         
         return await self._request("GET", "miembros", params=params)
     
+    async def buscar_miembros(self, q: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Autocompletado de socios (ordenado por relevancia, sin tildes)"""
+        return await self._request("GET", "miembros/buscar", params={"q": q, "limit": limit})
+    
     async def get_miembro(self, miembro_id: int) -> Dict[str, Any]:
         """Obtener detalles de un miembro"""
         return await self._request("GET", f"miembros/{miembro_id}")
@@ -335,10 +384,13 @@ class APIClient:
         fecha_inicio: Optional[str] = None,
         fecha_fin: Optional[str] = None,
         metodo_pago: Optional[str] = None,
-        estado: Optional[str] = None
+        estado: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Obtener lista de pagos"""
+        """Obtener lista de pagos (cursor="" inicia la paginación por cursor)"""
         params = {"page": page, "page_size": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
         if miembro_id:
             params["miembro_id"] = miembro_id
         if fecha_inicio:
@@ -416,7 +468,8 @@ class APIClient:
         miembro_id: Optional[int] = None,
         fecha_inicio: Optional[str] = None,
         fecha_fin: Optional[str] = None,
-        resultado: Optional[str] = None
+        resultado: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Obtener historial de accesos con filtros completos
@@ -428,11 +481,14 @@ class APIClient:
             fecha_inicio: Fecha inicio (ISO format YYYY-MM-DD)
             fecha_fin: Fecha fin (ISO format YYYY-MM-DD)
             resultado: Filtrar por resultado (permitido, rechazado, advertencia)
+            cursor: Cursor de paginación ("" = primera página; ignora page)
         
         Returns:
             Respuesta paginada con historial de accesos
         """
         params = {"page": page, "page_size": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
         if miembro_id:
             params["miembro_id"] = miembro_id
         if fecha_inicio:
@@ -534,6 +590,20 @@ class APIClient:
         """
         return await self._request("GET", "reportes/dashboard", timeout=30)
     
+    async def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """
+        Obtener en una sola llamada todo lo que muestra el dashboard
+        
+        Returns:
+            Dict con:
+            - socios, finanzas_mes, accesos (incluye por_hora y hora pico)
+            - ingresos_historicos: últimos 6 meses
+            - morosidad: cantidad, total_deuda y top_deudores
+            - actividad_reciente: lista (solo administradores) o None
+            - generado_at: momento del cálculo (el servidor lo cachea unos segundos)
+        """
+        return await self._request("GET", "reportes/dashboard/snapshot", timeout=30)
+    
     async def get_reporte_socios(self, **filters) -> Dict[str, Any]:
         """
         Obtener reporte de socios con filtros
@@ -632,7 +702,8 @@ class APIClient:
         severidad: Optional[str] = None,
         usuario_id: Optional[int] = None,
         page: int = 1,
-        page_size: int = 10
+        page_size: int = 10,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Obtener actividades de auditoría con paginación
@@ -643,11 +714,14 @@ class APIClient:
             usuario_id: Filtrar por usuario
             page: Número de página
             page_size: Registros por página
+            cursor: Cursor de paginación ("" = primera página; ignora page)
         
         Returns:
             Dict con items (lista de actividades) y pagination (metadata)
         """
         params = {"page": page, "page_size": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
         if tipo:
             params["tipo"] = tipo
         if severidad:
@@ -841,19 +915,21 @@ class APIClient:
         dias_mora_minimo: int = 5
     ) -> Dict[str, Any]:
         """
-        Enviar recordatorios masivos a socios con deuda
+        Encolar recordatorios masivos a socios con deuda
+        
+        El servidor responde de inmediato (202); los emails los envía el
+        worker de notificaciones. Consultar el avance con
+        obtener_job_notificaciones(job_id).
         
         Args:
             solo_morosos: Si True, solo envía a socios morosos
             dias_mora_minimo: Días mínimos de mora para enviar
         
         Returns:
-            Estadísticas de envío:
-            - total_enviados
-            - total_fallidos
-            - emails_enviados (lista con detalles)
+            - job_id: ID del trabajo encolado
+            - total_procesados: destinatarios del envío
         """
-        data = {
+        params = {
             "solo_morosos": solo_morosos,
             "dias_mora_minimo": dias_mora_minimo,
             "incluir_email": True
@@ -862,10 +938,20 @@ class APIClient:
         return await self._request(
             "POST",
             "notificaciones/recordatorios-masivos",
-            json=data,
-            timeout=120
+            params=params,
+            timeout=60
         )
     
+    async def obtener_job_notificaciones(self, job_id: int) -> Dict[str, Any]:
+        """
+        Estado de un envío masivo
+        
+        Returns:
+            estado (pendiente|en_curso|completado|fallido), total,
+            enviados, fallidos, omitidos, pendientes, error
+        """
+        return await self._request("GET", f"notificaciones/jobs/{job_id}")
+    
     async def test_email_config(self) -> Dict[str, Any]:
         """
         Probar configuración de email (envía un test al admin)
@@ -14,6 +14,7 @@ from src.services.api_client import (
     NotFoundError,
     APITimeoutError
 )
+import asyncio
 import flet as ft
 
 
@@ -286,17 +287,21 @@ async def ejemplo_enviar_recordatorios(page: ft.Page):
         if not confirmar:
             return
         
-        # 3. Enviar
-        resultado = await api_client.enviar_recordatorios_masivos(
+        # 3. Encolar y esperar a que el worker termine
+        encolado = await api_client.enviar_recordatorios_masivos(
             solo_morosos=True,
             dias_mora_minimo=5
         )
+        resultado = await api_client.obtener_job_notificaciones(encolado["job_id"])
+        while resultado["estado"] in ("pendiente", "en_curso"):
+            await asyncio.sleep(2)
+            resultado = await api_client.obtener_job_notificaciones(encolado["job_id"])
         
         page.snack_bar = ft.SnackBar(
             content=ft.Text(
                 f"✅ Recordatorios enviados\n"
-                f"Exitosos: {resultado['total_enviados']}\n"
-                f"Fallidos: {resultado['total_fallidos']}"
+                f"Exitosos: {resultado['enviados']}\n"
+                f"Fallidos: {resultado['fallidos']}"
             ),
             bgcolor=ft.colors.GREEN,
             duration=5000
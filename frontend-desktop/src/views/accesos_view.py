@@ -4,6 +4,7 @@ frontend-desktop/src/views/accesos_view.py
 """
 import flet as ft
 from src.services.api_client import api_client
+from src.components.pagination import create_cursor_pagination_controls
 
 
 class AccesosView(ft.Column):
@@ -30,6 +31,10 @@ class AccesosView(ft.Column):
         
         self.loading = ft.ProgressRing(visible=False)
         
+        # Paginación por cursor: el historial crece sin límite y no se cuenta
+        self.cursor = ""
+        self.pagination_row = ft.Row(alignment=ft.MainAxisAlignment.CENTER)
+        
         self.build_ui()
         
     # Cargar datos
@@ -78,7 +83,9 @@ class AccesosView(ft.Column):
                     expand=True
                 ),
                 expand=True
-            )
+            ),
+            
+            self.pagination_row
         ]
         
         self.spacing = 10
@@ -125,9 +132,13 @@ class AccesosView(ft.Column):
         self.update()
         
         try:
-            response = await api_client.get_accesos(page=1, page_size=20)
+            response = await api_client.get_accesos(page_size=20, cursor=self.cursor)
             items = response.get("items", [])
             
+            self.pagination_row.controls = [
+                create_cursor_pagination_controls(response.get("pagination", {}), self.on_cursor_change)
+            ]
+            
             self.data_table.rows.clear()
             
             for acceso in items:
@@ -177,6 +188,11 @@ class AccesosView(ft.Column):
             self.loading.visible = False
             self.update()
     
+    def on_cursor_change(self, cursor: str):
+        """Cambiar de página del historial"""
+        self.cursor = cursor
+        self.page.run_task(self.load_accesos)
+    
     def show_snackbar(self, message: str, error: bool = False):
         """Mostrar mensaje snackbar"""
         self.page.snack_bar = ft.SnackBar(
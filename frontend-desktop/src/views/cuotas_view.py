@@ -543,8 +543,7 @@ class CuotasView(ft.Column):
             error_banner.hide()
             
             try:
-                response = await api_client.get_miembros(q=query, page_size=5)
-                items = response.get("items", [])
+                items = await api_client.buscar_miembros(query, limit=5)
                 
                 resultado_busqueda.controls.clear()
                 
@@ -858,8 +857,7 @@ class CuotasView(ft.Column):
             error_banner.hide()
             
             try:
-                response = await api_client.get_miembros(q=query, page_size=5)
-                items = response.get("items", [])
+                items = await api_client.buscar_miembros(query, limit=5)
                 
                 resultado_busqueda.controls.clear()
                 
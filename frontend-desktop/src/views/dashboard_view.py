@@ -180,21 +180,21 @@ class DashboardView(ft.Column):
     async def _load_dashboard_data(self):
         """Cargar datos del dashboard (async)"""
         try:
-            # Cargar datos del dashboard
-            dashboard_data = await api_client.get_dashboard()
+            # Un solo request con todo el dashboard (snapshot cacheado en el servidor)
+            snapshot = await api_client.get_dashboard_snapshot()
             
             # Actualizar KPIs
-            self._update_kpis(dashboard_data)
+            self._update_kpis(snapshot)
             
             # Actualizar gráficos
-            await self._update_graficos(dashboard_data)
+            self._update_graficos(snapshot)
             
             # Actualizar alertas
-            await self._update_alertas()
+            self._update_alertas(snapshot.get("morosidad", {}))
             
             # Actualizar actividad reciente (solo admin)
             if self.actividad_container:
-                await self._update_actividad_reciente()
+                await self._update_actividad_reciente(snapshot.get("actividad_reciente"))
             
         except Exception as e:
             self.show_error(f"Error al cargar dashboard: {e}")
@@ -263,13 +263,12 @@ class DashboardView(ft.Column):
         self.kpi_morosidad.update()
         self.kpi_accesos.update()
     
-    async def _update_graficos(self, data: dict):
-        """Actualizar gráficos con datos reales"""
+    def _update_graficos(self, data: dict):
+        """Actualizar gráficos con los datos del snapshot"""
         
         # Gráfico de ingresos (datos históricos reales)
         try:
-            historico_data = await api_client.get_ingresos_historicos(meses=6)
-            historico = historico_data.get("historico", [])
+            historico = data.get("ingresos_historicos", [])
             
             meses = [h.get("mes") for h in historico]
             valores_ingresos = [h.get("ingresos", 0) for h in historico]
@@ -292,9 +291,8 @@ class DashboardView(ft.Column):
         
         # Gráfico de accesos (datos reales por hora)
         try:
-            accesos_data = await api_client.get_accesos_detallados()
-            accesos_por_hora = accesos_data.get("accesos_por_hora", [])
-            estadisticas = accesos_data.get("estadisticas", {})
+            estadisticas = data.get("accesos", {})
+            accesos_por_hora = estadisticas.get("por_hora", [])
             
             # Filtrar solo horas con actividad o cada 3 horas
             horas = []
@@ -355,24 +353,22 @@ class DashboardView(ft.Column):
             )
             self.grafico_accesos.update()
     
-    async def _update_alertas(self):
+    def _update_alertas(self, morosidad: dict):
         """Actualizar panel de alertas"""
         try:
-            # Obtener datos de morosidad
-            morosidad_data = await api_client.get_reporte_morosidad()
-            morosos = morosidad_data.get("morosos", [])
+            cantidad_morosos = morosidad.get("cantidad", 0)
             
-            # Top 5 morosos con mayor deuda
-            top_morosos = sorted(morosos, key=lambda x: x.get("deuda", 0), reverse=True)[:5]
+            # Mayores deudores (ya ordenados por deuda en el servidor)
+            top_morosos = morosidad.get("top_deudores", [])
             
             alertas = []
             
             # Alerta de morosidad
-            if len(morosos) > 0:
+            if cantidad_morosos > 0:
                 alertas.append(
                     self._create_alerta(
                         titulo="⚠️ Socios Morosos",
-                        descripcion=f"{len(morosos)} socios con deudas pendientes",
+                        descripcion=f"{cantidad_morosos} socios con deudas pendientes",
                         color=ft.Colors.ORANGE,
                         accion_texto="Ver Detalles",
                         accion=lambda: self.navigate_to("reportes")
@@ -591,19 +587,23 @@ class DashboardView(ft.Column):
             padding=10
         )
     
-    async def _update_actividad_reciente(self):
-        """Actualizar widget de actividad reciente"""
+    async def _update_actividad_reciente(self, actividades: list = None):
+        """
+        Actualizar widget de actividad reciente
+        
+        Con la carga inicial llegan en el snapshot; el botón de refresco
+        (actividades=None) pide solo las últimas 15.
+        """
         try:
-            # Obtener últimas 15 actividades
-            response = await api_client.get_actividades(
-                tipo=None,
-                severidad=None,
-                usuario_id=None,
-                page=1,
-                page_size=15
-            )
-            
-            actividades = response.get("data", [])
+            if actividades is None:
+                response = await api_client.get_actividades(
+                    tipo=None,
+                    severidad=None,
+                    usuario_id=None,
+                    page=1,
+                    page_size=15
+                )
+                actividades = response.get("items", [])
             
             # Crear lista de actividades
             actividad_items = []
@@ -694,8 +694,9 @@ class DashboardView(ft.Column):
         except:
             fecha_str = fecha[:5] if len(fecha) > 5 else fecha
         
-        icon = tipo_icons.get(tipo, "📌")
-        bgcolor = severidad_colors.get(severidad, ft.Colors.GREY_50)
+        # La API devuelve los valores del enum en minúsculas
+        icon = tipo_icons.get(tipo.upper(), "📌")
+        bgcolor = severidad_colors.get(severidad.upper(), ft.Colors.GREY_50)
         
         return ft.Container(
             content=ft.Row(
@@ -270,7 +270,6 @@ class ReportesView(ft.Column):
                     scroll=ft.ScrollMode.AUTO,
                 ),
                 padding=10,
-                expand=True,
                 expand=True
             )
             
@@ -912,7 +911,14 @@ class ReportesView(ft.Column):
             config_dialog.open = False
             self.page.update()
             
-            # Mostrar loading
+            # Diálogo de progreso (el envío corre en el servidor)
+            progreso = ft.ProgressBar(width=350, value=None)
+            estado_text = ft.Text("Encolando recordatorios...")
+            
+            def seguir_en_segundo_plano(_):
+                loading_dialog.open = False
+                self.page.update()
+            
             loading_dialog = ft.AlertDialog(
                 modal=True,
                 title=ft.Row(
@@ -922,7 +928,10 @@ class ReportesView(ft.Column):
                     ],
                     spacing=10
                 ),
-                content=ft.Text("Por favor espera, esto puede tomar unos momentos...")
+                content=ft.Column([progreso, estado_text], spacing=10, tight=True),
+                actions=[
+                    ft.TextButton("Seguir en segundo plano", on_click=seguir_en_segundo_plano)
+                ]
             )
             
             self.page.overlay.append(loading_dialog)
@@ -932,15 +941,42 @@ class ReportesView(ft.Column):
             try:
                 dias_mora = int(dias_mora_field.value or 5)
                 
-                # Llamar al API
-                resultado = await api_client.enviar_recordatorios_masivos(
+                # Encolar el envío
+                encolado = await api_client.enviar_recordatorios_masivos(
                     solo_morosos=solo_morosos.value,
                     dias_mora_minimo=dias_mora
                 )
+                job_id = encolado.get("job_id")
+                
+                # Consultar el avance hasta que termine o se cierre el diálogo
+                resultado = encolado
+                while job_id and loading_dialog.open:
+                    resultado = await api_client.obtener_job_notificaciones(job_id)
+                    total = resultado.get("total", 0)
+                    hechos = total - resultado.get("pendientes", 0)
+                    progreso.value = (hechos / total) if total else 1
+                    estado_text.value = (
+                        f"Enviados: {resultado.get('enviados', 0)} · "
+                        f"Fallidos: {resultado.get('fallidos', 0)} · "
+                        f"Pendientes: {resultado.get('pendientes', 0)} de {total}"
+                    )
+                    self.page.update()
+                    if resultado.get("estado") in ("completado", "fallido"):
+                        break
+                    await asyncio.sleep(1.5)
+                
+                if not loading_dialog.open:
+                    # El usuario eligió seguir en segundo plano
+                    self.show_snackbar(f"Envío #{job_id} en curso en segundo plano")
+                    return
                 
                 loading_dialog.open = False
                 self.page.update()
                 
+                if resultado.get("estado") == "fallido":
+                    self.show_snackbar(f"Error en el envío: {resultado.get('error')}", error=True)
+                    return
+                
                 # Mostrar resultado
                 resultado_dialog = ft.AlertDialog(
                     modal=True,
@@ -954,7 +990,7 @@ class ReportesView(ft.Column):
                     content=ft.Column(
                         [
                             ft.Text(
-                                f"✓ Recordatorios programados: {resultado.get('enviados', 0)}",
+                                f"✓ Recordatorios enviados: {resultado.get('enviados', 0)}",
                                 size=14,
                                 weight=ft.FontWeight.BOLD,
                                 color=ft.Colors.GREEN
@@ -964,12 +1000,11 @@ class ReportesView(ft.Column):
                                 size=14,
                                 color=ft.Colors.RED if resultado.get('fallidos', 0) > 0 else ft.Colors.GREY
                             ),
-                            ft.Divider(),
                             ft.Text(
-                                "Los emails se están enviando en segundo plano.",
+                                f"Omitidos (ya sin deuda): {resultado.get('omitidos', 0)}",
                                 size=12,
                                 color=ft.Colors.GREY_700
-                            )
+                            ),
                         ],
                         spacing=10,
                         tight=True
@@ -986,7 +1021,7 @@ class ReportesView(ft.Column):
                 resultado_dialog.open = True
                 self.page.update()
                 
-                self.show_snackbar(f"✓ {resultado.get('enviados', 0)} recordatorios programados")
+                self.show_snackbar(f"✓ {resultado.get('enviados', 0)} recordatorios enviados")
                 
             except Exception as ex:
                 import traceback
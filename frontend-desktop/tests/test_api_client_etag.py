@@ -0,0 +1,80 @@
+"""
+Tests de revalidación con ETag / If-None-Match del APIClient
+frontend-desktop/tests/test_api_client_etag.py
+
+No requieren backend: las respuestas salen de un httpx.MockTransport.
+Ejecutar: pytest tests/test_api_client_etag.py
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import asyncio
+
+import httpx
+
+# Agregar src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services import api_client as modulo
+from services.api_client import APIClient
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    """Servidor simulado: ETag fijo, 304 si llega el mismo If-None-Match"""
+    estado = {"etag": 'W/"v1"', "cuerpo": [{"id": 1, "nombre": "Activo"}], "pedidos": []}
+
+    def responder(request: httpx.Request) -> httpx.Response:
+        estado["pedidos"].append(request)
+        if request.headers.get("If-None-Match") == estado["etag"]:
+            return httpx.Response(304, headers={"ETag": estado["etag"]})
+        return httpx.Response(200, json=estado["cuerpo"], headers={"ETag": estado["etag"]})
+
+    transporte = httpx.MockTransport(responder)
+    cliente_real = httpx.AsyncClient
+    monkeypatch.setattr(
+        modulo.httpx, "AsyncClient",
+        lambda **kwargs: cliente_real(transport=transporte, **kwargs)
+    )
+    return estado
+
+
+def test_get_revalida_con_if_none_match(servidor):
+    client = APIClient()
+
+    primero = asyncio.run(client.get_categorias())
+    segundo = asyncio.run(client.get_categorias())
+
+    assert primero == segundo == servidor["cuerpo"]
+    assert "If-None-Match" not in servidor["pedidos"][0].headers
+    assert servidor["pedidos"][1].headers["If-None-Match"] == 'W/"v1"'
+
+
+def test_etag_nuevo_reemplaza_la_copia(servidor):
+    client = APIClient()
+    asyncio.run(client.get_categorias())
+
+    servidor["etag"] = 'W/"v2"'
+    servidor["cuerpo"] = [{"id": 1, "nombre": "Cadete"}]
+
+    assert asyncio.run(client.get_categorias()) == servidor["cuerpo"]
+    asyncio.run(client.get_categorias())
+    assert servidor["pedidos"][-1].headers["If-None-Match"] == 'W/"v2"'
+
+
+def test_copia_no_se_comparte_entre_llamadas(servidor):
+    client = APIClient()
+    datos = asyncio.run(client.get_categorias())
+    datos.append({"id": 99})
+
+    assert asyncio.run(client.get_categorias()) == servidor["cuerpo"]
+
+
+def test_logout_descarta_la_cache(servidor):
+    client = APIClient()
+    asyncio.run(client.get_categorias())
+    client.logout()
+    asyncio.run(client.get_categorias())
+
+    assert "If-None-Match" not in servidor["pedidos"][-1].headers
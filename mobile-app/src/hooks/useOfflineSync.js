@@ -1 +1,83 @@
-// Hook - Sincronización
\ No newline at end of file
+// Hook - Sincronización
+//
+// Expone la cantidad de escaneos offline pendientes y los envía al backend:
+// al montar, al volver la app a primer plano y cada `intervaloMs` mientras
+// haya pendientes. Los errores de red solo se informan; la cola se conserva.
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { AppState } from 'react-native';
+
+import { contarPendientes, encolarEscaneo, sincronizar } from '../services/offline';
+
+export default function useOfflineSync(cliente, { intervaloMs = 30000 } = {}) {
+  const [pendientes, setPendientes] = useState(0);
+  const [sincronizando, setSincronizando] = useState(false);
+  const [ultimoResultado, setUltimoResultado] = useState(null);
+  const [error, setError] = useState(null);
+  const montado = useRef(true);
+
+  const actualizarPendientes = useCallback(async () => {
+    const total = await contarPendientes();
+    if (montado.current) {
+      setPendientes(total);
+    }
+    return total;
+  }, []);
+
+  const sincronizarAhora = useCallback(async () => {
+    if (!cliente || (await actualizarPendientes()) === 0) {
+      return null;
+    }
+    setSincronizando(true);
+    try {
+      const resultado = await sincronizar(cliente);
+      if (montado.current) {
+        setUltimoResultado(resultado);
+        setError(null);
+      }
+      return resultado;
+    } catch (e) {
+      if (montado.current) {
+        setError(e);
+      }
+      return null;
+    } finally {
+      if (montado.current) {
+        setSincronizando(false);
+      }
+      await actualizarPendientes();
+    }
+  }, [cliente, actualizarPendientes]);
+
+  const guardarEscaneo = useCallback(async (escaneo) => {
+    const item = await encolarEscaneo(escaneo);
+    await actualizarPendientes();
+    return item;
+  }, [actualizarPendientes]);
+
+  useEffect(() => {
+    montado.current = true;
+    sincronizarAhora();
+
+    const suscripcion = AppState.addEventListener('change', (estado) => {
+      if (estado === 'active') {
+        sincronizarAhora();
+      }
+    });
+    const intervalo = setInterval(sincronizarAhora, intervaloMs);
+
+    return () => {
+      montado.current = false;
+      suscripcion.remove();
+      clearInterval(intervalo);
+    };
+  }, [sincronizarAhora, intervaloMs]);
+
+  return {
+    pendientes,
+    sincronizando,
+    ultimoResultado,
+    error,
+    guardarEscaneo,
+    sincronizarAhora,
+  };
+}
@@ -1 +1,141 @@
-// Sincronización offline
\ No newline at end of file
+// Sincronización offline
+//
+// Cola persistente (AsyncStorage) de escaneos QR hechos sin conexión.
+// Al recuperar la red se envían en lotes a POST /api/accesos/validar-qr/batch:
+// cada escaneo lleva la fecha/hora del dispositivo y un id_local, y el backend
+// responde una decisión por escaneo. Un escaneo se quita de la cola solo
+// cuando el backend lo procesó; si la respuesta se pierde, reenviar el lote es
+// seguro (el backend devuelve "duplicado" en lugar de registrarlo otra vez).
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+const CLAVE_COLA = '@offline/escaneos';
+const CLAVE_DISPOSITIVO = '@offline/dispositivo_id';
+const RUTA_BATCH = '/api/accesos/validar-qr/batch';
+
+export const TAMANO_LOTE = 200;
+
+// Evita dos sincronizaciones simultáneas (intervalo + botón, por ejemplo)
+let sincronizacionEnCurso = null;
+
+// Cadena de operaciones sobre la cola: cada leer-modificar-guardar espera al
+// anterior, así un escaneo encolado durante una sincronización no se pisa
+let ultimaOperacion = Promise.resolve();
+
+function enExclusiva(operacion) {
+  const resultado = ultimaOperacion.then(operacion);
+  // Un error no bloquea las operaciones siguientes
+  ultimaOperacion = resultado.catch(() => {});
+  return resultado;
+}
+
+function generarId() {
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+}
+
+async function leerCola() {
+  const crudo = await AsyncStorage.getItem(CLAVE_COLA);
+  if (!crudo) {
+    return [];
+  }
+  try {
+    return JSON.parse(crudo);
+  } catch (e) {
+    console.warn('[WARN] Cola offline corrupta, se descarta', e);
+    return [];
+  }
+}
+
+async function guardarCola(cola) {
+  await AsyncStorage.setItem(CLAVE_COLA, JSON.stringify(cola));
+}
+
+/**
+ * ID estable del dispositivo (se genera la primera vez)
+ */
+export async function obtenerDispositivoId() {
+  let id = await AsyncStorage.getItem(CLAVE_DISPOSITIVO);
+  if (!id) {
+    id = `movil-${generarId()}`;
+    await AsyncStorage.setItem(CLAVE_DISPOSITIVO, id);
+  }
+  return id;
+}
+
+/**
+ * Guardar un escaneo hecho sin conexión
+ *
+ * @param {{qr_code: string, ubicacion?: string, latitud?: string, longitud?: string, observaciones?: string}} escaneo
+ * @returns {Promise<object>} El escaneo encolado (con id_local y fecha_hora)
+ */
+export async function encolarEscaneo(escaneo) {
+  const item = {
+    ...escaneo,
+    id_local: generarId(),
+    fecha_hora: new Date().toISOString(),
+  };
+  await enExclusiva(async () => {
+    const cola = await leerCola();
+    cola.push(item);
+    await guardarCola(cola);
+  });
+  return item;
+}
+
+export async function obtenerPendientes() {
+  return leerCola();
+}
+
+export async function contarPendientes() {
+  return (await leerCola()).length;
+}
+
+async function enviarLotes(cliente, tamanoLote) {
+  const dispositivoId = await obtenerDispositivoId();
+  const resumen = { enviados: 0, registrados: 0, duplicados: 0, invalidos: 0, resultados: [] };
+
+  // Se trabaja sobre una copia: lo que se encole mientras tanto queda para la próxima
+  const pendientes = await leerCola();
+  for (let inicio = 0; inicio < pendientes.length; inicio += tamanoLote) {
+    const lote = pendientes.slice(inicio, inicio + tamanoLote);
+    const { data } = await cliente.post(RUTA_BATCH, {
+      dispositivo_id: dispositivoId,
+      escaneos: lote,
+    });
+
+    // Todos los estados que devuelve el backend son definitivos
+    const procesados = new Set(data.resultados.map((r) => r.id_local));
+    await enExclusiva(async () => {
+      const cola = await leerCola();
+      await guardarCola(cola.filter((item) => !procesados.has(item.id_local)));
+    });
+
+    resumen.enviados += lote.length;
+    resumen.registrados += data.registrados;
+    resumen.duplicados += data.duplicados;
+    resumen.invalidos += data.invalidos;
+    resumen.resultados.push(...data.resultados);
+  }
+  return resumen;
+}
+
+/**
+ * Enviar la cola al backend en lotes
+ *
+ * Un error de red corta la sincronización y deja en la cola lo no enviado.
+ *
+ * @param {import('axios').AxiosInstance} cliente Cliente con baseURL del servidor y token
+ * @param {{tamanoLote?: number}} opciones
+ * @returns {Promise<{enviados: number, registrados: number, duplicados: number, invalidos: number, resultados: object[]}>}
+ */
+export function sincronizar(cliente, { tamanoLote = TAMANO_LOTE } = {}) {
+  if (!sincronizacionEnCurso) {
+    sincronizacionEnCurso = enviarLotes(cliente, tamanoLote).finally(() => {
+      sincronizacionEnCurso = null;
+    });
+  }
+  return sincronizacionEnCurso;
+}
+
+export function vaciarCola() {
+  return enExclusiva(() => AsyncStorage.removeItem(CLAVE_COLA));
+}